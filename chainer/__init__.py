@@ -195,10 +195,14 @@ global_config.type_check = bool(int(os.environ.get('CHAINER_TYPE_CHECK', '1')))
 global_config.use_cudnn = os.environ.get('CHAINER_USE_CUDNN', 'auto')
 global_config.use_cudnn_tensor_core = 'auto'
 global_config.autotune = False
+global_config.cpu_conv_algorithm = os.environ.get(
+    'CHAINER_CPU_CONV_ALGORITHM', 'im2col')
 global_config.schedule_func = None
 global_config.use_ideep = os.environ.get('CHAINER_USE_IDEEP', 'never')
 global_config.lazy_grad_sum = bool(int(
     os.environ.get('CHAINER_LAZY_GRAD_SUM', '0')))
+global_config.free_retained_on_backward = bool(int(
+    os.environ.get('CHAINER_FREE_RETAINED_ON_BACKWARD', '0')))
 global_config.cudnn_fast_batch_normalization = bool(int(
     os.environ.get('CHAINER_CUDNN_FAST_BATCH_NORMALIZATION', '0')))
 
@@ -1,5 +1,7 @@
+import contextlib
 import os
 import shutil
+import threading
 import traceback
 
 import six
@@ -7,6 +9,9 @@ import six
 import chainer
 
 
+_thread_local = threading.local()
+
+
 def _reduce(grad_list):
     if not grad_list:
         return None
@@ -23,6 +28,40 @@ def _pop_or_none(grad_list):
     return grad_list.pop() if grad_list else None
 
 
+class SparseGradContext(object):
+
+    """State of a backprop in which sparse gradients can be accumulated.
+
+    Functions may add sparse gradients of their parameter inputs directly to
+    the parameters (see :meth:`chainer.Parameter.add_sparse_grad`) only in a
+    backprop of :meth:`chainer.Variable.backward`, whose gradients of the
+    parameters are not returned to the caller.
+
+    Attributes:
+        loss_scale (float): Loss scale of the backprop, which has to be
+            recorded with the sparse gradients.
+
+    """
+
+    def __init__(self, loss_scale):
+        self.loss_scale = loss_scale
+
+
+def get_sparse_grad_context():
+    """Returns the current :class:`SparseGradContext` or ``None``."""
+    return getattr(_thread_local, 'sparse_grad_context', None)
+
+
+@contextlib.contextmanager
+def sparse_grad_context(context):
+    old = get_sparse_grad_context()
+    _thread_local.sparse_grad_context = context
+    try:
+        yield
+    finally:
+        _thread_local.sparse_grad_context = old
+
+
 class GradTable(object):
 
     """Dict of nodes to references of gradients
@@ -74,6 +113,93 @@ class GradTable(object):
             assert gx == []
 
 
+class RetainedDataReleaser(object):
+
+    """Releases the arrays retained in the graph on their last use in backprop
+
+    The number of uses of each variable node in the backward graph (i.e. the
+    number of function nodes which take it as an input or an output) is
+    counted before backprop. Each time a function node is processed, the uses
+    of its inputs and outputs are decremented, and the data array retained by
+    a node is released as soon as no unprocessed function node refers to it.
+    The data arrays retained for the outputs of a function node are released
+    right after the function node is processed.
+
+    After backprop, the graph can no longer be used for another backprop.
+
+    Args:
+        output_nodes (iterable of ~chainer.variable.VariableNode): Output
+            nodes from which backprop starts.
+
+    Attributes:
+        retained_bytes (int): Total size of the arrays retained only by the
+            graph (i.e. the arrays of the variables which have already been
+            released) when backprop starts.
+        freed_bytes (int): Total size of the arrays released only by the graph
+            before the end of backprop. It is the upper bound of the reduction
+            of the peak memory consumption during backprop.
+
+    """
+
+    def __init__(self, output_nodes):
+        uses = {}
+        seen = set()
+        funcs = []
+
+        def add_func(func):
+            if func is not None and func not in seen:
+                seen.add(func)
+                funcs.append(func)
+
+        for y in output_nodes:
+            add_func(y.creator_node)
+
+        while funcs:
+            func = funcs.pop()
+            for x in set(func.inputs):
+                uses[x] = uses.get(x, 0) + 1
+                if x.requires_grad:
+                    add_func(x.creator_node)
+            for y in func.outputs:
+                y = y()
+                if y is not None:
+                    uses[y] = uses.get(y, 0) + 1
+
+        self._uses = uses
+        self.retained_bytes = sum([
+            self._nbytes(x) for x in uses])
+        self.freed_bytes = 0
+
+    @staticmethod
+    def _nbytes(node):
+        data = node._data
+        if data is None or node.get_variable_or_none() is not None:
+            return 0
+        return getattr(data, 'nbytes', 0)
+
+    def release(self, func):
+        """Releases the arrays not used after processing a function node."""
+        func._retained_output_data = None
+        uses = self._uses
+        nodes = set(func.inputs)
+        nodes.update([y() for y in func.outputs])
+        for node in nodes:
+            if node not in uses:
+                continue
+            uses[node] -= 1
+            if uses[node] == 0:
+                del uses[node]
+                self.freed_bytes += self._nbytes(node)
+                # Keep the dtype and shape of the node.
+                node._data = None
+
+    def report(self):
+        chainer.reporter.report({
+            'backward/retained_bytes': self.retained_bytes,
+            'backward/freed_bytes': self.freed_bytes,
+        })
+
+
 def backprop_step(
         func, target_input_indexes, grad_outputs, grad_inputs, is_debug):
     """Accumulates gradients of a FunctionNode
@@ -0,0 +1,173 @@
+import functools
+import time
+
+import chainer
+from chainer import variable
+
+
+def _call_layer(layer, x):
+    if isinstance(x, tuple):
+        return layer(*x)
+    return layer(x)
+
+
+def _nbytes(x):
+    if isinstance(x, tuple):
+        return sum([_nbytes(elem) for elem in x])
+    if isinstance(x, variable.Variable):
+        x = x.array
+    return getattr(x, 'nbytes', 0)
+
+
+class CheckpointSchedule(object):
+
+    """Schedule of the segments of layers recomputed during backprop.
+
+    A sequence of layers is split into segments. Each segment consisting of
+    two or more layers is called via :func:`~chainer.functions.forget`, so
+    only the outputs of the segments are retained in the computational graph
+    and the intermediate results inside each segment are recomputed during
+    backprop.
+
+    Args:
+        every (int): Number of layers in each segment.
+        memory_budget (int): Maximum total size in bytes of the outputs of the
+            layers inside each segment. The sizes are measured by the first
+            forward computation, which is done without checkpointing.
+
+    """
+
+    def __init__(self, every=None, memory_budget=None):
+        if (every is None) == (memory_budget is None):
+            raise ValueError(
+                'exactly one of every and memory_budget must be specified')
+        if every is not None and every < 1:
+            raise ValueError('every must be positive: {}'.format(every))
+        if memory_budget is not None and memory_budget <= 0:
+            raise ValueError(
+                'memory_budget must be positive: {}'.format(memory_budget))
+        self.every = every
+        self.memory_budget = memory_budget
+        # Pairs of the output size in bytes and the forward time in seconds
+        # of each layer.
+        self._layer_stats = None
+
+    def segments(self, n_layers):
+        """Returns the segments of layers.
+
+        Args:
+            n_layers (int): Number of layers.
+
+        Returns:
+            list of tuples: Pairs of the beginning and the end indices of the
+            segments. If the memory budget is used and the sizes of the
+            outputs of the layers have not been measured yet, it returns
+            ``None``.
+
+        """
+        if self.every is not None:
+            return [(begin, min(begin + self.every, n_layers))
+                    for begin in range(0, n_layers, self.every)]
+
+        stats = self._layer_stats
+        if (stats is None or len(stats) != n_layers
+                or any([s is None for s in stats])):
+            return None
+        segments = []
+        begin = 0
+        total = 0
+        for i, (nbytes, _) in enumerate(stats):
+            if i > begin and total + nbytes > self.memory_budget:
+                segments.append((begin, i))
+                begin = i
+                total = 0
+            total += nbytes
+        if begin < n_layers:
+            segments.append((begin, n_layers))
+        return segments
+
+    def forward(self, layers, x):
+        """Calls the layers sequentially according to the schedule.
+
+        Args:
+            layers (list of callables): Layers to call. The outputs of each
+                layer are passed to the next one.
+            x: Input variable, or a tuple of input variables.
+
+        Returns:
+            The outputs of the last layer.
+
+        """
+        n_layers = len(layers)
+        stats = self._layer_stats
+        if stats is None or len(stats) != n_layers:
+            stats = self._layer_stats = [None] * n_layers
+
+        segments = self.segments(n_layers)
+        if segments is None or not chainer.config.enable_backprop:
+            return self._forward_segment(layers, 0, n_layers, x)
+
+        for begin, end in segments:
+            if end - begin == 1:
+                x = self._forward_segment(layers, begin, end, x)
+            else:
+                xs = x if isinstance(x, tuple) else (x,)
+                func = functools.partial(
+                    self._forward_segment_variables, layers, begin, end)
+                x = chainer.functions.forget(func, *xs)
+        return x
+
+    def _forward_segment_variables(self, layers, begin, end, *xs):
+        return self._forward_segment(
+            layers, begin, end, xs if len(xs) > 1 else xs[0])
+
+    def _forward_segment(self, layers, begin, end, x):
+        measure = not chainer.config.in_recomputing
+        stats = self._layer_stats
+        for i in range(begin, end):
+            if measure:
+                start = time.time()
+                x = _call_layer(layers[i], x)
+                stats[i] = (_nbytes(x), time.time() - start)
+            else:
+                x = _call_layer(layers[i], x)
+        return x
+
+    def report(self):
+        """Reports the memory saved and the forward computation added.
+
+        Returns:
+            dict: Statistics estimated from the last forward computation,
+            with the current schedule, which contains the following entries.
+            It returns ``None`` if no forward computation has been done yet.
+
+            - ``activation_bytes``: Total size of the outputs of the layers.
+            - ``retained_bytes``: Total size of the outputs retained in the
+              graph, i.e. the outputs of the segments and of the layers which
+              are not recomputed.
+            - ``saved_bytes``: Difference of the above two values.
+            - ``recompute_ratio``: Ratio of the forward computation time of
+              the recomputed layers to the time of all layers. It is the
+              fraction of forward computation added to each iteration.
+
+        """
+        stats = self._layer_stats
+        if not stats or any([s is None for s in stats]):
+            return None
+
+        activation_bytes = sum([nbytes for nbytes, _ in stats])
+        total_time = sum([seconds for _, seconds in stats])
+        retained_bytes = 0
+        recompute_time = 0
+        for begin, end in self.segments(len(stats)):
+            retained_bytes += stats[end - 1][0]
+            if end - begin > 1:
+                recompute_time += sum(
+                    [seconds for _, seconds in stats[begin:end]])
+        return {
+            'activation_bytes': activation_bytes,
+            'retained_bytes': retained_bytes,
+            'saved_bytes': activation_bytes - retained_bytes,
+            'recompute_ratio': (
+                recompute_time / total_time if total_time > 0 else 0.),
+        }
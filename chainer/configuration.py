@@ -24,9 +24,11 @@ class GlobalConfig(object):
     use_cudnn = None  # type: str
     use_cudnn_tensor_core = None  # type: str
     autotune = None  # type: bool
+    cpu_conv_algorithm = None  # type: str
     schedule_func = None  # type: tp.Optional[static_graph.StaticScheduleFunction] # NOQA
     use_ideep = None  # type: str
     lazy_grad_sum = None  # type: bool
+    free_retained_on_backward = None  # type: bool
     cudnn_fast_batch_normalization = None  # type: bool
     dtype = None  # type: numpy.dtype
     in_recomputing = None  # type: bool
@@ -134,6 +134,71 @@ def _get_device(device_spec):
     return backend.get_device(device_spec)
 
 
+class ColumnarBatch(object):
+
+    """Batch of examples stored as already concatenated arrays.
+
+    This is a sequence of examples whose elements are stored as arrays with
+    the batch dimension, i.e., in the form that
+    :func:`~chainer.dataset.concat_examples` returns. Dataset iterators may
+    return a batch of this type to avoid the copy done by the concatenation:
+    :func:`~chainer.dataset.concat_examples` just sends the arrays to the
+    target device.
+
+    Each example can be retrieved by indexing, in which case it is built from
+    views of the arrays.
+
+    Args:
+        arrays: An array, a tuple of arrays, or a dictionary of arrays. All
+            arrays must have the same length along the first axis.
+
+    Attributes:
+        ~ColumnarBatch.arrays: The arrays given to the initializer.
+
+    """
+
+    def __init__(self, arrays):
+        if isinstance(arrays, tuple):
+            columns = arrays
+        elif isinstance(arrays, dict):
+            columns = list(arrays.values())
+        else:
+            columns = [arrays]
+        if len(columns) == 0:
+            raise ValueError('arrays must not be empty')
+        size = len(columns[0])
+        for column in columns:
+            if len(column) != size:
+                raise ValueError(
+                    'arrays must have the same length: {} != {}'.format(
+                        len(column), size))
+        self.arrays = arrays
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in six.moves.range(
+                *index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('index out of range')
+        arrays = self.arrays
+        if isinstance(arrays, tuple):
+            return tuple([array[index] for array in arrays])
+        elif isinstance(arrays, dict):
+            return {key: array[index] for key, array in six.iteritems(arrays)}
+        else:
+            return arrays[index]
+
+    def __iter__(self):
+        for i in six.moves.range(self._size):
+            yield self[i]
+
+
 # TODO(hvy): Write unit tests where batch elements contain Python lists.
 @converter()
 def concat_examples(batch, device=None, padding=None):
@@ -200,6 +265,10 @@ def concat_examples(batch, device=None, padding=None):
               [3, 4],
               [5, 6]]), 'label': array([0, 1, 2])}
 
+    If ``batch`` is a :class:`~chainer.dataset.ColumnarBatch`, its arrays are
+    already concatenated; they are just sent to the device without copying
+    the examples.
+
     Args:
         batch (list): A list of examples. This is typically given by a dataset
             iterator.
@@ -221,6 +290,17 @@ def concat_examples(batch, device=None, padding=None):
     if len(batch) == 0:
         raise ValueError('batch is empty')
 
+    if isinstance(batch, ColumnarBatch):
+        # All the examples have the same shapes, so padding is not needed.
+        arrays = batch.arrays
+        if isinstance(arrays, tuple):
+            return tuple([to_device(device, array) for array in arrays])
+        elif isinstance(arrays, dict):
+            return {key: to_device(device, array)
+                    for key, array in six.iteritems(arrays)}
+        else:
+            return to_device(device, arrays)
+
     first_elem = batch[0]
 
     if isinstance(first_elem, tuple):
@@ -349,6 +429,18 @@ class ConcatWithAsyncTransfer(object):
         if len(batch) == 0:
             raise ValueError('batch is empty')
         first_elem = batch[0]
+        columnar = isinstance(batch, ColumnarBatch)
+
+        def concat(key, padding):
+            # The arrays of a columnar batch are already concatenated.
+            if columnar:
+                if key is None:
+                    return batch.arrays
+                return batch.arrays[key]
+            if key is None:
+                return _concat_arrays(batch, padding)
+            return _concat_arrays(
+                [example[key] for example in batch], padding)
 
         if len(self._conveyor) == 0:
             self._device = device  # device is set at first call
@@ -369,8 +461,7 @@ class ConcatWithAsyncTransfer(object):
                     padding = [padding] * len(first_elem)
 
                 for i in six.moves.range(len(first_elem)):
-                    self._conveyor[i].put(_concat_arrays(
-                        [example[i] for example in batch], padding[i]))
+                    self._conveyor[i].put(concat(i, padding[i]))
 
                 for i in six.moves.range(len(first_elem)):
                     result.append(self._conveyor[i].get(sync=self._sync_get))
@@ -387,8 +478,7 @@ class ConcatWithAsyncTransfer(object):
                     padding = {key: padding for key in first_elem}
 
                 for key in first_elem:
-                    self._conveyor[key].put(_concat_arrays(
-                        [example[key] for example in batch], padding[key]))
+                    self._conveyor[key].put(concat(key, padding[key]))
 
                 for key in first_elem:
                     result[key] = self._conveyor[key].get(sync=self._sync_get)
@@ -400,7 +490,7 @@ class ConcatWithAsyncTransfer(object):
                 return result
 
             else:
-                return to_device(device, _concat_arrays(batch, padding))
+                return to_device(device, concat(None, padding))
 
 
 class Conveyor(object):
@@ -1,6 +1,8 @@
 import numpy
 import six
 
+from chainer.dataset import convert
+
 
 class DatasetMixin(object):
 
@@ -14,6 +16,12 @@ class DatasetMixin(object):
     Dataset implementation using DatasetMixin still has to provide the
     :meth:`__len__` operator explicitly.
 
+    It also provides the :meth:`get_examples` method, which the iterators use
+    to retrieve the examples of a batch at once. Implementations that can
+    gather the examples efficiently, e.g. by indexing arrays with the whole
+    index array, may override it to return a
+    :class:`~chainer.dataset.ColumnarBatch`.
+
     """
 
     def __getitem__(self, index):
@@ -70,6 +78,25 @@ class DatasetMixin(object):
         """Returns the number of data points."""
         raise NotImplementedError
 
+    def get_examples(self, indices):
+        """Returns the examples of given indices.
+
+        The default implementation indexes the dataset with each index.
+        Implementations may override it to return the examples in the
+        columnar form.
+
+        Args:
+            indices (numpy.ndarray or list): One-dimensional array of the
+                indices of the examples.
+
+        Returns:
+            A list of the examples, or a
+            :class:`~chainer.dataset.ColumnarBatch` holding the elements of
+            the examples concatenated along the first axis.
+
+        """
+        return [self[i] for i in indices]
+
     def get_example(self, i):
         """Returns the i-th example.
 
@@ -84,3 +111,46 @@ class DatasetMixin(object):
 
         """
         raise NotImplementedError
+
+
+def get_examples(dataset, indices):
+    """Returns the examples of given indices from a dataset.
+
+    It uses :meth:`~chainer.dataset.DatasetMixin.get_examples` if the dataset
+    implements it. If the dataset is a :class:`numpy.ndarray` of a numeric
+    dtype, the examples are returned as a
+    :class:`~chainer.dataset.ColumnarBatch` of the array indexed by
+    ``indices``. Otherwise, the dataset is indexed with each index.
+
+    Args:
+        dataset: Dataset.
+        indices (numpy.ndarray or list): One-dimensional array of the indices
+            of the examples.
+
+    Returns:
+        A list of the examples or a :class:`~chainer.dataset.ColumnarBatch`.
+
+    """
+    get = getattr(dataset, 'get_examples', None)
+    if get is not None:
+        return get(indices)
+    if isinstance(dataset, numpy.ndarray) and _is_numeric(dataset):
+        indices = numpy.asarray(indices, dtype=numpy.intp)
+        return convert.ColumnarBatch(dataset[indices])
+    return [dataset[i] for i in indices]
+
+
+def _is_numeric(array):
+    # Arrays of objects (e.g. variable-length sequences) are not batched as
+    # columns, so that the converters can handle each example.
+    return array.dtype.kind in 'biufc'
+
+
+def _column(batch):
+    # Returns the array of a columnar batch of examples which are numeric
+    # arrays, or None if the batch is not in that form.
+    if (isinstance(batch, convert.ColumnarBatch)
+            and not isinstance(batch.arrays, (tuple, dict))
+            and _is_numeric(batch.arrays)):
+        return batch.arrays
+    return None
@@ -17,8 +17,13 @@ from chainer.datasets.pickle_dataset import open_pickle_dataset  # NOQA
 from chainer.datasets.pickle_dataset import open_pickle_dataset_writer  # NOQA
 from chainer.datasets.pickle_dataset import PickleDataset  # NOQA
 from chainer.datasets.pickle_dataset import PickleDatasetWriter  # NOQA
+from chainer.datasets.pickle_dataset import write_sharded_pickle_dataset  # NOQA
 from chainer.datasets.ptb import get_ptb_words  # NOQA
 from chainer.datasets.ptb import get_ptb_words_vocabulary  # NOQA
+from chainer.datasets.record_dataset import open_record_dataset_writer  # NOQA
+from chainer.datasets.record_dataset import RecordDataset  # NOQA
+from chainer.datasets.record_dataset import RecordDatasetWriter  # NOQA
+from chainer.datasets.record_dataset import RecordOrderSampler  # NOQA
 from chainer.datasets.sub_dataset import get_cross_validation_datasets  # NOQA
 from chainer.datasets.sub_dataset import get_cross_validation_datasets_random  # NOQA
 from chainer.datasets.sub_dataset import split_dataset  # NOQA
@@ -1,6 +1,52 @@
+import bisect
+
+import numpy
+import six
+
+from chainer.dataset import convert
 from chainer.dataset import dataset_mixin
 
 
+def _columns(batch):
+    # Returns the arrays of a columnar batch as a list, with the kind and the
+    # keys of the examples, or None if the batch is not columnar.
+    if not isinstance(batch, convert.ColumnarBatch):
+        return None
+    arrays = batch.arrays
+    if isinstance(arrays, tuple):
+        return 'tuple', None, list(arrays)
+    elif isinstance(arrays, dict):
+        keys = sorted(arrays)
+        return 'dict', keys, [arrays[key] for key in keys]
+    return 'array', None, [arrays]
+
+
+def _merge_columnar(batches, positions, n):
+    # Merges the columnar batches of the groups into one columnar batch in the
+    # original order. Returns None if they cannot be merged.
+    columns = [_columns(batch) for batch in batches]
+    if any([c is None for c in columns]):
+        return None
+    kind, keys, first = columns[0]
+    for c_kind, c_keys, arrays in columns:
+        if (c_kind != kind or c_keys != keys or len(arrays) != len(first)
+                or not all([isinstance(a, numpy.ndarray) for a in arrays])):
+            return None
+        for a, b in six.moves.zip(arrays, first):
+            if a.shape[1:] != b.shape[1:] or a.dtype != b.dtype:
+                return None
+
+    merged = [numpy.empty((n,) + a.shape[1:], a.dtype) for a in first]
+    for pos, (_, _, arrays) in six.moves.zip(positions, columns):
+        for out, a in six.moves.zip(merged, arrays):
+            out[pos] = a
+    if kind == 'tuple':
+        return convert.ColumnarBatch(tuple(merged))
+    elif kind == 'dict':
+        return convert.ColumnarBatch(dict(six.moves.zip(keys, merged)))
+    return convert.ColumnarBatch(merged[0])
+
+
 class ConcatenatedDataset(dataset_mixin.DatasetMixin):
 
     """Dataset which concatenates some base datasets.
@@ -10,6 +56,13 @@ class ConcatenatedDataset(dataset_mixin.DatasetMixin):
     another base dataset with 20 samples are given, this dataset works as
     a dataset which has 30 samples.
 
+    The offsets of the base datasets are computed once on construction, and
+    each example is located by a binary search over them. Therefore, the
+    lengths of the base datasets must not change after the construction.
+
+    The examples of a batch can be retrieved at once by :meth:`get_examples`,
+    which fetches the examples of each base dataset together.
+
     Args:
         datasets: The underlying datasets. Each dataset has to support
             :meth:`__len__` and :meth:`__getitem__`.
@@ -18,15 +71,90 @@ class ConcatenatedDataset(dataset_mixin.DatasetMixin):
 
     def __init__(self, *datasets):
         self._datasets = datasets
+        # The i-th base dataset covers the indices from offsets[i] to
+        # offsets[i + 1].
+        self._offsets = [0]
+        for dataset in datasets:
+            self._offsets.append(self._offsets[-1] + len(dataset))
+        self._offsets_array = numpy.array(self._offsets, dtype=numpy.intp)
 
     def __len__(self):
-        return sum(len(dataset) for dataset in self._datasets)
+        return self._offsets[-1]
 
     def get_example(self, i):
-        if i < 0:
+        if i < 0 or i >= self._offsets[-1]:
             raise IndexError
-        for dataset in self._datasets:
-            if i < len(dataset):
-                return dataset[i]
-            i -= len(dataset)
-        raise IndexError
+        # Empty datasets are skipped, since bisect_right returns the last
+        # one of the equal offsets.
+        d = bisect.bisect_right(self._offsets, i) - 1
+        return self._datasets[d][i - self._offsets[d]]
+
+    def get_examples(self, indices):
+        """Returns the examples of given indices.
+
+        The indices are grouped by the base datasets, and the examples of each
+        group are retrieved at once by :func:`~chainer.dataset.get_examples`,
+        or by a slice if they are consecutive. If most of the groups would
+        have only one example, each example is retrieved directly instead.
+
+        Args:
+            indices (numpy.ndarray or list): One-dimensional array of the
+                indices of the examples.
+
+        Returns:
+            A :class:`~chainer.dataset.ColumnarBatch` if the examples of all
+            the groups are returned in the same columnar form, or a list of
+            the examples otherwise.
+
+        """
+        indices = numpy.asarray(indices, dtype=numpy.intp)
+        n = len(indices)
+        if n == 0:
+            return []
+        if indices.min() < 0 or indices.max() >= self._offsets[-1]:
+            raise IndexError('dataset index out of range')
+
+        offsets = self._offsets_array
+        d_indices = numpy.searchsorted(offsets, indices, side='right') - 1
+        local = indices - offsets[d_indices]
+
+        order = numpy.argsort(d_indices, kind='mergesort')
+        d_sorted = d_indices[order]
+        bounds = numpy.flatnonzero(d_sorted[1:] != d_sorted[:-1]) + 1
+        if 2 * (len(bounds) + 1) > n:
+            # Most of the groups have a single example, for which grouping
+            # does not pay off.
+            datasets = self._datasets
+            return [datasets[d][i] for d, i in six.moves.zip(
+                d_indices.tolist(), local.tolist())]
+        bounds = [0] + bounds.tolist() + [n]
+
+        batches = []
+        positions = []
+        for begin, end in six.moves.zip(bounds[:-1], bounds[1:]):
+            pos = order[begin:end]
+            dataset = self._datasets[d_sorted[begin]]
+            batches.append(self._fetch(dataset, local[pos]))
+            positions.append(pos)
+
+        if len(batches) == 1:
+            # The order of the indices is kept in the only group.
+            return batches[0]
+        merged = _merge_columnar(batches, positions, n)
+        if merged is not None:
+            return merged
+        ret = [None] * n
+        for pos, batch in six.moves.zip(positions, batches):
+            for p, example in six.moves.zip(pos.tolist(), batch):
+                ret[p] = example
+        return ret
+
+    @staticmethod
+    def _fetch(dataset, local):
+        if (isinstance(dataset, (list, tuple))
+                and len(local) > 1 and (numpy.diff(local) == 1).all()):
+            # Consecutive examples of a sequence are retrieved by a slice.
+            # Other datasets may not support slices, or may return something
+            # other than a sequence of the examples for them.
+            return dataset[int(local[0]):int(local[-1]) + 1]
+        return dataset_mixin.get_examples(dataset, local)
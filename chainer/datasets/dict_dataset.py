@@ -1,5 +1,8 @@
 import six
 
+from chainer.dataset import convert
+from chainer.dataset import dataset_mixin
+
 
 class DictDataset(object):
 
@@ -12,6 +15,10 @@ class DictDataset(object):
         datasets: Underlying datasets. The keys are used as the keys of each
             example. All datasets must have the same length.
 
+    The examples of a batch can be retrieved at once by :meth:`get_examples`.
+    If every underlying dataset returns its examples as an array, the batch
+    is built without creating each dictionary.
+
     """
 
     def __init__(self, **datasets):
@@ -39,3 +46,26 @@ class DictDataset(object):
 
     def __len__(self):
         return self._length
+
+    def get_examples(self, indices):
+        """Returns the examples of given indices.
+
+        Args:
+            indices (numpy.ndarray or list): One-dimensional array of the
+                indices of the examples.
+
+        Returns:
+            A :class:`~chainer.dataset.ColumnarBatch` of the dictionary of the
+            arrays of the underlying datasets if all of them return their
+            examples as arrays, or a list of dictionaries otherwise.
+
+        """
+        batches = {key: dataset_mixin.get_examples(dataset, indices)
+                   for key, dataset in six.iteritems(self._datasets)}
+        columns = {key: dataset_mixin._column(batch)
+                   for key, batch in six.iteritems(batches)}
+        if all([column is not None for column in columns.values()]):
+            return convert.ColumnarBatch(columns)
+        length = len(six.next(six.itervalues(batches)))
+        return [{key: batch[i] for key, batch in six.iteritems(batches)}
+                for i in six.moves.range(length)]
@@ -1,3 +1,5 @@
+import collections
+import multiprocessing
 import os
 
 import numpy
@@ -17,9 +19,18 @@ import chainer
 from chainer.dataset import dataset_mixin
 
 
-def _read_image_as_array(path, dtype):
+# Suffix of the sidecar files which hold the shapes and the offsets of the
+# images in the decoded image caches.
+_cache_index_suffix = '.index.npz'
+
+
+def _read_image_as_array(path, dtype, draft=None):
     f = Image.open(path)
     try:
+        if draft is not None:
+            # Only effective for JPEG images, which are decoded at the
+            # smallest scale not smaller than the given size.
+            f.draft(f.mode, tuple(draft))
         image = numpy.asarray(f, dtype=dtype)
     finally:
         # Only pillow >= 3.0 has 'close' method
@@ -35,6 +46,200 @@ def _postprocess_image(image):
     return image.transpose(2, 0, 1)
 
 
+_decode_dataset = None
+
+
+def _decode_setup(dataset):
+    global _decode_dataset
+    _decode_dataset = dataset
+
+
+def _decode_run(i):
+    return _decode_dataset._decode(i)
+
+
+def _file_stamps(paths):
+    # Sizes and modification times of the image files, which tell whether
+    # the images have been modified since the cache was built.
+    stamps = numpy.empty((len(paths), 2), dtype=numpy.int64)
+    for i, path in enumerate(paths):
+        st = os.stat(path)
+        stamps[i] = st.st_size, int(st.st_mtime * 1e9)
+    return stamps
+
+
+def _cache_key(sources, stamps, draft):
+    return (numpy.array(sources, dtype=numpy.unicode_),
+            numpy.asarray(stamps, dtype=numpy.int64).reshape(-1, 2),
+            numpy.array(draft if draft is not None else (), numpy.int64))
+
+
+def _build_cache(path, dataset, sources, stamps, draft, n_processes):
+    # Decodes all the images of the dataset in parallel and writes them to
+    # the data file followed by the index file, so that a cache with the index
+    # file is complete.
+    n = len(sources)
+    offsets = numpy.zeros(n + 1, dtype=numpy.int64)
+    shapes = numpy.empty((n, 3), dtype=numpy.int64)
+    index_path = path + _cache_index_suffix
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    tmp_index_path = '{}.{}.tmp'.format(index_path, os.getpid())
+
+    if n_processes == 1:
+        pool = None
+        images = six.moves.map(dataset._decode, six.moves.range(n))
+    else:
+        pool = multiprocessing.Pool(
+            n_processes, initializer=_decode_setup, initargs=(dataset,))
+        images = pool.imap(_decode_run, six.moves.range(n), chunksize=16)
+    try:
+        with open(tmp_path, 'wb') as f:
+            for i, image in enumerate(images):
+                if image.dtype != numpy.uint8:
+                    raise ValueError(
+                        'only 8-bit images can be cached: {} ({})'.format(
+                            sources[i], image.dtype))
+                if image.ndim == 2:
+                    image = image[..., None]
+                shapes[i] = image.shape
+                offsets[i + 1] = offsets[i] + image.size
+                f.write(numpy.ascontiguousarray(image).tobytes())
+        sources_array, stamps_array, draft_array = _cache_key(
+            sources, stamps, draft)
+        with open(tmp_index_path, 'wb') as f:
+            numpy.savez(f, offsets=offsets, shapes=shapes,
+                        sources=sources_array, stamps=stamps_array,
+                        draft=draft_array)
+        for src, dst in ((tmp_path, path), (tmp_index_path, index_path)):
+            if os.path.exists(dst):
+                os.remove(dst)
+            os.rename(src, dst)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        for p in (tmp_path, tmp_index_path):
+            if os.path.exists(p):
+                os.remove(p)
+
+
+def _load_cache_index(path, sources, stamps, draft):
+    # Returns the offsets and the shapes of the images in the cache, or None
+    # if the cache does not exist or is built for other images.
+    index_path = path + _cache_index_suffix
+    if not (os.path.exists(path) and os.path.exists(index_path)):
+        return None
+    sources_array, stamps_array, draft_array = _cache_key(
+        sources, stamps, draft)
+    try:
+        with numpy.load(index_path) as f:
+            if not (numpy.array_equal(f['sources'], sources_array)
+                    and numpy.array_equal(f['stamps'], stamps_array)
+                    and numpy.array_equal(f['draft'], draft_array)):
+                return None
+            offsets = f['offsets']
+            shapes = f['shapes']
+    except Exception:
+        # The cache is broken; it is rebuilt.
+        return None
+    if os.path.getsize(path) != offsets[-1]:
+        return None
+    return offsets, shapes
+
+
+class _ImageCache(object):
+
+    """Cache of decoded images.
+
+    The images are kept in their own data types and in the ``HWC`` layout.
+    The recently used images are kept in memory up to ``cache_bytes`` bytes in
+    total. If ``path`` is given, all the images are decoded once into a file,
+    which is mapped to memory and shared by the processes.
+
+    """
+
+    def __init__(self, cache_bytes=0, path=None):
+        if cache_bytes < 0:
+            raise ValueError(
+                'cache_bytes must not be negative: {}'.format(cache_bytes))
+        self.cache_bytes = cache_bytes
+        self.path = path
+        self._index = None
+        self._init_state()
+
+    def _init_state(self):
+        self._lock = threading.Lock()
+        self._images = collections.OrderedDict()
+        self._nbytes = 0
+        self._data = None
+
+    def __getstate__(self):
+        return {'cache_bytes': self.cache_bytes, 'path': self.path,
+                '_index': self._index}
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self._init_state()
+
+    def open(self, dataset, sources, stamps, draft, n_processes):
+        """Loads the cache file, or builds it if it is missing or stale.
+
+        The cache is identified by the resolved paths of the images
+        (``sources``), their sizes and modification times or checksums
+        (``stamps``) and the draft mode.
+
+        """
+        index = _load_cache_index(self.path, sources, stamps, draft)
+        if index is None:
+            _build_cache(
+                self.path, dataset, sources, stamps, draft, n_processes)
+            index = _load_cache_index(self.path, sources, stamps, draft)
+        self._index = index
+
+    def _map(self):
+        offsets = self._index[0]
+        if offsets[-1] == 0:
+            # Empty files cannot be mapped.
+            self._data = numpy.empty(0, dtype=numpy.uint8)
+        else:
+            self._data = numpy.memmap(
+                self.path, dtype=numpy.uint8, mode='r').view(numpy.ndarray)
+
+    def get(self, i, decode, dtype):
+        """Returns the ``i``-th image converted to ``dtype``.
+
+        ``decode(i, dtype)`` is called to decode the image if it is not
+        cached.
+
+        """
+        if self._index is not None:
+            if self._data is None:
+                self._map()
+            offsets, shapes = self._index
+            if i < 0:
+                i += len(shapes)
+            image = self._data[offsets[i]:offsets[i + 1]].reshape(shapes[i])
+            return image.astype(dtype)
+        if self.cache_bytes == 0:
+            return decode(i, dtype)
+
+        with self._lock:
+            image = self._images.pop(i, None)
+            if image is not None:
+                self._images[i] = image
+        if image is None:
+            image = decode(i, None)
+            if image.nbytes <= self.cache_bytes:
+                with self._lock:
+                    if i not in self._images:
+                        self._images[i] = image
+                        self._nbytes += image.nbytes
+                    while self._nbytes > self.cache_bytes:
+                        _, evicted = self._images.popitem(last=False)
+                        self._nbytes -= evicted.nbytes
+        return image.astype(dtype)
+
+
 class ImageDataset(dataset_mixin.DatasetMixin):
 
     """Dataset of images built from a list of paths to image files.
@@ -72,10 +277,30 @@ class ImageDataset(dataset_mixin.DatasetMixin):
         root (str): Root directory to retrieve images from.
         dtype: Data type of resulting image arrays. ``chainer.config.dtype`` is
             used by default (see :ref:`configuration`).
+        cache_bytes (int): Maximum total size in bytes of the decoded images
+            kept in memory. The images are kept in their own data types
+            (usually 8-bit) and the least recently used ones are discarded
+            first. ``0`` disables the in-memory cache.
+        cache_path (str): Path to the file in which all the images are
+            decoded and stored as 8-bit arrays. If the file does not exist or
+            is built for other images (the images are identified by their
+            resolved paths, sizes and modification times), it is built by
+            the constructor with ``n_processes`` processes. The file is
+            mapped to memory, so that the processes of
+            :class:`~chainer.iterators.MultiprocessIterator` share the decoded
+            images. The sidecar file named
+            ``<cache_path>.index.npz`` holds the shapes of the images.
+        draft (tuple of ints): If given, JPEG images are decoded at a reduced
+            scale by the draft mode of Pillow, which is the smallest scale not
+            smaller than this ``(width, height)``. It does not change the
+            other images.
+        n_processes (int): Number of processes to build the file at
+            ``cache_path``. The number of CPUs is used by default.
 
     """
 
-    def __init__(self, paths, root='.', dtype=None):
+    def __init__(self, paths, root='.', dtype=None, cache_bytes=0,
+                 cache_path=None, draft=None, n_processes=None):
         _check_pillow_availability()
         if isinstance(paths, six.string_types):
             with open(paths) as paths_file:
@@ -83,13 +308,23 @@ class ImageDataset(dataset_mixin.DatasetMixin):
         self._paths = paths
         self._root = root
         self._dtype = chainer.get_dtype(dtype)
+        self._draft = draft
+        self._cache = _ImageCache(cache_bytes, cache_path)
+        if cache_path is not None:
+            sources = [os.path.abspath(os.path.join(root, path))
+                       for path in paths]
+            self._cache.open(
+                self, sources, _file_stamps(sources), draft, n_processes)
 
     def __len__(self):
         return len(self._paths)
 
-    def get_example(self, i):
+    def _decode(self, i, dtype=None):
         path = os.path.join(self._root, self._paths[i])
-        image = _read_image_as_array(path, self._dtype)
+        return _read_image_as_array(path, dtype, self._draft)
+
+    def get_example(self, i):
+        image = self._cache.get(i, self._decode, self._dtype)
 
         return _postprocess_image(image)
 
@@ -130,10 +365,31 @@ class LabeledImageDataset(dataset_mixin.DatasetMixin):
         dtype: Data type of resulting image arrays. ``chainer.config.dtype`` is
             used by default (see :ref:`configuration`).
         label_dtype: Data type of the labels.
+        cache_bytes (int): Maximum total size in bytes of the decoded images
+            kept in memory. The images are kept in their own data types
+            (usually 8-bit) and the least recently used ones are discarded
+            first. ``0`` disables the in-memory cache.
+        cache_path (str): Path to the file in which all the images are
+            decoded and stored as 8-bit arrays. If the file does not exist or
+            is built for other images (the images are identified by their
+            resolved paths, sizes and modification times), it is built by
+            the constructor with ``n_processes`` processes. The file is
+            mapped to memory, so that the processes of
+            :class:`~chainer.iterators.MultiprocessIterator` share the decoded
+            images. The sidecar file named
+            ``<cache_path>.index.npz`` holds the shapes of the images.
+        draft (tuple of ints): If given, JPEG images are decoded at a reduced
+            scale by the draft mode of Pillow, which is the smallest scale not
+            smaller than this ``(width, height)``. It does not change the
+            other images.
+        n_processes (int): Number of processes to build the file at
+            ``cache_path``. The number of CPUs is used by default.
 
     """
 
-    def __init__(self, pairs, root='.', dtype=None, label_dtype=numpy.int32):
+    def __init__(self, pairs, root='.', dtype=None, label_dtype=numpy.int32,
+                 cache_bytes=0, cache_path=None, draft=None,
+                 n_processes=None):
         _check_pillow_availability()
         if isinstance(pairs, six.string_types):
             pairs_path = pairs
@@ -150,14 +406,24 @@ class LabeledImageDataset(dataset_mixin.DatasetMixin):
         self._root = root
         self._dtype = chainer.get_dtype(dtype)
         self._label_dtype = label_dtype
+        self._draft = draft
+        self._cache = _ImageCache(cache_bytes, cache_path)
+        if cache_path is not None:
+            sources = [os.path.abspath(os.path.join(root, path))
+                       for path, _ in pairs]
+            self._cache.open(
+                self, sources, _file_stamps(sources), draft, n_processes)
 
     def __len__(self):
         return len(self._pairs)
 
+    def _decode(self, i, dtype=None):
+        full_path = os.path.join(self._root, self._pairs[i][0])
+        return _read_image_as_array(full_path, dtype, self._draft)
+
     def get_example(self, i):
-        path, int_label = self._pairs[i]
-        full_path = os.path.join(self._root, path)
-        image = _read_image_as_array(full_path, self._dtype)
+        int_label = self._pairs[i][1]
+        image = self._cache.get(i, self._decode, self._dtype)
 
         label = numpy.array(int_label, dtype=self._label_dtype)
         return _postprocess_image(image), label
@@ -210,6 +476,18 @@ class LabeledZippedImageDataset(dataset_mixin.DatasetMixin):
         label = numpy.array(int_label, dtype=self._label_dtype)
         return self._zipfile.get_example(path), label
 
+    def get_examples(self, indices):
+        """Returns the pairs of given indices.
+
+        The images are read in the order of their offsets in the archive as
+        :meth:`ZippedImageDataset.get_examples`.
+
+        """
+        pairs = [self._pairs[i] for i in indices]
+        images = self._zipfile.get_examples([path for path, _ in pairs])
+        return [(image, numpy.array(int_label, dtype=self._label_dtype))
+                for image, (_, int_label) in six.moves.zip(images, pairs)]
+
 
 class MultiZippedImageDataset(dataset_mixin.DatasetMixin):
     """Dataset of images built from a list of paths to zip files.
@@ -243,6 +521,28 @@ class MultiZippedImageDataset(dataset_mixin.DatasetMixin):
         lidx = i - self._zpaths_accumlens[tgt]
         return self._zfs[tgt].get_example(lidx)
 
+    def get_examples(self, indices):
+        """Returns the images of given indices.
+
+        The indices are grouped by the zip files, and the images in each zip
+        file are read in the order of their offsets as
+        :meth:`ZippedImageDataset.get_examples`.
+
+        """
+        indices = numpy.asarray(indices, dtype=numpy.intp)
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError('dataset index out of range')
+        accumlens = numpy.array(self._zpaths_accumlens, dtype=numpy.intp)
+        tgts = numpy.searchsorted(accumlens, indices, side='right') - 1
+        ret = [None] * len(indices)
+        for tgt in numpy.unique(tgts).tolist():
+            pos = numpy.flatnonzero(tgts == tgt)
+            images = self._zfs[tgt].get_examples(
+                (indices[pos] - accumlens[tgt]).tolist())
+            for p, image in six.moves.zip(pos.tolist(), images):
+                ret[p] = image
+        return ret
+
 
 class ZippedImageDataset(dataset_mixin.DatasetMixin):
     """Dataset of images built from a zip file.
@@ -253,55 +553,168 @@ class ZippedImageDataset(dataset_mixin.DatasetMixin):
     and other networked file systems. If zipfile becomes too large you
     may consider ``MultiZippedImageDataset`` as a handy alternative.
 
-    Known issue: pickle and unpickle on same process may cause race
-    condition on ZipFile. Pickle of this class is expected to be sent
-    to different processess via ChainerMN.
+    Each thread of each process reads the archive through its own
+    :class:`zipfile.ZipFile`, so that the images can be read concurrently by
+    e.g. :class:`~chainer.iterators.MultithreadIterator`. The members are
+    looked up in an index from the filenames to :class:`zipfile.ZipInfo`
+    built on construction. :meth:`get_examples` reads the images of a batch
+    in the order of their offsets in the archive.
 
     Args:
         zipfilename (str): a string to point zipfile path
         dtype: Data type of resulting image arrays. ``chainer.config.dtype`` is
             used by default (see :ref:`configuration`).
+        cache_bytes (int): Maximum total size in bytes of the decoded images
+            kept in memory. The images are kept in their own data types
+            (usually 8-bit) and the least recently used ones are discarded
+            first. ``0`` disables the in-memory cache.
+        cache_path (str): Path to the file in which all the images are
+            decoded and stored as 8-bit arrays. If the file does not exist or
+            is built for other images (the images are identified by the path
+            of the zip file and the sizes and CRC-32 checksums of the
+            members), it is built by the constructor with ``n_processes``
+            processes. The file is mapped to memory, so that the processes of
+            :class:`~chainer.iterators.MultiprocessIterator` share the decoded
+            images. The sidecar file named
+            ``<cache_path>.index.npz`` holds the shapes of the images.
+        draft (tuple of ints): If given, JPEG images are decoded at a reduced
+            scale by the draft mode of Pillow, which is the smallest scale not
+            smaller than this ``(width, height)``. It does not change the
+            other images.
+        n_processes (int): Number of processes to build the file at
+            ``cache_path``. The number of CPUs is used by default.
 
     """
 
-    def __init__(self, zipfilename, dtype=None):
+    def __init__(self, zipfilename, dtype=None, cache_bytes=0,
+                 cache_path=None, draft=None, n_processes=None):
         self._zipfilename = zipfilename
-        self._zf = zipfile.ZipFile(zipfilename)
-        self._zf_pid = os.getpid()
+        self._init_handles()
         self._dtype = chainer.get_dtype(dtype)
-        self._paths = [x for x in self._zf.namelist() if not x.endswith('/')]
-        self._lock = threading.Lock()
+        self._infos = None
+        self._paths = [info.filename for info in self._handle().infolist()
+                       if not info.filename.endswith('/')]
+        self._draft = draft
+        self._cache = _ImageCache(cache_bytes, cache_path)
+        # Indices of the files, which are only used to cache the images read
+        # by the filenames.
+        self._path_indices = None
+        if cache_path is not None:
+            # The members are identified by their sizes and CRC-32 checksums.
+            zip_path = os.path.abspath(zipfilename)
+            sources = [os.path.join(zip_path, path) for path in self._paths]
+            stamps = [(self._info(path).file_size, self._info(path).CRC)
+                      for path in self._paths]
+            self._cache.open(self, sources, stamps, draft, n_processes)
 
     def __len__(self):
         return len(self._paths)
 
     def __getstate__(self):
         d = self.__dict__.copy()
-        d['_zf'] = None
+        d['_local'] = None
         d['_lock'] = None
+        d['_handles'] = None
+        d['_infos'] = None
         return d
 
     def __setstate__(self, state):
         self.__dict__ = state
+        self._init_handles()
+
+    def _init_handles(self):
+        self._local = threading.local()
         self._lock = threading.Lock()
+        self._handles = []
+        self._handles_pid = os.getpid()
+
+    def _handle(self):
+        # Returns the ZipFile of the current thread, which is opened on the
+        # first call in each thread of each process.
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, 'pid', None) != pid:
+            zf = zipfile.ZipFile(self._zipfilename)
+            with self._lock:
+                if self._handles_pid != pid:
+                    # The handles of the parent process are left to it.
+                    self._handles = []
+                    self._handles_pid = pid
+                self._handles.append(zf)
+            local.zf = zf
+            local.pid = pid
+        return local.zf
+
+    def _info(self, i_or_filename):
+        if self._infos is None:
+            self._infos = dict((info.filename, info)
+                               for info in self._handle().infolist())
+        if isinstance(i_or_filename, six.string_types):
+            return self._infos[i_or_filename]
+        return self._infos[self._paths[i_or_filename]]
+
+    def close(self):
+        """Closes the zip files opened by the threads of this process.
+
+        The files are opened again on the next read.
+        """
+        with self._lock:
+            handles = self._handles if self._handles_pid == os.getpid() else []
+            self._handles = []
+            self._handles_pid = os.getpid()
+            self._local = threading.local()
+        for zf in handles:
+            zf.close()
+
+    def _read(self, zfn, dtype):
+        # PIL may seek() on the file -- zipfile won't support it
+        image_file_mem = self._handle().read(self._info(zfn))
+        image_file = io.BytesIO(image_file_mem)
+        return _read_image_as_array(image_file, dtype, self._draft)
+
+    def _decode(self, i, dtype=None):
+        return self._read(self._paths[i], dtype)
 
     def get_example(self, i_or_filename):
         # LabeledZippedImageDataset needs file with filename in zip archive
-        if isinstance(i_or_filename, six.integer_types):
-            zfn = self._paths[i_or_filename]
+        if not isinstance(i_or_filename, six.string_types):
+            i = i_or_filename
         else:
-            zfn = i_or_filename
-
-        # PIL may seek() on the file -- zipfile won't support it
-        with self._lock:
-            if self._zf is None or self._zf_pid != os.getpid():
-                self._zf_pid = os.getpid()
-                self._zf = zipfile.ZipFile(self._zipfilename)
-            image_file_mem = self._zf.read(zfn)
-        image_file = io.BytesIO(image_file_mem)
-        image = _read_image_as_array(image_file, self._dtype)
+            if self._path_indices is None:
+                self._path_indices = dict(
+                    (path, i) for i, path in enumerate(self._paths))
+            i = self._path_indices.get(i_or_filename)
+            if i is None:
+                image = self._read(i_or_filename, self._dtype)
+                return _postprocess_image(image)
+
+        image = self._cache.get(i, self._decode, self._dtype)
         return _postprocess_image(image)
 
+    def get_examples(self, indices):
+        """Returns the images of given indices or filenames.
+
+        The images are read in the order of the offsets of the members in
+        the archive, so that the archive is read sequentially, and returned
+        in the given order.
+
+        Args:
+            indices (list or numpy.ndarray): Indices or filenames of the
+                images.
+
+        Returns:
+            list: The images.
+
+        """
+        if isinstance(indices, numpy.ndarray):
+            indices = indices.tolist()
+        offsets = [self._info(i).header_offset for i in indices]
+        ret = [None] * len(indices)
+        for p in sorted(six.moves.range(len(indices)),
+                        key=offsets.__getitem__):
+            ret[p] = self.get_example(indices[p])
+        return ret
+
 
 def _check_pillow_availability():
     if not available:
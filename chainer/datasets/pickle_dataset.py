@@ -1,11 +1,64 @@
+import io
+import mmap
+import multiprocessing
 import threading
 
+import numpy
 import six
 import six.moves.cPickle as pickle
 
 from chainer.dataset import dataset_mixin
 
 
+# The index footer consists of the pickled array of the positions of the
+# examples followed by the trailer, a pickled tuple of the magic and the
+# position of the array. The position is formatted with a fixed width, so that
+# the trailer has a fixed size.
+_index_magic = 'chainer.datasets.PickleDataset.index'
+
+
+def _trailer(position):
+    return pickle.dumps((_index_magic, '%020d' % position), protocol=2)
+
+
+_trailer_size = len(_trailer(0))
+
+
+def _read_index(reader):
+    # Returns the positions of the examples and the end of the last example
+    # from the index footer, or None if the footer is not found.
+    reader.seek(0, 2)
+    size = reader.tell()
+    if size < _trailer_size:
+        return None
+    reader.seek(size - _trailer_size)
+    try:
+        magic, position = pickle.loads(reader.read(_trailer_size))
+        if magic != _index_magic:
+            return None
+        position = int(position)
+    except Exception:
+        return None
+    reader.seek(position)
+    positions = pickle.load(reader)
+    return positions, position
+
+
+def _scan(reader):
+    # Returns the positions of the examples and the end of the last example by
+    # loading all the examples.
+    positions = []
+    reader.seek(0)
+    while True:
+        position = reader.tell()
+        try:
+            pickle.load(reader)
+        except EOFError:
+            break
+        positions.append(position)
+    return positions, position
+
+
 class PickleDatasetWriter(object):
 
     """Writer class that makes PickleDataset.
@@ -13,6 +66,11 @@ class PickleDatasetWriter(object):
     To make :class:`PickleDataset`, a user needs to prepare data using
     :class:`PickleDatasetWriter`.
 
+    When the writer is closed, it appends the index footer, which holds the
+    positions of the examples, so that :class:`PickleDataset` can open the
+    file without loading all the examples. Files written without closing the
+    writer can still be read; the examples are scanned on open in that case.
+
     Args:
         writer: File like object that supports ``write`` and ``tell`` methods.
         protocol (int): Valid protocol for :mod:`pickle`.
@@ -25,8 +83,17 @@ class PickleDatasetWriter(object):
         self._positions = []
         self._writer = writer
         self._protocol = protocol
+        self._closed = False
 
     def close(self):
+        """Writes the index footer and closes the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        position = self._writer.tell()
+        pickle.dump(numpy.array(self._positions, dtype=numpy.int64),
+                    self._writer, protocol=self._protocol)
+        self._writer.write(_trailer(position))
         self._writer.close()
 
     def __enter__(self):
@@ -73,28 +140,71 @@ class PickleDataset(dataset_mixin.DatasetMixin):
         import os
         os.close(fs)
 
+    The positions of the examples are read from the index footer written by
+    :class:`PickleDatasetWriter`. If the file does not have the footer, all
+    the examples are loaded once on construction to find their positions.
+
+    If ``use_mmap`` is ``True``, the file is mapped to memory and each
+    example is loaded from the map without locking or moving the position
+    of the reader. This mode is recommended with
+    :class:`~chainer.iterators.MultiprocessIterator`, since the forked worker
+    processes share the map, while they would share the position of the
+    file otherwise. If ``reader`` is a file opened with a path, the dataset
+    can be pickled; it is reopened by the path without reading the index
+    again on unpickling.
+
     Args:
         reader: File like object. `reader` must support random access.
+        use_mmap (bool): If ``True``, the file is mapped to memory. `reader`
+            must be a file which has a file descriptor.
 
     """
 
-    def __init__(self, reader):
+    def __init__(self, reader, use_mmap=False):
         # Only py3 supports `seekable` method
         if six.PY3 and not reader.seekable():
             raise ValueError('reader must support random access')
         self._reader = reader
-        self._positions = []
-        reader.seek(0)
-        while True:
-            position = reader.tell()
-            try:
-                pickle.load(reader)
-            except EOFError:
-                break
-            self._positions.append(position)
+        index = _read_index(reader)
+        if index is None:
+            index = _scan(reader)
+        self._positions, self._end = index
+        self._use_mmap = use_mmap
+        self._mmap = None
+        if use_mmap:
+            self._open_mmap()
 
         self._lock = threading.RLock()
 
+    def _open_mmap(self):
+        try:
+            fileno = self._reader.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            raise ValueError('reader must be a file to use mmap')
+        if self._end > 0:
+            self._mmap = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        del state['_mmap']
+        name = getattr(self._reader, 'name', None)
+        if isinstance(name, six.string_types):
+            # The file is reopened by the path.
+            del state['_reader']
+            state['_path'] = name
+        return state
+
+    def __setstate__(self, state):
+        path = state.pop('_path', None)
+        self.__dict__ = state
+        if path is not None:
+            self._reader = open(path, 'rb')
+        self._mmap = None
+        if self._use_mmap:
+            self._open_mmap()
+        self._lock = threading.RLock()
+
     def close(self):
         """Closes a file reader.
 
@@ -102,6 +212,8 @@ class PickleDataset(dataset_mixin.DatasetMixin):
         accessible..
         """
         with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
             self._reader.close()
 
     def __enter__(self):
@@ -114,12 +226,25 @@ class PickleDataset(dataset_mixin.DatasetMixin):
         return len(self._positions)
 
     def get_example(self, index):
+        if self._mmap is not None:
+            n = len(self._positions)
+            if index < 0:
+                index += n
+            if not 0 <= index < n:
+                raise IndexError('dataset index out of range')
+            start = int(self._positions[index])
+            if index + 1 < n:
+                end = int(self._positions[index + 1])
+            else:
+                end = self._end
+            return pickle.loads(self._mmap[start:end])
+
         with self._lock:
-            self._reader.seek(self._positions[index])
+            self._reader.seek(int(self._positions[index]))
             return pickle.load(self._reader)
 
 
-def open_pickle_dataset(path):
+def open_pickle_dataset(path, use_mmap=False):
     """Opens a dataset stored in a given path.
 
     This is a hepler function to open :class:`PickleDataset`. It opens a given
@@ -135,6 +260,8 @@ def open_pickle_dataset(path):
 
     Args:
         path (str): Path to a dataset.
+        use_mmap (bool): If ``True``, the file is mapped to memory. See
+            :class:`PickleDataset` for details.
 
     Returns:
         chainer.datasets.PickleDataset: Opened dataset.
@@ -143,7 +270,11 @@ def open_pickle_dataset(path):
 
     """
     reader = open(path, 'rb')
-    return PickleDataset(reader)
+    try:
+        return PickleDataset(reader, use_mmap=use_mmap)
+    except Exception:
+        reader.close()
+        raise
 
 
 def open_pickle_dataset_writer(path, protocol=pickle.HIGHEST_PROTOCOL):
@@ -173,3 +304,72 @@ def open_pickle_dataset_writer(path, protocol=pickle.HIGHEST_PROTOCOL):
     """
     writer = open(path, 'wb')
     return PickleDatasetWriter(writer, protocol=protocol)
+
+
+# The dataset is given to the worker processes by the initializer, in the same
+# way as MultiprocessIterator.
+_shard_dataset = None
+
+
+def _shard_setup(dataset):
+    global _shard_dataset
+    _shard_dataset = dataset
+
+
+def _write_shard(args):
+    path, start, stop, protocol = args
+    with open_pickle_dataset_writer(path, protocol=protocol) as writer:
+        for i in six.moves.range(start, stop):
+            writer.write(_shard_dataset[i])
+    return stop - start
+
+
+def write_sharded_pickle_dataset(paths, dataset,
+                                 protocol=pickle.HIGHEST_PROTOCOL,
+                                 n_processes=None):
+    """Writes a dataset to multiple PickleDataset files in parallel.
+
+    The dataset is split into contiguous shards of almost the same sizes, one
+    for each path, and the shards are pickled and written by worker
+    processes in parallel. Each file has the index footer, and the shards
+    can be read as one dataset by
+    :class:`~chainer.datasets.ConcatenatedDataset`:
+
+    .. code-block:: python
+
+        datasets = [chainer.datasets.open_pickle_dataset(path)
+                    for path in paths]
+        dataset = chainer.datasets.ConcatenatedDataset(*datasets)
+
+    Args:
+        paths (list of str): Paths to the files of the shards.
+        dataset: Dataset to write. It must support :meth:`__len__` and
+            :meth:`__getitem__`, and be picklable if the worker processes are
+            not forked.
+        protocol (int): Valid protocol for :mod:`pickle`.
+        n_processes (int): Number of worker processes. The smaller of the
+            number of the shards and the number of CPUs is used by default.
+
+    Returns:
+        list of int: Number of the examples written to each shard.
+
+    .. seealso: chainer.datasets.PickleDataset
+
+    """
+    if len(paths) == 0:
+        raise ValueError('at least one path must be specified')
+    n = len(dataset)
+    bounds = [n * i // len(paths) for i in six.moves.range(len(paths) + 1)]
+    tasks = [(path, bounds[i], bounds[i + 1], protocol)
+             for i, path in enumerate(paths)]
+    if n_processes is None:
+        n_processes = min(len(paths), multiprocessing.cpu_count())
+
+    pool = multiprocessing.Pool(
+        n_processes, initializer=_shard_setup, initargs=(dataset,))
+    try:
+        sizes = pool.map(_write_shard, tasks)
+    finally:
+        pool.close()
+        pool.join()
+    return sizes
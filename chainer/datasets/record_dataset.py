@@ -0,0 +1,502 @@
+import bisect
+import collections
+import json
+import struct
+import threading
+import zlib
+
+import numpy
+import six
+from six.moves import queue
+
+from chainer.dataset import dataset_mixin
+from chainer.iterators import order_samplers
+
+
+# A record file consists of the magic, the chunks, the index of the chunks,
+# the footer in JSON, the length of the footer and the magic again. Each chunk
+# holds length-prefixed records and is compressed as a whole. The index is an
+# int64 array of shape (n_chunks, 4), each row of which holds the offset, the
+# size, the size before compression and the number of records of a chunk.
+_magic = b'\x93CHAINERRECORD\x01'
+_footer_length = struct.Struct('<Q')
+_record_length = struct.Struct('<Q')
+
+_default_chunk_size = 1 << 20
+
+
+def _compress_zlib(data):
+    return zlib.compress(data)
+
+
+def _compress_none(data):
+    return data
+
+
+# Pairs of the compression and the decompression functions of each codec.
+_codecs = {
+    'none': (_compress_none, _compress_none),
+    'zlib': (_compress_zlib, zlib.decompress),
+}
+
+
+def _check_codec(codec):
+    if codec not in _codecs:
+        raise ValueError('codec must be one of {}: {}'.format(
+            ', '.join(sorted(_codecs)), codec))
+
+
+def _read_index(f, path):
+    # Returns the codec and the index of the chunks of a record file.
+    trailer_size = _footer_length.size + len(_magic)
+    f.seek(0, 2)
+    if f.tell() < len(_magic) + trailer_size:
+        raise ValueError('not a record file: {}'.format(path))
+    f.seek(-trailer_size, 2)
+    trailer = f.read(trailer_size)
+    if trailer[_footer_length.size:] != _magic:
+        raise ValueError('not a record file: {}'.format(path))
+    footer_size, = _footer_length.unpack(trailer[:_footer_length.size])
+    f.seek(-trailer_size - footer_size, 2)
+    footer = json.loads(f.read(footer_size).decode('utf-8'))
+    codec = footer['codec']
+    _check_codec(codec)
+    n_chunks = footer['n_chunks']
+    f.seek(footer['index_offset'])
+    index = numpy.frombuffer(f.read(n_chunks * 32), dtype='<i8')
+    return codec, index.reshape(n_chunks, 4).astype(numpy.int64)
+
+
+def _split_records(raw, n_records):
+    # Returns the records of a decompressed chunk.
+    records = []
+    position = 0
+    for _ in six.moves.range(n_records):
+        length, = _record_length.unpack_from(raw, position)
+        position += _record_length.size
+        records.append(raw[position:position + length])
+        position += length
+    if position != len(raw):
+        raise ValueError('chunk is corrupted')
+    return records
+
+
+class RecordDatasetWriter(object):
+
+    """Writer of the record files read by :class:`RecordDataset`.
+
+    Records are byte strings. They are buffered until their total size
+    reaches ``chunk_size``, and written as a chunk, which is compressed as a
+    whole. The index of the chunks is written when the writer is closed.
+
+    Args:
+        writer: File like object that supports ``write`` and ``tell``
+            methods.
+        codec (str): Compression of the chunks; ``'none'`` or ``'zlib'``.
+        chunk_size (int): Size of the chunks in bytes before compression.
+
+    .. seealso:: :class:`chainer.datasets.RecordDataset`
+
+    """
+
+    def __init__(self, writer, codec='none', chunk_size=None):
+        _check_codec(codec)
+        if chunk_size is None:
+            chunk_size = _default_chunk_size
+        if chunk_size < 1:
+            raise ValueError(
+                'chunk_size must be positive: {}'.format(chunk_size))
+        self._writer = writer
+        self._codec = codec
+        self._chunk_size = chunk_size
+        self._records = []
+        self._size = 0
+        self._index = []
+        self._closed = False
+        writer.write(_magic)
+
+    def write(self, record):
+        """Writes a record.
+
+        Args:
+            record (bytes): The record.
+
+        """
+        if not isinstance(record, six.binary_type):
+            raise TypeError('record must be bytes: {}'.format(type(record)))
+        self._records.append(_record_length.pack(len(record)))
+        self._records.append(record)
+        self._size += _record_length.size + len(record)
+        if self._size >= self._chunk_size:
+            self._write_chunk()
+
+    def _write_chunk(self):
+        if not self._records:
+            return
+        raw = b''.join(self._records)
+        data = _codecs[self._codec][0](raw)
+        n_records = len(self._records) // 2
+        self._index.append(
+            (self._writer.tell(), len(data), len(raw), n_records))
+        self._writer.write(data)
+        self._records = []
+        self._size = 0
+
+    def flush(self):
+        if hasattr(self._writer, 'flush'):
+            self._writer.flush()
+
+    def close(self):
+        """Writes the last chunk and the index, and closes the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_chunk()
+        index_offset = self._writer.tell()
+        index = numpy.array(self._index, dtype='<i8').reshape(-1, 4)
+        self._writer.write(index.tobytes())
+        footer = json.dumps({
+            'codec': self._codec, 'n_chunks': len(self._index),
+            'index_offset': index_offset}).encode('utf-8')
+        self._writer.write(footer)
+        self._writer.write(_footer_length.pack(len(footer)))
+        self._writer.write(_magic)
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _ChunkPrefetcher(object):
+
+    # Reads chunks in a background thread in the given order, keeping at most
+    # ``size`` chunks which are not taken yet.
+
+    def __init__(self, load, chunks, size):
+        self._queue = queue.Queue(size)
+        self._pending = set(chunks)
+        self._taken = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(load, chunks))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self, load, chunks):
+        for c in chunks:
+            try:
+                records = load(c)
+            except Exception:
+                # The chunk is read again on access to raise the error.
+                records = None
+            while not self._stop.is_set():
+                try:
+                    self._queue.put((c, records), timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if self._stop.is_set():
+                return
+
+    def take(self, c):
+        """Returns the records of a chunk, or None if it is not scheduled."""
+        with self._lock:
+            if c in self._taken:
+                return self._taken.pop(c)
+            if c not in self._pending:
+                return None
+            while True:
+                c_read, records = self._queue.get()
+                self._pending.discard(c_read)
+                if c_read == c:
+                    return records
+                self._taken[c_read] = records
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class RecordDataset(dataset_mixin.DatasetMixin):
+
+    """Dataset of records stored in sharded record files.
+
+    This dataset reads the byte strings written by
+    :class:`RecordDatasetWriter` to one or more files (shards). The records
+    are stored in chunks of many records, so that a large dataset is kept in
+    a few large files instead of a large number of small files, and read
+    sequentially in large blocks.
+
+    .. testsetup::
+
+        import tempfile
+        fs, path_to_data = tempfile.mkstemp()
+
+    >>> with chainer.datasets.open_record_dataset_writer(path_to_data) as w:
+    ...     w.write(b'hello')
+    ...     w.write(b'good-bye')
+    ...
+    >>> with chainer.datasets.RecordDataset(path_to_data) as dataset:
+    ...     print(dataset[1])
+    ...
+    b'good-bye'
+
+    .. testcleanup::
+
+        import os
+        os.close(fs)
+
+    Each access to a record reads and decompresses the whole chunk which
+    holds it, and the decompressed chunks are kept up to ``cache_chunks``
+    chunks. Therefore, the records should be read in the order of the chunks
+    rather than in a random order. :class:`RecordOrderSampler` generates such
+    orders, which shuffle the shards and the records within a window.
+
+    If ``readahead`` is positive, :class:`RecordOrderSampler` makes this
+    dataset read the chunks ahead in a background thread in the order of the
+    next epoch. It is only effective if the records are read in the process
+    which calls the sampler, e.g. by :class:`~chainer.iterators.SerialIterator`
+    or :class:`~chainer.iterators.MultithreadIterator`.
+
+    Use :class:`~chainer.datasets.TransformDataset` to decode the records.
+
+    Args:
+        paths (str or list of str): Paths to the record files.
+        cache_chunks (int): Maximum number of the decompressed chunks kept
+            in memory.
+        readahead (int): Maximum number of the chunks read ahead.
+
+    .. seealso:: :class:`chainer.datasets.RecordDatasetWriter`
+
+    """
+
+    def __init__(self, paths, cache_chunks=4, readahead=0):
+        if isinstance(paths, six.string_types):
+            paths = [paths]
+        if cache_chunks < 1:
+            raise ValueError(
+                'cache_chunks must be positive: {}'.format(cache_chunks))
+        if readahead < 0:
+            raise ValueError(
+                'readahead must not be negative: {}'.format(readahead))
+        self._paths = list(paths)
+        self.cache_chunks = cache_chunks
+        self.readahead = readahead
+
+        self._open()
+        try:
+            codecs = []
+            indexes = []
+            for path, f in six.moves.zip(self._paths, self._files):
+                codec, index = _read_index(f, path)
+                codecs.append(codec)
+                indexes.append(index)
+        except Exception:
+            self.close()
+            raise
+        self._codecs = codecs
+        # The c-th chunk is in the shard of chunk_shards[c], and holds the
+        # records from chunk_starts[c] to chunk_starts[c + 1]. The s-th shard
+        # holds the chunks from shard_chunks[s] to shard_chunks[s + 1].
+        self._chunks = numpy.concatenate(
+            [numpy.zeros((0, 4), numpy.int64)] + indexes)
+        self._chunk_shards = numpy.repeat(
+            numpy.arange(len(indexes)), [len(index) for index in indexes])
+        self._chunk_starts = numpy.concatenate(
+            ([0], numpy.cumsum(self._chunks[:, 3])))
+        self._chunk_starts_list = self._chunk_starts.tolist()
+        self._shard_chunks = numpy.concatenate(
+            ([0], numpy.cumsum([len(index) for index in indexes])))
+
+    def _open(self):
+        self._files = []
+        for path in self._paths:
+            self._files.append(open(path, 'rb'))
+        self._lock = threading.Lock()
+        self._cache = collections.OrderedDict()
+        self._prefetcher = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ('_files', '_lock', '_cache', '_prefetcher'):
+            del state[key]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self._open()
+
+    def close(self):
+        """Stops reading ahead and closes the record files."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+        for f in self._files:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return int(self._chunk_starts[-1])
+
+    def _load(self, c):
+        offset, size, raw_size, n_records = self._chunks[c].tolist()
+        f = self._files[self._chunk_shards[c]]
+        with self._lock:
+            f.seek(offset)
+            data = f.read(size)
+        raw = _codecs[self._codecs[self._chunk_shards[c]]][1](data)
+        if len(raw) != raw_size:
+            raise ValueError('chunk is corrupted')
+        return _split_records(raw, n_records)
+
+    def _get_chunk(self, c):
+        with self._lock:
+            records = self._cache.pop(c, None)
+            if records is not None:
+                self._cache[c] = records
+                return records
+        prefetcher = self._prefetcher
+        if prefetcher is not None:
+            records = prefetcher.take(c)
+        if records is None:
+            records = self._load(c)
+        with self._lock:
+            self._cache[c] = records
+            while len(self._cache) > self.cache_chunks:
+                self._cache.popitem(last=False)
+        return records
+
+    def get_example(self, i):
+        starts = self._chunk_starts_list
+        n = starts[-1]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('dataset index out of range')
+        c = bisect.bisect_right(starts, i) - 1
+        return self._get_chunk(c)[i - starts[c]]
+
+    def prefetch(self, order):
+        """Starts reading the chunks ahead for the given order of records.
+
+        The chunks are read in the order of their first records in
+        ``order``, keeping at most ``readahead`` chunks not accessed yet.
+        The chunks being read for the previous order are discarded. It does
+        nothing if ``readahead`` is zero.
+
+        Args:
+            order (numpy.ndarray): Indices of the records in the order of
+                access.
+
+        """
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+        if self.readahead == 0 or len(order) == 0:
+            return
+        chunk_ids = numpy.searchsorted(
+            self._chunk_starts, order, side='right') - 1
+        _, first = numpy.unique(chunk_ids, return_index=True)
+        chunks = chunk_ids[numpy.sort(first)].tolist()
+        with self._lock:
+            chunks = [c for c in chunks if c not in self._cache]
+        self._prefetcher = _ChunkPrefetcher(self._load, chunks, self.readahead)
+
+
+class RecordOrderSampler(order_samplers.OrderSampler):
+
+    """Sampler that generates orders suitable for :class:`RecordDataset`.
+
+    Each order visits the shards of the dataset in a random order if
+    ``shuffle_shards`` is ``True``, and the chunks of each shard in their
+    order in the file. Then, the records are shuffled within each window of
+    ``buffer_size`` consecutive records. The records of a window are spread
+    over ``buffer_size / records per chunk + 1`` chunks at most, which should
+    not exceed ``cache_chunks`` of the dataset.
+
+    If ``readahead`` of the dataset is positive, the dataset starts reading
+    the chunks ahead in the new order.
+
+    Args:
+        dataset (RecordDataset): Dataset to sample records from.
+        shuffle_shards (bool): If ``True``, the shards are shuffled.
+        buffer_size (int): Number of the records shuffled together. The
+            records are not shuffled if it is ``1``.
+        random_state (numpy.random.RandomState): Pseudo-random number
+            generator.
+
+    """
+
+    def __init__(self, dataset, shuffle_shards=True, buffer_size=1,
+                 random_state=None):
+        if buffer_size < 1:
+            raise ValueError(
+                'buffer_size must be positive: {}'.format(buffer_size))
+        if random_state is None:
+            random_state = numpy.random.random.__self__
+        self._dataset = dataset
+        self._shuffle_shards = shuffle_shards
+        self._buffer_size = buffer_size
+        self._random = random_state
+
+    def __call__(self, current_order, current_position):
+        dataset = self._dataset
+        shard_chunks = dataset._shard_chunks
+        chunk_starts = dataset._chunk_starts
+        shards = numpy.arange(len(shard_chunks) - 1)
+        if self._shuffle_shards:
+            shards = self._random.permutation(shards)
+        order = numpy.concatenate([numpy.zeros(0, numpy.intp)] + [
+            numpy.arange(chunk_starts[shard_chunks[s]],
+                         chunk_starts[shard_chunks[s + 1]])
+            for s in shards.tolist()])
+        n = len(order)
+        if self._buffer_size > 1 and n > 1:
+            keys = (numpy.arange(n) // self._buffer_size
+                    + self._random.random_sample(n))
+            order = order[numpy.argsort(keys, kind='mergesort')]
+        dataset.prefetch(order)
+        return order
+
+
+def open_record_dataset_writer(path, codec='none', chunk_size=None):
+    """Opens a writer to make a record file.
+
+    This is a helper function to open :class:`RecordDatasetWriter`. It opens
+    a given file in binary mode and creates a :class:`RecordDatasetWriter`
+    instance.
+
+    This method does not close the opened file. A user needs to call
+    :func:`RecordDatasetWriter.close` or use `with`:
+
+    .. code-block:: python
+
+        with chainer.datasets.open_record_dataset_writer('path') as writer:
+            pass  # use writer
+
+    Args:
+        path (str): Path to a record file.
+        codec (str): Compression of the chunks; ``'none'`` or ``'zlib'``.
+        chunk_size (int): Size of the chunks in bytes before compression.
+
+    Returns:
+        chainer.datasets.RecordDatasetWriter: Opened writer.
+
+    .. seealso:: :class:`chainer.datasets.RecordDatasetWriter`
+
+    """
+    writer = open(path, 'wb')
+    try:
+        return RecordDatasetWriter(writer, codec=codec, chunk_size=chunk_size)
+    except Exception:
+        writer.close()
+        raise
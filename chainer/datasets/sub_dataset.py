@@ -75,6 +75,16 @@ class SubDataset(dataset_mixin.DatasetMixin):
             index = self._order[index]
         return self._dataset[index]
 
+    def get_examples(self, indices):
+        indices = numpy.asarray(indices, dtype=numpy.intp)
+        if ((indices >= self._size) | (indices < -self._size)).any():
+            raise IndexError('dataset index out of range')
+        index = numpy.where(
+            indices >= 0, self._start + indices, self._finish + indices)
+        if self._order is not None:
+            index = numpy.asarray(self._order)[index]
+        return dataset_mixin.get_examples(self._dataset, index)
+
 
 def split_dataset(dataset, split_at, order=None):
     """Splits a dataset into two subsets.
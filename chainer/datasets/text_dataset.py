@@ -1,12 +1,145 @@
 import io
+import locale
+import mmap
+import os
 import sys
 import threading
 
+import numpy
 import six
 
 from chainer.dataset import dataset_mixin
 
 
+# Size of the chunks of bytes scanned at once to find the line boundaries.
+_scan_chunk_size = 1 << 24
+
+# Suffix of the sidecar files which cache the line boundaries.
+_index_suffix = '.index.npz'
+
+
+def _byte_lines_supported(encoding, newline):
+    # Tells whether the lines can be split by scanning the bytes for LF, i.e.
+    # the encoding is ASCII-compatible and the newline mode splits lines at
+    # LF or CRLF.
+    if newline not in (None, '', '\n', '\r\n'):
+        return False
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    try:
+        encoded = u'a\nb\r'.encode(encoding)
+    except (LookupError, UnicodeError):
+        return False
+    # A leading byte order mark (e.g. utf-8-sig) is allowed.
+    return encoded.endswith(b'a\nb\r')
+
+
+def _scan_lines(path, newline, chunk_size=_scan_chunk_size):
+    # Returns the byte offsets of the line boundaries of a file, i.e. the
+    # i-th line starts at offsets[i] and ends at offsets[i + 1], or None if a
+    # lone CR, which is a line boundary in the universal newlines mode, is
+    # found.
+    offsets = [numpy.zeros(1, numpy.int64)]
+    position = 0
+    prev_cr = False  # whether the previous chunk ends with CR
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buf = numpy.frombuffer(chunk, numpy.uint8)
+            lf = numpy.flatnonzero(buf == 10)
+            if newline in (None, ''):
+                if prev_cr and buf[0] != 10:
+                    return None
+                cr = numpy.flatnonzero(buf[:-1] == 13)
+                if (buf[cr + 1] != 10).any():
+                    return None
+            elif newline == '\r\n':
+                # LF is a line boundary only after CR.
+                after_cr = numpy.empty(len(lf), dtype=bool)
+                after_cr[lf > 0] = buf[lf[lf > 0] - 1] == 13
+                if len(lf) > 0 and lf[0] == 0:
+                    after_cr[0] = prev_cr
+                lf = lf[after_cr]
+            offsets.append(lf.astype(numpy.int64) + (position + 1))
+            position += len(buf)
+            prev_cr = buf[-1] == 13
+    if prev_cr and newline in (None, ''):
+        return None
+    offsets = numpy.concatenate(offsets)
+    if offsets[-1] != position:
+        # The last line does not end with a newline.
+        offsets = numpy.append(offsets, position)
+    return offsets
+
+
+def _file_key(path, newline):
+    stat = os.stat(path)
+    mtime = getattr(stat, 'st_mtime_ns', None)
+    if mtime is None:
+        mtime = int(stat.st_mtime * 1e9)
+    mode = 'universal' if newline in (None, '') else repr(newline)
+    return stat.st_size, mtime, mode
+
+
+def _load_index(path, newline, use_cache):
+    # Returns the byte offsets of the line boundaries, reading and writing
+    # the sidecar cache if ``use_cache`` is True.
+    key = _file_key(path, newline) if use_cache else None
+    index_path = path + _index_suffix
+    if use_cache and os.path.exists(index_path):
+        try:
+            with numpy.load(index_path) as f:
+                if (int(f['size']), int(f['mtime']), str(f['mode'])) == key:
+                    return f['offsets']
+        except Exception:
+            # The cache is broken; it is rebuilt.
+            pass
+
+    offsets = _scan_lines(path, newline)
+    if use_cache and offsets is not None:
+        tmp_path = '{}.{}.tmp'.format(index_path, os.getpid())
+        try:
+            with open(tmp_path, 'wb') as f:
+                numpy.savez(f, offsets=offsets, size=key[0], mtime=key[1],
+                            mode=key[2])
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            os.rename(tmp_path, index_path)
+        except (IOError, OSError):
+            # The cache is optional; e.g. the directory may not be writable.
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return offsets
+
+
+class _MmapFile(object):
+
+    # Read-only memory map of a file, which also supports empty files.
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self._mmap = None
+            else:
+                self._mmap = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.closed = False
+
+    def read(self, start, end):
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+        if self._mmap is None:
+            return b''
+        return self._mmap[start:end]
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self.closed = True
+
+
 class TextDataset(dataset_mixin.DatasetMixin):
 
     """Dataset of a line-oriented text file.
@@ -16,6 +149,13 @@ class TextDataset(dataset_mixin.DatasetMixin):
     Positions of line boundaries are cached so that you can quickliy
     random access the text file by the line number.
 
+    If the encoding is compatible with ASCII (e.g. UTF-8 or Latin-1) and the
+    lines are split at LF or CRLF, the line boundaries are found by scanning
+    the raw bytes of the files in large chunks, and each line is read as
+    bytes and decoded on access. Otherwise, e.g. for UTF-16 or files with
+    lone CR in the universal newlines mode, the files are read line by line
+    in the text mode.
+
     .. note::
         Cache will be built in the constructor.
         You can pickle and unpickle the dataset to reuse the cache, but in
@@ -54,12 +194,23 @@ class TextDataset(dataset_mixin.DatasetMixin):
             the number of files. Arguments are lines loaded from each file.
             The filter function must return True to accept the line, or
             return False to skip the line.
+        cache_index (bool): If ``True``, the line boundaries found by
+            scanning the bytes are saved to a sidecar file named
+            ``<path>.index.npz`` next to each text file, and loaded from it
+            on the next construction if the size and the modification time
+            of the text file are unchanged. The sidecar file is not written
+            if the directory is not writable.
+        use_mmap (bool): If ``True``, the files are mapped to memory and the
+            lines are read from the maps without locking, so that multiple
+            threads can read the lines concurrently. It is only effective
+            when the lines are read as bytes (see above); otherwise, the
+            files are read with a lock.
 
     """
 
     def __init__(
             self, paths, encoding=None, errors=None, newline=None,
-            filter_func=None):
+            filter_func=None, cache_index=False, use_mmap=False):
         if isinstance(paths, six.string_types):
             paths = [paths]
         elif len(paths) == 0:
@@ -81,37 +232,60 @@ class TextDataset(dataset_mixin.DatasetMixin):
         self._encoding = encoding
         self._errors = errors
         self._newline = newline
+        self._use_mmap = use_mmap
         self._fps = None
 
-        self._open()
-
         # Line number is 0-origin.
         # `lines` is a list of line numbers not filtered; if no filter_func is
         # given, it is range(linenum)).
         # `bounds` is a list of cursor positions of line boundaries for each
-        # file, i.e. i-th line of k-th file starts at `bounds[k][i]`.
-        linenum = 0
-        lines = []
-        bounds = tuple([[0] for _ in self._fps])
-        while True:
-            data = [fp.readline() for fp in self._fps]
-            if not all(data):  # any of files reached EOF
-                if any(data):  # not all files reached EOF
-                    raise ValueError(
-                        'number of lines in files does not match')
-                break
-            for i, fp in enumerate(self._fps):
-                bounds[i].append(fp.tell())
-            if filter_func is not None and filter_func(*data):
-                lines.append(linenum)
-            linenum += 1
+        # file, i.e. i-th line of k-th file starts at `bounds[k][i]`. They are
+        # the byte offsets if `binary` is True, and the positions given by
+        # `tell()` of the text files otherwise.
+        bounds = None
+        if all([_byte_lines_supported(enc, nl)
+                for enc, nl in six.moves.zip(encoding, newline)]):
+            bounds = [_load_index(path, nl, cache_index)
+                      for path, nl in six.moves.zip(paths, newline)]
+            if any([b is None for b in bounds]):
+                bounds = None
+        self._binary = bounds is not None
+
+        self._open()
+        self._lock = threading.Lock()
+
+        if self._binary:
+            linenum = len(bounds[0]) - 1
+            if any([len(b) - 1 != linenum for b in bounds]):
+                raise ValueError('number of lines in files does not match')
+            self._bounds = tuple(bounds)
+            lines = []
+            if filter_func is not None:
+                for i in six.moves.range(linenum):
+                    if filter_func(*self._read_binary(i)):
+                        lines.append(i)
+        else:
+            linenum = 0
+            lines = []
+            bounds = tuple([[0] for _ in self._fps])
+            while True:
+                data = [fp.readline() for fp in self._fps]
+                if not all(data):  # any of files reached EOF
+                    if any(data):  # not all files reached EOF
+                        raise ValueError(
+                            'number of lines in files does not match')
+                    break
+                for i, fp in enumerate(self._fps):
+                    bounds[i].append(fp.tell())
+                if filter_func is not None and filter_func(*data):
+                    lines.append(linenum)
+                linenum += 1
+            self._bounds = bounds
 
         if filter_func is None:
             lines = six.moves.range(linenum)
 
-        self._bounds = bounds
         self._lines = lines
-        self._lock = threading.Lock()
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -128,17 +302,22 @@ class TextDataset(dataset_mixin.DatasetMixin):
         return len(self._lines)
 
     def _open(self):
-        self._fps = [
-            io.open(
-                path,
-                mode='rt',
-                encoding=encoding,
-                errors=errors,
-                newline=newline,
-            ) for path, encoding, errors, newline in
-            six.moves.zip(self._paths, self._encoding, self._errors,
-                          self._newline)
-        ]
+        if self._binary and self._use_mmap:
+            self._fps = [_MmapFile(path) for path in self._paths]
+        elif self._binary:
+            self._fps = [io.open(path, mode='rb') for path in self._paths]
+        else:
+            self._fps = [
+                io.open(
+                    path,
+                    mode='rt',
+                    encoding=encoding,
+                    errors=errors,
+                    newline=newline,
+                ) for path, encoding, errors, newline in
+                six.moves.zip(self._paths, self._encoding, self._errors,
+                              self._newline)
+            ]
 
     def close(self):
         """Manually closes all text files.
@@ -155,11 +334,42 @@ class TextDataset(dataset_mixin.DatasetMixin):
         if exc is not None:
             six.reraise(*exc)
 
+    def _decode(self, k, data):
+        encoding = self._encoding[k]
+        if encoding is None:
+            encoding = locale.getpreferredencoding(False)
+        line = data.decode(encoding, self._errors[k] or 'strict')
+        if self._newline[k] is None:
+            # Lone CR does not appear in this mode.
+            line = line.replace(u'\r\n', u'\n')
+        return line
+
+    def _read_binary(self, linenum):
+        # Reads the lines of the given number as bytes and decodes them.
+        bounds = self._bounds
+        if self._use_mmap:
+            data = [fp.read(int(b[linenum]), int(b[linenum + 1]))
+                    for fp, b in six.moves.zip(self._fps, bounds)]
+        else:
+            data = []
+            with self._lock:
+                for fp, b in six.moves.zip(self._fps, bounds):
+                    start = int(b[linenum])
+                    fp.seek(start)
+                    data.append(fp.read(int(b[linenum + 1]) - start))
+        return [self._decode(k, d) for k, d in enumerate(data)]
+
     def get_example(self, idx):
         if idx < 0 or len(self._lines) <= idx:
             raise IndexError
         linenum = self._lines[idx]
 
+        if self._binary:
+            lines = self._read_binary(linenum)
+            if len(lines) == 1:
+                return lines[0]
+            return tuple(lines)
+
         self._lock.acquire()
         try:
             for k, fp in enumerate(self._fps):
@@ -1,3 +1,4 @@
+from chainer.dataset import convert
 from chainer.dataset import dataset_mixin
 
 
@@ -37,12 +38,23 @@ class TransformDataset(dataset_mixin.DatasetMixin):
             above.
         transform (callable): A function that is called to transform values
             returned by the underlying dataset's :meth:`__getitem__`.
+        batch_transform (callable): A function that transforms a batch of
+            examples in the columnar form at once. If the underlying dataset
+            returns the examples of a batch as a
+            :class:`~chainer.dataset.ColumnarBatch` from
+            :meth:`get_examples`, its arrays (an array, a tuple or a
+            dictionary of arrays) are passed to this function, which should
+            return the transformed arrays in the same form, i.e., what
+            :obj:`transform` returns with the batch dimension added. If it is
+            ``None`` or the batch is not columnar, :obj:`transform` is applied
+            to each example.
 
     """
 
-    def __init__(self, dataset, transform):
+    def __init__(self, dataset, transform, batch_transform=None):
         self._dataset = dataset
         self._transform = transform
+        self._batch_transform = batch_transform
 
     def __len__(self):
         return len(self._dataset)
@@ -50,3 +62,10 @@ class TransformDataset(dataset_mixin.DatasetMixin):
     def get_example(self, i):
         in_data = self._dataset[i]
         return self._transform(in_data)
+
+    def get_examples(self, indices):
+        batch = dataset_mixin.get_examples(self._dataset, indices)
+        if (self._batch_transform is not None
+                and isinstance(batch, convert.ColumnarBatch)):
+            return convert.ColumnarBatch(self._batch_transform(batch.arrays))
+        return [self._transform(in_data) for in_data in batch]
@@ -1,5 +1,8 @@
 import six
 
+from chainer.dataset import convert
+from chainer.dataset import dataset_mixin
+
 
 class TupleDataset(object):
 
@@ -25,6 +28,11 @@ class TupleDataset(object):
             ``__len__``. The ``j``-th dataset will be used for the ``j``-th
             item of each example tuple. All datasets must have the same length.
 
+    The examples of a batch can be retrieved at once by :meth:`get_examples`.
+    If every underlying dataset returns its examples as an array, e.g. if it
+    is a :class:`numpy.ndarray`, the batch is built without creating each
+    tuple.
+
     """
 
     def __init__(self, *datasets):
@@ -49,3 +57,24 @@ class TupleDataset(object):
 
     def __len__(self):
         return self._length
+
+    def get_examples(self, indices):
+        """Returns the examples of given indices.
+
+        Args:
+            indices (numpy.ndarray or list): One-dimensional array of the
+                indices of the examples.
+
+        Returns:
+            A :class:`~chainer.dataset.ColumnarBatch` of the tuple of the
+            arrays of the underlying datasets if all of them return their
+            examples as arrays, or a list of tuples otherwise.
+
+        """
+        batches = [dataset_mixin.get_examples(dataset, indices)
+                   for dataset in self._datasets]
+        columns = [dataset_mixin._column(batch) for batch in batches]
+        if all([column is not None for column in columns]):
+            return convert.ColumnarBatch(tuple(columns))
+        return [tuple([batch[i] for batch in batches])
+                for i in six.moves.range(len(batches[0]))]
@@ -1064,7 +1064,10 @@ def grad(outputs, inputs, grad_outputs=None, grad_inputs=None, set_grad=False,
 
     # Backprop implementation. It edits grads which will only contain the
     # gradients w.r.t. the inputs.
-    with chainer.using_config('enable_backprop', enable_double_backprop):
+    # The gradients of the inputs are returned, so sparse gradients are not
+    # accumulated to them directly.
+    with chainer.using_config('enable_backprop', enable_double_backprop), \
+            _backprop_utils.sparse_grad_context(None):
         ret_dict = _backprop(
             outputs, inputs, grad_required, retain_grad, grads, loss_scale)
 
@@ -1090,6 +1093,11 @@ def _backprop(outputs, inputs, grad_required, retain_grad, grads, loss_scale):
 
     is_debug = chainer.is_debug()
     base_hooks = chainer.get_function_hooks().values()
+    releaser = None
+    if (chainer.config.free_retained_on_backward
+            and not chainer.config.enable_backprop):
+        releaser = _backprop_utils.RetainedDataReleaser(
+            [y.node for y in outputs])
     while candidate_funcs:
         func = pop_candidate()
 
@@ -1118,6 +1126,8 @@ def _backprop(outputs, inputs, grad_required, retain_grad, grads, loss_scale):
             if x not in x_grads:
                 x_grads[x] = grads.get_as_list(x)
         if not input_indexes:
+            if releaser is not None:
+                releaser.release(func)
             continue
         input_indexes = tuple(input_indexes)
 
@@ -1147,6 +1157,10 @@ def _backprop(outputs, inputs, grad_required, retain_grad, grads, loss_scale):
                 hook.backward_postprocess(
                     func, tuple(in_data), tuple(out_grad_data))
 
+        del in_data
+        if releaser is not None:
+            releaser.release(func)
+
         # Update grads
         for node, g in x_grads.items():
             if not g:  # gradient == None
@@ -1159,6 +1173,8 @@ def _backprop(outputs, inputs, grad_required, retain_grad, grads, loss_scale):
     for x in input_nodes:
         if x not in ret_dict:
             ret_dict[x] = grads.pop(x)
+    if releaser is not None:
+        releaser.report()
     return ret_dict
 
 
@@ -0,0 +1,194 @@
+import collections
+import time
+
+import numpy
+
+import chainer
+from chainer.utils import conv
+
+
+# Winograd F(2x2, 3x3) transformation matrix of the filters. The
+# transformations of the inputs and the outputs are written as additions.
+_winograd_G = numpy.array([[1, 0, 0],
+                           [.5, .5, .5],
+                           [.5, -.5, .5],
+                           [0, 0, 1]], dtype=numpy.float64)
+
+
+class _Params(object):
+
+    def __init__(self, sy, sx, ph, pw, cover_all, dy, dx):
+        self.sy = sy
+        self.sx = sx
+        self.ph = ph
+        self.pw = pw
+        self.cover_all = cover_all
+        self.dy = dy
+        self.dx = dx
+
+    def key(self):
+        return (self.sy, self.sx, self.ph, self.pw, self.cover_all,
+                self.dy, self.dx)
+
+
+def _supports_im2col(x, W, p):
+    return True
+
+
+def _forward_im2col(x, W, p):
+    kh, kw = W.shape[2:]
+    col = conv.im2col_cpu(
+        x, kh, kw, p.sy, p.sx, p.ph, p.pw,
+        cover_all=p.cover_all, dy=p.dy, dx=p.dx)
+    y = numpy.tensordot(
+        col, W, ((1, 2, 3), (1, 2, 3))).astype(x.dtype, copy=False)
+    return numpy.rollaxis(y, 3, 1)
+
+
+def _supports_winograd(x, W, p):
+    return (W.shape[2:] == (3, 3) and p.sy == 1 and p.sx == 1
+            and p.dy == 1 and p.dx == 1
+            and x.dtype in (numpy.float32, numpy.float64)
+            and x.dtype == W.dtype)
+
+
+def _forward_winograd(x, W, p):
+    # Winograd's minimal filtering algorithm F(2x2, 3x3). Each 2x2 tile of
+    # the output is computed from a 4x4 tile of the input with 16
+    # multiplications per pair of channels instead of 36.
+    n, c, h, w = x.shape
+    out_c = W.shape[0]
+    out_h = h + 2 * p.ph - 2
+    out_w = w + 2 * p.pw - 2
+    tile_h = (out_h + 1) // 2
+    tile_w = (out_w + 1) // 2
+    dtype = x.dtype
+
+    x = numpy.pad(
+        x, ((0, 0), (0, 0),
+            (p.ph, tile_h * 2 + 2 - h - p.ph),
+            (p.pw, tile_w * 2 + 2 - w - p.pw)),
+        mode='constant')
+    # Tiles of the input: (4, 4, c, n, tile_h, tile_w)
+    s0, s1, s2, s3 = x.strides
+    d = numpy.lib.stride_tricks.as_strided(
+        x, (4, 4, c, n, tile_h, tile_w),
+        (s2, s3, s1, s0, s2 * 2, s3 * 2))
+
+    # Transformed inputs B^T d B: (4, 4, c, n * tile_h * tile_w)
+    V = _winograd_input_transform(_winograd_input_transform(d, 0), 1)
+    V = V.reshape(4, 4, c, -1)
+    # Transformed filters G g G^T: (4, 4, out_c, c)
+    G = _winograd_G.astype(dtype)
+    U = conv._matmul_cpu(conv._matmul_cpu(G, W), G.T)
+    U = numpy.ascontiguousarray(U.transpose(2, 3, 0, 1))
+    # Elementwise products summed over the input channels, which are
+    # computed as 16 independent matrix products: (4, 4, out_c, P)
+    M = conv._matmul_cpu(U, V)
+    # Inverse transformation A^T M A: (2, 2, out_c, P)
+    Y = _winograd_output_transform(_winograd_output_transform(M, 0), 1)
+    y = Y.reshape(2, 2, out_c, n, tile_h, tile_w).transpose(
+        3, 2, 4, 0, 5, 1).reshape(n, out_c, tile_h * 2, tile_w * 2)
+    return y[:, :, :out_h, :out_w]
+
+
+def _take(a, axis, i):
+    return a[i] if axis == 0 else a[:, i]
+
+
+def _winograd_input_transform(d, axis):
+    # Multiplies B^T along the axis, written as additions.
+    d0, d1, d2, d3 = [_take(d, axis, i) for i in range(4)]
+    return numpy.stack([d0 - d2, d1 + d2, d2 - d1, d1 - d3], axis=axis)
+
+
+def _winograd_output_transform(m, axis):
+    # Multiplies A^T along the axis, written as additions.
+    m0, m1, m2, m3 = [_take(m, axis, i) for i in range(4)]
+    return numpy.stack([m0 + m1 + m2, m1 - m2 - m3], axis=axis)
+
+
+def _supports_fft(x, W, p):
+    return (p.sy == 1 and p.sx == 1 and p.dy == 1 and p.dx == 1
+            and x.dtype in (numpy.float32, numpy.float64)
+            and x.dtype == W.dtype)
+
+
+def _forward_fft(x, W, p):
+    # Cross-correlation computed as the products in the frequency domain.
+    # The circular correlation equals the linear one in the output region,
+    # which does not wrap around.
+    kh, kw = W.shape[2:]
+    if p.ph != 0 or p.pw != 0:
+        x = numpy.pad(x, ((0, 0), (0, 0), (p.ph, p.ph), (p.pw, p.pw)),
+                      mode='constant')
+    h, w = x.shape[2:]
+    out_h = h - kh + 1
+    out_w = w - kw + 1
+    X = numpy.fft.rfft2(x, s=(h, w))
+    K = numpy.conj(numpy.fft.rfft2(W, s=(h, w)))
+    Y = numpy.einsum('nchw,ochw->nohw', X, K)
+    y = numpy.fft.irfft2(Y, s=(h, w))[:, :, :out_h, :out_w]
+    return y.astype(x.dtype, copy=False)
+
+
+_Algorithm = collections.namedtuple('_Algorithm', ('supports', 'forward'))
+
+# Registry of the CPU implementations of 2D convolution. Each entry consists
+# of a function which tells whether the algorithm supports given inputs and
+# parameters, and a function which computes the output of shape
+# (n, out_c, out_h, out_w).
+_algorithms = collections.OrderedDict([
+    ('im2col', _Algorithm(_supports_im2col, _forward_im2col)),
+    ('winograd', _Algorithm(_supports_winograd, _forward_winograd)),
+    ('fft', _Algorithm(_supports_fft, _forward_fft)),
+])
+
+# Algorithms selected by autotuning, keyed by the shapes and parameters.
+_autotune_cache = {}
+
+
+def _autotune(x, W, p):
+    key = (x.shape, W.shape, x.dtype, W.dtype) + p.key()
+    name = _autotune_cache.get(key)
+    if name is not None:
+        return name, None
+
+    best_time = None
+    best_y = None
+    for candidate, algorithm in _algorithms.items():
+        if not algorithm.supports(x, W, p):
+            continue
+        start = time.time()
+        y = algorithm.forward(x, W, p)
+        elapsed = time.time() - start
+        if best_time is None or elapsed < best_time:
+            name, best_time, best_y = candidate, elapsed, y
+    _autotune_cache[key] = name
+    return name, best_y
+
+
+def convolution_2d(x, W, sy, sx, ph, pw, cover_all=False, dy=1, dx=1):
+    """Computes a 2D convolution on CPU with the configured algorithm.
+
+    The algorithm is selected by ``chainer.config.cpu_conv_algorithm``. If
+    the algorithm does not support the inputs, im2col is used instead.
+
+    Returns:
+        numpy.ndarray: Output of shape ``(n, out_c, out_h, out_w)``.
+
+    """
+    p = _Params(sy, sx, ph, pw, cover_all, dy, dx)
+    name = chainer.config.cpu_conv_algorithm
+    if name == 'auto':
+        name, y = _autotune(x, W, p)
+        if y is not None:
+            return y
+    elif name not in _algorithms:
+        raise ValueError(
+            'invalid cpu_conv_algorithm configuration: {}'.format(name))
+
+    algorithm = _algorithms[name]
+    if not algorithm.supports(x, W, p):
+        algorithm = _algorithms['im2col']
+    return algorithm.forward(x, W, p)
@@ -7,6 +7,7 @@ from chainer.backends import intel64
 from chainer import configuration
 from chainer import function_node
 import chainer.functions
+from chainer.functions.connection import _convolution_2d_cpu
 from chainer.utils import argument
 from chainer.utils import conv
 from chainer.utils import type_check
@@ -118,23 +119,45 @@ class Convolution2DFunction(function_node.FunctionNode):
             self._use_ideep = True
 
         if self.groups > 1:
+            if W.shape[1] == 1:
+                return self._forward_depthwise_cpu(x, W, b)
             return self._forward_grouped_convolution(x, W, b)
         else:
             return self._forward_cpu_core(x, W, b)
 
+    def _is_1x1_without_padding(self, kh, kw):
+        return (kh == 1 and kw == 1 and self.ph == 0 and self.pw == 0
+                and not self.cover_all)
+
     def _forward_cpu_core(self, x, W, b):
         if self._use_ideep:
             return self._forward_ideep(x, W, b)
 
         kh, kw = W.shape[2:]
-        col = conv.im2col_cpu(
-            x, kh, kw, self.sy, self.sx, self.ph, self.pw,
+        if self._is_1x1_without_padding(kh, kw):
+            # Direct implementation without im2col
+            y = conv.conv_1x1_cpu(
+                x, W, self.sy, self.sx).astype(x.dtype, copy=False)
+            if b is not None:
+                y += b.reshape(1, b.size, 1, 1)
+            return y,
+
+        y = _convolution_2d_cpu.convolution_2d(
+            x, W, self.sy, self.sx, self.ph, self.pw,
             cover_all=self.cover_all, dy=self.dy, dx=self.dx)
-        y = numpy.tensordot(
-            col, W, ((1, 2, 3), (1, 2, 3))).astype(x.dtype, copy=False)
         if b is not None:
-            y += b
-        y = numpy.rollaxis(y, 3, 1)
+            y += b.reshape(1, b.size, 1, 1)
+        return y,
+
+    def _forward_depthwise_cpu(self, x, W, b):
+        # Each group has only one input channel.
+        oC, _, kH, kW = W.shape
+        y = conv.depthwise_conv_cpu(
+            x, W.reshape(self.groups, oC // self.groups, kH, kW),
+            self.sy, self.sx, self.ph, self.pw, cover_all=self.cover_all,
+            dy=self.dy, dx=self.dx).astype(x.dtype, copy=False)
+        if b is not None:
+            y += b.reshape(1, b.size, 1, 1)
         return y,
 
     def _forward_ideep(self, x, W, b):
@@ -289,6 +312,8 @@ class Convolution2DGradW(function_node.FunctionNode):
         x, gy = inputs
 
         if self.groups > 1:
+            if x.shape[1] == self.groups:
+                return self._forward_depthwise_cpu(x, gy)
             return self._forward_grouped_convolution(x, gy)
         else:
             return self._forward_cpu_core(x, gy)
@@ -297,6 +322,12 @@ class Convolution2DGradW(function_node.FunctionNode):
         if self._use_ideep:
             return self._forward_ideep(x, gy)
 
+        if (self.kh == 1 and self.kw == 1 and self.ph == 0 and self.pw == 0
+                and not self.cover_all):
+            # Direct implementation without im2col
+            gW = conv.conv_1x1_grad_w_cpu(x, gy, self.sy, self.sx)
+            return gW.astype(self.W_dtype, copy=False),
+
         # NumPy raises an error when the array is not contiguous.
         # See: https://github.com/chainer/chainer/issues/2744
         # TODO(niboshi): Remove this code when NumPy is fixed.
@@ -311,6 +342,14 @@ class Convolution2DGradW(function_node.FunctionNode):
                              ).astype(self.W_dtype, copy=False)
         return gW,
 
+    def _forward_depthwise_cpu(self, x, gy):
+        # Each group has only one input channel.
+        gW = conv.depthwise_conv_grad_w_cpu(
+            x, gy, self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
+            cover_all=self.cover_all, dy=self.dy, dx=self.dx)
+        gW = gW.reshape(-1, 1, self.kh, self.kw)
+        return gW.astype(self.W_dtype, copy=False),
+
     def _forward_ideep(self, x, gy):
         n, input_c, h, w = x.shape
         n, out_c, out_h, out_w = gy.shape
@@ -122,6 +122,9 @@ class Deconvolution2DFunction(function_node.FunctionNode):
         self._calc_out_size(x, W)
 
         if self.groups > 1:
+            if W.shape[1] == 1:
+                # Each group has only one output channel.
+                return self._forward_depthwise_cpu(x, W, b)
             # Grouped convolution implementation
             return self._forward_grouped_convolution(x, W, b)
 
@@ -138,6 +141,16 @@ class Deconvolution2DFunction(function_node.FunctionNode):
         if self._use_ideep:
             return self._forward_ideep(x, W, b)
 
+        kh, kw = W.shape[2:]
+        if kh == 1 and kw == 1 and self.ph == 0 and self.pw == 0:
+            # Direct implementation without col2im
+            y = conv.deconv_1x1_cpu(
+                x, W, self.sy, self.sx, self.outh, self.outw
+            ).astype(x.dtype, copy=False)
+            if b is not None:
+                y += b.reshape((1, b.size, 1, 1))
+            return y,
+
         gcol = numpy.tensordot(W, x, (0, 1)).astype(x.dtype, copy=False)
         gcol = numpy.rollaxis(gcol, 3)
         y = conv.col2im_cpu(
@@ -148,6 +161,16 @@ class Deconvolution2DFunction(function_node.FunctionNode):
             y += b.reshape((1, b.size, 1, 1))
         return y,
 
+    def _forward_depthwise_cpu(self, x, W, b):
+        _, _, kH, kW = W.shape
+        y = conv.depthwise_deconv_cpu(
+            x, W.reshape(self.groups, -1, kH, kW), self.sy, self.sx,
+            self.ph, self.pw, self.outh, self.outw, dy=self.dy, dx=self.dx
+        ).astype(x.dtype, copy=False)
+        if b is not None:
+            y += b.reshape(1, b.size, 1, 1)
+        return y,
+
     def _forward_ideep(self, x, W, b):
         _, in_c, kh, kw = W.shape
         n, _, in_h, in_w = x.shape
@@ -1,7 +1,7 @@
 import numpy
-import six
 
 import chainer
+from chainer import _backprop_utils
 from chainer import backend
 from chainer.backends import cuda
 from chainer import function_node
@@ -9,10 +9,21 @@ from chainer import utils
 from chainer.utils import type_check
 
 
+def _indexed_rows(x, gy, w_shape, ignore_label):
+    rows = x.ravel()
+    values = gy.reshape((rows.size,) + tuple(w_shape[1:]))
+    if ignore_label is not None:
+        mask = rows != ignore_label
+        rows = rows[mask]
+        values = values[mask]
+    return utils.IndexedRows(rows, values, w_shape)
+
+
 class EmbedIDFunction(function_node.FunctionNode):
 
-    def __init__(self, ignore_label=None):
+    def __init__(self, ignore_label=None, sparse_grad=False):
         self.ignore_label = ignore_label
+        self.sparse_grad = sparse_grad
 
     def check_type_forward(self, in_types):
         type_check.expect(in_types.size() == 2)
@@ -48,10 +59,31 @@ class EmbedIDFunction(function_node.FunctionNode):
 
     def backward(self, indexes, grad_outputs):
         inputs = self.get_retained_inputs()
+        context = _backprop_utils.get_sparse_grad_context()
+        if (self.sparse_grad and context is not None
+                and not chainer.config.enable_backprop):
+            param = self._sparse_grad_target()
+            if param is not None:
+                param.add_sparse_grad(_indexed_rows(
+                    inputs[0].array, grad_outputs[0].array, self._w_shape,
+                    self.ignore_label), loss_scale=context.loss_scale)
+                return None, None
         gW = EmbedIDGrad(
             self._w_shape, self.ignore_label).apply(inputs + grad_outputs)[0]
         return None, gW
 
+    def _sparse_grad_target(self):
+        # The gradient is directly accumulated to the parameter only if it
+        # is a parameter whose array can be updated sparsely.
+        param = self.inputs[1].get_variable_or_none()
+        if not isinstance(param, chainer.Parameter):
+            return None
+        array = param.array
+        if not (type(array) is numpy.ndarray
+                or isinstance(array, cuda.ndarray)):
+            return None
+        return param
+
 
 class EmbedIDGrad(function_node.FunctionNode):
 
@@ -64,37 +96,34 @@ class EmbedIDGrad(function_node.FunctionNode):
         xp = backend.get_array_module(*inputs)
         x, gy = inputs
         self._gy_shape = gy.shape
-        gW = xp.zeros(self.w_shape, dtype=gy.dtype)
 
         if xp is numpy:
             # It is equivalent to `numpy.add.at(gW, x, gy)` but ufunc.at is
-            # too slow.
-            for ix, igy in six.moves.zip(x.ravel(),
-                                         gy.reshape(x.size, -1)):
-                if ix == self.ignore_label:
-                    continue
-                gW[ix] += igy
+            # too slow. The rows of the same ID are summed up after sorting.
+            return _indexed_rows(
+                x, gy, self.w_shape, self.ignore_label).to_dense(),
+
+        gW = xp.zeros(self.w_shape, dtype=gy.dtype)
+        utils.nondeterministic('atomicAdd')
+        if self.ignore_label is None:
+            cuda.elementwise(
+                'T gy, S x, S n_out', 'raw T gW',
+                'ptrdiff_t w_ind[] = {x, i % n_out};'
+                'atomicAdd(&gW[w_ind], gy)',
+                'embed_id_bwd')(
+                    gy, xp.expand_dims(x, -1), gW.shape[1], gW)
         else:
-            utils.nondeterministic('atomicAdd')
-            if self.ignore_label is None:
-                cuda.elementwise(
-                    'T gy, S x, S n_out', 'raw T gW',
-                    'ptrdiff_t w_ind[] = {x, i % n_out};'
-                    'atomicAdd(&gW[w_ind], gy)',
-                    'embed_id_bwd')(
-                        gy, xp.expand_dims(x, -1), gW.shape[1], gW)
-            else:
-                cuda.elementwise(
-                    'T gy, S x, S n_out, S ignore', 'raw T gW',
-                    '''
-                    if (x != ignore) {
-                      ptrdiff_t w_ind[] = {x, i % n_out};
-                      atomicAdd(&gW[w_ind], gy);
-                    }
-                    ''',
-                    'embed_id_bwd_ignore_label')(
-                        gy, xp.expand_dims(x, -1), gW.shape[1],
-                        self.ignore_label, gW)
+            cuda.elementwise(
+                'T gy, S x, S n_out, S ignore', 'raw T gW',
+                '''
+                if (x != ignore) {
+                  ptrdiff_t w_ind[] = {x, i % n_out};
+                  atomicAdd(&gW[w_ind], gy);
+                }
+                ''',
+                'embed_id_bwd_ignore_label')(
+                    gy, xp.expand_dims(x, -1), gW.shape[1],
+                    self.ignore_label, gW)
         return gW,
 
     def backward(self, indexes, grads):
@@ -118,7 +147,7 @@ class EmbedIDGrad(function_node.FunctionNode):
         return None, ggy
 
 
-def embed_id(x, W, ignore_label=None):
+def embed_id(x, W, ignore_label=None, sparse_grad=False):
     """Efficient linear function for one-hot input.
 
     This function implements so called *word embeddings*. It takes two
@@ -137,6 +166,15 @@ def embed_id(x, W, ignore_label=None):
         ignore_label (:class:`int` or :class:`None`):
             If ``ignore_label`` is an int value, ``i``-th column of return
             value is filled with ``0``.
+        sparse_grad (bool): If ``True`` and ``W`` is a
+            :class:`~chainer.Parameter`, the gradient of ``W`` is accumulated
+            to :attr:`W.sparse_grad <chainer.Parameter.sparse_grad>` as an
+            :class:`~chainer.utils.IndexedRows` object, which only holds the
+            rows of the IDs in ``x``, instead of ``W.grad``. The optimizers
+            supporting sparse gradients then update these rows only. It
+            only takes effect in :meth:`chainer.Variable.backward` without
+            double backpropagation; :func:`chainer.grad` returns the dense
+            gradient of ``W``.
 
     Returns:
         ~chainer.Variable: Output variable.
@@ -163,4 +201,5 @@ def embed_id(x, W, ignore_label=None):
                [0., 0., 0.]], dtype=float32)
 
     """
-    return EmbedIDFunction(ignore_label=ignore_label).apply((x, W))[0]
+    return EmbedIDFunction(
+        ignore_label=ignore_label, sparse_grad=sparse_grad).apply((x, W))[0]
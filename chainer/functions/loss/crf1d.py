@@ -1,3 +1,8 @@
+import numpy
+import six
+
+from chainer import backend
+from chainer import function_node
 from chainer.functions.array import broadcast
 from chainer.functions.array import concat
 from chainer.functions.array import reshape
@@ -5,11 +10,216 @@ from chainer.functions.array import select_item
 from chainer.functions.array import split_axis
 from chainer.functions.connection import embed_id
 from chainer.functions.math import logsumexp
+from chainer.functions.math import matmul
 from chainer.functions.math import minmax
 from chainer.functions.math import sum as _sum
+from chainer import variable
+import chainerx
+
+
+def _logsumexp(a, xp, axis):
+    m = a.max(axis=axis, keepdims=True)
+    ret = xp.log(xp.exp(a - m).sum(axis=axis, keepdims=True))
+    ret += m
+    return ret.squeeze(axis)
+
+
+def _gather_last(values, n_batch, xp):
+    # Gathers the values at the last position of each sequence. The batch
+    # sizes of ``values`` are sorted in descending order.
+    ret = xp.empty((n_batch,) + values[-1].shape[1:], dtype=values[-1].dtype)
+    for i, value in enumerate(values):
+        end = len(value)
+        begin = len(values[i + 1]) if i + 1 < len(values) else 0
+        ret[begin:end] = value[begin:end]
+    return ret
+
 
+def _transition_counts(ys, n_label, n_batch, xp):
+    # Number of the transitions between each pair of labels in each
+    # sequence, of shape (B, K * K).
+    counts = xp.zeros((n_batch, n_label * n_label), dtype=numpy.float32)
+    for y_prev, y in six.moves.zip(ys[:-1], ys[1:]):
+        batch = len(y)
+        counts[xp.arange(batch), y_prev[:batch] * n_label + y] += 1
+    return counts
+
+
+class CRF1d(function_node.FunctionNode):
+
+    """Negative log-likelihood of linear-chain CRF with the analytic gradient.
+
+    The gradients are computed from the marginal probabilities of the labels
+    and the transitions, which are given by the forward-backward algorithm.
+
+    """
 
-def crf1d(cost, xs, ys, reduce='mean'):
+    def __init__(self, ys, reduce):
+        self.ys = ys
+        self.reduce = reduce
+
+    def forward(self, inputs):
+        self.retain_inputs(tuple(six.moves.range(len(inputs))))
+        xp = backend.get_array_module(*inputs)
+        cost, xs = inputs[0], inputs[1:]
+        ys = self.ys
+        n_batch = len(xs[0])
+
+        alpha = xs[0]
+        alphas = [alpha]
+        score = xs[0][xp.arange(n_batch), ys[0]]
+        for x, y, y_prev in six.moves.zip(xs[1:], ys[1:], ys[:-1]):
+            batch = len(x)
+            alpha = _logsumexp(alpha[:batch, :, None] + cost, xp, 1) + x
+            alphas.append(alpha)
+            score[:batch] += x[xp.arange(batch), y] + cost[y_prev[:batch], y]
+        self.alphas = alphas
+
+        self.logz = _logsumexp(_gather_last(alphas, n_batch, xp), xp, 1)
+        loss = self.logz - score
+        if self.reduce == 'mean':
+            return xp.asarray(loss.sum() / n_batch, dtype=loss.dtype),
+        return loss,
+
+    def backward(self, indexes, grad_outputs):
+        inputs = self.get_retained_inputs()
+        grads = CRF1dGrad(self.ys, self.reduce, self.alphas, self.logz).apply(
+            inputs + grad_outputs)
+        return tuple([grads[i] for i in indexes])
+
+
+class CRF1dGrad(function_node.FunctionNode):
+
+    # A backward implementation of CRF1d which does not support
+    # double-backprop.
+
+    def __init__(self, ys, reduce, alphas, logz):
+        self.ys = ys
+        self.reduce = reduce
+        self.alphas = alphas
+        self.logz = logz
+
+    def forward(self, inputs):
+        xp = backend.get_array_module(*inputs)
+        cost, xs, gloss = inputs[0], inputs[1:-1], inputs[-1]
+        ys = self.ys
+        alphas = self.alphas
+        logz = self.logz
+        n_batch = len(xs[0])
+        n_label = len(cost)
+        if self.reduce == 'mean':
+            g = xp.full((n_batch,), gloss / n_batch, dtype=cost.dtype)
+        else:
+            g = gloss
+
+        gcost = xp.zeros_like(cost)
+        gxs = [None] * len(xs)
+        beta = xp.zeros_like(xs[-1])
+        for i in six.moves.range(len(xs) - 1, -1, -1):
+            x = xs[i]
+            batch = len(x)
+            gx = xp.exp(alphas[i] + beta - logz[:batch, None])
+            gx[xp.arange(batch), ys[i]] -= 1
+            gx *= g[:batch, None]
+            gxs[i] = gx
+            if i == 0:
+                break
+
+            # Marginal probabilities of the transitions, and the backward
+            # log-probabilities of the previous position.
+            x_beta = x + beta
+            pair = cost + x_beta[:, None, :]
+            pair_beta = _logsumexp(pair, xp, 2)
+            pair += alphas[i - 1][:batch, :, None]
+            pair -= logz[:batch, None, None]
+            gcost += xp.tensordot(g[:batch], xp.exp(pair), 1)
+            beta = xp.zeros_like(xs[i - 1])
+            beta[:batch] = pair_beta
+
+        counts = _transition_counts(ys, n_label, n_batch, xp)
+        gcost -= g.dot(counts.astype(g.dtype)).reshape(n_label, n_label)
+        return (gcost,) + tuple(gxs)
+
+    def backward(self, indexes, grad_outputs):
+        raise RuntimeError(
+            'F.crf1d was called with \'enable_double_backprop=False\' '
+            'argument, but double-backprop is actually being performed. '
+            'Please specify \'enable_double_backprop=True\' explicitly.')
+
+
+class ArgmaxCRF1d(function_node.FunctionNode):
+
+    """Batched Viterbi algorithm of linear-chain CRF.
+
+    It computes the scores of the best paths, which are stored in
+    ``path``. The gradients are given by the labels and the transitions on
+    the paths.
+
+    """
+
+    def forward(self, inputs):
+        xp = backend.get_array_module(*inputs)
+        cost, xs = inputs[0], inputs[1:]
+        n_batch = len(xs[0])
+
+        alpha = xs[0]
+        alphas = [alpha]
+        max_inds = []
+        for x in xs[1:]:
+            batch = len(x)
+            scores = alpha[:batch, :, None] + cost
+            max_ind = scores.argmax(axis=1)
+            max_inds.append(max_ind)
+            alpha = scores.max(axis=1) + x
+            alphas.append(alpha)
+
+        inds = alphas[-1].argmax(axis=1)
+        path = [inds]
+        for max_ind, alpha in six.moves.zip(max_inds[::-1], alphas[-2::-1]):
+            batch = len(inds)
+            inds = max_ind[xp.arange(batch), inds]
+            if len(alpha) > batch:
+                inds = xp.concatenate((inds, alpha[batch:].argmax(axis=1)))
+            path.append(inds)
+        path.reverse()
+        self.path = path
+
+        score = _gather_last(alphas, n_batch, xp).max(axis=1)
+        return score,
+
+    def backward(self, indexes, grad_outputs):
+        gy, = grad_outputs
+        cost = self.inputs[0]
+        xp = backend.get_array_module(gy)
+        n_label = cost.shape[0]
+        ret = []
+        if 0 in indexes:
+            counts = _transition_counts(
+                self.path, n_label, len(gy), xp).astype(gy.dtype)
+            gcost = matmul.matmul(reshape.reshape(gy, (1, -1)), counts)
+            ret.append(reshape.reshape(gcost, cost.shape))
+        for i in indexes:
+            if i == 0:
+                continue
+            inds = self.path[i - 1]
+            batch = len(inds)
+            onehot = xp.zeros((batch, n_label), dtype=gy.dtype)
+            onehot[xp.arange(batch), inds] = 1
+            gy_i = broadcast.broadcast_to(
+                reshape.reshape(gy[:batch], (batch, 1)), onehot.shape)
+            ret.append(gy_i * onehot)
+        return ret
+
+
+def _is_chainerx(cost, xs):
+    arrays = [cost] + list(xs)
+    arrays = [a.array if isinstance(a, variable.Variable) else a
+              for a in arrays]
+    return (chainerx.is_available()
+            and backend.get_array_module(*arrays) is chainerx)
+
+
+def crf1d(cost, xs, ys, reduce='mean', enable_double_backprop=False):
     """Calculates negative log-likelihood of linear-chain CRF.
 
     It takes a transition cost matrix, a sequence of costs, and a sequence of
@@ -88,6 +298,12 @@ def crf1d(cost, xs, ys, reduce='mean'):
             ``ys[i].shape == xs[i].shape[0:1]`` for all ``i``.
         reduce (str): Reduction option. Its value must be either
             ``'mean'`` or ``'no'``. Otherwise, :class:`ValueError` is raised.
+        enable_double_backprop (bool): If ``True``, this function is computed
+            by a sequence of differentiable functions, which supports
+            double-backprop. Otherwise, it is computed by a single function
+            whose gradient is given by the forward-backward algorithm. The
+            latter is much faster and does not create a computational graph
+            growing with the length of the sequences.
 
     Returns:
         ~chainer.Variable: A variable holding the average negative
@@ -107,6 +323,16 @@ def crf1d(cost, xs, ys, reduce='mean'):
 
     assert xs[0].shape[1] == cost.shape[0]
 
+    if not enable_double_backprop and not _is_chainerx(cost, xs):
+        ys = [y.array if isinstance(y, variable.Variable) else y for y in ys]
+        loss, = CRF1d(ys, reduce).apply((cost,) + tuple(xs))
+        return loss
+
+    return _crf1d_double_backprop(cost, xs, ys, reduce)
+
+
+def _crf1d_double_backprop(cost, xs, ys, reduce):
+    # Generic double-backprop-enabled but unoptimized implementation.
     n_label = cost.shape[0]
     n_batch = xs[0].shape[0]
 
@@ -177,6 +403,15 @@ def argmax_crf1d(cost, xs):
         the mini-batch size of the corresponding ``xs[i]``. That means,
         ``ps[i].shape == xs[i].shape[0:1]``.
     """
+    if _is_chainerx(cost, xs):
+        return _argmax_crf1d_chainerx(cost, xs)
+
+    func = ArgmaxCRF1d()
+    score, = func.apply((cost,) + tuple(xs))
+    return score, func.path
+
+
+def _argmax_crf1d_chainerx(cost, xs):
     alpha = xs[0]
     alphas = []
     max_inds = []
@@ -24,6 +24,23 @@ def _logsumexp(a, xp, axis=None):
     return xp.squeeze(vmax, axis=axis)
 
 
+def _logsumexp3(a, b, c):
+    # Elementwise log-sum-exp of three arrays computed in a single pass.
+    m = numpy.maximum(a, b)
+    numpy.maximum(m, c, out=m)
+    ret = numpy.subtract(a, m)
+    numpy.exp(ret, out=ret)
+    tmp = numpy.subtract(b, m)
+    numpy.exp(tmp, out=tmp)
+    ret += tmp
+    numpy.subtract(c, m, out=tmp)
+    numpy.exp(tmp, out=tmp)
+    ret += tmp
+    numpy.log(ret, out=ret)
+    ret += m
+    return ret
+
+
 def _softmax(x, xp):
     val = xp.exp(x - xp.amax(x, axis=2, keepdims=True))
     val /= xp.sum(val, axis=2, keepdims=True)
@@ -142,7 +159,9 @@ class ConnectionistTemporalClassification(function.Function):
 
     def log_matrix(self, x, xp):
         if xp == numpy:
-            res = numpy.ma.log(x).filled(fill_value=self.zero_padding)
+            with numpy.errstate(divide='ignore'):
+                res = numpy.log(x)
+            res[x == 0] = self.zero_padding
         else:
             create_recurrence_relation = cuda.elementwise(
                 'T x, T e', 'T y',
@@ -158,16 +177,20 @@ class ConnectionistTemporalClassification(function.Function):
         n_batch = len(path)
         dtype = multiply_seq.dtype
 
-        ret = xp.zeros((seq_length, n_batch, label_size), dtype)
         if xp == numpy:
-            for b in six.moves.range(len(path)):
-                target_path = path[b, :path_length[b]]
-                chars = {c for c in target_path}
-                for c in chars:
-                    ret[:, b, c] = xp.sum(
-                        multiply_seq[:, b, 0:path_length[b]]
-                        [:, target_path == c], axis=1)
+            # Sums up the probabilities of the same labels by a single
+            # bincount over the flattened indices of the output.
+            outside = numpy.arange(path.shape[1]) >= path_length[:, None]
+            index = (numpy.arange(seq_length * n_batch).reshape(
+                seq_length, n_batch, 1) * label_size + path)
+            weights = numpy.where(outside, 0, multiply_seq)
+            ret = numpy.bincount(
+                index.ravel(), weights.ravel(),
+                minlength=seq_length * n_batch * label_size)
+            ret = ret.reshape(seq_length, n_batch, label_size).astype(
+                dtype, copy=False)
         else:
+            ret = xp.zeros((seq_length, n_batch, label_size), dtype)
             utils.nondeterministic('atomicAdd')
             cuda.elementwise(
                 'T prob, I path, I path_length, I max_path_length',
@@ -189,57 +212,38 @@ class ConnectionistTemporalClassification(function.Function):
     def _computes_transition(
             self, prev_prob, path, path_length, cum_prob, y):
         xp = backend.get_array_module(prev_prob)
-
-        if xp == numpy:
-            n_batch, max_path_length = path.shape
-            mat = xp.full(
-                (3, n_batch, max_path_length), self.zero_padding, y.dtype)
-            mat[0, :, :] = prev_prob
-            mat[1, :, 1:] = prev_prob[:, :-1]
-            mat[2, :, 2:] = prev_prob[:, :-2]
-            # disable transition between the same symbols
-            # (including blank-to-blank)
-            same_transition = (path[:, :-2] == path[:, 2:])
-            mat[2, :, 2:][same_transition] = self.zero_padding
-            prob = _logsumexp(mat, xp, axis=0)
-            outside = xp.arange(max_path_length) >= path_length[:, None]
-            prob[outside] = self.zero_padding
-            cum_prob += prob
-            batch_index = xp.arange(n_batch, dtype=xp.int32)
-            prob += y[batch_index[:, None], path]
-        else:
-            prob = xp.empty_like(prev_prob)
-            cuda.elementwise(
-                'raw T prob, raw I path, I path_length, T zero, raw T y',
-                'T z, T cum_prob',
-                '''
-                int length = prob.shape()[1];
-                int b = i / length;
-                int t = i - b * length;
-                if (t >= path_length) {
-                  z = zero;
-                  cum_prob += zero;
-                  return;
-                }
-                int ind1[] = {b, t};
-                int ind2[] = {b, t - 1};
-                int ind3[] = {b, t - 2};
-                T f1 = prob[ind1];
-                T f2 = (0 <= t - 1) ? prob[ind2] : zero;
-                T f3 = (0 <= t - 2 && path[ind3] != path[ind1]) ?
-                  prob[ind3] : zero;
-
-                // calculates log-sum-exp
-                T m = max(f1, max(f2, f3));
-                z = m + log(exp(f1 - m) + exp(f2 - m) + exp(f3 - m));
-
-                cum_prob += z;
-
-                int y_ind[] = {b, path[ind1]};
-                z += y[y_ind];
-                ''', 'ctc_transition'
-            )(prev_prob, path, path_length[:, None], self.zero_padding, y,
-              prob, cum_prob)
+        prob = xp.empty_like(prev_prob)
+        cuda.elementwise(
+            'raw T prob, raw I path, I path_length, T zero, raw T y',
+            'T z, T cum_prob',
+            '''
+            int length = prob.shape()[1];
+            int b = i / length;
+            int t = i - b * length;
+            if (t >= path_length) {
+              z = zero;
+              cum_prob += zero;
+              return;
+            }
+            int ind1[] = {b, t};
+            int ind2[] = {b, t - 1};
+            int ind3[] = {b, t - 2};
+            T f1 = prob[ind1];
+            T f2 = (0 <= t - 1) ? prob[ind2] : zero;
+            T f3 = (0 <= t - 2 && path[ind3] != path[ind1]) ?
+              prob[ind3] : zero;
+
+            // calculates log-sum-exp
+            T m = max(f1, max(f2, f3));
+            z = m + log(exp(f1 - m) + exp(f2 - m) + exp(f3 - m));
+
+            cum_prob += z;
+
+            int y_ind[] = {b, path[ind1]};
+            z += y[y_ind];
+            ''', 'ctc_transition'
+        )(prev_prob, path, path_length[:, None], self.zero_padding, y,
+          prob, cum_prob)
         return prob
 
     def calc_trans(self, yseq, input_length,
@@ -250,6 +254,9 @@ class ConnectionistTemporalClassification(function.Function):
         assert label.shape == (n_batch, max_label_length), label.shape
         assert path.shape == (n_batch, max_label_length * 2 + 1)
 
+        if xp is numpy:
+            return self._calc_trans_cpu(yseq, input_length, path, path_length)
+
         forward_prob = xp.full(
             (n_batch, max_path_length), self.zero_padding, dtype=yseq.dtype)
         forward_prob[:, 0] = 0
@@ -274,6 +281,64 @@ class ConnectionistTemporalClassification(function.Function):
 
         return _flip_path_probability(prob, input_length, path_length, xp)
 
+    def _calc_trans_cpu(self, yseq, input_length, path, path_length):
+        # Computes the same matrix as calc_trans, i.e., the sum of the log
+        # forward and backward probabilities of the paths. The backward
+        # recursion runs from the end of the padded sequences without
+        # flipping them, and starts at the end of each sequence by masking.
+        max_input_length, n_batch = yseq.shape[:2]
+        max_path_length = path.shape[1]
+        zero = self.zero_padding
+        dtype = yseq.dtype
+
+        # Log probabilities of the labels on the paths.
+        prob = yseq[:, numpy.arange(n_batch)[:, None], path]
+        outside = numpy.arange(max_path_length) >= path_length[:, None]
+        # Transitions skipping a blank are allowed between different labels;
+        # the others are disabled by adding the log of zero.
+        penalty = numpy.full(
+            (n_batch, max_path_length + 2), zero, dtype=dtype)
+        penalty[:, 2:-2][path[:, 2:] != path[:, :-2]] = 0
+        forward_penalty = penalty[:, :-2]
+        backward_penalty = penalty[:, 2:]
+
+        # Forward probabilities, which are preceded by two dummy states. The
+        # states beyond the end of each path never reach the ones inside.
+        prev = numpy.full(
+            (n_batch, max_path_length + 2), zero, dtype=dtype)
+        prev[:, 2] = 0
+        skipped = numpy.empty((n_batch, max_path_length), dtype=dtype)
+        ret = numpy.empty_like(prob)
+        for i in six.moves.range(max_input_length):
+            numpy.add(prev[:, :-2], forward_penalty, out=skipped)
+            cur = _logsumexp3(prev[:, 2:], prev[:, 1:-1], skipped)
+            cur += prob[i]
+            ret[i] = cur
+            prev[:, 2:] = cur
+
+        # Backward probabilities, which are followed by two dummy states. The
+        # recursion of each sequence starts at its last input.
+        initial = numpy.full((n_batch, max_path_length), zero, dtype=dtype)
+        batch_index = numpy.arange(n_batch)
+        initial[batch_index, path_length - 1] = 0
+        has_label = path_length > 1
+        initial[batch_index[has_label], path_length[has_label] - 2] = 0
+        initial[outside] = zero
+        last = input_length - 1
+        prev = numpy.full(
+            (n_batch, max_path_length + 2), zero, dtype=dtype)
+        for i in six.moves.range(max_input_length - 1, -1, -1):
+            numpy.add(prev[:, 2:], backward_penalty, out=skipped)
+            cur = _logsumexp3(prev[:, :-2], prev[:, 1:-1], skipped)
+            starts = last == i
+            if starts.any():
+                cur[starts] = initial[starts]
+            ret[i] += cur
+            cur += prob[i]
+            prev[:, :-2] = cur
+        ret[:, outside] = zero
+        return ret
+
     def forward(self, inputs):
         xp = backend.get_array_module(inputs[0])
         self.input_length, label_length, t, xs = inputs
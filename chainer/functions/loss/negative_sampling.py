@@ -60,13 +60,16 @@ class NegativeSamplingFunction(function_node.FunctionNode):
         self.ignore_mask = (t != self.ignore_label)
         samples = self._make_samples(t)
 
-        w = W[samples]
-        wx = numpy.einsum(
-            'ij,ikj->ik', x[self.ignore_mask], w[self.ignore_mask])
-        wx[:, 0] *= -1
+        mask = self.ignore_mask
+        # The products are kept for the backward computation as the GPU
+        # implementation does.
+        self.wx = numpy.zeros(samples.shape, x.dtype)
+        self.wx[mask] = numpy.einsum('ij,ikj->ik', x[mask], W[samples[mask]])
+        f = self.wx[mask]
+        f[:, 0] *= -1
 
         loss = numpy.zeros(len(x), x.dtype)
-        loss[self.ignore_mask] = numpy.sum(numpy.logaddexp(wx, 0), axis=1)
+        loss[mask] = numpy.sum(numpy.logaddexp(f, 0), axis=1)
 
         if self.reduce == 'sum':
             loss = numpy.array(loss.sum(), x.dtype)
@@ -148,30 +151,32 @@ class NegativeSamplingFunctionGrad(function_node.FunctionNode):
         self.retain_inputs((0, 1, 2))
         x, W, gloss = inputs
 
-        samples = self.samples
-        gx = numpy.zeros_like(x)
-        gW = numpy.zeros_like(W)
-
-        for i in numpy.arange(len(self.ignore_mask))[self.ignore_mask]:
-            ix = x[i]
-
-            k = samples[i]
-            if self.reduce == 'sum':
-                igy = gloss
-            else:
-                igy = gloss[i]
-
-            w = W[k]
-            f = w.dot(ix)
+        # All the rows of the batch are computed at once.
+        mask = self.ignore_mask
+        samples = self.samples[mask]
+        x_m = x[mask]
+        w = W[samples]
+        if self.wx is None:
+            f = numpy.einsum('ij,ikj->ik', x_m, w)
+        else:
+            f = self.wx[mask]
+        if self.reduce == 'sum':
+            gy = gloss
+        else:
+            gy = gloss[mask][:, None]
 
-            # g == -y * gloss / (1 + exp(yf))
-            f[0] *= -1
-            g = igy / (1 + numpy.exp(-f))
-            g[0] *= -1
+        # g == -y * gloss / (1 + exp(yf))
+        f[:, 0] *= -1
+        g = (gy / (1 + numpy.exp(-f))).astype(x.dtype, copy=False)
+        g[:, 0] *= -1
 
-            gx[i] = g.dot(w)
-            for ik, ig in six.moves.zip(k, g):
-                gW[ik] += ig * ix
+        gx = numpy.zeros_like(x)
+        gx[mask] = numpy.einsum('ik,ikj->ij', g, w)
+        # The rows of the samples may be duplicated, which are summed up.
+        gW = utils.IndexedRows(
+            samples.ravel(),
+            (g[:, :, None] * x_m[:, None, :]).reshape(-1, x.shape[1]),
+            W.shape).to_dense()
         return gx, None, gW
 
     def forward_gpu(self, inputs):
@@ -5,18 +5,26 @@ from multiprocessing import sharedctypes  # type: ignore
 import signal
 import sys
 import threading
+import time
 import warnings
 
 import numpy
 import six
 
+from chainer.dataset import convert
+from chainer.dataset import dataset_mixin
 from chainer.dataset import iterator
 from chainer.iterators import _statemachine
 from chainer.iterators.order_samplers import ShuffleOrderSampler
+from chainer import reporter
 
 
 _response_time = 0.1
 
+# Number of batches between the adjustments in the autotuning mode.
+_autotune_interval = 10
+_autotune_max_prefetch = 8
+
 
 def _raise_timeout_warning():
     warnings.warn(
@@ -90,6 +98,35 @@ class MultiprocessIterator(iterator.Iterator):
             can complete before it will exit and be replaced with a fresh
             worker process, to enable unused resources to be freed. If
             ``None``, worker processes will live as long as the pool.
+        columnar (bool): If ``True``, the worker processes write the elements
+            of the examples directly into arrays of the whole batch allocated
+            in shared memory, and each batch is returned as a
+            :class:`~chainer.dataset.ColumnarBatch`, so that
+            :func:`~chainer.dataset.concat_examples` does not need to copy
+            the examples. The layout of the arrays is determined by the first
+            batch; it requires that every example is an array, a tuple or a
+            dictionary of arrays (or scalars) of the same shapes and dtypes.
+            Examples that do not match the layout are returned as is in a
+            list batch. The arrays of a batch are views of the shared memory,
+            which is reused after the batches following it are retrieved;
+            copy them if they must be kept longer. ``shared_mem`` is ignored
+            in this mode. The indices of a batch are split into one chunk per
+            worker process, and the examples of each chunk are retrieved by
+            :func:`~chainer.dataset.get_examples`; the arrays of a chunk
+            returned in the columnar form are written at once.
+        autotune (bool): If ``True``, the number of worker processes and
+            the number of prefetch batches are adjusted at runtime.
+            ``n_processes`` and ``n_prefetch`` are used as the initial
+            values. Every few batches, the time the consumer waited for the
+            batches is compared to the time the workers were idle because
+            the prefetch queue was full. The pool grows if the consumer
+            waits, and shrinks if the workers are mostly idle. The number of
+            worker processes is at most the number of CPUs. The following
+            values are reported to the current :class:`~chainer.Reporter`
+            on each batch: ``iterator/wait_time`` (the time in seconds the
+            consumer waited for the batch), ``iterator/idle_time`` (the time
+            in seconds the workers were idle since the previous batch),
+            ``iterator/n_processes`` and ``iterator/n_prefetch``.
 
     """
 
@@ -104,7 +141,7 @@ class MultiprocessIterator(iterator.Iterator):
     def __init__(self, dataset, batch_size, repeat=True, shuffle=None,
                  n_processes=None, n_prefetch=1, shared_mem=None,
                  order_sampler=None, dataset_timeout=30.0,
-                 maxtasksperchild=None):
+                 maxtasksperchild=None, columnar=False, autotune=False):
         self.dataset = dataset
         self.batch_size = batch_size
         self.repeat = repeat
@@ -114,6 +151,8 @@ class MultiprocessIterator(iterator.Iterator):
         self.shared_mem = shared_mem
         self.dataset_timeout = dataset_timeout
         self._maxtasksperchild = maxtasksperchild
+        self.columnar = columnar
+        self.autotune = autotune
 
         if self.shuffle is not None:
             if order_sampler is not None:
@@ -136,7 +175,8 @@ class MultiprocessIterator(iterator.Iterator):
             self.dataset, self.batch_size, self.repeat,
             self.n_processes, self.n_prefetch, self.shared_mem,
             self._comm, self.order_sampler,
-            self._interruption_testing, self._maxtasksperchild)
+            self._interruption_testing, self._maxtasksperchild,
+            self.columnar, self.autotune)
         # defer launching prefetch thread until creating the worker pool,
         # not to leave a background thread in forked processes.
 
@@ -151,6 +191,8 @@ class MultiprocessIterator(iterator.Iterator):
 
         if not measure_mode:
             batch, state = self._comm.get()
+            if self.autotune:
+                reporter.report(self._prefetch_loop.statistics())
 
         self._previous_epoch_detail = self.epoch_detail
         self._state = state
@@ -182,7 +224,8 @@ class MultiprocessIterator(iterator.Iterator):
         other = MultiprocessIterator(
             self.dataset, self.batch_size, self.repeat, shuffle=None,
             n_processes=self.n_processes, n_prefetch=self.n_prefetch,
-            shared_mem=self.shared_mem, order_sampler=self.order_sampler)
+            shared_mem=self.shared_mem, order_sampler=self.order_sampler,
+            columnar=self.columnar, autotune=self.autotune)
 
         other._reset_state(self.current_position, self.epoch,
                            self.is_new_epoch, self._state.order)
@@ -279,6 +322,14 @@ class _Communicator(object):
         self._status = _Communicator.STATUS_CONTINUE
         self._reset_count = 0
 
+        # Statistics for the autotuning mode, in seconds. The idle time of
+        # the workers is accumulated separately for the reports and for the
+        # adjustments.
+        self.last_wait_time = 0.
+        self._wait_time = 0.
+        self._idle_time = 0.
+        self._report_idle_time = 0.
+
     @property
     def is_terminated(self):
         with self._lock:
@@ -295,10 +346,20 @@ class _Communicator(object):
                         and dt > datetime.timedelta(
                             seconds=self.dataset_timeout)):
                     _raise_timeout_warning()
+            wait_time = (datetime.datetime.now() - start).total_seconds()
+            self.last_wait_time = wait_time
+            self._wait_time += wait_time
             batch, prefetch_state = self._batch_queue.pop(0)
             self._not_full_cond.notify()
             return batch, prefetch_state
 
+    # called from iterator
+    def pop_report_idle_time(self):
+        with self._lock:
+            idle_time = self._report_idle_time
+            self._report_idle_time = 0.
+            return idle_time
+
     # called from iterator
     def reset(self, prefetch_state):
         with self._lock:
@@ -329,12 +390,32 @@ class _Communicator(object):
     # called from thread
     def put(self, batch, prefetch_state, reset_count):
         with self._lock:
-            if len(self._batch_queue) == self.n_prefetch:
+            if len(self._batch_queue) >= self.n_prefetch:
+                start = time.time()
                 self._not_full_cond.wait()
+                idle_time = time.time() - start
+                self._idle_time += idle_time
+                self._report_idle_time += idle_time
             if reset_count == self._reset_count:
                 self._batch_queue.append((batch, prefetch_state))
                 self._not_empty_cond.notify()
 
+    # called from thread
+    def pop_tuning_statistics(self):
+        # Returns the wait time of the consumer and the idle time of the
+        # workers since the previous call.
+        with self._lock:
+            wait_time, idle_time = self._wait_time, self._idle_time
+            self._wait_time = 0.
+            self._idle_time = 0.
+            return wait_time, idle_time
+
+    # called from thread
+    def set_n_prefetch(self, n_prefetch):
+        with self._lock:
+            self.n_prefetch = n_prefetch
+            self._not_full_cond.notify()
+
 
 class _PrefetchLoop(object):
 
@@ -345,7 +426,8 @@ class _PrefetchLoop(object):
     def __init__(self, dataset, batch_size, repeat,
                  n_processes, n_prefetch, mem_size, comm,
                  order_sampler,
-                 _interruption_testing, maxtasksperchild):
+                 _interruption_testing, maxtasksperchild, columnar=False,
+                 autotune=False):
         self.dataset = dataset
         self.batch_size = batch_size
         self.repeat = repeat
@@ -354,6 +436,22 @@ class _PrefetchLoop(object):
         self._comm = comm
         self.order_sampler = order_sampler
         self.maxtasksperchild = maxtasksperchild
+        self.columnar = columnar
+        self.autotune = autotune
+        if autotune:
+            self._max_processes = max(
+                n_processes, multiprocessing.cpu_count())
+            self._max_prefetch = max(n_prefetch, _autotune_max_prefetch)
+        else:
+            self._max_processes = n_processes
+            self._max_prefetch = n_prefetch
+        self._autotune_count = 0
+        self._autotune_start = None
+        # Layout of the columnar batches, which is determined by the first
+        # batch, and the arrays of the batches in the shared memory.
+        self._layout = None
+        self._slot_arrays = None
+        self._next_slot = 0
 
         self._allocate_shared_memory()
 
@@ -378,6 +476,8 @@ class _PrefetchLoop(object):
         return self._thread
 
     def measure_required(self):
+        if self.columnar:
+            return self._layout is None
         return self.mem_size is None
 
     def measure(self, dataset_timeout):
@@ -396,7 +496,11 @@ class _PrefetchLoop(object):
             batch_ret = [None]
 
             def fetch_batch():
-                batch_ret[0] = [self.dataset[idx] for idx in indices]
+                if self.columnar:
+                    batch_ret[0] = dataset_mixin.get_examples(
+                        self.dataset, indices)
+                else:
+                    batch_ret[0] = [self.dataset[idx] for idx in indices]
 
             if dataset_timeout is None:
                 # Timeout is not set: fetch synchronously
@@ -412,24 +516,59 @@ class _PrefetchLoop(object):
                 thr.join()
 
             batch = batch_ret[0]
-            self.mem_size = max(map(_measure, batch))
+            if self.columnar:
+                self._layout = _ColumnarLayout.create(batch, self.batch_size)
+                if self._layout is None:
+                    warnings.warn(
+                        'The examples cannot be stored in columnar batches. '
+                        'Falling back to list batches.', UserWarning)
+                    self.columnar = False
+                    batch = list(batch)
+            if not self.columnar and self.mem_size is None:
+                self.mem_size = max(map(_measure, batch))
             self._allocate_shared_memory()
+            if self.columnar:
+                # Return the first batch in the same form as the following
+                # ones.
+                slot = self._next_slot
+                self._next_slot = slot + 1
+                if not self._layout.write_batch(
+                        batch, self.mem_bulk, slot, 0):
+                    for i, example in enumerate(batch):
+                        self._layout.write(example, self.mem_bulk, slot, i)
+                batch = self._layout.make_batch(
+                    self._slot_arrays[slot], [None] * len(batch))
 
         return batch, self.prefetch_state
 
     def _allocate_shared_memory(self):
         if self.measure_required():
             self.mem_bulk = None
+        elif self.columnar:
+            # A batch held by the user, the batches in the queue and the batch
+            # being written by the workers must not share a slot.
+            layout = self._layout
+            n_slots = self._max_prefetch + 2
+            self.mem_bulk = sharedctypes.RawArray(
+                'b', n_slots * layout.slot_nbytes)
+            self._slot_arrays = [
+                layout.arrays(self.mem_bulk, slot)
+                for slot in six.moves.range(n_slots)]
+            self._next_slot = 0
         else:
             self.mem_bulk = \
                 sharedctypes.RawArray('b', self.batch_size * self.mem_size)
 
-    def launch_thread(self):
-        self._pool = multiprocessing.Pool(
+    def _create_pool(self):
+        return multiprocessing.Pool(
             processes=self.n_processes,
             initializer=_fetch_setup,
-            initargs=(self.dataset, self.mem_size, self.mem_bulk),
+            initargs=(self.dataset, self.mem_size, self.mem_bulk,
+                      self._layout if self.columnar else None),
             maxtasksperchild=self.maxtasksperchild)
+
+    def launch_thread(self):
+        self._pool = self._create_pool()
         if self._interruption_testing:
             pids = self._pool.map(_report_pid, range(self.n_processes))
             print(' '.join(map(str, pids)))
@@ -470,7 +609,18 @@ class _PrefetchLoop(object):
         if indices is None:  # stop iteration
             batch = None
         else:
-            future = self._pool.map_async(_fetch_run, enumerate(indices))
+            if self.columnar:
+                slot = self._next_slot
+                self._next_slot = (slot + 1) % len(self._slot_arrays)
+                chunks = numpy.array_split(
+                    indices, min(self.n_processes, len(indices)))
+                starts = numpy.cumsum([0] + [len(c) for c in chunks[:-1]])
+                future = self._pool.map_async(
+                    _fetch_run_columnar,
+                    [(slot, int(start), chunk)
+                     for start, chunk in six.moves.zip(starts, chunks)])
+            else:
+                future = self._pool.map_async(_fetch_run, enumerate(indices))
             while True:
                 try:
                     data_all = future.get(_response_time)
@@ -479,11 +629,71 @@ class _PrefetchLoop(object):
                         return False
                 else:
                     break
-            batch = [_unpack(data, self.mem_bulk) for data in data_all]
+            if self.columnar:
+                data_all = [data for chunk in data_all for data in chunk]
+                batch = self._layout.make_batch(
+                    self._slot_arrays[slot], data_all)
+            else:
+                batch = [_unpack(data, self.mem_bulk) for data in data_all]
 
         self._comm.put(batch, self.prefetch_state, reset_count)
+        if self.autotune:
+            self._tune()
         return True
 
+    def statistics(self):
+        return {
+            'iterator/wait_time': self._comm.last_wait_time,
+            'iterator/idle_time': self._comm.pop_report_idle_time(),
+            'iterator/n_processes': self.n_processes,
+            'iterator/n_prefetch': self._comm.n_prefetch,
+        }
+
+    def _tune(self):
+        # Adjusts the number of processes and prefetch batches every
+        # `_autotune_interval` batches based on the time the consumer waited
+        # for the batches and the time the workers were idle.
+        now = time.time()
+        if self._autotune_start is None:
+            self._autotune_start = now
+            self._comm.pop_tuning_statistics()
+            return
+        self._autotune_count += 1
+        if self._autotune_count < _autotune_interval:
+            return
+        elapsed = now - self._autotune_start
+        wait_time, idle_time = self._comm.pop_tuning_statistics()
+        self._autotune_count = 0
+        self._autotune_start = now
+
+        n_processes = self.n_processes
+        n_prefetch = self._comm.n_prefetch
+        if wait_time > 0.1 * elapsed:
+            # The workers cannot keep up with the consumer.
+            if n_processes < self._max_processes:
+                n_processes += 1
+            elif n_prefetch < self._max_prefetch:
+                n_prefetch += 1
+        elif wait_time > 0.01 * elapsed:
+            # The throughput is enough, but the batches are sometimes late.
+            if n_prefetch < self._max_prefetch:
+                n_prefetch += 1
+        elif idle_time > 0.5 * elapsed:
+            # The workers are mostly idle.
+            if n_processes > 1:
+                n_processes -= 1
+            elif n_prefetch > 1:
+                n_prefetch -= 1
+
+        if n_prefetch != self._comm.n_prefetch:
+            self._comm.set_n_prefetch(n_prefetch)
+        if n_processes != self.n_processes:
+            self.n_processes = n_processes
+            # The workers are idle here since no task is running.
+            self._pool.close()
+            self._pool.join()
+            self._pool = self._create_pool()
+
 
 # Using `parameterized` function (e.g. bound method) with Pool is tricky due to
 # restrictions imposed by Pickle. Picklable types differ across versions.
@@ -494,14 +704,16 @@ class _PrefetchLoop(object):
 _fetch_dataset = None
 _fetch_mem_size = None
 _fetch_mem_bulk = None
+_fetch_layout = None
 
 
-def _fetch_setup(dataset, mem_size, mem_bulk):
-    global _fetch_dataset, _fetch_mem_size, _fetch_mem_bulk
+def _fetch_setup(dataset, mem_size, mem_bulk, layout=None):
+    global _fetch_dataset, _fetch_mem_size, _fetch_mem_bulk, _fetch_layout
     signal.signal(signal.SIGINT, signal.SIG_IGN)
     _fetch_dataset = dataset
     _fetch_mem_size = mem_size
     _fetch_mem_bulk = mem_bulk
+    _fetch_layout = layout
 
 
 def _fetch_run(inputs):
@@ -514,6 +726,21 @@ def _fetch_run(inputs):
     return data
 
 
+def _fetch_run_columnar(inputs):
+    # Retrieves a chunk of a batch and writes it from the ``start``-th row.
+    slot, start, indices = inputs
+    batch = dataset_mixin.get_examples(_fetch_dataset, indices)
+    if _fetch_layout.write_batch(batch, _fetch_mem_bulk, slot, start):
+        return [None] * len(indices)
+    ret = []
+    for i, data in enumerate(batch):
+        if _fetch_layout.write(data, _fetch_mem_bulk, slot, start + i):
+            data = None
+        # The example does not match the layout; send it through the pipe.
+        ret.append(data)
+    return ret
+
+
 def _report_pid(_):  # for testing
     return multiprocessing.current_process().pid
 
@@ -615,3 +842,179 @@ def _unpack(data, mem):
     elif t is _PackedNdarray:
         data = data.unpack(mem)
     return data
+
+
+class _ColumnarLayout(object):
+
+    """Layout of the arrays of columnar batches in shared memory.
+
+    The shared memory is split into slots, each of which holds the arrays of
+    a whole batch. Each array has the shape ``(batch_size,) + shape`` of an
+    element of the examples.
+
+    """
+
+    _alignment = 64
+
+    def __init__(self, kind, keys, fields, batch_size):
+        # kind: 'tuple', 'dict' or 'array'
+        # keys: keys of the dictionary examples
+        # fields: pairs of the shape and the dtype of the elements
+        self.kind = kind
+        self.keys = keys
+        self.batch_size = batch_size
+        self.fields = []
+        offset = 0
+        for shape, dtype in fields:
+            self.fields.append((shape, dtype, offset))
+            nbytes = batch_size * dtype.itemsize * _prod(shape)
+            offset += -(-nbytes // self._alignment) * self._alignment
+        self.slot_nbytes = offset
+
+    @staticmethod
+    def create(batch, batch_size):
+        # Returns None if the examples cannot be stored in the layout.
+        if isinstance(batch, convert.ColumnarBatch):
+            return _ColumnarLayout._create_columnar(batch, batch_size)
+        first = batch[0]
+        if type(first) is tuple:
+            kind, keys = 'tuple', None
+        elif type(first) is dict:
+            kind, keys = 'dict', sorted(first)
+        else:
+            kind, keys = 'array', None
+
+        fields = None
+        for example in batch:
+            values = _ColumnarLayout._values(example, kind, keys)
+            if values is None:
+                return None
+            values = [numpy.asarray(value) for value in values]
+            if any([value.dtype.kind not in 'biufc' for value in values]):
+                return None
+            example_fields = [(value.shape, value.dtype) for value in values]
+            if fields is None:
+                fields = example_fields
+            elif fields != example_fields:
+                return None
+        if not fields:
+            return None
+        return _ColumnarLayout(kind, keys, fields, batch_size)
+
+    @staticmethod
+    def _create_columnar(batch, batch_size):
+        arrays = batch.arrays
+        if type(arrays) is tuple:
+            kind, keys = 'tuple', None
+        elif type(arrays) is dict:
+            kind, keys = 'dict', sorted(arrays)
+        else:
+            kind, keys = 'array', None
+        values = _ColumnarLayout._values(arrays, kind, keys)
+        if not values:
+            return None
+        values = [numpy.asarray(value) for value in values]
+        if any([value.ndim == 0 or value.dtype.kind not in 'biufc'
+                for value in values]):
+            return None
+        fields = [(value.shape[1:], value.dtype) for value in values]
+        return _ColumnarLayout(kind, keys, fields, batch_size)
+
+    @staticmethod
+    def _values(example, kind, keys):
+        if kind == 'tuple':
+            if type(example) is not tuple:
+                return None
+            return example
+        elif kind == 'dict':
+            if type(example) is not dict or sorted(example) != keys:
+                return None
+            return [example[key] for key in keys]
+        else:
+            if type(example) is tuple or type(example) is dict:
+                return None
+            return example,
+
+    def arrays(self, mem, slot):
+        base = slot * self.slot_nbytes
+        return [
+            numpy.frombuffer(
+                mem, dtype, self.batch_size * _prod(shape), base + offset
+            ).reshape((self.batch_size,) + shape)
+            for shape, dtype, offset in self.fields]
+
+    def write(self, example, mem, slot, i):
+        # Writes an example to the i-th row of the arrays in a slot.
+        # Returns False without writing anything if the example does not
+        # match the layout.
+        values = self._values(example, self.kind, self.keys)
+        if values is None or len(values) != len(self.fields):
+            return False
+        values = [numpy.asarray(value) for value in values]
+        for value, (shape, dtype, _) in six.moves.zip(values, self.fields):
+            if value.shape != shape or value.dtype != dtype:
+                return False
+
+        base = slot * self.slot_nbytes
+        for value, (shape, dtype, offset) in six.moves.zip(
+                values, self.fields):
+            size = value.size
+            target = numpy.frombuffer(
+                mem, dtype, size, base + offset + i * size * dtype.itemsize)
+            target[...] = value.ravel()
+        return True
+
+    def write_batch(self, batch, mem, slot, start):
+        # Writes the arrays of a columnar batch to the rows of the arrays in a
+        # slot from the ``start``-th row. Returns False without writing
+        # anything if the batch is not columnar or does not match the layout.
+        if not isinstance(batch, convert.ColumnarBatch):
+            return False
+        values = self._values(batch.arrays, self.kind, self.keys)
+        if values is None or len(values) != len(self.fields):
+            return False
+        n = len(batch)
+        values = [numpy.asarray(value) for value in values]
+        for value, (shape, dtype, _) in six.moves.zip(values, self.fields):
+            if value.shape != (n,) + shape or value.dtype != dtype:
+                return False
+
+        base = slot * self.slot_nbytes
+        for value, (shape, dtype, offset) in six.moves.zip(
+                values, self.fields):
+            size = _prod(shape)
+            target = numpy.frombuffer(
+                mem, dtype, n * size,
+                base + offset + start * size * dtype.itemsize)
+            target.reshape(value.shape)[...] = value
+        return True
+
+    def make_batch(self, arrays, data_all):
+        n = len(data_all)
+        arrays = [array[:n] for array in arrays]
+        if any([data is not None for data in data_all]):
+            # Some examples did not match the layout; fall back to a list of
+            # examples, copying the ones written to the shared memory.
+            batch = []
+            for i, data in enumerate(data_all):
+                if data is None:
+                    values = [array[i].copy() for array in arrays]
+                    data = self._example(values)
+                batch.append(data)
+            return batch
+        return convert.ColumnarBatch(self._example(arrays))
+
+    def _example(self, values):
+        if self.kind == 'tuple':
+            return tuple(values)
+        elif self.kind == 'dict':
+            return dict(six.moves.zip(self.keys, values))
+        else:
+            return values[0]
+
+
+def _prod(shape):
+    size = 1
+    for dim in shape:
+        size *= dim
+    return size
@@ -24,6 +24,11 @@ class SerialIterator(iterator.Iterator):
     This iterator saves ``-1`` instead of ``None`` in snapshots since some
     serializers do not support ``None``.
 
+    If the dataset implements ``get_examples`` (see
+    :meth:`chainer.dataset.DatasetMixin.get_examples`), the examples of each
+    batch are retrieved by it at once, and the batch may be a
+    :class:`~chainer.dataset.ColumnarBatch`.
+
     Args:
         dataset: Dataset to iterate.
         batch_size (int): Number of examples within each batch.
@@ -74,7 +79,12 @@ class SerialIterator(iterator.Iterator):
         if indices is None:
             raise StopIteration
 
-        batch = [self.dataset[index] for index in indices]
+        get_examples = getattr(self.dataset, 'get_examples', None)
+        if get_examples is not None:
+            # The dataset may return the batch in the columnar form.
+            batch = get_examples(indices)
+        else:
+            batch = [self.dataset[index] for index in indices]
         return batch
 
     next = __next__
@@ -8,6 +8,7 @@ import numpy
 import six
 
 import chainer
+from chainer import _checkpointing
 from chainer import backend
 from chainer.backends import cuda
 from chainer.backends import intel64
@@ -1173,6 +1174,8 @@ class ChainList(Link, collections_abc.MutableSequence):
 
     """
 
+    _checkpoint_schedule = None  # type: tp.Optional[_checkpointing.CheckpointSchedule] # NOQA
+
     def __init__(self, *links):
         # type: (*Link) -> None
 
@@ -1264,6 +1267,88 @@ class ChainList(Link, collections_abc.MutableSequence):
         """
         self.append(link)
 
+    def set_checkpointing(self, every=None, memory_budget=None):
+        # type: (tp.Optional[int], tp.Optional[int]) -> None
+        """Sets the checkpointing schedule of the sequential forward pass.
+
+        With checkpointing, the layers are split into segments, and only the
+        outputs of the segments are retained in the computational graph. The
+        intermediate results inside each segment are discarded in the forward
+        pass and recomputed during backprop (see
+        :func:`~chainer.functions.forget`), which reduces the memory
+        consumption for activations at the cost of extra forward computation.
+
+        The schedule is used by :meth:`call_sequentially` and by
+        :meth:`Sequential.forward() <chainer.Sequential.forward>`. Calling this
+        method without arguments disables checkpointing.
+
+        .. note::
+
+            Layers which behave differently in multiple calls with the same
+            inputs (e.g. :func:`~chainer.functions.dropout`) must not be
+            included in the segments.
+
+        Args:
+            every (int): Number of layers in each segment.
+            memory_budget (int): Maximum total size in bytes of the outputs of
+                the layers inside each segment. The sizes are measured by the
+                first forward computation, which is done without
+                checkpointing.
+
+        """
+        if every is None and memory_budget is None:
+            self._checkpoint_schedule = None
+        else:
+            self._checkpoint_schedule = _checkpointing.CheckpointSchedule(
+                every, memory_budget)
+
+    def checkpointing_report(self):
+        # type: () -> tp.Optional[tp.Dict[str, float]]
+        """Reports the activation memory saved by checkpointing.
+
+        Returns:
+            dict: Estimates based on the last forward computation, or ``None``
+            if checkpointing is disabled or no forward computation has been
+            done yet. It contains the total size of the outputs of the layers
+            (``activation_bytes``), the size of those retained in the graph
+            (``retained_bytes``), their difference (``saved_bytes``) and the
+            ratio of the forward computation time of the recomputed layers to
+            that of all the layers (``recompute_ratio``).
+
+        """
+        if self._checkpoint_schedule is None:
+            return None
+        return self._checkpoint_schedule.report()
+
+    def call_sequentially(self, *x):
+        # type: (*tp.Any) -> tp.Any
+        """Calls the child links sequentially.
+
+        The input variables are given to the first child link, and the outputs
+        of each child link are given to the next one, following the
+        checkpointing schedule set by :meth:`set_checkpointing` if any.
+
+        Args:
+            x: Input variables.
+
+        Returns:
+            The outputs of the last child link.
+
+        """
+        return self._call_layers(self._children, x)
+
+    def _call_layers(self, layers, x):
+        if len(x) == 1:
+            x = x[0]
+        if self._checkpoint_schedule is not None:
+            return self._checkpoint_schedule.forward(layers, x)
+        for layer in layers:
+            if isinstance(x, tuple):
+                x = layer(*x)
+            else:
+                x = layer(x)
+        return x
+
     def copy(self, mode='share'):
         # type: (str) -> 'ChainList'
         """Returns a deep copy of the chainlist."""
@@ -28,6 +28,31 @@ class TreeParser(object):
     def get_codes(self):
         return self.codes
 
+    def get_padded_paths(self, n_leaves):
+        """Returns the paths and the codes of the leaves padded to a matrix.
+
+        Args:
+            n_leaves (int): Number of leaves. The leaves not in the tree
+                have empty paths.
+
+        Returns:
+            tuple: The paths and the codes of shape ``(n_leaves, max_depth)``,
+            and the mask of the same shape which is ``True`` at the nodes on
+            the paths. The padded entries of the paths and the codes are
+            zeros.
+
+        """
+        depth = max([len(path) for path in six.itervalues(self.paths)])
+        paths = numpy.zeros((n_leaves, depth), dtype=numpy.int32)
+        codes = numpy.zeros((n_leaves, depth), dtype=self.dtype)
+        mask = numpy.zeros((n_leaves, depth), dtype=bool)
+        for leaf, path in six.iteritems(self.paths):
+            length = len(path)
+            paths[leaf, :length] = path
+            codes[leaf, :length] = self.codes[leaf]
+            mask[leaf, :length] = True
+        return paths, codes, mask
+
     def parse(self, tree):
         self.next_id = 0
         self.path = []
@@ -97,6 +122,10 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
             length = len(paths[i]) if i in paths else 0
             begins[i + 1] = begins[i] + length
         self.begins = begins
+        # Paths padded to the maximum depth, with which the computation on
+        # CPU is batched.
+        self.padded_paths, self.padded_codes, self.padded_mask = \
+            parser.get_padded_paths(n_vocab)
 
         self.parser_size = parser.size()
 
@@ -130,41 +159,30 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
     def forward_cpu(self, inputs):
         x, t, W = inputs
 
-        loss = x.dtype.type(0.0)
-        for ix, it in six.moves.zip(x, t):
-            loss += self._forward_cpu_one(ix, it, W)
-        return numpy.array(loss),
-
-    def _forward_cpu_one(self, x, t, W):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
-
-        w = W[self.paths[begin:end]]
-        wxy = w.dot(x) * self.codes[begin:end]
+        # Weights of the nodes on the paths: (batch, max_depth, n_in)
+        w = W[self.padded_paths[t]]
+        codes = self.padded_codes[t].astype(x.dtype, copy=False)
+        wxy = numpy.matmul(w, x[:, :, None])[:, :, 0] * codes
         loss = numpy.logaddexp(0.0, -wxy)  # == log(1 + exp(-wxy))
-        return numpy.sum(loss)
+        loss = loss[self.padded_mask[t]].sum()
+        self.wxy = wxy
+        return numpy.array(loss, dtype=x.dtype),
 
     def backward_cpu(self, inputs, grad_outputs):
         x, t, W = inputs
         gloss, = grad_outputs
-        gx = numpy.empty_like(x)
-        gW = numpy.zeros_like(W)
-        for i, (ix, it) in enumerate(six.moves.zip(x, t)):
-            gx[i] = self._backward_cpu_one(ix, it, W, gloss, gW)
-        return gx, None, gW
 
-    def _backward_cpu_one(self, x, t, W, gloss, gW):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
-
-        path = self.paths[begin:end]
-        w = W[path]
-        wxy = w.dot(x) * self.codes[begin:end]
-        g = -gloss * self.codes[begin:end] / (1.0 + numpy.exp(wxy))
-        gx = g.dot(w)
-        gw = g.reshape((g.shape[0], 1)).dot(x.reshape(1, x.shape[0]))
-        gW[path] += gw
-        return gx
+        paths = self.padded_paths[t]
+        mask = self.padded_mask[t]
+        w = W[paths]
+        codes = self.padded_codes[t].astype(x.dtype, copy=False)
+        g = -gloss * codes / (1.0 + numpy.exp(self.wxy))
+        g *= mask
+        gx = numpy.einsum('bd,bdi->bi', g, w).astype(x.dtype, copy=False)
+        # The gradients of the same node are summed up without ufunc.at.
+        gw = g[mask][:, None] * x[numpy.nonzero(mask)[0]]
+        gW = utils.IndexedRows(paths[mask], gw, W.shape).to_dense()
+        return gx, None, gW.astype(W.dtype, copy=False)
 
     def forward_gpu(self, inputs):
         x, t, W = inputs
@@ -24,10 +24,16 @@ class NegativeSampling(link.Link):
         power (float): Power factor :math:`\\alpha`.
         dtype (numpy.dtype): Type to use in computing.
 
+    On CPU, the negative samples can be drawn in a background thread while
+    the other computation runs, by calling
+    :meth:`chainer.utils.WalkerAlias.use_prefetch` of :attr:`sampler`.
+
     .. seealso:: :func:`~chainer.functions.negative_sampling` for more detail.
 
     Attributes:
         W (~chainer.Variable): Weight parameter matrix.
+        sampler (~chainer.utils.WalkerAlias): Sampler of the negative
+            examples.
 
     """
 
@@ -1,5 +1,6 @@
 import collections
 import copy
+import itertools
 import warnings
 
 import numpy
@@ -7,6 +8,7 @@ import six
 
 import chainer
 from chainer import backend
+from chainer.backends import cuda
 from chainer import link as link_module
 from chainer import optimizer_hooks
 from chainer import serializer as serializer_module
@@ -111,6 +113,18 @@ class UpdateRule(object):
 
     """
 
+    # If ``True``, :meth:`update_core_cpu` only updates the parameter array and
+    # the state arrays in-place with elementwise operations, so that it can be
+    # applied at once to flat buffers packing many parameters. See
+    # :meth:`GradientMethod.use_fused_update`.
+    _fusable = False
+
+    # If ``True``, :meth:`update_core_sparse` is implemented, and the
+    # parameters with sparse gradients (see
+    # :attr:`~chainer.Parameter.sparse_grad`) are updated lazily, i.e. only the
+    # rows in the gradient are updated.
+    _supports_sparse_grad = False
+
     def __init__(self, parent_hyperparam=None):
         self._pre_update_hooks = collections.OrderedDict()
         self._post_update_hooks = collections.OrderedDict()
@@ -190,6 +204,13 @@ class UpdateRule(object):
 
         self.t += 1
 
+        sparse_grad = getattr(param, 'sparse_grad', None)
+        if sparse_grad is not None:
+            if self._updates_sparse(param):
+                param.sparse_grad = sparse_grad.coalesce()
+            else:
+                param._densify_grad()
+
         if self._use_fp32_update and param.dtype == numpy.float16:
             if self._fp32_param is None:
                 self._fp32_param = variable.Variable(
@@ -214,7 +235,11 @@ class UpdateRule(object):
             if param.data is not None:
                 self._prepare(param)
             if param._loss_scale is not None:
-                param.grad /= param._loss_scale
+                sparse_grad = getattr(param, 'sparse_grad', None)
+                if sparse_grad is None:
+                    param.grad /= param._loss_scale
+                else:
+                    sparse_grad.values /= param._loss_scale
             for hook in six.itervalues(self._pre_update_hooks):
                 hook(self, param)
             self.update_core(param)
@@ -233,7 +258,9 @@ class UpdateRule(object):
         """
         device = param.device
         with chainer.using_device(device):
-            if device.xp is chainerx:
+            if getattr(param, 'sparse_grad', None) is not None:
+                self.update_core_sparse(param)
+            elif device.xp is chainerx:
                 self.update_core_chainerx(param)
             elif device.xp is numpy:
                 self.update_core_cpu(param)
@@ -262,6 +289,39 @@ class UpdateRule(object):
         """
         raise NotImplementedError
 
+    def update_core_sparse(self, param):
+        """Updates the rows of the parameter in its sparse gradient.
+
+        It is called instead of the other variants of :meth:`update_core`
+        for the parameters whose gradient is given by
+        :attr:`~chainer.Parameter.sparse_grad`, if the update rule supports
+        it. The sparse gradient is coalesced in advance, so that the row
+        indices are unique. Only the rows of the parameter and of the state
+        arrays at these indices should be updated (a.k.a. lazy update).
+
+        Args:
+            param (~chainer.Parameter): Parameter to be updated.
+
+        """
+        raise NotImplementedError
+
+    def _updates_sparse(self, param):
+        # Tells whether the sparse gradient of the parameter is used as is.
+        # Otherwise, it is merged into the dense gradient before the update.
+        if not (self._supports_sparse_grad and param.grad is None):
+            return False
+        if self._use_fp32_update and param.dtype == numpy.float16:
+            return False
+        array = param.array
+        if not (type(array) is numpy.ndarray
+                or isinstance(array, cuda.ndarray)):
+            return False
+        for hook in itertools.chain(six.itervalues(self._pre_update_hooks),
+                                    six.itervalues(self._post_update_hooks)):
+            if not getattr(hook, 'supports_sparse_grad', False):
+                return False
+        return True
+
     def update_core_chainerx(self, param):
         """Updates the ChainerX parameter.
 
@@ -456,6 +516,7 @@ class Optimizer(object):
     _pre_update_hooks = None
     _post_update_hooks = None
     _loss_scale = None
+    _grad_buckets = None
     use_auto_new_epoch = False
 
     def setup(self, link):
@@ -484,6 +545,7 @@ class Optimizer(object):
         self.epoch = 0
         self._pre_update_hooks = collections.OrderedDict()
         self._post_update_hooks = collections.OrderedDict()
+        self._grad_buckets = None
         return self
 
     def update(self, lossfun=None, *args, **kwds):
@@ -623,6 +685,10 @@ class Optimizer(object):
             self._call_hook(hook)
 
     def _call_hook(self, hook):
+        if not getattr(hook, 'supports_sparse_grad', False):
+            # The hook only knows the dense gradients.
+            for param in self.target.params():
+                param._densify_grad()
         if getattr(hook, 'call_for_each_param', False):
             for param in self.target.params():
                 hook(param.update_rule, param)
@@ -657,6 +723,117 @@ class Optimizer(object):
         self._loss_scale = loss_scale
 
 
+class _FusedBuffer(object):
+
+    """Flat buffers packing the parameters updated by a fused update.
+
+    The data array and the state arrays of each parameter are replaced with
+    views into the flat buffers, so that the parameters and the update rules
+    remain usable independently (e.g. by serializers). The gradients are
+    copied into the flat gradient buffer on each update.
+
+    """
+
+    def __init__(self, params):
+        self.params = params
+        dtype = params[0].dtype
+        sizes = [param.size for param in params]
+        self.offsets = numpy.cumsum([0] + sizes).tolist()
+        total = self.offsets[-1]
+
+        self.data = numpy.empty(total, dtype=dtype)
+        self.grad = numpy.empty(total, dtype=dtype)
+        state_names = sorted(params[0].update_rule.state.keys())
+        rule_state = params[0].update_rule.state
+        self.state = {
+            name: numpy.empty(total, dtype=rule_state[name].dtype)
+            for name in state_names}
+
+        self.data_views = []
+        self.state_views = []
+        for param, begin, end in six.moves.zip(
+                params, self.offsets[:-1], self.offsets[1:]):
+            view = self.data[begin:end].reshape(param.shape)
+            view[...] = param.array
+            param.array = view
+            self.data_views.append(view)
+
+            rule_state = param.update_rule.state
+            views = {}
+            for name in state_names:
+                view = self.state[name][begin:end].reshape(param.shape)
+                view[...] = rule_state[name]
+                rule_state[name] = view
+                views[name] = view
+            self.state_views.append(views)
+
+        self.param = variable.Variable._init_unchecked(
+            self.data, is_chainerx_array=False)
+        self.param._set_grad_without_check(self.grad)
+
+    @staticmethod
+    def is_compatible(params):
+        state = params[0].update_rule.state
+        names = set(state.keys())
+        for param in params:
+            rule_state = param.update_rule.state
+            if set(rule_state.keys()) != names:
+                return False
+            for name, st in six.iteritems(rule_state):
+                if (type(st) is not numpy.ndarray
+                        or st.shape != param.shape
+                        or st.dtype != state[name].dtype):
+                    return False
+        return True
+
+    def is_valid_for(self, params):
+        if len(params) != len(self.params):
+            return False
+        for param, own, data_view, state_views in six.moves.zip(
+                params, self.params, self.data_views, self.state_views):
+            if param is not own or param.array is not data_view:
+                return False
+            rule_state = param.update_rule.state
+            if len(rule_state) != len(state_views):
+                return False
+            for name, view in six.iteritems(state_views):
+                if rule_state.get(name) is not view:
+                    return False
+        return True
+
+    def update(self):
+        grad = self.grad
+        for param, begin, end in six.moves.zip(
+                self.params, self.offsets[:-1], self.offsets[1:]):
+            grad[begin:end] = param.grad.ravel()
+            param.update_rule.t += 1
+
+        # The first update rule performs the update of all the parameters by
+        # temporarily replacing its state with the flat state buffers.
+        rule = self.params[0].update_rule
+        state = rule._state
+        rule._state = self.state
+        try:
+            rule.update_core(self.param)
+        finally:
+            rule._state = state
+
+
+def _is_fusable(param):
+    rule = param.update_rule
+    return (
+        type(rule)._fusable
+        and rule.enabled
+        and not rule._pre_update_hooks
+        and not rule._post_update_hooks
+        and not (rule._use_fp32_update and param.dtype == numpy.float16)
+        # Rules overriding hyperparameters of the optimizer are not fused.
+        and len(rule.hyperparam.__dict__) == 1
+        and type(param.array) is numpy.ndarray
+        and type(param.grad) is numpy.ndarray
+        and param._loss_scale is None)
+
+
 class GradientMethod(Optimizer):
     """Base class of all single gradient-based optimizers.
 
@@ -688,6 +865,8 @@ class GradientMethod(Optimizer):
         super(GradientMethod, self).__init__()
         self.hyperparam = Hyperparameter()
         self._use_fp32_update = False
+        self._use_fused_update = False
+        self._fused_buffers = {}
 
     def setup(self, link):
         super(GradientMethod, self).setup(link)
@@ -707,7 +886,7 @@ class GradientMethod(Optimizer):
 
         """
         for name, param in self.target.namedparams(False):
-            if param.grad is None:
+            if param.grad is None and param.sparse_grad is None:
                 device = param.device
                 with chainer.using_device(device):
                     param.grad = device.xp.zeros_like(param.data)
@@ -754,8 +933,11 @@ class GradientMethod(Optimizer):
         self.call_hooks('pre')
 
         self.t += 1
-        for param in self.target.params():
-            param.update()
+        if self._use_fused_update:
+            self._fused_update()
+        else:
+            for param in self.target.params():
+                param.update()
 
         self.reallocate_cleared_grads()
 
@@ -805,6 +987,63 @@ class GradientMethod(Optimizer):
             for param in link.params():
                 param.update_rule.use_fp32_update()
 
+    def use_fused_update(self, flag=True):
+        """Enables fused parameter updates on CPU.
+
+        When it is enabled, the parameters that share the same update rule
+        type, data type, update count and hyperparameter are packed into
+        contiguous flat buffers, and each group of them is updated by one
+        vectorized call of :meth:`UpdateRule.update_core` instead of one call
+        per parameter. The data array of each parameter and the arrays in the
+        state of its update rule are replaced with views into the flat
+        buffers, so they can still be accessed (and serialized) for each
+        parameter.
+
+        Only the update rules that support it (e.g. those of
+        :class:`~chainer.optimizers.SGD`,
+        :class:`~chainer.optimizers.MomentumSGD`,
+        :class:`~chainer.optimizers.Adam` and
+        :class:`~chainer.optimizers.RMSprop`) are fused, and only for
+        parameters on the NumPy (CPU) backend. The other parameters, as well as
+        those whose update rules have their own hooks or hyperparameter values,
+        are updated one by one as usual.
+
+        Args:
+            flag (bool): If ``True``, the fused update is enabled.
+
+        """
+        self._use_fused_update = flag
+        self._fused_buffers = {}
+
+    def _fused_update(self):
+        groups = collections.OrderedDict()
+        for param in self.target.params():
+            rule = param.update_rule
+            if rule is None or param.array is None:
+                continue
+            if not _is_fusable(param):
+                param.update()
+                continue
+            if rule.state is None:
+                rule._prepare(param)
+            key = (type(rule), param.dtype, rule.t,
+                   id(rule.hyperparam.parent))
+            groups.setdefault(key, []).append(param)
+
+        buffers = {}
+        for params in six.itervalues(groups):
+            key = tuple([id(param) for param in params])
+            fused = self._fused_buffers.get(key)
+            if fused is None or not fused.is_valid_for(params):
+                if not _FusedBuffer.is_compatible(params):
+                    for param in params:
+                        param.update()
+                    continue
+                fused = _FusedBuffer(params)
+            fused.update()
+            buffers[key] = fused
+        self._fused_buffers = buffers
+
 
 class HyperparameterProxy(object):
 
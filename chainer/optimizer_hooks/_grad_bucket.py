@@ -0,0 +1,139 @@
+import collections
+
+import numpy
+import six
+
+
+class GradBucket(object):
+
+    """Flat gradient buffer shared by the parameters of the same dtype.
+
+    The gradient of each parameter is replaced with a view into the flat
+    buffer, so that optimizer hooks can process the gradients of many
+    parameters with a single reduction or elementwise operation.
+
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.offsets = numpy.cumsum(
+            [0] + [param.grad.size for param in params]).tolist()
+        self.grad = numpy.empty(self.offsets[-1], dtype=params[0].grad.dtype)
+        self.views = self._split(self.grad)
+        self._work = None
+        self._work_views = None
+
+    def _split(self, buf):
+        return [
+            buf[begin:end].reshape(param.grad.shape)
+            for param, begin, end in six.moves.zip(
+                self.params, self.offsets[:-1], self.offsets[1:])]
+
+    def holds(self, params):
+        if len(params) != len(self.params):
+            return False
+        for param, own, view in six.moves.zip(params, self.params, self.views):
+            if param is not own or param.grad.shape != view.shape:
+                return False
+        return True
+
+    def sync(self):
+        # Gradients are typically replaced with new arrays by each backward
+        # computation; copy them into the buffer and rebind the views.
+        for param, view in six.moves.zip(self.params, self.views):
+            grad = param.grad
+            if grad is not view:
+                view[...] = grad
+                param._set_grad_without_check(view)
+
+    def add_data(self, rate, sign=False):
+        """Adds the parameter arrays multiplied by ``rate`` to the gradients.
+
+        Args:
+            rate (float): Coefficient of the parameter arrays.
+            sign (bool): If ``True``, the signs of the parameter arrays are
+                added instead.
+
+        """
+        # The parameter arrays are not rebound, since they are often
+        # referenced by users; they are written into a persistent work buffer
+        # instead of being gathered into a new array at every call.
+        if self._work is None:
+            self._work = numpy.empty_like(self.grad)
+            self._work_views = self._split(self._work)
+        for param, work in six.moves.zip(self.params, self._work_views):
+            if sign:
+                numpy.sign(param.array, out=work)
+            else:
+                numpy.multiply(param.array, rate, out=work)
+        if sign:
+            self._work *= rate
+        self.grad += self._work
+
+
+def pack_grads(opt):
+    """Packs the gradients of the target link of an optimizer.
+
+    The gradients of the parameters on CPU are packed into one
+    :class:`GradBucket` per dtype. The buckets are cached in the optimizer
+    and reused as long as the set of parameters does not change.
+
+    Args:
+        opt (~chainer.Optimizer): Optimizer.
+
+    Returns:
+        tuple: A list of :class:`GradBucket` objects and a list of the other
+        parameters with gradients (e.g. parameters on GPU or ChainerX
+        parameters), which should be processed one by one.
+
+    """
+    groups = collections.OrderedDict()
+    others = []
+    for param in opt.target.params(False):
+        grad = param.grad
+        if grad is None:
+            continue
+        if (type(grad) is numpy.ndarray
+                and type(param.array) is numpy.ndarray):
+            groups.setdefault(grad.dtype, []).append(param)
+        else:
+            others.append(param)
+
+    cached = opt._grad_buckets or {}
+    buckets = collections.OrderedDict()
+    for dtype, params in six.iteritems(groups):
+        bucket = cached.get(dtype)
+        if bucket is None or not bucket.holds(params):
+            bucket = GradBucket(params)
+        bucket.sync()
+        buckets[dtype] = bucket
+    opt._grad_buckets = buckets
+    return list(buckets.values()), others
+
+
+def coalesce_sparse_grads(opt):
+    """Coalesces the sparse gradients of the target link of an optimizer.
+
+    The sparse gradient of a parameter which also has a dense gradient is
+    merged into the dense one, so that it is processed by
+    :func:`pack_grads`.
+
+    Args:
+        opt (~chainer.Optimizer): Optimizer.
+
+    Returns:
+        list: Parameters which only have sparse gradients. Their sparse
+        gradients are coalesced.
+
+    """
+    params = []
+    for param in opt.target.params(False):
+        sparse_grad = param.sparse_grad
+        if sparse_grad is None:
+            continue
+        if param.grad is not None:
+            param._densify_grad()
+            continue
+        param.sparse_grad = sparse_grad.coalesce()
+        params.append(param)
+    return params
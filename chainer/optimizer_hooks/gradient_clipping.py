@@ -4,6 +4,7 @@ import six
 
 from chainer import backend
 from chainer import cuda
+from chainer.optimizer_hooks import _grad_bucket
 
 
 def _sum_sqnorm(arr):
@@ -27,12 +28,31 @@ class GradientClipping(object):
     This hook function scales all gradient arrays to fit to the defined L2 norm
     threshold.
 
+    The gradients of the parameters on CPU are packed into a flat buffer per
+    dtype, so that the norm and the scaling are computed by one operation for
+    each buffer.
+
+    Weight decay can optionally be applied to the gradients before computing
+    the norm, in the same pass. The decay matches that of
+    :class:`~chainer.optimizer_hooks.WeightDecay` applied to the gradients
+    before the norm is computed. Note that ``WeightDecay`` with the default
+    ``call_for_each_param=True`` is instead called by the update rules, i.e.
+    after the gradients are clipped.
+
+    The sparse gradients of the parameters (see
+    :attr:`~chainer.Parameter.sparse_grad`) are kept sparse; the norm is
+    computed from their coalesced rows, which are scaled in place.
+
     Args:
         threshold (float): L2 norm threshold.
+        weight_decay (float): Coefficient for the weight decay applied before
+            clipping.
 
     Attributes:
         ~optimizer_hooks.GradientClipping.threshold (float): L2
                          norm threshold of gradient norm.
+        ~optimizer_hooks.GradientClipping.weight_decay (float): Coefficient
+                         for the weight decay applied before clipping.
         ~optimizer_hooks.GradientClipping.timing (string): Specifies
                          when this hook should be
                          called by the Optimizer/UpdateRule. Valid values are
@@ -45,12 +65,32 @@ class GradientClipping(object):
     """
     name = 'GradientClipping'
     timing = 'pre'
+    supports_sparse_grad = True
 
-    def __init__(self, threshold):
+    def __init__(self, threshold, weight_decay=0.0):
         self.threshold = threshold
+        self.weight_decay = weight_decay
 
     def __call__(self, opt):
-        sqnorm = _sum_sqnorm([p.grad for p in opt.target.params(False)])
+        sparse_grads = [
+            (param.data, param.sparse_grad)
+            for param in _grad_bucket.coalesce_sparse_grads(opt)]
+        buckets, others = _grad_bucket.pack_grads(opt)
+        if self.weight_decay:
+            for bucket in buckets:
+                bucket.add_data(self.weight_decay)
+            for param in others:
+                p, g = param.data, param.grad
+                with cuda.get_device_from_array(g):
+                    g += self.weight_decay * p
+            for p, g in sparse_grads:
+                with cuda.get_device_from_array(g.values):
+                    g.values += self.weight_decay * p[g.rows]
+
+        sqnorm = _sum_sqnorm(
+            [bucket.grad for bucket in buckets]
+            + [param.grad for param in others]
+            + [g.values for _, g in sparse_grads])
         with cuda.get_device_from_array(sqnorm) as dev:
             norm = backend.get_array_module(sqnorm).sqrt(sqnorm)
             rate = self.threshold / norm
@@ -61,7 +101,12 @@ class GradientClipping(object):
                     return
             else:
                 rate = rate.clip(None, 1)
-        for param in opt.target.params(False):
+        for bucket in buckets:
+            bucket.grad *= rate
+        for param in others:
             grad = param.grad
             with cuda.get_device_from_array(grad):
                 grad *= rate
+        for _, g in sparse_grads:
+            with cuda.get_device_from_array(g.values):
+                g.values *= rate
@@ -1,5 +1,6 @@
 from chainer import backend
 from chainer import cuda
+from chainer.optimizer_hooks import _grad_bucket
 
 
 class Lasso(object):
@@ -10,6 +11,11 @@ class Lasso(object):
 
     Args:
         rate (float): Coefficient for the weight decay.
+        call_for_each_param (bool): If ``False``, this hook is called only
+            once by an optimizer to which it is registered, and processes the
+            gradients of the parameters on CPU packed into a flat buffer per
+            dtype with one operation for each buffer. It can still be
+            registered to an update rule in that case.
 
     Attributes:
         ~optimizer_hooks.Lasso.rate (float): Coefficient for the weight decay.
@@ -20,9 +26,8 @@ class Lasso(object):
         ~optimizer_hooks.Lasso.call_for_each_param (bool): Specifies
                          if this hook is called for each parameter (``True``)
                          or only once (``False``) by an optimizer to
-                         which this hook is registered. This function does
-                         not expect users to switch the value from default one,
-                         which is `True`.
+                         which this hook is registered. It can be configured
+                         by the constructor argument.
 
     .. versionadded:: 4.0.0
        The *timing* parameter.
@@ -32,10 +37,22 @@ class Lasso(object):
     call_for_each_param = True
     timing = 'pre'
 
-    def __init__(self, rate):
+    def __init__(self, rate, call_for_each_param=True):
         self.rate = rate
+        self.call_for_each_param = call_for_each_param
 
-    def __call__(self, rule, param):
+    def __call__(self, rule, param=None):
+        # ``rule`` is the optimizer if called only once by an optimizer.
+        if param is None:
+            buckets, others = _grad_bucket.pack_grads(rule)
+            for bucket in buckets:
+                bucket.add_data(self.rate, sign=True)
+            for param in others:
+                self._update(param)
+        else:
+            self._update(param)
+
+    def _update(self, param):
         p, g = param.data, param.grad
         if p is None or g is None:
             return
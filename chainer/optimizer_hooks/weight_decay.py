@@ -1,4 +1,5 @@
 from chainer import cuda
+from chainer.optimizer_hooks import _grad_bucket
 
 
 class WeightDecay(object):
@@ -10,6 +11,15 @@ class WeightDecay(object):
 
     Args:
         rate (float): Coefficient for the weight decay.
+        call_for_each_param (bool): If ``False``, this hook is called only
+            once by an optimizer to which it is registered, and processes the
+            gradients of the parameters on CPU packed into a flat buffer per
+            dtype with one operation for each buffer. It can still be
+            registered to an update rule in that case.
+
+    The sparse gradients of the parameters (see
+    :attr:`~chainer.Parameter.sparse_grad`) are kept sparse; only the rows in
+    the gradients are decayed.
 
     Attributes:
         ~optimizer_hooks.WeightDecay.rate (float): Coefficient
@@ -21,9 +31,8 @@ class WeightDecay(object):
         ~optimizer_hooks.WeightDecay.call_for_each_param (bool): Specifies
                          if this hook is called for each parameter (``True``)
                          or only once (``False``) by an optimizer to
-                         which this hook is registered. This function does
-                         not expect users to switch the value from default one,
-                         which is `True`.
+                         which this hook is registered. It can be configured
+                         by the constructor argument.
 
     .. versionadded:: 4.0.0
        The *timing* parameter.
@@ -32,11 +41,30 @@ class WeightDecay(object):
     name = 'WeightDecay'
     call_for_each_param = True
     timing = 'pre'
+    supports_sparse_grad = True
 
-    def __init__(self, rate):
+    def __init__(self, rate, call_for_each_param=True):
         self.rate = rate
+        self.call_for_each_param = call_for_each_param
+
+    def __call__(self, rule, param=None):
+        # ``rule`` is the optimizer if called only once by an optimizer.
+        if param is None:
+            sparse_params = _grad_bucket.coalesce_sparse_grads(rule)
+            buckets, others = _grad_bucket.pack_grads(rule)
+            for bucket in buckets:
+                bucket.add_data(self.rate)
+            for param in others + sparse_params:
+                self._update(param)
+        else:
+            self._update(param)
 
-    def __call__(self, rule, param):
+    def _update(self, param):
+        if getattr(param, 'sparse_grad', None) is not None:
+            if param.grad is None:
+                self._update_sparse(param)
+                return
+            param._densify_grad()
         p, g = param.data, param.grad
         if p is None or g is None:
             return
@@ -47,3 +75,11 @@ class WeightDecay(object):
                 kernel = cuda.elementwise(
                     'T p, T decay', 'T g', 'g += decay * p', 'weight_decay')
                 kernel(p, self.rate, g)
+
+    def _update_sparse(self, param):
+        if param.data is None:
+            return
+        grad = param.sparse_grad.coalesce()
+        with cuda.get_device_from_array(grad.values):
+            grad.values += self.rate * param.data[grad.rows]
+        param.sparse_grad = grad
@@ -37,6 +37,7 @@ class AdaGradRule(optimizer.UpdateRule):
         eps (float): Small value for the numerical stability.
 
     """
+    _supports_sparse_grad = True
     _kernel = None
 
     def __init__(self, parent_hyperparam=None, lr=None, eps=None):
@@ -78,6 +79,16 @@ class AdaGradRule(optimizer.UpdateRule):
         AdaGradRule._kernel(grad, self.hyperparam.lr, self.hyperparam.eps,
                             param.data, self.state['h'])
 
+    def update_core_sparse(self, param):
+        grad = param.sparse_grad
+        rows, g = grad.rows, grad.values
+        xp = backend.get_array_module(g)
+        h = self.state['h']
+        h_rows = h[rows] + g * g
+        h[rows] = h_rows
+        param.data[rows] -= self.hyperparam.lr * g / (
+            xp.sqrt(h_rows) + self.hyperparam.eps)
+
 
 class AdaGrad(optimizer.GradientMethod):
 
@@ -80,6 +80,8 @@ class AdamRule(optimizer.UpdateRule):
         amsgrad (bool): Whether to use the AMSGrad variant of Adam.
 
     """
+    _fusable = True
+    _supports_sparse_grad = True
     _kernel = None
     _amsgrad_kernel = None
 
@@ -198,6 +200,35 @@ class AdamRule(optimizer.UpdateRule):
                              hp.eta, hp.weight_decay_rate,
                              param.data, self.state['m'], self.state['v'])
 
+    def update_core_sparse(self, param):
+        # Lazy Adam: the moments of the rows not in the gradient are not
+        # decayed, and these rows are left as is.
+        grad = param.sparse_grad
+        rows, g = grad.rows, grad.values
+        xp = backend.get_array_module(g)
+        hp = self.hyperparam
+        eps = g.dtype.type(hp.eps)
+        if hp.eps != 0 and eps == 0:
+            raise ValueError(
+                'eps of Adam optimizer is too small for {} ({})'.format(
+                    g.dtype.name, hp.eps))
+        m, v = self.state['m'], self.state['v']
+        m_rows = m[rows]
+        m_rows += (1 - hp.beta1) * (g - m_rows)
+        m[rows] = m_rows
+        v_rows = v[rows]
+        v_rows += (1 - hp.beta2) * (g * g - v_rows)
+        v[rows] = v_rows
+        if hp.amsgrad:
+            vhat = self.state['vhat']
+            v_rows = xp.maximum(vhat[rows], v_rows)
+            vhat[rows] = v_rows
+        p_rows = param.data[rows]
+        p_rows -= hp.eta * (
+            self.alpha_t * m_rows / (xp.sqrt(v_rows) + hp.eps) +
+            hp.weight_decay_rate * p_rows)
+        param.data[rows] = p_rows
+
     @property
     def alpha_t(self):
         return _learning_rate(self.hyperparam, self.t)
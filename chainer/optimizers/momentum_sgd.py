@@ -36,6 +36,8 @@ class MomentumSGDRule(optimizer.UpdateRule):
         momentum (float): Exponential decay rate of the first order moment.
 
     """
+    _fusable = True
+    _supports_sparse_grad = True
     _kernel = None
 
     def __init__(self, parent_hyperparam=None, lr=None, momentum=None):
@@ -85,6 +87,16 @@ class MomentumSGDRule(optimizer.UpdateRule):
             grad, self.hyperparam.lr, self.hyperparam.momentum, param.data,
             self.state['v'])
 
+    def update_core_sparse(self, param):
+        # The velocity of the rows not in the gradient is left as is.
+        grad = param.sparse_grad
+        rows = grad.rows
+        v = self.state['v']
+        v_rows = (self.hyperparam.momentum * v[rows]
+                  - self.hyperparam.lr * grad.values)
+        v[rows] = v_rows
+        param.data[rows] += v_rows
+
 
 class MomentumSGD(optimizer.GradientMethod):
 
@@ -32,6 +32,8 @@ class SGDRule(optimizer.UpdateRule):
         lr (float): Learning rate.
 
     """
+    _fusable = True
+    _supports_sparse_grad = True
     _kernel = None
 
     def __init__(self, parent_hyperparam=None, lr=None):
@@ -59,6 +61,10 @@ class SGDRule(optimizer.UpdateRule):
                 'param -= lr * grad', 'sgd')
         SGDRule._kernel(grad, self.hyperparam.lr, param.data)
 
+    def update_core_sparse(self, param):
+        grad = param.sparse_grad
+        param.data[grad.rows] -= self.hyperparam.lr * grad.values
+
 
 class SGD(optimizer.GradientMethod):
 
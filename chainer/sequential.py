@@ -198,6 +198,9 @@ class Sequential(_link.ChainList):
         of outputs at a layer should be the same as the number of inputs at
         the next layer.
 
+        If a checkpointing schedule is set by :meth:`set_checkpointing`, the
+        layers are called in segments following it.
+
         Args:
             x: Input variables.
 
@@ -205,6 +208,8 @@ class Sequential(_link.ChainList):
             The output of the final layer in the given layers.
 
         """
+        if self._checkpoint_schedule is not None:
+            return self._call_layers(self._layers, x)
         for layer in self._layers:
             if isinstance(x, tuple):
                 x = layer(*x)
@@ -212,6 +217,14 @@ class Sequential(_link.ChainList):
                 x = layer(x)
         return x
 
+    def call_sequentially(self, *x):
+        """Calls the layers sequentially.
+
+        It is equivalent to :meth:`forward`.
+
+        """
+        return self.forward(*x)
+
     def __reduce__(self):
         n_lambda = 0
         for layer in self._layers:
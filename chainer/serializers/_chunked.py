@@ -0,0 +1,249 @@
+import json
+import multiprocessing
+from multiprocessing import pool
+import struct
+import zlib
+
+import numpy
+import six
+
+try:
+    import lzma
+    _lzma_available = True
+except ImportError:
+    _lzma_available = False
+
+
+# The chunked container consists of the magic, the compressed chunks of the
+# arrays, the footer in JSON, the length of the footer and the magic again.
+_magic = b'\x93CHAINERCHUNKED\x01'
+_footer_length = struct.Struct('<Q')
+
+_default_chunk_size = 4 << 20
+
+
+def _compress_zlib(data):
+    return zlib.compress(data)
+
+
+def _compress_lzma(data):
+    return lzma.compress(data)
+
+
+def _compress_none(data):
+    return data
+
+
+def _decompress_lzma(data):
+    return lzma.decompress(data)
+
+
+# Pairs of the compression and the decompression functions of each codec.
+_codecs = {
+    'none': (_compress_none, _compress_none),
+    'zlib': (_compress_zlib, zlib.decompress),
+    'lzma': (_compress_lzma, _decompress_lzma),
+}
+
+
+def _check_codec(codec):
+    if codec not in _codecs:
+        raise ValueError('codec must be one of {}: {}'.format(
+            ', '.join(sorted(_codecs)), codec))
+    if codec == 'lzma' and not _lzma_available:
+        raise RuntimeError('lzma module is not available')
+
+
+def _crc32(data):
+    return zlib.crc32(data) & 0xffffffff
+
+
+def _compress_chunk(args):
+    codec, data = args
+    return _codecs[codec][0](data), len(data), _crc32(data)
+
+
+def _decompress_chunk(args):
+    codec, data, raw_size, crc, out = args
+    raw = _codecs[codec][1](data)
+    if len(raw) != raw_size or _crc32(raw) != crc:
+        raise ValueError('chunk is corrupted')
+    out[...] = numpy.frombuffer(raw, dtype=numpy.uint8)
+
+
+def _entry(name, value):
+    value = numpy.asarray(value)
+    if value.dtype == object:
+        if value.shape == () and value[()] is None:
+            return {'name': name, 'none': True}, None
+        raise ValueError(
+            'object arrays cannot be saved in the chunked format: '
+            '{}'.format(name))
+    if value.dtype.fields is not None:
+        raise ValueError(
+            'structured arrays cannot be saved in the chunked format: '
+            '{}'.format(name))
+    value = numpy.ascontiguousarray(value)
+    entry = {'name': name, 'dtype': value.dtype.str,
+             'shape': list(value.shape), 'chunks': []}
+    return entry, value.reshape(-1).view(numpy.uint8)
+
+
+def save(file, target, codec='zlib', chunk_size=None, n_threads=None):
+    """Saves a dictionary of arrays in the chunked container format.
+
+    Each array is split into chunks of ``chunk_size`` bytes, which are
+    compressed by a pool of threads in parallel and written in order.
+
+    Args:
+        file (file-like): File object to write to.
+        target (dict): Dictionary of arrays.
+        codec (str): Name of the codec.
+        chunk_size (int): Size of the chunks in bytes before compression.
+        n_threads (int): Number of threads. The number of CPUs is used by
+            default.
+
+    """
+    _check_codec(codec)
+    if chunk_size is None:
+        chunk_size = _default_chunk_size
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive: {}'.format(chunk_size))
+    if n_threads is None:
+        n_threads = multiprocessing.cpu_count()
+
+    entries = []
+    chunks = []
+    for name in sorted(target):
+        entry, data = _entry(name, target[name])
+        entries.append(entry)
+        if data is not None:
+            view = memoryview(data)
+            for i in six.moves.range(0, len(view), chunk_size):
+                chunks.append((entry, view[i:i + chunk_size]))
+
+    file.write(_magic)
+    offset = len(_magic)
+    p = pool.ThreadPool(n_threads)
+    try:
+        results = p.imap(
+            _compress_chunk, [(codec, data) for _, data in chunks])
+        for (entry, _), (data, raw_size, crc) in six.moves.zip(
+                chunks, results):
+            file.write(data)
+            entry['chunks'].append([offset, len(data), raw_size, crc])
+            offset += len(data)
+    finally:
+        p.close()
+        p.join()
+
+    footer = json.dumps({'codec': codec, 'entries': entries}).encode('utf-8')
+    file.write(footer)
+    file.write(_footer_length.pack(len(footer)))
+    file.write(_magic)
+
+
+def is_chunked(file):
+    """Tells whether a file is in the chunked container format.
+
+    Args:
+        file (str or file-like): Path to the file or a seekable file object.
+
+    """
+    if isinstance(file, six.string_types):
+        with open(file, 'rb') as f:
+            return is_chunked(f)
+    position = file.tell()
+    try:
+        return file.read(len(_magic)) == _magic
+    finally:
+        file.seek(position)
+
+
+class ChunkedFile(object):
+
+    """Reader of the chunked container format.
+
+    It works like :class:`numpy.lib.npyio.NpzFile`; the arrays are read and
+    decompressed on access by a pool of threads in parallel.
+
+    Args:
+        file (str or file-like): Path to the file or a seekable file object.
+        n_threads (int): Number of threads. The number of CPUs is used by
+            default.
+
+    """
+
+    def __init__(self, file, n_threads=None):
+        if isinstance(file, six.string_types):
+            self._file = open(file, 'rb')
+            self._own_file = True
+        else:
+            self._file = file
+            self._own_file = False
+        self._n_threads = n_threads or multiprocessing.cpu_count()
+        self._pool = None
+
+        f = self._file
+        self._base = f.tell()
+        trailer_size = _footer_length.size + len(_magic)
+        f.seek(0, 2)
+        if f.tell() - self._base < len(_magic) + trailer_size:
+            self.close()
+            raise ValueError('not a file in the chunked format')
+        f.seek(-trailer_size, 2)
+        trailer = f.read(trailer_size)
+        if trailer[_footer_length.size:] != _magic:
+            self.close()
+            raise ValueError('not a file in the chunked format')
+        footer_size, = _footer_length.unpack(trailer[:_footer_length.size])
+        f.seek(-trailer_size - footer_size, 2)
+        footer = json.loads(f.read(footer_size).decode('utf-8'))
+        self.codec = footer['codec']
+        _check_codec(self.codec)
+        self._entries = dict(
+            [(entry['name'], entry) for entry in footer['entries']])
+        self.files = sorted(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getitem__(self, key):
+        entry = self._entries[key]
+        if entry.get('none'):
+            return numpy.asarray(None)
+
+        out = numpy.empty(entry['shape'], dtype=numpy.dtype(entry['dtype']))
+        buf = out.reshape(-1).view(numpy.uint8)
+        tasks = []
+        position = 0
+        f = self._file
+        for offset, size, raw_size, crc in entry['chunks']:
+            f.seek(self._base + offset)
+            tasks.append((self.codec, f.read(size), raw_size, crc,
+                          buf[position:position + raw_size]))
+            position += raw_size
+        if position != buf.size:
+            raise ValueError('entry is corrupted: {}'.format(key))
+        if len(tasks) > 1:
+            if self._pool is None:
+                self._pool = pool.ThreadPool(self._n_threads)
+            self._pool.map(_decompress_chunk, tasks)
+        elif tasks:
+            _decompress_chunk(tasks[0])
+        return out
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._own_file and self._file is not None:
+            self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, typ, value, traceback):
+        self.close()
@@ -1,10 +1,17 @@
+import mmap
+import struct
+import zipfile
+
 import numpy
 import six
 
+import chainer
+from chainer import backend
 from chainer.backends import _cpu
 from chainer.backends import cuda
 from chainer.backends import intel64
 from chainer import serializer
+from chainer.serializers import _chunked
 import chainerx
 
 
@@ -68,17 +75,33 @@ def serialize(obj):
     return s.target
 
 
-def save_npz(file, obj, compression=True):
+def save_npz(file, obj, compression=True, codec=None, chunk_size=None,
+             n_threads=None):
     """Saves an object to the file in NPZ format.
 
     This is a short-cut function to save only one object into an NPZ file.
 
+    If ``codec`` is specified, the object is saved in the chunked format
+    instead of NPZ. Each array is split into chunks, which are compressed
+    in parallel by a pool of threads, and the CRC-32 checksum of each chunk is
+    verified on loading. Since the compression functions release the GIL, it
+    is much faster than NPZ for large arrays on multi-core machines.
+    :func:`~chainer.serializers.load_npz` reads both formats.
+
     Args:
         file (str or file-like): Target file to write to.
         obj: Object to be serialized. It must support serialization protocol.
             If it is a dictionary object, the serialization will be skipped.
         compression (bool): If ``True``, compression in the resulting zip file
-            is enabled.
+            is enabled. It is ignored if ``codec`` is specified.
+        codec (str): Codec of the chunked format. It must be one of
+            ``'zlib'``, ``'lzma'`` (only available on Python 3) and
+            ``'none'`` (the chunks are not compressed but checksummed). If it
+            is ``None``, the object is saved in NPZ format.
+        chunk_size (int): Size in bytes of the chunks of the chunked format.
+            The default is 4 MiB.
+        n_threads (int): Number of threads compressing the chunks. The number
+            of CPUs is used by default.
 
     .. seealso::
         :func:`chainer.serializers.load_npz`
@@ -86,7 +109,7 @@ def save_npz(file, obj, compression=True):
     """
     if isinstance(file, six.string_types):
         with open(file, 'wb') as f:
-            save_npz(f, obj, compression)
+            save_npz(f, obj, compression, codec, chunk_size, n_threads)
         return
 
     if isinstance(obj, dict):
@@ -96,12 +119,31 @@ def save_npz(file, obj, compression=True):
         s.save(obj)
         target = s.target
 
-    if compression:
+    if codec is not None:
+        _chunked.save(file, target, codec, chunk_size, n_threads)
+    elif compression:
         numpy.savez_compressed(file, **target)
     else:
         numpy.savez(file, **target)
 
 
+def _is_ignored(key, ignore_names):
+    if not isinstance(ignore_names, (tuple, list)):
+        ignore_names = (ignore_names,)
+    for ignore_name in ignore_names:
+        if isinstance(ignore_name, str):
+            if key == ignore_name:
+                return True
+        elif callable(ignore_name):
+            if ignore_name(key):
+                return True
+        else:
+            raise ValueError(
+                'ignore_names needs to be a callable, string or '
+                'list of them.')
+    return False
+
+
 class NpzDeserializer(serializer.Deserializer):
 
     """Deserializer for NPZ format.
@@ -144,21 +186,8 @@ class NpzDeserializer(serializer.Deserializer):
         if not self.strict and key not in self.npz:
             return value
 
-        if isinstance(self.ignore_names, (tuple, list)):
-            ignore_names = self.ignore_names
-        else:
-            ignore_names = (self.ignore_names,)
-        for ignore_name in ignore_names:
-            if isinstance(ignore_name, str):
-                if key == ignore_name:
-                    return value
-            elif callable(ignore_name):
-                if ignore_name(key):
-                    return value
-            else:
-                raise ValueError(
-                    'ignore_names needs to be a callable, string or '
-                    'list of them.')
+        if _is_ignored(key, self.ignore_names):
+            return value
 
         dataset = self.npz[key]
         if dataset[()] is None:
@@ -188,7 +217,118 @@ class NpzDeserializer(serializer.Deserializer):
         return value
 
 
-def load_npz(file, obj, path='', strict=True, ignore_names=None):
+# Local file header of ZIP archives.
+_zip_local_header = struct.Struct('<4s2B4HL2L2H')
+_zip_filename_length_index = 10
+_zip_extra_field_length_index = 11
+
+_mmap_accesses = {
+    'r': mmap.ACCESS_READ,
+    'c': mmap.ACCESS_COPY,
+    'r+': mmap.ACCESS_WRITE,
+}
+
+
+class _MappedNpzFile(object):
+
+    # NPZ file whose uncompressed entries are mapped into memory.
+    # The arrays of the uncompressed entries are views of a single memory map
+    # of the whole file. Other entries are read on demand as NpzFile does.
+
+    def __init__(self, file, mmap_mode):
+        if mmap_mode not in _mmap_accesses:
+            raise ValueError(
+                'mmap_mode must be one of {}: {}'.format(
+                    ', '.join(sorted(_mmap_accesses)), mmap_mode))
+        self.npz = numpy.load(file)
+        self.arrays = {}
+        with open(file, 'r+b' if mmap_mode == 'r+' else 'rb') as f:
+            offsets = self._find_arrays(f)
+            if offsets:
+                self._mmap = mmap.mmap(
+                    f.fileno(), 0, access=_mmap_accesses[mmap_mode])
+        for key, (offset, shape, dtype, order) in six.iteritems(offsets):
+            self.arrays[key] = numpy.ndarray(
+                shape, dtype, buffer=self._mmap, offset=offset, order=order)
+
+    @staticmethod
+    def _find_arrays(f):
+        offsets = {}
+        for info in zipfile.ZipFile(f).infolist():
+            if (info.compress_type != zipfile.ZIP_STORED
+                    or not info.filename.endswith('.npy')):
+                continue
+            f.seek(info.header_offset)
+            header = _zip_local_header.unpack(
+                f.read(_zip_local_header.size))
+            f.seek(info.header_offset + _zip_local_header.size
+                   + header[_zip_filename_length_index]
+                   + header[_zip_extra_field_length_index])
+            version = numpy.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = \
+                    numpy.lib.format.read_array_header_1_0(f)
+            elif version == (2, 0):
+                shape, fortran_order, dtype = \
+                    numpy.lib.format.read_array_header_2_0(f)
+            else:
+                continue
+            if dtype.hasobject or numpy.prod(shape) == 0:
+                continue
+            offsets[info.filename[:-4]] = (
+                f.tell(), shape, dtype, 'F' if fortran_order else 'C')
+        return offsets
+
+    def __contains__(self, key):
+        return key in self.arrays or key in self.npz
+
+    def __getitem__(self, key):
+        array = self.arrays.get(key)
+        if array is None:
+            return self.npz[key]
+        return array
+
+    def close(self):
+        # The memory map is kept open as long as the arrays are referenced.
+        self.npz.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _bind_mapped_params(link, npz, path, ignore_names):
+    # Replaces the arrays of the parameters on CPU with the mapped arrays.
+    # Returns the keys of the bound parameters.
+    keys = []
+    for name, param in link.namedparams():
+        key = path + name.lstrip('/')
+        array = npz.arrays.get(key)
+        if array is None or _is_ignored(key, ignore_names):
+            continue
+        data = param.array
+        if data is None:
+            if not isinstance(param._initial_device, backend.CpuDevice):
+                continue
+        elif (not isinstance(data, numpy.ndarray)
+              or data.shape != array.shape or data.dtype != array.dtype):
+            continue
+        param.array = array
+        keys.append(key)
+    return keys
+
+
+def _open(file):
+    # Opens an NPZ file or a file in the chunked format.
+    if _chunked.is_chunked(file):
+        return _chunked.ChunkedFile(file)
+    return numpy.load(file)
+
+
+def load_npz(file, obj, path='', strict=True, ignore_names=None,
+             mmap_mode=None):
     """Loads an object from the file in NPZ format.
 
     This is a short-cut function to load from an `.npz` file that contains only
@@ -210,12 +350,40 @@ def load_npz(file, obj, path='', strict=True, ignore_names=None):
             going to be skipped.
             This can also be a list of callables and strings that behave as
             described above.
+        mmap_mode (str): If it is not ``None``, the file is mapped into memory
+            instead of being read. If ``obj`` is a :class:`~chainer.Link`, its
+            parameters on CPU are replaced with arrays backed by the memory map
+            instead of being copied. The contents of the parameters are read
+            from the disk lazily on the first access, and the pages of the file
+            are shared by the processes mapping the same file. The other values
+            are deserialized as usual. It must be one of ``'r'`` (read-only),
+            ``'c'`` (copy-on-write; the parameters can be updated without
+            modifying the file) and ``'r+'`` (the updates are written back to
+            the file). ``file`` must be a path to a file saved with
+            ``compression=False``; the compressed entries are read as usual.
+            Files in the chunked format are also read as usual.
 
     .. seealso::
         :func:`chainer.serializers.save_npz`
 
     """
-    with numpy.load(file) as f:
+    if mmap_mode is None or _chunked.is_chunked(file):
+        with _open(file) as f:
+            d = NpzDeserializer(
+                f, path=path, strict=strict, ignore_names=ignore_names)
+            d.load(obj)
+        return
+
+    if not isinstance(file, six.string_types):
+        raise TypeError('file must be a path to use mmap_mode')
+    with _MappedNpzFile(file, mmap_mode) as f:
+        if ignore_names is None:
+            ignore_names = []
+        elif not isinstance(ignore_names, (tuple, list)):
+            ignore_names = [ignore_names]
+        if isinstance(obj, chainer.Link):
+            ignore_names = list(ignore_names) + _bind_mapped_params(
+                obj, f, path, ignore_names)
         d = NpzDeserializer(
             f, path=path, strict=strict, ignore_names=ignore_names)
         d.load(obj)
@@ -0,0 +1,226 @@
+import hashlib
+import os
+
+import numpy
+import six
+
+from chainer.serializers import npz
+
+
+# Keys of the entries of incremental snapshots. The other entries are the
+# values stored in full, in the same way as the ordinary snapshots.
+_parent_key = '_incremental/parent'
+_keys_key = '_incremental/keys'
+_chunk_size_key = '_incremental/chunk_size'
+_index_prefix = '_incremental/index/'
+_data_prefix = '_incremental/data/'
+
+
+def _flat_bytes(array):
+    return numpy.ascontiguousarray(array).reshape(-1).view(numpy.uint8)
+
+
+def _chunk_length(array, chunk_size):
+    # Number of elements in each chunk.
+    return max(1, chunk_size // max(1, array.dtype.itemsize))
+
+
+def _copy(value):
+    if isinstance(value, numpy.ndarray):
+        return value.copy()
+    return value
+
+
+def _chunk_digests(array, chunk_size):
+    data = memoryview(_flat_bytes(array))
+    nbytes = _chunk_length(array, chunk_size) * array.dtype.itemsize
+    return [hashlib.sha1(data[i:i + nbytes]).digest()
+            for i in six.moves.range(0, len(data), nbytes)]
+
+
+class _DeltaEncoder(object):
+
+    """Encoder of the serialized targets into incremental snapshots.
+
+    It keeps the hashes of the chunks of the arrays written by the last
+    snapshot, and builds a dictionary which contains only the chunks changed
+    since then. Every ``full_interval`` snapshots, the whole target is written
+    instead, which compacts the chain of the incremental snapshots.
+
+    """
+
+    def __init__(self, full_interval, chunk_size):
+        if full_interval < 1:
+            raise ValueError(
+                'full_interval must be positive: {}'.format(full_interval))
+        if chunk_size < 1:
+            raise ValueError(
+                'chunk_size must be positive: {}'.format(chunk_size))
+        self.full_interval = full_interval
+        self.chunk_size = chunk_size
+        self._digests = None
+        self._parent = None
+        self._count = 0
+
+    def encode(self, target, filename, outdir):
+        """Returns the dictionary to be saved as the snapshot.
+
+        Args:
+            target (dict): Serialized object.
+            filename (str): Name of the snapshot file.
+            outdir (str): Output directory.
+
+        Returns:
+            dict: A copy of ``target`` if the whole target is written, or the
+            difference from the previous snapshot otherwise.
+
+        """
+        digests = {}
+        for key, value in six.iteritems(target):
+            if isinstance(value, numpy.ndarray) and value.dtype != object:
+                digests[key] = (value.shape, value.dtype,
+                                _chunk_digests(value, self.chunk_size))
+
+        full = (self._digests is None or self._parent == filename
+                or self._count % self.full_interval == 0)
+        if full:
+            # The arrays are copied, since asynchronous writers may save them
+            # after they are updated, which would break the consistency with
+            # the hashes.
+            delta = {key: _copy(value) for key, value in six.iteritems(target)}
+            self._count = 0
+        else:
+            delta = self._encode_delta(target, digests)
+            path = os.path.join(outdir, filename)
+            parent = os.path.join(outdir, self._parent)
+            delta[_parent_key] = numpy.array(
+                os.path.relpath(parent, os.path.dirname(path)))
+
+        self._digests = digests
+        self._parent = filename
+        self._count += 1
+        return delta
+
+    def _encode_delta(self, target, digests):
+        delta = {
+            _keys_key: numpy.array(sorted(target), dtype=numpy.unicode_),
+            _chunk_size_key: numpy.array(self.chunk_size),
+        }
+        for key, value in six.iteritems(target):
+            new = digests.get(key)
+            old = self._digests.get(key)
+            if new is None or old is None or new[:2] != old[:2]:
+                delta[key] = _copy(value)
+                continue
+
+            changed = [i for i, (a, b) in enumerate(six.moves.zip(
+                new[2], old[2])) if a != b]
+            if not changed:
+                continue
+            if len(changed) == len(new[2]):
+                delta[key] = _copy(value)
+                continue
+
+            length = _chunk_length(value, self.chunk_size)
+            flat = numpy.ascontiguousarray(value).reshape(-1)
+            delta[_index_prefix + key] = numpy.array(changed, numpy.int64)
+            delta[_data_prefix + key] = numpy.concatenate(
+                [flat[i * length:(i + 1) * length] for i in changed])
+        return delta
+
+
+class _ReplayedSnapshot(object):
+
+    # Read-only mapping of the values restored by replaying the chain of the
+    # snapshots from the full snapshot to the last incremental one.
+
+    def __init__(self, files):
+        self.files = files
+        last = files[-1]
+        if _keys_key in last:
+            self.keys = set(last[_keys_key].tolist())
+        else:
+            self.keys = set(last.files)
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def __getitem__(self, key):
+        if key not in self.keys:
+            raise KeyError(key)
+        files = self.files
+        # The latest snapshot which stores the value in full.
+        begin = len(files) - 1
+        while key not in files[begin]:
+            begin -= 1
+            if begin < 0:
+                raise KeyError(key)
+
+        value = files[begin][key]
+        copied = False
+        for f in files[begin + 1:]:
+            index_key = _index_prefix + key
+            if index_key not in f:
+                continue
+            if not copied:
+                value = value.copy()
+                copied = True
+            length = _chunk_length(value, int(f[_chunk_size_key]))
+            flat = value.reshape(-1)
+            data = f[_data_prefix + key]
+            offset = 0
+            for i in f[index_key].tolist():
+                chunk = flat[i * length:(i + 1) * length]
+                chunk[...] = data[offset:offset + chunk.size]
+                offset += chunk.size
+        return value
+
+
+def load_incremental_snapshot(file, obj, path='', strict=True,
+                              ignore_names=None):
+    """Loads an object from a snapshot taken in the incremental mode.
+
+    An incremental snapshot taken by :func:`~chainer.training.extensions.\
+snapshot` with ``incremental=True`` only contains the chunks of the arrays
+    changed since the previous snapshot, and a reference to it. This function
+    follows the references back to the last full snapshot, and restores the
+    object by replaying the chain of the snapshots. It can also load full
+    snapshots, which are ordinary NPZ files.
+
+    Args:
+        file (str): Name of the snapshot file. The files of the previous
+            snapshots in the chain must be kept in the same relative paths.
+        obj: Object to be deserialized. It must support serialization
+            protocol.
+        path (str): The path in the hierarchy of the serialized data under
+            which the data is to be loaded. The default behavior (blank) will
+            load all data under the root path.
+        strict (bool): If ``True``, the deserializer raises an error when an
+            expected value is not found in the given file. Otherwise,
+            it ignores the value and skip deserialization.
+        ignore_names (string, callable or list of them):
+            Names of the values which are not loaded. See
+            :class:`~chainer.serializers.NpzDeserializer` for details.
+
+    .. seealso::
+        :func:`chainer.training.extensions.snapshot`
+
+    """
+    files = []
+    try:
+        while file is not None:
+            f = npz._open(file)
+            files.append(f)
+            if _parent_key in f:
+                file = os.path.join(os.path.dirname(file),
+                                    str(f[_parent_key]))
+            else:
+                file = None
+        files.reverse()
+        replayed = _ReplayedSnapshot(files)
+        d = npz.NpzDeserializer(
+            replayed, path=path, strict=strict, ignore_names=ignore_names)
+        d.load(obj)
+    finally:
+        for f in files:
+            f.close()
@@ -1,5 +1,6 @@
 from chainer.serializers import npz
 from chainer.training import extension
+from chainer.training.extensions import _incremental_snapshot
 from chainer.training.extensions import snapshot_writers
 from chainer.utils import argument
 
@@ -29,6 +30,13 @@ def snapshot_object(target, filename, savefun=npz.save_npz, **kwargs):
             output file path and the object to serialize.
         snapshot_on_error (bool): Whether to take a snapshot in case trainer
             loop has been failed.
+        incremental (bool): If ``True``, snapshots are taken in the
+            incremental mode. See :meth:`chainer.training.extensions.snapshot`
+            for details.
+        compaction_interval (int): Interval of the full snapshots in the
+            incremental mode.
+        chunk_size (int): Size in bytes of the chunks of the arrays compared
+            in the incremental mode.
 
     Returns:
         Snapshot extension object.
@@ -37,21 +45,26 @@ def snapshot_object(target, filename, savefun=npz.save_npz, **kwargs):
 
         - :meth:`chainer.training.extensions.snapshot`
     """
-    snapshot_on_error = argument.parse_kwargs(
-        kwargs, ('snapshot_on_error', False))
+    (snapshot_on_error, incremental, compaction_interval,
+     chunk_size) = argument.parse_kwargs(
+        kwargs, ('snapshot_on_error', False), ('incremental', False),
+        ('compaction_interval', 10), ('chunk_size', 1 << 20))
     argument.assert_kwargs_empty(kwargs)
 
     return _Snapshot(
         target=target,
         writer=snapshot_writers.SimpleWriter(savefun=savefun),
         filename=filename,
-        snapshot_on_error=snapshot_on_error)
+        snapshot_on_error=snapshot_on_error,
+        delta_encoder=_create_delta_encoder(
+            incremental, compaction_interval, chunk_size))
 
 
 def snapshot(savefun=None,
              filename='snapshot_iter_{.updater.iteration}', **kwargs):
     """snapshot(savefun=None, filename='snapshot_iter_{.updater.iteration}', \
-*, target=None, condition=None, writer=None, snapshot_on_error=False)
+*, target=None, condition=None, writer=None, snapshot_on_error=False, \
+incremental=False, compaction_interval=10, chunk_size=1048576)
 
     Returns a trainer extension to take snapshots of the trainer.
 
@@ -98,6 +111,13 @@ def snapshot(savefun=None,
             used.
         snapshot_on_error (bool): Whether to take a snapshot in case trainer
             loop has been failed.
+        incremental (bool): If ``True``, snapshots are taken in the
+            incremental mode described below.
+        compaction_interval (int): Interval of the full snapshots in the
+            incremental mode. Every ``compaction_interval``-th snapshot
+            contains the whole target, and the others are incremental.
+        chunk_size (int): Size in bytes of the chunks of the arrays compared
+            in the incremental mode.
 
     Returns:
         Snapshot extension object.
@@ -135,6 +155,30 @@ trigger=(1, 'epoch'))
         >>> trainer.extend(extensions.snapshot(writer=writer), \
 trigger=(1, 'epoch'))
 
+    .. admonition:: Incremental snapshots
+
+        In the incremental mode, each array of the target is split into
+        chunks of ``chunk_size`` bytes, and the hashes of the chunks are
+        compared with those of the previous snapshot. Only the changed
+        chunks, the names of the values and the name of the previous
+        snapshot file are written, so that taking snapshots of large models
+        frequently costs much less disk I/O. Every
+        ``compaction_interval``-th snapshot and the first one after
+        resuming are full snapshots, which are ordinary NPZ files and bound
+        the length of the chain of the incremental ones.
+
+        The snapshots must be saved in the NPZ format, i.e., ``savefun`` of
+        the writer must be :func:`~chainer.serializers.save_npz`, and the
+        file name must differ for each snapshot. Use
+        :func:`~chainer.training.extensions.load_incremental_snapshot`
+        instead of :func:`~chainer.serializers.load_npz` to restore the
+        target from an incremental snapshot, which replays the chain of
+        the snapshots. The previous snapshot files in the chain must not be
+        removed.
+
+        >>> trainer.extend(extensions.snapshot(incremental=True), \
+trigger=(1000, 'iteration'))
+
     This is the list of built-in snapshot writers.
 
         - :class:`chainer.training.extensions.snapshot_writers.SimpleWriter`
@@ -148,11 +192,14 @@ ProcessQueueWriter`
     .. seealso::
 
         - :meth:`chainer.training.extensions.snapshot_object`
+        - :meth:`chainer.training.extensions.load_incremental_snapshot`
     """
-    target, condition, writer, snapshot_on_error = argument.parse_kwargs(
+    (target, condition, writer, snapshot_on_error, incremental,
+     compaction_interval, chunk_size) = argument.parse_kwargs(
         kwargs,
         ('target', None), ('condition', None), ('writer', None),
-        ('snapshot_on_error', False))
+        ('snapshot_on_error', False), ('incremental', False),
+        ('compaction_interval', 10), ('chunk_size', 1 << 20))
     argument.assert_kwargs_empty(kwargs)
 
     if savefun is not None and writer is not None:
@@ -166,13 +213,22 @@ ProcessQueueWriter`
 
     return _Snapshot(
         target=target, condition=condition, writer=writer, filename=filename,
-        snapshot_on_error=snapshot_on_error)
+        snapshot_on_error=snapshot_on_error,
+        delta_encoder=_create_delta_encoder(
+            incremental, compaction_interval, chunk_size))
 
 
 def _always_true():
     return True
 
 
+def _create_delta_encoder(incremental, compaction_interval, chunk_size):
+    if not incremental:
+        return None
+    return _incremental_snapshot._DeltaEncoder(
+        compaction_interval, chunk_size)
+
+
 class _Snapshot(extension.Extension):
     """Trainer extension to take snapshots.
 
@@ -193,7 +249,7 @@ class _Snapshot(extension.Extension):
     def __init__(
             self, target=None, condition=None, writer=None,
             filename='snapshot_iter_{.updater.iteration}',
-            snapshot_on_error=False):
+            snapshot_on_error=False, delta_encoder=None):
         if condition is None:
             condition = _always_true
         if writer is None:
@@ -203,6 +259,7 @@ class _Snapshot(extension.Extension):
         self.condition = condition
         self.writer = writer
         self._snapshot_on_error = snapshot_on_error
+        self._delta_encoder = delta_encoder
 
     def on_error(self, trainer, exc, tb):
         super(_Snapshot, self).on_error(trainer, exc, tb)
@@ -222,6 +279,9 @@ class _Snapshot(extension.Extension):
         else:
             filename = filename.format(trainer)
         outdir = trainer.out
+        if self._delta_encoder is not None:
+            serialized_target = self._delta_encoder.encode(
+                serialized_target, filename, outdir)
         self.writer(filename, outdir, serialized_target)
 
     def finalize(self):
@@ -54,7 +54,7 @@ class Writer(object):
         prefix = 'tmp' + filename
         with utils.tempdir(prefix=prefix, dir=outdir) as tmpdir:
             tmppath = os.path.join(tmpdir, filename)
-            savefun(tmppath, target)
+            savefun(tmppath, target, **kwds)
             shutil.move(tmppath, os.path.join(outdir, filename))
 
 
@@ -196,6 +196,8 @@ class QueueWriter(Writer):
             arguments.
         task: Callable object. Its ``__call__`` must have a same interface to
             ``Writer.__call__``. This object is directly put into the queue.
+        kwds: Keyword arguments for the ``savefun``. They are ignored if the
+            task is specified.
 
     .. seealso::
 
@@ -207,9 +209,9 @@ class QueueWriter(Writer):
     _queue = None
     _consumer = None
 
-    def __init__(self, savefun=npz.save_npz, task=None):
+    def __init__(self, savefun=npz.save_npz, task=None, **kwds):
         if task is None:
-            self._task = self.create_task(savefun)
+            self._task = self.create_task(savefun, **kwds)
         else:
             self._task = task
         self._queue = self.create_queue()
@@ -221,8 +223,8 @@ class QueueWriter(Writer):
     def __call__(self, filename, outdir, target):
         self._queue.put([self._task, filename, outdir, target])
 
-    def create_task(self, savefun):
-        return SimpleWriter(savefun=savefun)
+    def create_task(self, savefun, **kwds):
+        return SimpleWriter(savefun=savefun, **kwds)
 
     def create_queue(self):
         raise NotImplementedError
@@ -62,9 +62,31 @@ def get_deconv_outsize(size, k, s, p, cover_all=False, d=1):
         return s * (size - 1) + dk - 2 * p
 
 
-def im2col_cpu(
+def _windows(img, kh, kw, sy, sx, dy, dx, out_h, out_w):
+    # Returns a view of shape (n, c, kh, kw, out_h, out_w) whose element at
+    # (:, :, j, i, y, x) is img[:, :, j * dy + y * sy, i * dx + x * sx].
+    s0, s1, s2, s3 = img.strides
+    return numpy.lib.stride_tricks.as_strided(
+        img, img.shape[:2] + (kh, kw, out_h, out_w),
+        (s0, s1, s2 * dy, s3 * dx, s2 * sy, s3 * sx))
+
+
+def _is_disjoint(k, s, d, out_size):
+    # Whether the windows along an axis do not overlap each other.
+    return k == 1 or out_size == 1 or s >= (k - 1) * d + 1
+
+
+def im2col_view_cpu(
         img, kh, kw, sy, sx, ph, pw, pval=0, cover_all=False, dy=1, dx=1,
         out_h=None, out_w=None):
+    """Returns a strided view of the patches of images on CPU.
+
+    This function returns the same values as :func:`im2col_cpu`, but as a
+    view of the input array instead of a new array. The input is copied only
+    if it needs padding. The returned array must not be written to, since
+    its elements alias each other.
+
+    """
     n, c, h, w = img.shape
     if out_h is None:
         out_h = get_conv_outsize(h, kh, sy, ph, cover_all, dy)
@@ -73,20 +95,22 @@ def im2col_cpu(
         out_w = get_conv_outsize(w, kw, sx, pw, cover_all, dx)
     assert out_w > 0, 'Width in the output should be positive.'
 
-    img = numpy.pad(img,
-                    ((0, 0), (0, 0), (ph, ph + sy - 1), (pw, pw + sx - 1)),
-                    mode='constant', constant_values=(pval,))
-    col = numpy.ndarray((n, c, kh, kw, out_h, out_w), dtype=img.dtype)
+    # Pad only the rows and columns covered by the windows.
+    pad_h = max((kh - 1) * dy + (out_h - 1) * sy + 1 - h - ph, 0)
+    pad_w = max((kw - 1) * dx + (out_w - 1) * sx + 1 - w - pw, 0)
+    if ph != 0 or pw != 0 or pad_h != 0 or pad_w != 0:
+        img = numpy.pad(img, ((0, 0), (0, 0), (ph, pad_h), (pw, pad_w)),
+                        mode='constant', constant_values=(pval,))
+    return _windows(img, kh, kw, sy, sx, dy, dx, out_h, out_w)
 
-    for j in six.moves.range(kh):
-        jdy = j * dy
-        j_lim = jdy + sy * out_h
-        for i in six.moves.range(kw):
-            idx = i * dx
-            i_lim = idx + sx * out_w
-            col[:, :, j, i, :, :] = img[:, :, jdy:j_lim:sy, idx:i_lim:sx]
 
-    return col
+def im2col_cpu(
+        img, kh, kw, sy, sx, ph, pw, pval=0, cover_all=False, dy=1, dx=1,
+        out_h=None, out_w=None):
+    col = im2col_view_cpu(
+        img, kh, kw, sy, sx, ph, pw, pval=pval, cover_all=cover_all,
+        dy=dy, dx=dx, out_h=out_h, out_w=out_w)
+    return numpy.ascontiguousarray(col)
 
 
 def im2col_gpu(img, kh, kw, sy, sx, ph, pw, cover_all=False, dy=1, dx=1,
@@ -133,15 +157,20 @@ def im2col(img, kh, kw, sy, sx, ph, pw, cover_all=False, dy=1, dx=1,
 
 def col2im_cpu(col, sy, sx, ph, pw, h, w, dy=1, dx=1):
     n, c, kh, kw, out_h, out_w = col.shape
-    img = numpy.zeros((n, c, h + 2 * ph + sy - 1, w + 2 * pw + sx - 1),
-                      dtype=col.dtype)
-    for j in six.moves.range(kh):
-        jdy = j * dy
-        j_lim = jdy + sy * out_h
-        for i in six.moves.range(kw):
-            idx = i * dx
-            i_lim = idx + sx * out_w
-            img[:, :, jdy:j_lim:sy, idx:i_lim:sx] += col[:, :, j, i]
+    img = numpy.zeros(
+        (n, c,
+         max(h + 2 * ph, (kh - 1) * dy + (out_h - 1) * sy + 1),
+         max(w + 2 * pw, (kw - 1) * dx + (out_w - 1) * sx + 1)),
+        dtype=col.dtype)
+    view = _windows(img, kh, kw, sy, sx, dy, dx, out_h, out_w)
+    if (_is_disjoint(kh, sy, dy, out_h)
+            and _is_disjoint(kw, sx, dx, out_w)):
+        # Each pixel belongs to at most one window.
+        view[...] = col
+    else:
+        for j in six.moves.range(kh):
+            for i in six.moves.range(kw):
+                view[:, :, j, i] += col[:, :, j, i]
     return img[:, :, ph:h + ph, pw:w + pw]
 
 
@@ -182,3 +211,193 @@ def col2im_gpu(col, sy, sx, ph, pw, h, w, dy=1, dx=1):
 def col2im(col, sy, sx, ph, pw, h, w, dy=1, dx=1):
     fn = col2im_gpu if isinstance(col, cuda.ndarray) else col2im_cpu
     return fn(col, sy, sx, ph, pw, h, w, dy, dx)
+
+
+def _matmul_cpu(a, b):
+    if not hasattr(numpy, 'matmul'):
+        # NumPy 1.9 does not support matmul. We use einsum instead.
+        return numpy.einsum('...ij,...jk->...ik', a, b)
+    return numpy.matmul(a, b)
+
+
+def conv_1x1_cpu(x, W, sy, sx):
+    """Computes a 1x1 convolution without padding on CPU directly.
+
+    Args:
+        x (numpy.ndarray): Input images of shape ``(n, c, h, w)``.
+        W (numpy.ndarray): Filter of shape ``(out_c, c, 1, 1)``.
+        sy (int): Stride of the filter application along y-axis.
+        sx (int): Stride of the filter application along x-axis.
+
+    Returns:
+        numpy.ndarray: Output images of shape ``(n, out_c, out_h, out_w)``.
+
+    """
+    if sy != 1 or sx != 1:
+        x = x[:, :, ::sy, ::sx]
+    n, c, out_h, out_w = x.shape
+    y = _matmul_cpu(W.reshape(W.shape[0], c), x.reshape(n, c, -1))
+    return y.reshape(n, W.shape[0], out_h, out_w)
+
+
+def conv_1x1_grad_w_cpu(x, gy, sy, sx):
+    """Computes the gradient of the filter of a 1x1 convolution on CPU.
+
+    Args:
+        x (numpy.ndarray): Input images of shape ``(n, c, h, w)``.
+        gy (numpy.ndarray): Gradient of the output images of shape
+            ``(n, out_c, out_h, out_w)``.
+        sy (int): Stride of the filter application along y-axis.
+        sx (int): Stride of the filter application along x-axis.
+
+    Returns:
+        numpy.ndarray: Gradient of the filter of shape ``(out_c, c, 1, 1)``.
+
+    """
+    if sy != 1 or sx != 1:
+        x = x[:, :, ::sy, ::sx]
+    gW = numpy.tensordot(gy, x, ((0, 2, 3), (0, 2, 3)))
+    return gW.reshape(gW.shape + (1, 1))
+
+
+def deconv_1x1_cpu(x, W, sy, sx, h, w):
+    """Computes a 1x1 deconvolution without padding on CPU directly.
+
+    Args:
+        x (numpy.ndarray): Input images of shape ``(n, in_c, in_h, in_w)``.
+        W (numpy.ndarray): Filter of shape ``(in_c, c, 1, 1)``.
+        sy (int): Stride of the filter application along y-axis.
+        sx (int): Stride of the filter application along x-axis.
+        h (int): Height of the output images.
+        w (int): Width of the output images.
+
+    Returns:
+        numpy.ndarray: Output images of shape ``(n, c, h, w)``.
+
+    """
+    n, in_c, in_h, in_w = x.shape
+    c = W.shape[1]
+    y = _matmul_cpu(W.reshape(in_c, c).T, x.reshape(n, in_c, -1))
+    y = y.reshape(n, c, in_h, in_w)
+    if sy == 1 and sx == 1 and (in_h, in_w) == (h, w):
+        return y
+    img = numpy.zeros((n, c, h, w), dtype=y.dtype)
+    view = img[:, :, ::sy, ::sx]
+    out_h = min(view.shape[2], in_h)
+    out_w = min(view.shape[3], in_w)
+    view[:, :, :out_h, :out_w] = y[:, :, :out_h, :out_w]
+    return img
+
+
+def depthwise_conv_cpu(x, W, sy, sx, ph, pw, cover_all=False, dy=1, dx=1):
+    """Computes a depthwise convolution on CPU without im2col.
+
+    It accumulates the products of the filter and a strided view of the input
+    for each position in the filter, so that the patches of the input are not
+    copied.
+
+    Args:
+        x (numpy.ndarray): Input images of shape ``(n, c, h, w)``.
+        W (numpy.ndarray): Filter of shape ``(c, m, kh, kw)``, where ``m`` is
+            the channel multiplier. The ``(k * m + l)``-th output channel is
+            computed from the ``k``-th input channel and ``W[k, l]``.
+        sy (int): Stride of the filter application along y-axis.
+        sx (int): Stride of the filter application along x-axis.
+        ph (int): Spatial padding width along y-axis.
+        pw (int): Spatial padding width along x-axis.
+        cover_all (bool): Use ``cover_all`` option or not.
+        dy (int): Dilation factor along y-axis.
+        dx (int): Dilation factor along x-axis.
+
+    Returns:
+        numpy.ndarray: Output images of shape ``(n, c * m, out_h, out_w)``.
+
+    """
+    n, c = x.shape[:2]
+    _, m, kh, kw = W.shape
+    view = im2col_view_cpu(
+        x, kh, kw, sy, sx, ph, pw, cover_all=cover_all, dy=dy, dx=dx)
+    out_h, out_w = view.shape[4:]
+    y = numpy.zeros((n, c, m, out_h, out_w), dtype=numpy.result_type(x, W))
+    for j in six.moves.range(kh):
+        for i in six.moves.range(kw):
+            y += view[:, :, None, j, i] * W[:, :, j, i, None, None]
+    return y.reshape(n, c * m, out_h, out_w)
+
+
+def depthwise_conv_grad_w_cpu(x, gy, kh, kw, sy, sx, ph, pw, cover_all=False,
+                              dy=1, dx=1):
+    """Computes the gradient of the filter of a depthwise convolution on CPU.
+
+    See :func:`depthwise_conv_cpu` for the layout of the arrays.
+
+    Args:
+        x (numpy.ndarray): Input images of shape ``(n, c, h, w)``.
+        gy (numpy.ndarray): Gradient of the output images of shape
+            ``(n, c * m, out_h, out_w)``.
+        kh (int): Height of the filter.
+        kw (int): Width of the filter.
+        sy (int): Stride of the filter application along y-axis.
+        sx (int): Stride of the filter application along x-axis.
+        ph (int): Spatial padding width along y-axis.
+        pw (int): Spatial padding width along x-axis.
+        cover_all (bool): Use ``cover_all`` option or not.
+        dy (int): Dilation factor along y-axis.
+        dx (int): Dilation factor along x-axis.
+
+    Returns:
+        numpy.ndarray: Gradient of the filter of shape ``(c, m, kh, kw)``.
+
+    """
+    n, c = x.shape[:2]
+    out_h, out_w = gy.shape[2:]
+    view = im2col_view_cpu(
+        x, kh, kw, sy, sx, ph, pw, cover_all=cover_all, dy=dy, dx=dx,
+        out_h=out_h, out_w=out_w)
+    gy = gy.reshape(n, c, -1, out_h, out_w)
+    gW = numpy.empty((c, gy.shape[2], kh, kw),
+                     dtype=numpy.result_type(x, gy))
+    for j in six.moves.range(kh):
+        for i in six.moves.range(kw):
+            gW[:, :, j, i] = numpy.einsum(
+                'ncyx,ncmyx->cm', view[:, :, j, i], gy)
+    return gW
+
+
+def depthwise_deconv_cpu(x, W, sy, sx, ph, pw, h, w, dy=1, dx=1):
+    """Computes a depthwise deconvolution on CPU without col2im.
+
+    This is the transpose of :func:`depthwise_conv_cpu`, i.e., it computes the
+    gradient of the input of a depthwise convolution.
+
+    Args:
+        x (numpy.ndarray): Input images of shape ``(n, c * m, in_h, in_w)``.
+        W (numpy.ndarray): Filter of shape ``(c, m, kh, kw)``.
+        sy (int): Stride of the filter application along y-axis.
+        sx (int): Stride of the filter application along x-axis.
+        ph (int): Spatial padding width along y-axis.
+        pw (int): Spatial padding width along x-axis.
+        h (int): Height of the output images.
+        w (int): Width of the output images.
+        dy (int): Dilation factor along y-axis.
+        dx (int): Dilation factor along x-axis.
+
+    Returns:
+        numpy.ndarray: Output images of shape ``(n, c, h, w)``.
+
+    """
+    n, _, in_h, in_w = x.shape
+    c, m, kh, kw = W.shape
+    x = x.reshape(n, c, m, in_h, in_w)
+    img = numpy.zeros(
+        (n, c,
+         max(h + 2 * ph, (kh - 1) * dy + (in_h - 1) * sy + 1),
+         max(w + 2 * pw, (kw - 1) * dx + (in_w - 1) * sx + 1)),
+        dtype=numpy.result_type(x, W))
+    view = _windows(img, kh, kw, sy, sx, dy, dx, in_h, in_w)
+    for j in six.moves.range(kh):
+        for i in six.moves.range(kw):
+            # The windows at a fixed position in the filter do not overlap.
+            view[:, :, j, i] += numpy.einsum(
+                'ncmyx,cm->ncyx', x, W[:, :, j, i])
+    return img[:, :, ph:h + ph, pw:w + pw]
@@ -1,5 +1,8 @@
+import numpy
+
 import chainer
 from chainer import backend
+from chainer.backends import cuda
 
 
 class CooMatrix(object):
@@ -71,6 +74,110 @@ class CooMatrix(object):
             return x
 
 
+class IndexedRows(object):
+
+    """Gradient of a matrix whose nonzero entries are in some rows only.
+
+    It represents the sum of ``values[i]`` added to the ``rows[i]``-th row of
+    a zero array of ``shape``. The same row may appear more than once until
+    the representation is coalesced by :meth:`coalesce`.
+
+    It is used as the sparse gradient of an embedding matrix (see
+    :class:`~chainer.links.EmbedID`), whose rows are touched only by the IDs
+    in the mini-batch.
+
+    Args:
+        rows (:ref:`ndarray`): Row indices of shape ``(n,)``.
+        values (:ref:`ndarray`): Rows to be added, of shape
+            ``(n,) + shape[1:]``.
+        shape (tuple of int): Shape of the array in dense format.
+        coalesced (bool): If ``True``, the row indices are assumed to be
+            sorted and unique.
+
+    Attributes:
+        ~IndexedRows.rows: Row indices.
+        ~IndexedRows.values: Rows to be added.
+        ~IndexedRows.shape (tuple of int): Shape in dense format.
+        ~IndexedRows.coalesced (bool): ``True`` if the row indices are
+            sorted and unique.
+
+    """
+
+    def __init__(self, rows, values, shape, coalesced=False):
+        shape = tuple(shape)
+        if rows.ndim != 1:
+            raise ValueError('rows must be a 1-dimensional array.')
+        if values.shape != rows.shape + shape[1:]:
+            raise ValueError(
+                'shape of values must be {}: {}'.format(
+                    rows.shape + shape[1:], values.shape))
+        self.rows = rows
+        self.values = values
+        self.shape = shape
+        self.coalesced = coalesced
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    def coalesce(self):
+        """Returns an equivalent object whose rows are sorted and unique.
+
+        The values of the same row are summed up.
+
+        Returns:
+            ~chainer.utils.IndexedRows: Coalesced rows. It is ``self`` if it
+            is already coalesced.
+
+        """
+        if self.coalesced:
+            return self
+        rows = self.rows
+        values = self.values
+        xp = backend.get_array_module(values)
+        if xp is numpy:
+            if rows.size == 0:
+                return IndexedRows(rows, values, self.shape, True)
+            order = numpy.argsort(rows, kind='mergesort')
+            rows = rows[order]
+            starts = numpy.flatnonzero(numpy.r_[True, rows[1:] != rows[:-1]])
+            values = numpy.add.reduceat(values[order], starts, axis=0)
+            rows = rows[starts]
+        else:
+            rows, inverse = xp.unique(rows, return_inverse=True)
+            summed = xp.zeros((len(rows),) + values.shape[1:], values.dtype)
+            cuda.cupyx.scatter_add(summed, inverse, values)
+            values = summed
+        return IndexedRows(rows, values, self.shape, True)
+
+    def concat(self, other):
+        """Returns the sum with another object of the same shape."""
+        if other.shape != self.shape:
+            raise ValueError('shapes mismatch: {} != {}'.format(
+                self.shape, other.shape))
+        xp = backend.get_array_module(self.values)
+        return IndexedRows(
+            xp.concatenate((self.rows, other.rows)),
+            xp.concatenate((self.values, other.values)), self.shape)
+
+    def to_dense(self, out=None):
+        """Returns the array in dense format.
+
+        Args:
+            out (:ref:`ndarray`): If given, the rows are added to this array
+                in place and it is returned.
+
+        """
+        coalesced = self.coalesce()
+        xp = backend.get_array_module(self.values)
+        if out is None:
+            out = xp.zeros(self.shape, dtype=self.values.dtype)
+            out[coalesced.rows] = coalesced.values
+        else:
+            out[coalesced.rows] += coalesced.values
+        return out
+
+
 def to_coo(x, ldnz=None, requires_grad=False):
     """Returns a single or a batch of matrices in COO format.
 
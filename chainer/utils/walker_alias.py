@@ -1,10 +1,95 @@
+import threading
+
 import numpy
+import six
 
 import chainer
 from chainer import backend
 from chainer.backends import cuda
 
 
+def _sample_cpu(threshold, values, shape, random, out=None):
+    thr_dtype = threshold.dtype
+    pb = random.uniform(0, len(threshold), shape)
+    index = pb.astype(numpy.int32)
+    left_right = threshold[index] < (pb.astype(thr_dtype)
+                                     - index.astype(thr_dtype))
+    index *= 2
+    index += left_right
+    return numpy.take(values, index, out=out)
+
+
+def _prefetch_worker(threshold, values, shape, random, queue, free, stop):
+    # It does not refer to the prefetcher, so that the sampler can be
+    # collected while the thread is running.
+    while not stop.is_set():
+        try:
+            buf = free.get_nowait()
+        except six.moves.queue.Empty:
+            buf = numpy.empty(shape, numpy.int32)
+        samples = _sample_cpu(threshold, values, shape, random, buf)
+        while not stop.is_set():
+            try:
+                queue.put(samples, timeout=0.1)
+                break
+            except six.moves.queue.Full:
+                pass
+
+
+class _Prefetcher(object):
+
+    # Draws samples of the last requested shape in a background thread.
+
+    def __init__(self, sampler, size):
+        self.size = size
+        self._threshold = sampler.threshold
+        self._values = sampler.values
+        # Seeded from the global random state for reproducibility.
+        self._random = numpy.random.RandomState(
+            numpy.random.randint(2 ** 31))
+        self._shape = None
+        self._thread = None
+        self._stop = None
+        self._queue = None
+        self._free = None
+
+    def get(self, shape, out):
+        if shape != self._shape:
+            self._restart(shape)
+        samples = self._queue.get()
+        if out is None:
+            return samples
+        out[...] = samples
+        # The buffer is reused by the worker.
+        self._free.put(samples)
+        return out
+
+    def _restart(self, shape):
+        self.close()
+        self._shape = shape
+        self._stop = threading.Event()
+        self._queue = six.moves.queue.Queue(self.size)
+        self._free = six.moves.queue.Queue()
+        self._thread = threading.Thread(
+            target=_prefetch_worker,
+            args=(self._threshold, self._values, shape, self._random,
+                  self._queue, self._free, self._stop))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._shape = None
+
+    def __del__(self):
+        if self._stop is not None:
+            self._stop.set()
+
+
 class WalkerAlias(object):
     """Implementation of Walker's alias method.
 
@@ -17,10 +102,16 @@ class WalkerAlias(object):
         probs (float list): Probabilities of entries. They are normalized with
                             `sum(probs)`.
 
+    On CPU, the samples can be drawn in a background thread in advance, so
+    that the sampling overlaps the other computation. See
+    :meth:`use_prefetch`.
+
     See: `Wikipedia article <https://en.wikipedia.org/wiki/Alias_method>`_
 
     """
 
+    _prefetcher = None
+
     def __init__(self, probs):
         prob = numpy.array(probs, numpy.float32)
         prob /= numpy.sum(prob)
@@ -46,6 +137,12 @@ class WalkerAlias(object):
         self.threshold = threshold
         self.values = values
         self._device = backend.CpuDevice()
+        self._prefetch = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_prefetcher', None)
+        return state
 
     @property
     def device(self):
@@ -66,11 +163,37 @@ class WalkerAlias(object):
 
     def to_device(self, device):
         device = chainer.get_device(device)
+        self._close_prefetcher()
         self.threshold = device.send(self.threshold)
         self.values = device.send(self.values)
         self._device = device
         return self
 
+    def use_prefetch(self, size=2):
+        """Enables or disables drawing the samples in advance on CPU.
+
+        When it is enabled, a background thread draws the samples of the
+        last requested shape and keeps up to ``size`` of them in a queue.
+        The thread is restarted whenever the shape changes. It uses its own
+        random state, which is seeded from the global random state of NumPy
+        when the prefetch is enabled.
+
+        Args:
+            size (int): Maximum number of the samples drawn in advance. If
+                it is ``0``, the prefetch is disabled and the thread is
+                stopped.
+
+        """
+        if size < 0:
+            raise ValueError('size must be non-negative: {}'.format(size))
+        self._close_prefetcher()
+        self._prefetch = size
+
+    def _close_prefetcher(self):
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+
     def to_gpu(self):
         """Make a sampler GPU mode.
 
@@ -83,26 +206,36 @@ class WalkerAlias(object):
         """
         return self.to_device(backend.CpuDevice())
 
-    def sample(self, shape):
+    def sample(self, shape, out=None):
         """Generates a random sample based on given probabilities.
 
         Args:
             shape (tuple of int): Shape of a return value.
+            out (:ref:`ndarray`): Preallocated int32 array of the given shape
+                on the device of the sampler. If it is given, the samples are
+                written into it instead of a new array.
 
         Returns:
             Returns a generated array with the given shape. If a sampler is in
             CPU mode the return value is a :class:`numpy.ndarray` object, and
             if it is in GPU mode the return value is a :class:`cupy.ndarray`
-            object.
+            object. It is ``out`` if given.
         """
         xp = self._device.xp
         with chainer.using_device(self._device):
             if xp is cuda.cupy:
-                return self.sample_gpu(shape)
+                return self.sample_gpu(shape, out)
+            elif xp is numpy and self._prefetch:
+                if self._prefetcher is None:
+                    self._prefetcher = _Prefetcher(self, self._prefetch)
+                return self._prefetcher.get(tuple(shape), out)
             else:
-                return self.sample_xp(xp, shape)
+                return self.sample_xp(xp, shape, out)
 
-    def sample_xp(self, xp, shape):
+    def sample_xp(self, xp, shape, out=None):
+        if xp is numpy:
+            return _sample_cpu(
+                self.threshold, self.values, shape, numpy.random, out)
         thr_dtype = self.threshold.dtype
         pb = xp.random.uniform(0, len(self.threshold), shape)
         index = pb.astype(numpy.int32)
@@ -110,10 +243,17 @@ class WalkerAlias(object):
             self.threshold[index]
             < (pb.astype(thr_dtype) - index.astype(thr_dtype)))
         left_right = left_right.astype(numpy.int32)
-        return self.values[index * 2 + left_right]
+        samples = self.values[index * 2 + left_right]
+        if out is None:
+            return samples
+        out[...] = samples
+        return out
 
-    def sample_gpu(self, shape):
+    def sample_gpu(self, shape, out=None):
         ps = cuda.cupy.random.uniform(size=shape, dtype=numpy.float32)
+        args = (ps, self.threshold, self.values, len(self.threshold))
+        if out is not None:
+            args += (out,)
         vs = cuda.elementwise(
             'T ps, raw T threshold , raw S values, int32 b',
             'int32 vs',
@@ -128,5 +268,5 @@ class WalkerAlias(object):
             vs = values[index * 2 + lr];
             ''',
             'walker_alias_sample'
-        )(ps, self.threshold, self.values, len(self.threshold))
+        )(*args)
         return vs
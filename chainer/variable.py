@@ -1421,7 +1421,9 @@ class Variable(object):
             if loss_scale is not None:
                 self.grad *= loss_scale
 
-        with chainer.using_config('enable_backprop', enable_double_backprop):
+        with chainer.using_config('enable_backprop', enable_double_backprop), \
+                _backprop_utils.sparse_grad_context(
+                    _backprop_utils.SparseGradContext(loss_scale)):
             _backprop_to_all([self], retain_grad, loss_scale)
 
     def reshape(self, *shape):
@@ -1578,6 +1580,10 @@ def _backprop_to_all(outputs, retain_grad, loss_scale):
 
     is_debug = chainer.is_debug()
     base_hooks = chainer.get_function_hooks().values()
+    releaser = None
+    if (chainer.config.free_retained_on_backward
+            and not chainer.config.enable_backprop):
+        releaser = _backprop_utils.RetainedDataReleaser(root_nodes)
     while cand_funcs:
         _, _, func = heapq.heappop(cand_funcs)
         inputs = func.inputs
@@ -1587,6 +1593,8 @@ def _backprop_to_all(outputs, retain_grad, loss_scale):
         outputs = [y() for y in func.outputs]  # access via weak ref
         out_grad = tuple([grads.pop(y) for y in outputs])
         if not target_input_indexes:
+            if releaser is not None:
+                releaser.release(func)
             continue
 
         in_data = [x.data for x in inputs]
@@ -1622,6 +1630,10 @@ def _backprop_to_all(outputs, retain_grad, loss_scale):
                 hook.backward_postprocess(
                     func, tuple(in_data), tuple(out_grad_array))
 
+        del in_data  # to reduce memory usage
+        if releaser is not None:
+            releaser.release(func)
+
         for y, gy in six.moves.zip(outputs, out_grad):
             if y is not None and y not in root_nodes:
                 y._set_grad_var_if_available(
@@ -1650,6 +1662,8 @@ def _backprop_to_all(outputs, retain_grad, loss_scale):
             x_var._set_grad_var_without_check(gx)
             x_var._loss_scale = loss_scale
     grads.assert_no_grads()
+    if releaser is not None:
+        releaser.report()
 
 
 class Parameter(Variable):
@@ -1698,6 +1712,7 @@ class Parameter(Variable):
     initializer = None  # type: tp.Optional[tp.Union[tp.Optional[types.AbstractInitializer], types.NdArray]] # NOQA
     # TODO(okapies): fix the behavior when shape is None and remove NdArray
     _grad_initializer = None  # type: tp.Optional[types.AbstractInitializer]
+    _sparse_grad = None
 
     def __init__(self, initializer=None, shape=None, name=None):
         # type: (tp.Optional[types.InitializerSpec], tp.Optional[types.ShapeSpec], tp.Optional[str]) -> None # NOQA
@@ -1753,6 +1768,7 @@ class Parameter(Variable):
     def to_chainerx(self):
         if not chainerx.is_available():
             raise RuntimeError('ChainerX is not available.')
+        self._densify_grad()
 
         # Derive the target ChainerX device from the array if it is
         # initialized. Otherwise, from the current initial device.
@@ -1788,6 +1804,15 @@ class Parameter(Variable):
 
     def to_device(self, device):
         device = chainer.get_device(device)
+        sparse_grad = self._sparse_grad
+        if sparse_grad is not None:
+            if not isinstance(device, (backend.CpuDevice, cuda.GpuDevice)):
+                self._densify_grad()
+            else:
+                self._sparse_grad = type(sparse_grad)(
+                    device.send(sparse_grad.rows),
+                    device.send(sparse_grad.values), sparse_grad.shape,
+                    sparse_grad.coalesced)
         if self.data is None and self._initial_device != device:
             self._data = [None]  # Renew placeholder to break sharing
             self._has_chainerx_array = False
@@ -1796,15 +1821,72 @@ class Parameter(Variable):
 
     def cleargrad(self):
         super(Parameter, self).cleargrad()
+        self._sparse_grad = None
         if self.array is None:
             self._grad_initializer = None
 
     def zerograd(self):
         super(Parameter, self).zerograd()
+        self._sparse_grad = None
         if self.array is None:
             dtype = getattr(self.initializer, 'dtype', None)
             self._grad_initializer = initializers.Zero(dtype)
 
+    @property
+    def sparse_grad(self):
+        """Gradient of the rows touched by sparse backward computations.
+
+        Functions like :func:`~chainer.functions.embed_id` with
+        ``sparse_grad=True`` accumulate the gradient of the parameter to this
+        :class:`~chainer.utils.IndexedRows` object instead of :attr:`grad`,
+        so that the optimizers update only the touched rows. The gradient of
+        the parameter is the sum of :attr:`grad` (if any) and this object.
+
+        """
+        return self._sparse_grad
+
+    @sparse_grad.setter
+    def sparse_grad(self, indexed_rows):
+        if indexed_rows is not None and indexed_rows.shape != self.shape:
+            raise ValueError(
+                'shape of the sparse gradient must be {}: {}'.format(
+                    self.shape, indexed_rows.shape))
+        self._sparse_grad = indexed_rows
+
+    def add_sparse_grad(self, indexed_rows, loss_scale=None):
+        """Accumulates a sparse gradient to :attr:`sparse_grad`.
+
+        Args:
+            indexed_rows (~chainer.utils.IndexedRows): Gradient to be added.
+            loss_scale (float): Loss scale of the backprop which computed the
+                gradient. It is recorded as that of the dense gradient, so
+                that the gradient is unscaled by the optimizer.
+
+        """
+        self._loss_scale = loss_scale
+        if self._sparse_grad is None:
+            self.sparse_grad = indexed_rows
+        else:
+            self._sparse_grad = self._sparse_grad.concat(indexed_rows)
+
+    def _densify_grad(self):
+        # Merges the sparse gradient into the dense gradient.
+        sparse_grad = self._sparse_grad
+        if sparse_grad is None:
+            return
+        self._sparse_grad = None
+        grad = self.grad
+        if grad is None:
+            self.grad = sparse_grad.to_dense()
+        else:
+            sparse_grad.to_dense(out=grad)
+
+    def addgrad(self, var):
+        if isinstance(var, Parameter):
+            var._densify_grad()
+        self._densify_grad()
+        super(Parameter, self).addgrad(var)
+
     def initialize(self, shape):
         """Initializes the uninitialized variable.
 
@@ -1,6 +1,7 @@
 import chainer
 
 from chainermn import communicators  # NOQA
+from chainermn import compression  # NOQA
 from chainermn import datasets  # NOQA
 from chainermn import extensions  # NOQA
 from chainermn import functions  # NOQA
@@ -29,11 +29,13 @@ def create_communicator(
     +---------------+---+---+--------+--------------------------------------+
     |naive          |OK |OK |        |Testing on CPU mode                   |
     +---------------+---+---+--------+--------------------------------------+
+    |bucketed       |OK |   |        |Training on CPU mode                  |
+    +---------------+---+---+--------+--------------------------------------+
 
     Args:
-        communicator_name: The name of communicator (``naive``, ``flat``,
-          ``hierarchical``, ``two_dimensional``, ``pure_nccl``, or
-          ``single_node``)
+        communicator_name: The name of communicator (``naive``,
+          ``bucketed``, ``flat``, ``hierarchical``, ``two_dimensional``,
+          ``pure_nccl``, or ``single_node``)
         mpi_comm: MPI4py communicator
         allreduce_grad_dtype: Data type of gradient used in All-Reduce.
           If ``None``, the dtype of a model is used.
@@ -69,6 +71,11 @@ def create_communicator(
             import NaiveCommunicator
         return NaiveCommunicator(mpi_comm=mpi_comm)
 
+    elif communicator_name == 'bucketed':
+        from chainermn.communicators.bucketed_communicator \
+            import BucketedCommunicator
+        return BucketedCommunicator(mpi_comm=mpi_comm)
+
     elif communicator_name == 'flat':
         from chainermn.communicators.flat_communicator \
             import FlatCommunicator
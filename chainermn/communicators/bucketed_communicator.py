@@ -0,0 +1,122 @@
+import mpi4py.MPI
+import numpy as np
+
+import chainer.backend
+from chainermn.communicators import _memory_utility
+from chainermn.communicators import mpi_communicator_base
+
+
+_default_bucket_size = 4 * 1024 * 1024
+
+
+def _buffer_dtype(dtype):
+    # MPI does not support half-precision floats, which are reduced in
+    # single precision.
+    if dtype == np.float16:
+        return np.dtype(np.float32)
+    return np.dtype(dtype)
+
+
+class _Bucket(object):
+
+    """Host buffer which holds the gradients of some parameters."""
+
+    def __init__(self, params, dtype):
+        self.params = params
+        self.buffer = np.empty(
+            sum(param.grad.size for param in params), dtype=dtype)
+
+    def pack(self):
+        offset = 0
+        for param in self.params:
+            grad = param.grad
+            self.buffer[offset:offset + grad.size] = grad.ravel()
+            offset += grad.size
+
+    def unpack(self, scale):
+        # The gradients are averaged while being copied back.
+        offset = 0
+        for param in self.params:
+            grad = param.grad
+            np.multiply(
+                self.buffer[offset:offset + grad.size].reshape(grad.shape),
+                scale, out=grad, casting='unsafe')
+            offset += grad.size
+
+
+class BucketedCommunicator(mpi_communicator_base.MpiCommunicatorBase):
+
+    """Communicator which reduces gradients on CPU in buckets.
+
+    The gradients are packed into host buffers (buckets) of about
+    ``bucket_size`` bytes. The parameters are assigned to the buckets in the
+    reverse order of their names, which is common to all the processes. Each
+    bucket is reduced by a non-blocking ``Iallreduce`` as soon as it is
+    packed, so that the reduction overlaps with packing the following
+    buckets, and it is unpacked as soon as its reduction completes. The
+    gradients are averaged while they are unpacked.
+
+    Args:
+        mpi_comm: MPI4py communicator.
+        bucket_size (int): Size of the buckets in bytes. A parameter larger
+            than this size has a bucket of its own.
+
+    """
+
+    def __init__(self, mpi_comm, bucket_size=_default_bucket_size):
+        super(BucketedCommunicator, self).__init__(mpi_comm)
+        if bucket_size <= 0:
+            raise ValueError(
+                'bucket_size must be positive: {}'.format(bucket_size))
+        self.bucket_size = bucket_size
+        self._buckets = []
+        self._buckets_key = None
+
+    def _get_buckets(self, params):
+        key = tuple((id(param), param.grad.shape, param.grad.dtype)
+                    for param in params)
+        if key == self._buckets_key:
+            return self._buckets
+
+        buckets = []
+        bucket_params = []
+        bucket_dtype = None
+        n_bytes = 0
+        for param in reversed(params):
+            dtype = _buffer_dtype(param.grad.dtype)
+            size = param.grad.size * dtype.itemsize
+            if bucket_params and (dtype != bucket_dtype
+                                  or n_bytes + size > self.bucket_size):
+                buckets.append(_Bucket(bucket_params, bucket_dtype))
+                bucket_params = []
+                n_bytes = 0
+            bucket_params.append(param)
+            bucket_dtype = dtype
+            n_bytes += size
+        if bucket_params:
+            buckets.append(_Bucket(bucket_params, bucket_dtype))
+
+        self._buckets = buckets
+        self._buckets_key = key
+        return buckets
+
+    def allreduce_grad(self, model):
+        params = _memory_utility.extract_params_set_grad(model)
+        for param in params:
+            if chainer.backend.get_array_module(param.grad) is not np:
+                raise ValueError(
+                    'BucketedCommunicator only supports gradients on CPU')
+        buckets = self._get_buckets(params)
+        if not buckets:
+            return
+
+        requests = []
+        for bucket in buckets:
+            bucket.pack()
+            requests.append(self.mpi_comm.Iallreduce(
+                mpi4py.MPI.IN_PLACE, bucket.buffer))
+
+        scale = 1.0 / self.size
+        for _ in range(len(requests)):
+            i = mpi4py.MPI.Request.Waitany(requests)
+            buckets[i].unpack(scale)
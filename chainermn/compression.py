@@ -0,0 +1,249 @@
+import numpy
+
+import chainer.backend
+from chainer import serializer as serializer_module
+
+
+def _allgather(mpi_comm, array):
+    out = numpy.empty((mpi_comm.size,) + array.shape, dtype=array.dtype)
+    mpi_comm.Allgather(array, out)
+    return out
+
+
+_fp16_sum_op = None
+
+
+def _get_fp16_sum_op():
+    # MPI does not support half-precision floats, which are reduced as
+    # 16-bit integers by this operation.
+    global _fp16_sum_op
+    if _fp16_sum_op is None:
+        import mpi4py.MPI
+
+        def fp16_sum(inbuf, outbuf, datatype):
+            out = numpy.frombuffer(outbuf, dtype=numpy.float16)
+            out += numpy.frombuffer(inbuf, dtype=numpy.float16)
+
+        _fp16_sum_op = mpi4py.MPI.Op.Create(fp16_sum, commute=True)
+    return _fp16_sum_op
+
+
+class GradientCompression(object):
+
+    """Base class of gradient compression methods.
+
+    A gradient compression method reduces the gradients of a model over the
+    processes by exchanging compressed representations of them, instead of
+    the gradients themselves. It works with any MPI-based communicator.
+
+    The error of the compression is kept as a residual of each parameter,
+    which is added to the gradient of the next iteration (error feedback),
+    so that the whole gradient is eventually applied. The residuals are part
+    of the state of the multi-node optimizer, and are saved and loaded by
+    its :meth:`serialize` method.
+
+    Every compression method has to implement :meth:`_exchange`.
+
+    Args:
+        error_feedback (bool): If ``True``, the residuals are kept and added
+            to the gradients.
+
+    Attributes:
+        payload_bytes (int): Total number of bytes sent by this process as
+            the compressed gradients.
+
+    """
+
+    def __init__(self, error_feedback=True):
+        self.error_feedback = error_feedback
+        self.residuals = {}
+        self.payload_bytes = 0
+
+    def allreduce_grad(self, communicator, model):
+        """Averages the gradients of a model over the processes.
+
+        Args:
+            communicator: ChainerMN communicator.
+            model (chainer.Link): Model whose gradients are reduced.
+
+        """
+        params = [(name, param) for name, param in sorted(model.namedparams())
+                  if param.grad is not None and param.grad.size > 0]
+        if not params:
+            return
+        sizes = [param.grad.size for _, param in params]
+        v = numpy.empty(sum(sizes), dtype=numpy.float32)
+        offset = 0
+        for (name, param), size in zip(params, sizes):
+            grad = chainer.backend.CpuDevice().send(param.grad)
+            v[offset:offset + size] = grad.ravel()
+            residual = self.residuals.get(name)
+            if (self.error_feedback and residual is not None
+                    and residual.size == size):
+                v[offset:offset + size] += residual.ravel()
+            offset += size
+
+        total, local = self._exchange(communicator.mpi_comm, v, sizes)
+        total *= 1.0 / communicator.size
+
+        offset = 0
+        for (name, param), size in zip(params, sizes):
+            grad = param.grad
+            if self.error_feedback:
+                self.residuals[name] = (
+                    v[offset:offset + size]
+                    - local[offset:offset + size]).reshape(grad.shape)
+            mean = total[offset:offset + size].reshape(grad.shape)
+            grad[...] = chainer.backend.get_device_from_array(grad).send(
+                mean.astype(grad.dtype, copy=False))
+            offset += size
+
+    def _exchange(self, mpi_comm, v, sizes):
+        """Exchanges the compressed gradients.
+
+        Args:
+            mpi_comm: MPI4py communicator.
+            v (numpy.ndarray): Concatenated gradients of this process with
+                the residuals added.
+            sizes (list of ints): Sizes of the gradients of the parameters.
+
+        Returns:
+            tuple: The sum of the decompressed gradients of all the processes
+            and the decompressed gradients of this process.
+
+        """
+        raise NotImplementedError
+
+    def serialize(self, serializer, model):
+        """Serializes the residuals.
+
+        Args:
+            serializer (~chainer.AbstractSerializer): Serializer object.
+            model (chainer.Link): Model of the residuals.
+
+        """
+        for name, param in sorted(model.namedparams()):
+            key = name.lstrip('/')
+            if isinstance(serializer, serializer_module.Serializer):
+                residual = self.residuals.get(name)
+                if residual is None:
+                    residual = numpy.zeros(param.shape, dtype=numpy.float32)
+                serializer(key, residual)
+            else:
+                try:
+                    residual = serializer(key, None)
+                except KeyError:
+                    # Snapshots taken without compression have no residuals.
+                    continue
+                if residual is not None:
+                    self.residuals[name] = numpy.asarray(
+                        residual, dtype=numpy.float32)
+
+
+class FP16Compression(GradientCompression):
+
+    """Gradient compression by casting to half precision.
+
+    The gradients divided by the number of processes are cast to
+    half-precision floats and summed up by ``Allreduce``, which halves the
+    bytes sent compared to single precision.
+
+    Args:
+        error_feedback (bool): If ``True``, the residuals are kept and added
+            to the gradients.
+
+    """
+
+    def _exchange(self, mpi_comm, v, sizes):
+        import mpi4py.MPI
+
+        size = mpi_comm.size
+        half = (v * (1.0 / size)).astype(numpy.float16)
+        local = half.astype(numpy.float32) * size
+        mpi_comm.Allreduce(
+            mpi4py.MPI.IN_PLACE, [half.view(numpy.int16), mpi4py.MPI.SHORT],
+            op=_get_fp16_sum_op())
+        self.payload_bytes += half.nbytes
+        return half.astype(numpy.float32) * size, local
+
+
+class TopKCompression(GradientCompression):
+
+    """Gradient compression by top-k sparsification.
+
+    Only the ``ratio`` of the elements of the largest magnitudes of each
+    gradient are sent as pairs of indices and values by ``Allgather``. The
+    other elements are kept as the residuals.
+
+    Args:
+        ratio (float): Ratio of the elements sent. At least one element of
+            each gradient is sent.
+        error_feedback (bool): If ``True``, the residuals are kept and added
+            to the gradients.
+
+    """
+
+    def __init__(self, ratio=0.01, error_feedback=True):
+        if not 0 < ratio <= 1:
+            raise ValueError('ratio must be in (0, 1]: {}'.format(ratio))
+        super(TopKCompression, self).__init__(error_feedback)
+        self.ratio = ratio
+
+    def _exchange(self, mpi_comm, v, sizes):
+        index_dtype = numpy.int32 if v.size < 2 ** 31 else numpy.int64
+        indices = []
+        offset = 0
+        for size in sizes:
+            k = max(1, int(numpy.ceil(size * self.ratio)))
+            s = v[offset:offset + size]
+            if k < size:
+                top = numpy.argpartition(numpy.abs(s), size - k)[size - k:]
+            else:
+                top = numpy.arange(size)
+            indices.append(top + offset)
+            offset += size
+        indices = numpy.concatenate(indices).astype(index_dtype)
+        values = v[indices]
+
+        local = numpy.zeros_like(v)
+        local[indices] = values
+        all_indices = _allgather(mpi_comm, indices)
+        all_values = _allgather(mpi_comm, values)
+        self.payload_bytes += indices.nbytes + values.nbytes
+        total = numpy.bincount(
+            all_indices.ravel(), weights=all_values.ravel(),
+            minlength=v.size).astype(numpy.float32)
+        return total, local
+
+
+class OneBitCompression(GradientCompression):
+
+    """Gradient compression by 1-bit quantization.
+
+    Each element of a gradient is quantized to its sign, and sent as a bit
+    by ``Allgather``. The signs of each gradient are scaled by the mean of
+    the magnitudes of its elements on decompression.
+
+    Args:
+        error_feedback (bool): If ``True``, the residuals are kept and added
+            to the gradients.
+
+    """
+
+    def _exchange(self, mpi_comm, v, sizes):
+        bounds = numpy.cumsum([0] + sizes)
+        scales = (numpy.add.reduceat(numpy.abs(v), bounds[:-1])
+                  / numpy.asarray(sizes)).astype(numpy.float32)
+        signs = v >= 0
+        bits = numpy.packbits(signs)
+
+        element_scales = numpy.repeat(scales, sizes)
+        local = numpy.where(signs, element_scales, -element_scales)
+        all_bits = _allgather(mpi_comm, bits)
+        all_scales = _allgather(mpi_comm, scales)
+        self.payload_bytes += bits.nbytes + scales.nbytes
+        all_signs = numpy.unpackbits(all_bits, axis=1)[:, :v.size]
+        all_signs = all_signs.astype(numpy.float32) * 2 - 1
+        total = (all_signs * numpy.repeat(all_scales, sizes, axis=1)).sum(
+            axis=0)
+        return total, local
@@ -2,15 +2,26 @@ import chainer
 import copy
 
 
+def _densify_sparse_grads(target):
+    # The communicators only reduce the dense gradients, and the rows of the
+    # sparse gradients (see chainer.Parameter.sparse_grad) differ among the
+    # processes, so the sparse gradients are merged into the dense ones.
+    for param in target.params():
+        if getattr(param, 'sparse_grad', None) is not None:
+            param._densify_grad()
+
+
 class _MultiNodeOptimizer(object):
 
-    def __init__(self, actual_optimizer, communicator):
+    def __init__(self, actual_optimizer, communicator, compression=None):
         super(_MultiNodeOptimizer, self).__setattr__(
             'communicator', communicator)
         super(_MultiNodeOptimizer, self).__setattr__(
             'actual_optimizer', actual_optimizer)
         super(_MultiNodeOptimizer, self).__setattr__(
             'target_params', [])
+        super(_MultiNodeOptimizer, self).__setattr__(
+            'compression', compression)
 
     def update(self, lossfun=None, *args, **kwds):
         target = self.target
@@ -27,7 +38,11 @@ class _MultiNodeOptimizer(object):
         if self.is_changed(target):
             self.communicator.bcast_data(target)
         else:
-            self.communicator.allreduce_grad(target)
+            _densify_sparse_grads(target)
+            if self.compression is None:
+                self.communicator.allreduce_grad(target)
+            else:
+                self.compression.allreduce_grad(self.communicator, target)
             self.actual_optimizer.update(None, *args, **kwds)
 
     def is_changed(self, target):
@@ -47,6 +62,12 @@ class _MultiNodeOptimizer(object):
         self.actual_optimizer.setup(link)
         return self
 
+    def serialize(self, serializer):
+        self.actual_optimizer.serialize(serializer)
+        if self.compression is not None:
+            self.compression.serialize(
+                serializer['compression_residual'], self.target)
+
     def __getattr__(self, attr_name):
         return getattr(self.actual_optimizer, attr_name)
 
@@ -95,6 +116,7 @@ class _DoubleBufferingOptimizer(object):
                 'needs_update', False)
         else:
             self.wait()
+            _densify_sparse_grads(target)
             self.swap_grad(self.target_params_list[0],
                            self.target_params_list[1])
             self.allreduce_grad_async()
@@ -142,7 +164,7 @@ class _DoubleBufferingOptimizer(object):
 
 
 def create_multi_node_optimizer(actual_optimizer, communicator,
-                                double_buffering=False):
+                                double_buffering=False, compression=None):
     """Create a multi node optimizer from a Chainer optimizer.
 
     Args:
@@ -156,9 +178,22 @@ def create_multi_node_optimizer(actual_optimizer, communicator,
              the gradients of the previous iteration are used
              for update. This flag is supported by
              ``PureNcclCommunicator`` only.
+        compression: Gradient compression method
+             (e.g., :class:`chainermn.compression.TopKCompression`).
+             If it is given, the gradients are compressed to be reduced
+             instead of using ``allreduce_grad`` of the communicator,
+             and the residuals of the compression are saved as a part
+             of the state of the optimizer. It requires an MPI-based
+             communicator, and cannot be used with double buffering.
     Returns:
         The multi node optimizer based on ``actual_optimizer``.
     """
+    if compression is not None:
+        if double_buffering:
+            raise ValueError(
+                'Gradient compression does not support double buffering.')
+        return _MultiNodeOptimizer(
+            actual_optimizer, communicator, compression=compression)
     if double_buffering:
         from chainermn.communicators.pure_nccl_communicator \
             import PureNcclCommunicator
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+from __future__ import print_function
+
+import argparse
+import time
+
+import numpy as np
+
+import chainer
+import chainer.functions as F
+import chainer.links as L
+
+import chainermn
+from chainermn import compression
+
+
+class MLP(chainer.Chain):
+
+    def __init__(self, n_units, n_out):
+        super(MLP, self).__init__(
+            l1=L.Linear(784, n_units),
+            l2=L.Linear(n_units, n_units),
+            l3=L.Linear(n_units, n_out),
+        )
+
+    def __call__(self, x):
+        h1 = F.relu(self.l1(x))
+        h2 = F.relu(self.l2(h1))
+        return self.l3(h2)
+
+
+def create_compression(name, topk_ratio):
+    if name == 'none':
+        return None
+    elif name == 'fp16':
+        return compression.FP16Compression()
+    elif name == 'topk':
+        return compression.TopKCompression(ratio=topk_ratio)
+    elif name == 'onebit':
+        return compression.OneBitCompression()
+    raise ValueError('unknown compression: {}'.format(name))
+
+
+def wire_bytes(name, payload, size):
+    # Estimated bytes sent by each process: ring all-reduce for the dense
+    # methods, and all-gather for the sparse and quantized ones.
+    if name in ('none', 'fp16'):
+        return 2.0 * (size - 1) / size * payload
+    return (size - 1) * payload
+
+
+def run(comm, name, args, train, test):
+    np.random.seed(args.seed)
+    model = L.Classifier(MLP(args.unit, 10))
+    optimizer = chainermn.create_multi_node_optimizer(
+        chainer.optimizers.MomentumSGD(args.lr), comm,
+        compression=create_compression(name, args.topk_ratio))
+    optimizer.setup(model)
+
+    train_iter = chainer.iterators.SerialIterator(
+        train, args.batchsize, shuffle=True)
+    n_params = sum(param.size for param in model.params())
+    losses = []
+    elapsed = 0.0
+    for i in range(args.iteration + 1):
+        x, t = chainer.dataset.concat_examples(train_iter.next())
+        start = time.time()
+        # The first update broadcasts the initial parameters.
+        optimizer.update(model, x, t)
+        if i > 0:
+            elapsed += time.time() - start
+            losses.append(float(model.loss.array))
+
+    with chainer.using_config('train', False), \
+            chainer.no_backprop_mode():
+        x, t = chainer.dataset.concat_examples(test)
+        accuracy = float(F.accuracy(model.predictor(x), t).array)
+    accuracy = comm.allreduce_obj(accuracy) / comm.size
+
+    if optimizer.compression is None:
+        payload = n_params * 4.0
+    else:
+        payload = optimizer.compression.payload_bytes / float(args.iteration)
+    return {
+        'payload': payload,
+        'wire': wire_bytes(name, payload, comm.size),
+        'loss': np.mean(losses[-args.loss_window:]),
+        'accuracy': accuracy,
+        'time': elapsed / args.iteration,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='ChainerMN benchmark: gradient compression')
+    parser.add_argument('--batchsize', '-b', type=int, default=100,
+                        help='Number of images in each mini-batch')
+    parser.add_argument('--communicator', type=str, default='naive',
+                        help='Type of communicator')
+    parser.add_argument('--iteration', '-i', type=int, default=1000,
+                        help='Number of iterations for each method')
+    parser.add_argument('--lr', type=float, default=0.01,
+                        help='Learning rate')
+    parser.add_argument('--loss-window', type=int, default=100,
+                        help='Number of last iterations to average the loss')
+    parser.add_argument('--method', '-m', nargs='+',
+                        default=['none', 'fp16', 'topk', 'onebit'],
+                        help='Compression methods to compare')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed of the initial parameters')
+    parser.add_argument('--topk-ratio', type=float, default=0.01,
+                        help='Ratio of the elements sent by top-k')
+    parser.add_argument('--unit', '-u', type=int, default=1000,
+                        help='Number of units')
+    args = parser.parse_args()
+
+    comm = chainermn.create_communicator(args.communicator)
+
+    if comm.rank == 0:
+        train, test = chainer.datasets.get_mnist()
+    else:
+        train, test = None, None
+    train = chainermn.scatter_dataset(train, comm, shuffle=True, seed=0)
+    test = chainermn.scatter_dataset(test, comm, shuffle=True, seed=0)
+
+    results = [(name, run(comm, name, args, train, test))
+               for name in args.method]
+
+    if comm.rank == 0:
+        print('Num process: {}'.format(comm.size))
+        print('{:<8} {:>14} {:>14} {:>10} {:>10} {:>10}'.format(
+            'method', 'payload [B]', 'wire [B]', 'loss', 'accuracy',
+            'time [s]'))
+        for name, r in results:
+            print('{:<8} {:>14.0f} {:>14.0f} {:>10.4f} {:>10.4f} '
+                  '{:>10.4f}'.format(name, r['payload'], r['wire'],
+                                     r['loss'], r['accuracy'], r['time']))
+
+
+if __name__ == '__main__':
+    main()
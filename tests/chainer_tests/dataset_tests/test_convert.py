@@ -321,6 +321,57 @@ class TestConcatExamplesWithBuiltInTypes(unittest.TestCase):
             numpy.float64)
 
 
+class TestColumnarBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.rand(3, 2).astype(numpy.float32)
+        self.t = numpy.arange(3, dtype=numpy.int32)
+
+    def test_tuple(self):
+        batch = dataset.ColumnarBatch((self.x, self.t))
+        self.assertEqual(len(batch), 3)
+        x, t = batch[1]
+        numpy.testing.assert_array_equal(x, self.x[1])
+        self.assertEqual(t, self.t[1])
+        self.assertEqual(len(list(batch)), 3)
+        self.assertEqual(len(batch[1:]), 2)
+
+        x, t = dataset.concat_examples(batch)
+        self.assertIs(x, self.x)
+        self.assertIs(t, self.t)
+
+    def test_dict(self):
+        batch = dataset.ColumnarBatch({'x': self.x, 't': self.t})
+        example = batch[-1]
+        numpy.testing.assert_array_equal(example['x'], self.x[2])
+        self.assertEqual(example['t'], self.t[2])
+
+        result = dataset.concat_examples(batch, -1)
+        self.assertIs(result['x'], self.x)
+        self.assertIs(result['t'], self.t)
+
+    def test_array(self):
+        batch = dataset.ColumnarBatch(self.x)
+        numpy.testing.assert_array_equal(batch[0], self.x[0])
+        self.assertIs(dataset.concat_examples(batch), self.x)
+
+    def test_index_out_of_range(self):
+        batch = dataset.ColumnarBatch(self.x)
+        with self.assertRaises(IndexError):
+            batch[3]
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            dataset.ColumnarBatch((self.x, self.t[:2]))
+
+    @attr.gpu
+    def test_concat_to_gpu(self):
+        batch = dataset.ColumnarBatch((self.x, self.t))
+        x, t = dataset.concat_examples(batch, 0)
+        self.assertIsInstance(x, cuda.ndarray)
+        numpy.testing.assert_array_equal(cuda.to_cpu(x), self.x)
+
+
 def get_xp(gpu):
     if gpu:
         return cuda.cupy
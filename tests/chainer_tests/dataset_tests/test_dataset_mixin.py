@@ -79,4 +79,31 @@ class TestDatasetMixin(unittest.TestCase):
                              ds.values[i * 4096:(i + 1) * 4096])
 
 
+class TestGetExamples(unittest.TestCase):
+
+    def test_dataset_mixin(self):
+        ds = SimpleDataset([1, 2, 3, 4, 5])
+        self.assertEqual(ds.get_examples(numpy.array([4, 0, 0])), [5, 1, 1])
+        self.assertEqual(dataset.get_examples(ds, [1, 2]), [2, 3])
+
+    def test_ndarray(self):
+        x = numpy.arange(10).reshape(5, 2)
+        batch = dataset.get_examples(x, [3, 1])
+        self.assertIsInstance(batch, dataset.ColumnarBatch)
+        numpy.testing.assert_array_equal(batch.arrays, x[[3, 1]])
+
+    def test_object_ndarray(self):
+        x = numpy.empty(3, dtype=object)
+        x[:] = [[1], [2, 3], []]
+        self.assertEqual(dataset.get_examples(x, [1, 0]), [[2, 3], [1]])
+
+    def test_empty_indices(self):
+        x = numpy.arange(10).reshape(5, 2)
+        batch = dataset.get_examples(x, [])
+        self.assertEqual(len(batch), 0)
+
+    def test_list(self):
+        self.assertEqual(dataset.get_examples([1, 2, 3], [2, 0]), [3, 1])
+
+
 testing.run_module(__name__, __file__)
@@ -3,10 +3,29 @@ import six
 import unittest
 
 
+from chainer import dataset
+from chainer import datasets
 from chainer.datasets import ConcatenatedDataset
+from chainer import iterators
 from chainer import testing
 
 
+class IntIndexDataset(object):
+
+    # Dataset which only supports integer indices.
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        if not isinstance(i, six.integer_types + (np.integer,)):
+            raise TypeError('index must be an integer')
+        return self.values[i]
+
+
 @testing.parameterize(
     # basic usage
     {'datasets': (
@@ -60,5 +79,73 @@ class TestConcatenatedDataset(unittest.TestCase):
                 concatenated_slice, expected_slice):
             np.testing.assert_equal(concatenated, expected)
 
+    def test_concatenated_dataset_get_examples(self):
+        n = len(self.expected_dataset)
+        if n == 0:
+            self.assertEqual(self.concatenated_dataset.get_examples([]), [])
+            return
+        indices = np.random.randint(0, n, 2 * n)
+        batch = self.concatenated_dataset.get_examples(indices)
+        self.assertEqual(len(batch), len(indices))
+        for example, i in six.moves.zip(batch, indices):
+            np.testing.assert_equal(example, self.expected_dataset[i])
+
+    def test_concatenated_dataset_overrun(self):
+        n = len(self.expected_dataset)
+        with self.assertRaises(IndexError):
+            self.concatenated_dataset[n]
+        with self.assertRaises(IndexError):
+            self.concatenated_dataset.get_examples([0, n])
+        with self.assertRaises(IndexError):
+            self.concatenated_dataset.get_examples([-1])
+
+
+class TestConcatenatedDatasetGetExamples(unittest.TestCase):
+
+    def setUp(self):
+        self.xs = [np.random.uniform(size=(n, 3)).astype(np.float32)
+                   for n in (4, 0, 7, 1)]
+        self.x = np.concatenate(self.xs)
+        self.t = np.arange(len(self.x), dtype=np.int32)
+
+    def test_columnar(self):
+        ds = ConcatenatedDataset(*self.xs)
+        indices = np.array([11, 0, 5, 3, 4, 11])
+        batch = ds.get_examples(indices)
+        self.assertIsInstance(batch, dataset.ColumnarBatch)
+        np.testing.assert_array_equal(batch.arrays, self.x[indices])
+
+    def test_columnar_tuple(self):
+        ts = np.split(self.t, [4, 4, 11])
+        ds = ConcatenatedDataset(*[
+            datasets.TupleDataset(x, t) for x, t in zip(self.xs, ts)])
+        indices = np.array([6, 1, 11, 2])
+        x, t = dataset.concat_examples(ds.get_examples(indices))
+        np.testing.assert_array_equal(x, self.x[indices])
+        np.testing.assert_array_equal(t, indices)
+
+    def test_slice_of_list(self):
+        lists = [list(range(0, 4)), [], list(range(4, 11)), [11]]
+        ds = ConcatenatedDataset(*lists)
+        self.assertEqual(ds.get_examples([4, 5, 6, 0, 1, 11]),
+                         [4, 5, 6, 0, 1, 11])
+
+    def test_int_index_dataset(self):
+        ds = ConcatenatedDataset(
+            IntIndexDataset(list(range(0, 4))),
+            IntIndexDataset(list(range(4, 11))))
+        self.assertEqual(ds.get_examples([4, 5, 6, 0, 1, 2]),
+                         [4, 5, 6, 0, 1, 2])
+        it = iterators.SerialIterator(ds, 11, shuffle=False)
+        self.assertEqual(it.next(), list(range(11)))
+
+    def test_mismatched_columns(self):
+        xs = [self.xs[0], self.xs[2].astype(np.float64)]
+        ds = ConcatenatedDataset(*xs)
+        batch = ds.get_examples([5, 0])
+        self.assertIsInstance(batch, list)
+        np.testing.assert_array_equal(batch[0], xs[1][1])
+        np.testing.assert_array_equal(batch[1], xs[0][0])
+
 
 testing.run_module(__name__, __file__)
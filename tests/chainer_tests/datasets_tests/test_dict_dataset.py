@@ -3,6 +3,7 @@ import unittest
 import numpy
 
 from chainer.backends import cuda
+from chainer import dataset
 from chainer import datasets
 from chainer import testing
 from chainer.testing import attr
@@ -57,4 +58,31 @@ class TestDictDataset(unittest.TestCase):
             dd[3]
 
 
+class TestDictDatasetGetExamples(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.rand(5, 4)
+        self.y = numpy.arange(5, dtype=numpy.int32)
+        self.indices = numpy.array([2, 2, 0])
+
+    def test_columnar(self):
+        dd = datasets.DictDataset(x=self.x, y=self.y)
+        batch = dd.get_examples(self.indices)
+        self.assertIsInstance(batch, dataset.ColumnarBatch)
+        self.assertEqual(sorted(batch.arrays), ['x', 'y'])
+        numpy.testing.assert_array_equal(
+            batch.arrays['x'], self.x[self.indices])
+        numpy.testing.assert_array_equal(
+            batch.arrays['y'], self.y[self.indices])
+
+    def test_not_columnar(self):
+        y = list(self.y)
+        dd = datasets.DictDataset(x=self.x, y=y)
+        batch = dd.get_examples(self.indices)
+        self.assertIsInstance(batch, list)
+        for example, i in zip(batch, self.indices):
+            numpy.testing.assert_array_equal(example['x'], self.x[i])
+            self.assertEqual(example['y'], y[i])
+
+
 testing.run_module(__name__, __file__)
@@ -1,7 +1,12 @@
+from multiprocessing import pool
 import os
 import pickle
+import shutil
+import tempfile
 import unittest
+import zipfile
 
+import mock
 import numpy
 
 from chainer import datasets
@@ -67,6 +72,208 @@ class TestLabeledImageDataset(unittest.TestCase):
         self.assertEqual(label, 1)
 
 
+@testing.parameterize(*testing.product({
+    'dtype': [numpy.float32, numpy.uint8],
+    'cache_bytes': [0, 1000, 1 << 30],
+    'use_cache_path': [False, True],
+}))
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestImageDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = os.path.join(os.path.dirname(__file__), 'image_dataset')
+        self.path = os.path.join(self.root, 'img.lst')
+        self.tmpdir = tempfile.mkdtemp()
+        if self.use_cache_path:
+            self.cache_path = os.path.join(self.tmpdir, 'cache')
+        else:
+            self.cache_path = None
+        expected = datasets.ImageDataset(
+            self.path, root=self.root, dtype=self.dtype)
+        self.expected = [expected[i] for i in range(len(expected))]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _create(self):
+        return datasets.ImageDataset(
+            self.path, root=self.root, dtype=self.dtype,
+            cache_bytes=self.cache_bytes, cache_path=self.cache_path,
+            n_processes=1)
+
+    def _check(self, dataset):
+        for _ in range(2):
+            for i in (0, 1, -1):
+                img = dataset[i]
+                self.assertEqual(img.dtype, self.dtype)
+                numpy.testing.assert_array_equal(img, self.expected[i])
+
+    def test_get(self):
+        self._check(self._create())
+
+    def test_decode_once(self):
+        dataset = self._create()
+        with mock.patch.object(
+                image_dataset, '_read_image_as_array',
+                wraps=image_dataset._read_image_as_array) as read:
+            self._check(dataset)
+        if self.use_cache_path:
+            self.assertEqual(read.call_count, 0)
+        elif self.cache_bytes == 1 << 30:
+            self.assertEqual(read.call_count, 3)
+        else:
+            self.assertEqual(read.call_count, 6)
+
+    def test_cache_file_reused(self):
+        if not self.use_cache_path:
+            return
+        self._create()
+        with mock.patch.object(
+                image_dataset, '_read_image_as_array') as read:
+            dataset = self._create()
+        self.assertEqual(read.call_count, 0)
+        self._check(dataset)
+
+    def test_pickle_unpickle(self):
+        dataset = self._create()
+        dataset[0]
+        self._check(pickle.loads(pickle.dumps(dataset)))
+
+
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestImageDatasetCacheFile(unittest.TestCase):
+
+    def setUp(self):
+        self.root = os.path.join(os.path.dirname(__file__), 'image_dataset')
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmpdir, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_rebuild_for_other_images(self):
+        dataset = datasets.ImageDataset(
+            ['chainer.png'], root=self.root, cache_path=self.cache_path,
+            n_processes=1)
+        self.assertEqual(len(dataset), 1)
+        dataset = datasets.ImageDataset(
+            ['chainer_grey.png', 'chainer.png'], root=self.root,
+            cache_path=self.cache_path, n_processes=1)
+        self.assertEqual(dataset[0].shape, (1, 300, 300))
+        self.assertEqual(dataset[1].shape, (4, 300, 300))
+
+    def copy_image(self, name, dst):
+        if not os.path.isdir(os.path.dirname(dst)):
+            os.makedirs(os.path.dirname(dst))
+        shutil.copy(os.path.join(self.root, name), dst)
+
+    def test_rebuild_for_other_root(self):
+        for name, root in (('chainer.png', 'a'), ('chainer_grey.png', 'b')):
+            self.copy_image(name, os.path.join(self.tmpdir, root, 'img.png'))
+        dataset = datasets.ImageDataset(
+            ['img.png'], root=os.path.join(self.tmpdir, 'a'),
+            cache_path=self.cache_path, n_processes=1)
+        self.assertEqual(dataset[0].shape, (4, 300, 300))
+        dataset = datasets.ImageDataset(
+            ['img.png'], root=os.path.join(self.tmpdir, 'b'),
+            cache_path=self.cache_path, n_processes=1)
+        self.assertEqual(dataset[0].shape, (1, 300, 300))
+
+    def test_rebuild_for_modified_image(self):
+        path = os.path.join(self.tmpdir, 'images', 'img.png')
+        self.copy_image('chainer.png', path)
+        dataset = datasets.ImageDataset(
+            ['img.png'], root=os.path.dirname(path),
+            cache_path=self.cache_path, n_processes=1)
+        self.assertEqual(dataset[0].shape, (4, 300, 300))
+        self.copy_image('chainer_grey.png', path)
+        dataset = datasets.ImageDataset(
+            ['img.png'], root=os.path.dirname(path),
+            cache_path=self.cache_path, n_processes=1)
+        self.assertEqual(dataset[0].shape, (1, 300, 300))
+
+    def test_rebuild_for_other_zip(self):
+        zipfilenames = []
+        for name in ('chainer.png', 'chainer_grey.png'):
+            zipfilename = os.path.join(self.tmpdir, name + '.zip')
+            with zipfile.ZipFile(zipfilename, 'w') as zf:
+                zf.write(os.path.join(self.root, name), 'img.png')
+            zipfilenames.append(zipfilename)
+        dataset = datasets.ZippedImageDataset(
+            zipfilenames[0], cache_path=self.cache_path, n_processes=1)
+        self.assertEqual(dataset[0].shape, (4, 300, 300))
+        dataset.close()
+        dataset = datasets.ZippedImageDataset(
+            zipfilenames[1], cache_path=self.cache_path, n_processes=1)
+        self.assertEqual(dataset[0].shape, (1, 300, 300))
+        dataset.close()
+
+    def test_parallel_build(self):
+        paths = ['chainer.png', 'chainer_grey.png'] * 3
+        dataset = datasets.ImageDataset(
+            paths, root=self.root, cache_path=self.cache_path, n_processes=2)
+        expected = datasets.ImageDataset(paths, root=self.root)
+        for i in range(len(paths)):
+            numpy.testing.assert_array_equal(dataset[i], expected[i])
+
+    def test_invalid_cache_bytes(self):
+        with self.assertRaises(ValueError):
+            datasets.ImageDataset(
+                ['chainer.png'], root=self.root, cache_bytes=-1)
+
+
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestImageDatasetDraft(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        image = numpy.random.randint(0, 256, (240, 320, 3)).astype(numpy.uint8)
+        image_dataset.Image.fromarray(image).save(
+            os.path.join(self.tmpdir, 'img.jpg'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_draft(self):
+        dataset = datasets.ImageDataset(
+            ['img.jpg'], root=self.tmpdir, draft=(80, 60))
+        self.assertEqual(dataset[0].shape, (3, 60, 80))
+
+    def test_draft_not_smaller_than_size(self):
+        dataset = datasets.ImageDataset(
+            ['img.jpg'], root=self.tmpdir, draft=(100, 60))
+        self.assertEqual(dataset[0].shape, (3, 120, 160))
+
+    def test_draft_cache_file(self):
+        dataset = datasets.ImageDataset(
+            ['img.jpg'], root=self.tmpdir, draft=(80, 60),
+            cache_path=os.path.join(self.tmpdir, 'cache'), n_processes=1)
+        self.assertEqual(dataset[0].shape, (3, 60, 80))
+
+
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestLabeledImageDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = os.path.join(os.path.dirname(__file__), 'image_dataset')
+        self.path = os.path.join(self.root, 'labeled_img.lst')
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get(self):
+        dataset = datasets.LabeledImageDataset(
+            self.path, root=self.root, cache_bytes=1 << 30,
+            cache_path=os.path.join(self.tmpdir, 'cache'), n_processes=1)
+        expected = datasets.LabeledImageDataset(self.path, root=self.root)
+        for i in range(len(expected)):
+            img, label = dataset[i]
+            expected_img, expected_label = expected[i]
+            numpy.testing.assert_array_equal(img, expected_img)
+            self.assertEqual(label, expected_label)
+
+
 @unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
 class TestLabeledImageDatasetInvalidFormat(unittest.TestCase):
 
@@ -103,6 +310,97 @@ class TestZippedImageDataset(unittest.TestCase):
         self.assertEqual(img.shape, (1, 300, 300))
 
 
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestZippedImageDatasetConcurrentReads(unittest.TestCase):
+
+    def setUp(self):
+        root = os.path.join(os.path.dirname(__file__), 'image_dataset')
+        self.zipfilename = os.path.join(root, 'zipped_images_2.zip')
+        self.dataset = datasets.ZippedImageDataset(self.zipfilename)
+        self.expected = [self.dataset[i] for i in range(len(self.dataset))]
+
+    def tearDown(self):
+        self.dataset.close()
+
+    def _check(self, images, indices):
+        self.assertEqual(len(images), len(indices))
+        for img, i in zip(images, indices):
+            numpy.testing.assert_array_equal(img, self.expected[i])
+
+    def test_threads(self):
+        indices = list(range(len(self.dataset))) * 8
+        p = pool.ThreadPool(4)
+        try:
+            images = p.map(self.dataset.get_example, indices, chunksize=1)
+        finally:
+            p.close()
+            p.join()
+        self._check(images, indices)
+        self.assertGreaterEqual(len(self.dataset._handles), 1)
+        self.assertLessEqual(len(self.dataset._handles), 5)
+
+    def test_get_examples(self):
+        indices = [2, 0, 1, 0]
+        with mock.patch.object(
+                self.dataset, 'get_example',
+                wraps=self.dataset.get_example) as get_example:
+            images = self.dataset.get_examples(numpy.array(indices))
+        self._check(images, indices)
+        offsets = [self.dataset._info(args[0]).header_offset
+                   for args, _ in get_example.call_args_list]
+        self.assertEqual(offsets, sorted(offsets))
+
+    def test_get_examples_by_filename(self):
+        indices = [1, 2, 0]
+        images = self.dataset.get_examples(
+            [self.dataset._paths[i] for i in indices])
+        self._check(images, indices)
+
+    def test_get_by_numpy_integer(self):
+        self._check([self.dataset[numpy.int64(1)]], [1])
+
+    def test_close(self):
+        self.dataset.close()
+        self.assertEqual(self.dataset._handles, [])
+        self._check([self.dataset[0]], [0])
+        self.assertEqual(len(self.dataset._handles), 1)
+
+    def test_pickle_unpickle(self):
+        dataset = pickle.loads(pickle.dumps(self.dataset))
+        self._check(dataset.get_examples([2, 1, 0]), [2, 1, 0])
+        dataset.close()
+
+
+@testing.parameterize(*testing.product({
+    'cache_bytes': [0, 1 << 30],
+    'use_cache_path': [False, True],
+}))
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestZippedImageDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        root = os.path.join(os.path.dirname(__file__), 'image_dataset')
+        self.zipfilename = os.path.join(root, 'zipped_images_2.zip')
+        self.tmpdir = tempfile.mkdtemp()
+        if self.use_cache_path:
+            cache_path = os.path.join(self.tmpdir, 'cache')
+        else:
+            cache_path = None
+        self.dataset = datasets.ZippedImageDataset(
+            self.zipfilename, cache_bytes=self.cache_bytes,
+            cache_path=cache_path, n_processes=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get(self):
+        expected = datasets.ZippedImageDataset(self.zipfilename)
+        for i in range(len(expected)):
+            numpy.testing.assert_array_equal(self.dataset[i], expected[i])
+            numpy.testing.assert_array_equal(
+                self.dataset.get_example(expected._paths[i]), expected[i])
+
+
 @testing.parameterize(*testing.product({
     'dtype': [numpy.float32, numpy.int32],
 }))
@@ -131,6 +429,16 @@ class TestMultiZippedImageDataset(unittest.TestCase):
     def test_get(self):
         self._get_check(self.dataset)
 
+    def test_get_examples(self):
+        indices = [4, 0, 3, 1, 2, 0]
+        images = self.dataset.get_examples(indices)
+        for img, i in zip(images, indices):
+            numpy.testing.assert_array_equal(img, self.dataset[i])
+
+    def test_get_examples_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.dataset.get_examples([0, 5])
+
     def test_pickle_unpickle(self):
         dss = pickle.dumps(self.dataset)
         ds = pickle.loads(dss)
@@ -162,6 +470,15 @@ class TestLabeledZippedImageDataset(unittest.TestCase):
         self.assertEqual(label.dtype, self.label_dtype)
         self.assertEqual(label, 0)
 
+    def test_get_examples(self):
+        pairs = self.dataset.get_examples([1, 0])
+        self.assertEqual(len(pairs), 2)
+        for (img, label), i in zip(pairs, [1, 0]):
+            expected_img, expected_label = self.dataset[i]
+            numpy.testing.assert_array_equal(img, expected_img)
+            self.assertEqual(label.dtype, self.label_dtype)
+            self.assertEqual(label, expected_label)
+
     def test_get_gray(self):
         img, label = self.dataset.get_example(1)
         self.assertEqual(img.dtype, self.dtype)
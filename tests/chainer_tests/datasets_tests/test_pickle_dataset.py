@@ -1,9 +1,13 @@
 import io
 import os
+import pickle
 import sys
 import unittest
 
+import numpy
+
 from chainer import datasets
+from chainer.datasets import pickle_dataset
 from chainer import testing
 from chainer import utils
 
@@ -45,4 +49,132 @@ class TestPickleDatasetHelper(unittest.TestCase):
             assert dataset[0] == 1
 
 
+class _BytesIO(io.BytesIO):
+
+    # Keeps the contents after the writer is closed.
+
+    def close(self):
+        pass
+
+
+class TestPickleDatasetIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.io = _BytesIO()
+        self.examples = [1, 'hello', (1.5, None), numpy.arange(3)]
+
+    def write(self):
+        writer = datasets.PickleDatasetWriter(self.io)
+        for x in self.examples:
+            writer.write(x)
+        writer.flush()
+        return writer
+
+    def check(self, dataset):
+        assert len(dataset) == len(self.examples)
+        for x, y in zip(self.examples, dataset):
+            numpy.testing.assert_equal(x, y)
+
+    def test_footer(self):
+        writer = self.write()
+        positions, end = pickle_dataset._scan(self.io)
+        writer.close()
+
+        index = pickle_dataset._read_index(self.io)
+        assert index is not None
+        numpy.testing.assert_array_equal(index[0], positions)
+        assert index[1] == end
+        self.check(datasets.PickleDataset(self.io))
+
+    def test_no_footer(self):
+        self.write()
+        assert pickle_dataset._read_index(self.io) is None
+        self.check(datasets.PickleDataset(self.io))
+
+    def test_mmap_unsupported(self):
+        self.write()
+        with self.assertRaises(ValueError):
+            datasets.PickleDataset(self.io, use_mmap=True)
+
+
+@testing.parameterize(*testing.product({
+    'use_mmap': [False, True],
+    'close_writer': [False, True],
+}))
+class TestPickleDatasetFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = utils.tempdir()
+        dirpath = self.tempdir.__enter__()
+        self.path = os.path.join(dirpath, 'test.pkl')
+        self.examples = [1, 'hello', (1.5, None), numpy.arange(3)]
+        writer = datasets.open_pickle_dataset_writer(self.path)
+        for x in self.examples:
+            writer.write(x)
+        writer.flush()
+        if self.close_writer:
+            writer.close()
+        else:
+            writer._writer.close()
+
+    def tearDown(self):
+        self.tempdir.__exit__(*sys.exc_info())
+
+    def check(self, dataset):
+        assert len(dataset) == len(self.examples)
+        for i, x in enumerate(self.examples):
+            numpy.testing.assert_equal(dataset[i], x)
+        numpy.testing.assert_equal(dataset[-1], self.examples[-1])
+
+    def test_read(self):
+        with datasets.open_pickle_dataset(
+                self.path, use_mmap=self.use_mmap) as dataset:
+            self.check(dataset)
+            with self.assertRaises(IndexError):
+                dataset[len(self.examples)]
+
+    def test_pickle(self):
+        with datasets.open_pickle_dataset(
+                self.path, use_mmap=self.use_mmap) as dataset:
+            dataset2 = pickle.loads(pickle.dumps(dataset))
+        self.check(dataset2)
+        dataset2.close()
+
+    def test_empty(self):
+        with datasets.open_pickle_dataset_writer(self.path):
+            pass
+        with datasets.open_pickle_dataset(
+                self.path, use_mmap=self.use_mmap) as dataset:
+            assert len(dataset) == 0
+
+
+class TestWriteShardedPickleDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = utils.tempdir()
+        self.dirpath = self.tempdir.__enter__()
+
+    def tearDown(self):
+        self.tempdir.__exit__(*sys.exc_info())
+
+    def test_write(self):
+        paths = [os.path.join(self.dirpath, 'shard{}.pkl'.format(i))
+                 for i in range(3)]
+        examples = [(i, str(i)) for i in range(10)]
+        sizes = datasets.write_sharded_pickle_dataset(
+            paths, examples, n_processes=2)
+        assert sizes == [3, 3, 4]
+
+        shards = [datasets.open_pickle_dataset(path, use_mmap=True)
+                  for path in paths]
+        dataset = datasets.ConcatenatedDataset(*shards)
+        assert [dataset[i] for i in range(len(dataset))] == examples
+        for shard in shards:
+            shard.close()
+
+    def test_no_paths(self):
+        with self.assertRaises(ValueError):
+            datasets.write_sharded_pickle_dataset([], [1])
+
+
 testing.run_module(__name__, __file__)
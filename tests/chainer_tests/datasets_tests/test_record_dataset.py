@@ -0,0 +1,226 @@
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import mock
+import numpy
+import six
+
+from chainer import datasets
+from chainer.datasets import record_dataset
+from chainer import iterators
+from chainer import testing
+
+
+class _BytesIO(io.BytesIO):
+
+    def close(self):
+        pass
+
+
+def _records(n):
+    return [six.b('record-{}'.format(i)) * (i % 5) for i in range(n)]
+
+
+@testing.parameterize(*testing.product({
+    'codec': ['none', 'zlib'],
+    'chunk_size': [1, 40, 1 << 20],
+}))
+class TestRecordDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.records = _records(50)
+        self.paths = []
+        # The shards have 20, 0 and 30 records.
+        for k, (begin, end) in enumerate([(0, 20), (20, 20), (20, 50)]):
+            path = os.path.join(self.tmpdir, 'shard{}'.format(k))
+            with datasets.open_record_dataset_writer(
+                    path, codec=self.codec,
+                    chunk_size=self.chunk_size) as writer:
+                for record in self.records[begin:end]:
+                    writer.write(record)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get(self):
+        with datasets.RecordDataset(self.paths, cache_chunks=2) as dataset:
+            self.assertEqual(len(dataset), 50)
+            for i in list(range(50)) + [7, 3, 45, 0]:
+                self.assertEqual(dataset[i], self.records[i])
+            self.assertEqual(dataset[-1], self.records[-1])
+            with self.assertRaises(IndexError):
+                dataset[50]
+
+    def test_single_path(self):
+        with datasets.RecordDataset(self.paths[0]) as dataset:
+            self.assertEqual(len(dataset), 20)
+            self.assertEqual(dataset[19], self.records[19])
+
+    def test_pickle_unpickle(self):
+        with datasets.RecordDataset(self.paths) as dataset:
+            dataset[0]
+            with pickle.loads(pickle.dumps(dataset)) as copied:
+                for i in range(50):
+                    self.assertEqual(copied[i], self.records[i])
+
+    def test_chunk_cache(self):
+        with datasets.RecordDataset(self.paths, cache_chunks=4) as dataset:
+            n_chunks = len(dataset._chunks)
+            with mock.patch.object(
+                    dataset, '_load', wraps=dataset._load) as load:
+                for i in range(50):
+                    dataset[i]
+            self.assertEqual(load.call_count, n_chunks)
+
+    def test_order_sampler(self):
+        with datasets.RecordDataset(self.paths, readahead=2) as dataset:
+            sampler = datasets.RecordOrderSampler(
+                dataset, buffer_size=8,
+                random_state=numpy.random.RandomState(0))
+            it = iterators.SerialIterator(
+                dataset, 10, order_sampler=sampler)
+            for _ in range(2):
+                seen = []
+                while True:
+                    seen += it.next()
+                    if it.is_new_epoch:
+                        break
+                self.assertEqual(sorted(seen), sorted(self.records))
+
+
+class TestRecordOrderSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.paths = []
+        for k in range(3):
+            path = os.path.join(self.tmpdir, 'shard{}'.format(k))
+            with datasets.open_record_dataset_writer(
+                    path, chunk_size=30) as writer:
+                for record in _records(10):
+                    writer.write(record)
+            self.paths.append(path)
+        self.dataset = datasets.RecordDataset(self.paths)
+
+    def tearDown(self):
+        self.dataset.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_no_shuffle(self):
+        sampler = datasets.RecordOrderSampler(
+            self.dataset, shuffle_shards=False)
+        order = sampler(numpy.arange(30), 0)
+        numpy.testing.assert_array_equal(order, numpy.arange(30))
+
+    def test_shuffle_shards(self):
+        sampler = datasets.RecordOrderSampler(
+            self.dataset, random_state=numpy.random.RandomState(1))
+        order = sampler(numpy.arange(30), 0)
+        shards = order.reshape(3, 10)
+        for shard in shards:
+            numpy.testing.assert_array_equal(
+                shard, numpy.arange(10) + shard[0])
+        self.assertEqual(sorted(shards[:, 0].tolist()), [0, 10, 20])
+
+    def test_buffer_shuffle(self):
+        sampler = datasets.RecordOrderSampler(
+            self.dataset, shuffle_shards=False, buffer_size=4,
+            random_state=numpy.random.RandomState(2))
+        order = sampler(numpy.arange(30), 0)
+        self.assertFalse((order == numpy.arange(30)).all())
+        for begin in range(0, 30, 4):
+            self.assertEqual(sorted(order[begin:begin + 4].tolist()),
+                             list(range(begin, min(begin + 4, 30))))
+
+    def test_invalid_buffer_size(self):
+        with self.assertRaises(ValueError):
+            datasets.RecordOrderSampler(self.dataset, buffer_size=0)
+
+
+class TestRecordDatasetReadahead(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'records')
+        self.records = _records(40)
+        with datasets.open_record_dataset_writer(
+                self.path, codec='zlib', chunk_size=30) as writer:
+            for record in self.records:
+                writer.write(record)
+        self.dataset = datasets.RecordDataset(
+            self.path, cache_chunks=2, readahead=3)
+
+    def tearDown(self):
+        self.dataset.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_prefetch(self):
+        order = numpy.random.RandomState(3).permutation(40)
+        self.dataset.prefetch(order)
+        prefetcher = self.dataset._prefetcher
+        self.assertIsNotNone(prefetcher)
+        with mock.patch.object(
+                self.dataset, '_load',
+                side_effect=AssertionError('chunk is not read ahead')):
+            for i in order[:5].tolist():
+                self.assertEqual(self.dataset[i], self.records[i])
+
+    def test_prefetch_replaced(self):
+        self.dataset.prefetch(numpy.arange(40))
+        self.dataset.prefetch(numpy.arange(40)[::-1])
+        for i in range(39, -1, -1):
+            self.assertEqual(self.dataset[i], self.records[i])
+
+    def test_no_readahead(self):
+        dataset = datasets.RecordDataset(self.path)
+        dataset.prefetch(numpy.arange(40))
+        self.assertIsNone(dataset._prefetcher)
+        dataset.close()
+
+
+class TestRecordDatasetWriter(unittest.TestCase):
+
+    def test_write_non_bytes(self):
+        writer = datasets.RecordDatasetWriter(_BytesIO())
+        with self.assertRaises(TypeError):
+            writer.write(u'record')
+
+    def test_invalid_codec(self):
+        with self.assertRaises(ValueError):
+            datasets.RecordDatasetWriter(_BytesIO(), codec='unknown')
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            datasets.RecordDatasetWriter(_BytesIO(), chunk_size=0)
+
+    def test_chunks(self):
+        f = _BytesIO()
+        with datasets.RecordDatasetWriter(f, chunk_size=20) as writer:
+            for record in _records(10):
+                writer.write(record)
+        f.seek(0)
+        codec, index = record_dataset._read_index(f, 'records')
+        self.assertEqual(codec, 'none')
+        self.assertEqual(index[:, 3].sum(), 10)
+        self.assertGreater(len(index), 1)
+        self.assertTrue((index[:-1, 2] >= 20).all())
+
+    def test_not_record_file(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'file')
+            with open(path, 'wb') as f:
+                f.write(b'x' * 100)
+            with self.assertRaises(ValueError):
+                datasets.RecordDataset(path)
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+testing.run_module(__name__, __file__)
@@ -1,5 +1,8 @@
 import unittest
 
+import numpy
+
+from chainer import dataset
 from chainer import datasets
 from chainer import testing
 
@@ -33,6 +36,26 @@ class TestSubDataset(unittest.TestCase):
         with self.assertRaises(ValueError):
             datasets.SubDataset(original, 1, 4, [2, 0, 3, 1])
 
+    def test_get_examples(self):
+        original = [1, 2, 3, 4, 5]
+        subset = datasets.SubDataset(original, 1, 4, [2, 0, 3, 1, 4])
+        self.assertEqual(subset.get_examples([2, 0, -1, -3]), [2, 1, 2, 1])
+
+    def test_get_examples_columnar(self):
+        original = numpy.arange(10).reshape(5, 2)
+        subset = datasets.SubDataset(original, 1, 4, [2, 0, 3, 1, 4])
+        batch = subset.get_examples(numpy.array([1, 2]))
+        self.assertIsInstance(batch, dataset.ColumnarBatch)
+        numpy.testing.assert_array_equal(batch.arrays, original[[3, 1]])
+
+    def test_get_examples_overrun(self):
+        original = [1, 2, 3, 4, 5]
+        subset = datasets.SubDataset(original, 1, 4)
+        with self.assertRaises(IndexError):
+            subset.get_examples([0, 3])
+        with self.assertRaises(IndexError):
+            subset.get_examples([-4])
+
 
 class TestSplitDataset(unittest.TestCase):
 
@@ -2,13 +2,19 @@
 
 from __future__ import unicode_literals
 
+import io
 import os
 import pickle
+import shutil
+import tempfile
+import threading
 import unittest
 
+import numpy
 import six
 
 from chainer import datasets
+from chainer.datasets import text_dataset
 from chainer import testing
 
 
@@ -148,4 +154,182 @@ class TestTextDataset(unittest.TestCase):
         assert ds2[1] == ('テスト2\n', 'テスト2\n')
 
 
+@testing.parameterize(*testing.product({
+    'use_mmap': [False, True],
+}))
+class TestTextDatasetByteIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write(self, name, data):
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def _expected(self, path, **kwargs):
+        with io.open(path, 'rt', **kwargs) as f:
+            return list(f)
+
+    def check(self, path, binary=True, **kwargs):
+        ds = datasets.TextDataset(path, use_mmap=self.use_mmap, **kwargs)
+        assert ds._binary == binary
+        expected = self._expected(path, **kwargs)
+        assert len(ds) == len(expected)
+        assert [ds[i] for i in range(len(ds))] == expected
+        ds.close()
+
+    def test_lf(self):
+        self.check(self._write('a.txt', 'テスト1\n\nx\r\ny'.encode('utf-8')),
+                   encoding='utf-8')
+
+    def test_empty(self):
+        self.check(self._write('a.txt', b''))
+
+    def test_newline_crlf(self):
+        path = self._write('a.txt', b'a\r\nb\nc\r\n')
+        self.check(path, newline='\r\n')
+        self.check(path, newline='')
+        self.check(path, newline='\n')
+
+    def test_lone_cr(self):
+        # Lone CR is a line boundary in the universal newlines mode, for
+        # which the files are read in the text mode.
+        path = self._write('a.txt', b'a\rb\nc')
+        self.check(path, binary=False)
+        self.check(path, binary=False, newline='')
+        self.check(path, newline='\n')
+
+    def test_lone_cr_at_end(self):
+        self.check(self._write('a.txt', b'a\nb\r'), binary=False)
+
+    def test_utf16(self):
+        path = self._write('a.txt', 'テスト1\nTest2\n'.encode('utf-16'))
+        self.check(path, binary=False, encoding='utf-16')
+
+    def test_filter(self):
+        path = self._write('a.txt', b'hello\nworld\ntest\n')
+        ds = datasets.TextDataset(
+            path, filter_func=lambda line: line != 'world\n',
+            use_mmap=self.use_mmap)
+        assert ds._binary
+        assert [ds[i] for i in range(len(ds))] == ['hello\n', 'test\n']
+
+    def test_multiple_mismatch(self):
+        path1 = self._write('a.txt', b'a\nb\n')
+        path2 = self._write('b.txt', b'a\n')
+        with self.assertRaises(ValueError):
+            datasets.TextDataset([path1, path2], use_mmap=self.use_mmap)
+
+    def test_threads(self):
+        lines = ['line {}\n'.format(i) for i in range(1000)]
+        path = self._write('a.txt', ''.join(lines).encode('ascii'))
+        ds = datasets.TextDataset(path, use_mmap=self.use_mmap)
+        errors = []
+
+        def read(offset):
+            for i in range(offset, len(ds), 4):
+                if ds[i] != lines[i]:
+                    errors.append(i)
+
+        threads = [threading.Thread(target=read, args=(i,))
+                   for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+
+    def test_pickle(self):
+        path = self._write('a.txt', b'a\nb\n')
+        ds = pickle.loads(pickle.dumps(
+            datasets.TextDataset(path, use_mmap=self.use_mmap)))
+        assert ds[1] == 'b\n'
+
+
+class TestScanLines(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def scan(self, data, newline, chunk_size):
+        with open(self.path, 'wb') as f:
+            f.write(data)
+        return text_dataset._scan_lines(self.path, newline, chunk_size)
+
+    def test_chunk_boundaries(self):
+        data = b'ab\r\n\ncd\r\nef\n\r\ng'
+        for chunk_size in range(1, len(data) + 1):
+            numpy.testing.assert_array_equal(
+                self.scan(data, None, chunk_size),
+                [0, 4, 5, 9, 12, 14, 15])
+            numpy.testing.assert_array_equal(
+                self.scan(data, '\r\n', chunk_size), [0, 4, 9, 14, 15])
+
+    def test_lone_cr_chunk_boundary(self):
+        for chunk_size in range(1, 5):
+            assert self.scan(b'ab\rcd\n', None, chunk_size) is None
+
+
+class TestTextDatasetCacheIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'a.txt')
+        with open(self.path, 'wb') as f:
+            f.write(b'a\nb\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_cache_index(self):
+        index_path = self.path + '.index.npz'
+        ds = datasets.TextDataset(self.path, cache_index=True)
+        assert len(ds) == 2
+        assert os.path.exists(index_path)
+
+        # The cache is used as long as the file is unchanged.
+        with open(index_path, 'rb') as f:
+            cache = dict(numpy.load(f))
+        cache['offsets'] = numpy.array([0, 1], numpy.int64)
+        with open(index_path, 'wb') as f:
+            numpy.savez(f, **cache)
+        ds = datasets.TextDataset(self.path, cache_index=True)
+        assert len(ds) == 1
+
+        # The cache is rebuilt if the file is modified.
+        with open(self.path, 'ab') as f:
+            f.write(b'c\n')
+        ds = datasets.TextDataset(self.path, cache_index=True)
+        assert len(ds) == 3
+        assert ds[2] == 'c\n'
+
+    def test_cache_index_newline(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'a\r\nb\nc\r\n')
+        ds = datasets.TextDataset(self.path, cache_index=True)
+        assert len(ds) == 3
+        ds = datasets.TextDataset(
+            self.path, newline='\r\n', cache_index=True)
+        assert len(ds) == 2
+
+    def test_broken_cache(self):
+        with open(self.path + '.index.npz', 'wb') as f:
+            f.write(b'broken')
+        ds = datasets.TextDataset(self.path, cache_index=True)
+        assert len(ds) == 2
+
+    def test_no_cache(self):
+        datasets.TextDataset(self.path)
+        assert not os.path.exists(self.path + '.index.npz')
+
+
 testing.run_module(__name__, __file__)
@@ -2,6 +2,7 @@ import unittest
 
 import numpy
 
+from chainer import dataset
 from chainer import datasets
 from chainer import testing
 
@@ -45,4 +46,43 @@ class TestTransformDataset(unittest.TestCase):
             td[len(td) + 1]
 
 
+class TestTransformDatasetGetExamples(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(size=(5, 3)).astype(numpy.float32)
+        self.t = numpy.arange(5, dtype=numpy.int32)
+        self.base = datasets.TupleDataset(self.x, self.t)
+        self.indices = numpy.array([4, 1, 1])
+
+    def transform(self, in_data):
+        x, t = in_data
+        return x * 2, t + 1
+
+    def check(self, batch):
+        x, t = dataset.concat_examples(batch)
+        numpy.testing.assert_array_equal(x, self.x[self.indices] * 2)
+        numpy.testing.assert_array_equal(t, self.t[self.indices] + 1)
+
+    def test_batch_transform(self):
+        td = datasets.TransformDataset(
+            self.base, self.transform, batch_transform=self.transform)
+        batch = td.get_examples(self.indices)
+        self.assertIsInstance(batch, dataset.ColumnarBatch)
+        self.check(batch)
+
+    def test_no_batch_transform(self):
+        td = datasets.TransformDataset(self.base, self.transform)
+        batch = td.get_examples(self.indices)
+        self.assertIsInstance(batch, list)
+        self.check(batch)
+
+    def test_batch_transform_not_columnar(self):
+        base = [(x, t) for x, t in zip(self.x, self.t)]
+        td = datasets.TransformDataset(
+            base, self.transform, batch_transform=self.transform)
+        batch = td.get_examples(self.indices)
+        self.assertIsInstance(batch, list)
+        self.check(batch)
+
+
 testing.run_module(__name__, __file__)
@@ -3,7 +3,9 @@ import unittest
 import numpy
 
 from chainer.backends import cuda
+from chainer import dataset
 from chainer import datasets
+from chainer import iterators
 from chainer import testing
 from chainer.testing import attr
 
@@ -55,4 +57,65 @@ class TestTupleDataset(unittest.TestCase):
             td[3]
 
 
+class TestTupleDatasetGetExamples(unittest.TestCase):
+
+    def setUp(self):
+        self.x0 = numpy.random.rand(5, 4)
+        self.x1 = numpy.arange(5, dtype=numpy.int32)
+        self.indices = numpy.array([3, 0, 3, 4])
+
+    def test_columnar(self):
+        td = datasets.TupleDataset(self.x0, self.x1)
+        batch = td.get_examples(self.indices)
+        self.assertIsInstance(batch, dataset.ColumnarBatch)
+        x0, x1 = batch.arrays
+        numpy.testing.assert_array_equal(x0, self.x0[self.indices])
+        numpy.testing.assert_array_equal(x1, self.x1[self.indices])
+
+    def test_nested(self):
+        td = datasets.TupleDataset(
+            datasets.SubDataset(self.x0, 0, 5), self.x1)
+        batch = td.get_examples(self.indices)
+        self.assertIsInstance(batch, dataset.ColumnarBatch)
+        numpy.testing.assert_array_equal(
+            batch.arrays[0], self.x0[self.indices])
+
+    def test_not_columnar(self):
+        x1 = list(self.x1)
+        td = datasets.TupleDataset(self.x0, x1)
+        batch = td.get_examples(self.indices)
+        self.assertIsInstance(batch, list)
+        self.assertEqual(len(batch), len(self.indices))
+        for example, i in zip(batch, self.indices):
+            numpy.testing.assert_array_equal(example[0], self.x0[i])
+            self.assertEqual(example[1], x1[i])
+
+    def test_concat_examples(self):
+        td = datasets.TupleDataset(self.x0, self.x1)
+        expected = dataset.concat_examples(
+            [td[i] for i in self.indices])
+        actual = dataset.concat_examples(td.get_examples(self.indices))
+        for e, a in zip(expected, actual):
+            numpy.testing.assert_array_equal(e, a)
+
+
+class TestTupleDatasetObjectArray(unittest.TestCase):
+
+    def test_padding(self):
+        # Variable-length sequences in an object array are padded by the
+        # converter, as if each example was fetched one by one.
+        x = numpy.empty(4, dtype=object)
+        x[:] = [numpy.arange(n, dtype=numpy.int32) for n in (1, 4, 2, 3)]
+        t = numpy.arange(4, dtype=numpy.int32)
+        td = datasets.TupleDataset(x, t)
+        it = iterators.SerialIterator(td, 4, repeat=False, shuffle=False)
+        xs, ts = dataset.concat_examples(it.next(), padding=-1)
+        expected = numpy.full((4, 4), -1, dtype=numpy.int32)
+        for i, n in enumerate((1, 4, 2, 3)):
+            expected[i, :n] = numpy.arange(n)
+        self.assertEqual(xs.dtype, numpy.int32)
+        numpy.testing.assert_array_equal(xs, expected)
+        numpy.testing.assert_array_equal(ts, t)
+
+
 testing.run_module(__name__, __file__)
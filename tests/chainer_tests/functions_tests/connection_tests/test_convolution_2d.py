@@ -331,6 +331,126 @@ class TestConvolution2DFunctionCudnnDeterministic(unittest.TestCase):
         return x, W, b, y
 
 
+@testing.parameterize(*testing.product({
+    'shape': [
+        # (in_channels, out_channels, groups, kh, kw, pad)
+        (3, 4, 1, 1, 1, 0),
+        (3, 3, 3, 3, 3, 1),
+        (3, 6, 3, 2, 3, 0),
+    ],
+    'stride': [1, 2],
+    'cover_all': [False, True],
+}))
+class TestConvolution2DFunctionDirectCPU(unittest.TestCase):
+
+    # Tests the implementations without im2col for 1x1 and depthwise
+    # convolutions.
+
+    def setUp(self):
+        in_channels, out_channels, groups, kh, kw, pad = self.shape
+        self.groups = groups
+        self.pad = pad
+        self.x = numpy.random.uniform(
+            -1, 1, (2, in_channels, 5, 4)).astype(numpy.float64)
+        self.W = numpy.random.uniform(
+            -1, 1, (out_channels, in_channels // groups, kh, kw)
+        ).astype(numpy.float64)
+        self.b = numpy.random.uniform(
+            -1, 1, out_channels).astype(numpy.float64)
+
+    def _forward(self, x, W, b):
+        return F.convolution_2d(
+            x, W, b, stride=self.stride, pad=self.pad,
+            cover_all=self.cover_all, groups=self.groups)
+
+    def test_forward(self):
+        y = self._forward(self.x, self.W, self.b)
+        # Reference computed with im2col
+        out_c = self.W.shape[0]
+        _, in_c_g, kh, kw = self.W.shape
+        col = chainer.utils.conv.im2col_cpu(
+            self.x, kh, kw, self.stride, self.stride, self.pad, self.pad,
+            cover_all=self.cover_all)
+        n, in_c, _, _, out_h, out_w = col.shape
+        col = col.reshape(n, self.groups, in_c_g, kh, kw, out_h, out_w)
+        W = self.W.reshape(self.groups, out_c // self.groups, in_c_g, kh, kw)
+        expect = numpy.einsum('ngcjiyx,gocji->ngoyx', col, W)
+        expect = expect.reshape(n, out_c, out_h, out_w)
+        expect += self.b.reshape(1, out_c, 1, 1)
+        testing.assert_allclose(y.array, expect)
+
+    def test_backward(self):
+        gy = numpy.random.uniform(
+            -1, 1, self._forward(self.x, self.W, self.b).shape)
+        gradient_check.check_backward(
+            self._forward, (self.x, self.W, self.b), gy,
+            dtype=numpy.float64)
+
+    def test_double_backward(self):
+        y = self._forward(self.x, self.W, self.b)
+        gy = numpy.random.uniform(-1, 1, y.shape)
+        ggx = numpy.random.uniform(-1, 1, self.x.shape)
+        ggW = numpy.random.uniform(-1, 1, self.W.shape)
+        ggb = numpy.random.uniform(-1, 1, self.b.shape)
+        gradient_check.check_double_backward(
+            self._forward, (self.x, self.W, self.b), gy, (ggx, ggW, ggb),
+            dtype=numpy.float64)
+
+
+@testing.parameterize(*testing.product({
+    'algorithm': ['im2col', 'winograd', 'fft', 'auto'],
+    'params': [
+        # (kh, kw, stride, pad, dilate)
+        (3, 3, 1, 1, 1),
+        (3, 3, 1, 0, 1),
+        (5, 5, 1, 2, 1),
+        (3, 3, 2, 1, 1),
+        (3, 3, 1, 1, 2),
+    ],
+    'x_shape': [(2, 3, 7, 6), (1, 2, 4, 4)],
+    'dtype': [numpy.float32, numpy.float64],
+}))
+class TestConvolution2DFunctionCPUAlgorithm(unittest.TestCase):
+
+    def setUp(self):
+        kh, kw, _, _, _ = self.params
+        in_channels = self.x_shape[1]
+        self.x = numpy.random.uniform(-1, 1, self.x_shape).astype(self.dtype)
+        self.W = numpy.random.uniform(
+            -1, 1, (4, in_channels, kh, kw)).astype(self.dtype)
+        self.b = numpy.random.uniform(-1, 1, 4).astype(self.dtype)
+        if self.dtype == numpy.float32:
+            self.check_forward_options = {'atol': 1e-4, 'rtol': 1e-4}
+        else:
+            self.check_forward_options = {}
+
+    def _forward(self, algorithm):
+        _, _, stride, pad, dilate = self.params
+        with chainer.using_config('cpu_conv_algorithm', algorithm):
+            return F.convolution_2d(
+                self.x, self.W, self.b, stride=stride, pad=pad,
+                dilate=dilate).array
+
+    def test_forward(self):
+        expect = self._forward('im2col')
+        y = self._forward(self.algorithm)
+        self.assertEqual(y.dtype, self.dtype)
+        testing.assert_allclose(y, expect, **self.check_forward_options)
+        # Second call uses the cache in the autotuning mode.
+        y = self._forward(self.algorithm)
+        testing.assert_allclose(y, expect, **self.check_forward_options)
+
+
+class TestConvolution2DFunctionCPUAlgorithmInvalid(unittest.TestCase):
+
+    def test_invalid_algorithm(self):
+        x = numpy.ones((1, 1, 3, 3), numpy.float32)
+        W = numpy.ones((1, 1, 3, 3), numpy.float32)
+        with chainer.using_config('cpu_conv_algorithm', 'invalid'):
+            with self.assertRaises(ValueError):
+                F.convolution_2d(x, W)
+
+
 class TestConvolution2DBackwardNoncontiguousGradOutputs(unittest.TestCase):
     # NumPy raises an error when the inputs of dot operation are not
     # contiguous. This test ensures this issue is correctly handled.
@@ -131,4 +131,100 @@ class TestEmbedIdGrad(unittest.TestCase):
             cuda.to_gpu(self.x), cuda.to_gpu(self.gy), cuda.to_gpu(self.ggW))
 
 
+@testing.parameterize(*testing.product({
+    'x_data': [[0, 1, 0], [[0, 3, -1], [-1, 0, 3]]],
+    'ignore_label': [None, -1],
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+}))
+class TestEmbedIDSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.array(self.x_data, dtype='i')
+        if self.ignore_label is None:
+            self.x[self.x < 0] = 2
+        self.W = numpy.random.uniform(-1, 1, (5, 2)).astype(self.dtype)
+        self.gy = numpy.random.uniform(
+            -1, 1, self.x.shape + (2,)).astype(self.dtype)
+
+    def check_sparse_grad(self, x, W, gy):
+        W_dense = chainer.Parameter(W.copy())
+        y = chainer.functions.embed_id(x, W_dense, self.ignore_label)
+        y.grad = gy
+        y.backward()
+
+        W_sparse = chainer.Parameter(W.copy())
+        y = chainer.functions.embed_id(
+            x, W_sparse, self.ignore_label, sparse_grad=True)
+        y.grad = gy
+        y.backward()
+
+        self.assertIsNone(W_sparse.grad)
+        sparse_grad = W_sparse.sparse_grad
+        self.assertIsInstance(sparse_grad, chainer.utils.IndexedRows)
+        self.assertEqual(sparse_grad.shape, W.shape)
+        testing.assert_allclose(sparse_grad.to_dense(), W_dense.grad)
+        if self.ignore_label is not None:
+            self.assertNotIn(self.ignore_label, cuda.to_cpu(sparse_grad.rows))
+
+    def test_sparse_grad_cpu(self):
+        self.check_sparse_grad(self.x, self.W, self.gy)
+
+    @attr.gpu
+    def test_sparse_grad_gpu(self):
+        self.check_sparse_grad(
+            cuda.to_gpu(self.x), cuda.to_gpu(self.W), cuda.to_gpu(self.gy))
+
+    def test_accumulate(self):
+        W = chainer.Parameter(self.W.copy())
+        for _ in range(2):
+            y = chainer.functions.embed_id(
+                self.x, W, self.ignore_label, sparse_grad=True)
+            y.grad = self.gy
+            y.backward()
+        expected = embed_id.EmbedIDGrad(self.W.shape, self.ignore_label).apply(
+            (self.x, self.gy))[0].array * 2
+        testing.assert_allclose(W.sparse_grad.to_dense(), expected)
+
+        W.cleargrad()
+        self.assertIsNone(W.sparse_grad)
+
+    def test_not_parameter(self):
+        # The gradient is dense unless W is a parameter.
+        W = chainer.Variable(self.W.copy())
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        y.grad = self.gy
+        y.backward()
+        self.assertIsNotNone(W.grad)
+
+    def test_grad(self):
+        # The gradient of an explicitly requested input is dense.
+        W = chainer.Parameter(self.W.copy())
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        gW, = chainer.grad([y], [W], grad_outputs=[chainer.Variable(self.gy)])
+        expected = embed_id.EmbedIDGrad(self.W.shape, self.ignore_label).apply(
+            (self.x, self.gy))[0].array
+        testing.assert_allclose(gW.array, expected)
+        self.assertIsNone(W.sparse_grad)
+
+    def test_loss_scale(self):
+        W = chainer.Parameter(self.W.copy())
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        y.grad = self.gy
+        y.backward(loss_scale=16.)
+        self.assertIsNotNone(W.sparse_grad)
+        self.assertEqual(W._loss_scale, 16.)
+
+    def test_double_backprop(self):
+        W = chainer.Parameter(self.W.copy())
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        y.grad = self.gy
+        y.backward(enable_double_backprop=True)
+        self.assertIsNotNone(W.grad)
+        self.assertIsNone(W.sparse_grad)
+
+
 testing.run_module(__name__, __file__)
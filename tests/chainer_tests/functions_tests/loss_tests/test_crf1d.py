@@ -99,6 +99,64 @@ class TestCRF1d(unittest.TestCase):
                             [cuda.to_gpu(y) for y in self.ys],
                             cuda.to_gpu(self.g))
 
+    def test_backward_double_backprop_cpu(self):
+        def f(cost, *args):
+            xs = args[:len(args) // 2]
+            ys = args[len(args) // 2:]
+            return functions.crf1d(
+                cost, xs, ys, reduce=self.reduce,
+                enable_double_backprop=True)
+
+        args = [self.cost] + self.xs + self.ys
+        grad = None if self.reduce == 'mean' else self.g
+        gradient_check.check_backward(
+            f, args, grad, rtol=1e-3, atol=1e-3)
+
+    def test_same_gradient_as_double_backprop_cpu(self):
+        grads = []
+        for enable_double_backprop in (False, True):
+            cost = chainer.Variable(self.cost)
+            xs = [chainer.Variable(x) for x in self.xs]
+            loss = functions.crf1d(
+                cost, xs, self.ys, reduce=self.reduce,
+                enable_double_backprop=enable_double_backprop)
+            if self.reduce == 'no':
+                loss.grad = self.g
+            else:
+                loss.grad = numpy.ones_like(loss.array)
+            loss.backward()
+            grads.append([cost.grad] + [x.grad for x in xs])
+        for fused, generic in zip(*grads):
+            if generic is None:
+                # The transition cost is not used by sequences of length 1.
+                generic = numpy.zeros_like(fused)
+            testing.assert_allclose(fused, generic, rtol=1e-5, atol=1e-6)
+
+    def test_double_backprop_error_cpu(self):
+        cost = chainer.Variable(self.cost)
+        xs = [chainer.Variable(x) for x in self.xs]
+        loss = functions.sum(functions.crf1d(cost, xs, self.ys, 'no'))
+        gcost, = chainer.grad([loss], [cost], enable_double_backprop=True)
+        with self.assertRaises(RuntimeError):
+            functions.sum(gcost * gcost).backward()
+
+    def check_argmax_backward(self, cost_data, xs_data, g_data):
+        def f(cost, *xs):
+            return functions.argmax_crf1d(cost, xs)[0]
+
+        gradient_check.check_backward(
+            f, [cost_data] + xs_data, g_data, eps=1e-3, rtol=1e-3,
+            atol=1e-3)
+
+    def test_argmax_backward_cpu(self):
+        self.check_argmax_backward(self.cost, self.xs, self.g)
+
+    @attr.gpu
+    def test_argmax_backward_gpu(self):
+        self.check_argmax_backward(cuda.to_gpu(self.cost),
+                                   [cuda.to_gpu(x) for x in self.xs],
+                                   cuda.to_gpu(self.g))
+
     def check_argmax(self, cost_data, xs_data):
         cost = chainer.Variable(cost_data)
         xs = [chainer.Variable(x) for x in xs_data]
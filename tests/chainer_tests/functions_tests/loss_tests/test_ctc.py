@@ -229,6 +229,25 @@ class TestCTCBlankSymbol(unittest.TestCase, CTCTestBase):
         self.blank_symbol = 3
 
 
+@testing.parameterize(*testing.product({
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+    'reduce': ['mean', 'no'],
+}))
+class TestCTCWithMixedLength(unittest.TestCase, CTCTestBase):
+
+    def setUp(self):
+        CTCTestBase.setUp(self)
+        self.x = numpy.random.uniform(-1, 1, (5, 3, 3)).astype(self.dtype)
+        self.t = numpy.array([[0, 0], [1, 0], [0, 1]]).astype(numpy.int32)
+        self.l = numpy.array([[2, 0, 2, 0, 2],
+                              [2, 1, 2, 0, 2],
+                              [2, 0, 2, 1, 2]]).astype(numpy.int32)
+        self.x_length = numpy.array([5, 3, 2], dtype='i')
+        self.l_length = numpy.array([2, 1, 0], dtype='i')
+        if self.reduce == 'no':
+            self.gy = numpy.random.uniform(-1, 1, (3,)).astype(self.dtype)
+
+
 class TestCTCUseNoBackpropMode(unittest.TestCase):
 
     def test_no_backprop_mode(self):
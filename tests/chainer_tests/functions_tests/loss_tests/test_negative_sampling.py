@@ -189,4 +189,57 @@ class TestNegativeSamplingInvalidReductionOption(unittest.TestCase):
         self.check_invalid_option(cuda.cupy)
 
 
+@testing.parameterize(*testing.product({
+    'reduce': ['sum', 'no'],
+}))
+class TestNegativeSamplingBatchCPU(unittest.TestCase):
+
+    # Compares the batched CPU implementation with a per-example one, on a
+    # batch where the samples of the examples share rows of the weight.
+
+    in_size = 4
+    sample_size = 6
+    label_size = 7
+
+    def setUp(self):
+        batch = 20
+        self.x = numpy.random.uniform(
+            -1, 1, (batch, self.in_size)).astype(numpy.float64)
+        self.t = numpy.random.randint(
+            -1, self.label_size, batch).astype(numpy.int32)
+        self.w = numpy.random.uniform(
+            -1, 1, (self.label_size, self.in_size)).astype(numpy.float64)
+        g_shape = () if self.reduce == 'sum' else (batch,)
+        self.gy = numpy.random.uniform(-1, 1, g_shape)
+
+    def test_backward(self):
+        x = chainer.Variable(self.x)
+        w = chainer.Variable(self.w)
+        sampler = make_sampler(
+            chainer.testing.BackendConfig({}), self.label_size)
+        y, samples = functions.negative_sampling(
+            x, self.t, w, sampler, self.sample_size, reduce=self.reduce,
+            return_samples=True)
+        y.grad = self.gy
+        y.backward()
+
+        gx = numpy.zeros_like(self.x)
+        gw = numpy.zeros_like(self.w)
+        for i in six.moves.range(len(self.x)):
+            if self.t[i] == -1:
+                continue
+            gy = self.gy if self.reduce == 'sum' else self.gy[i]
+            k = samples[i]
+            f = self.w[k].dot(self.x[i])
+            f[0] *= -1
+            g = gy / (1 + numpy.exp(-f))
+            g[0] *= -1
+            gx[i] = g.dot(self.w[k])
+            for ik, ig in six.moves.zip(k, g):
+                gw[ik] += ig * self.x[i]
+
+        testing.assert_allclose(x.grad, gx)
+        testing.assert_allclose(w.grad, gw)
+
+
 testing.run_module(__name__, __file__)
@@ -11,10 +11,15 @@ import threading
 import time
 import unittest
 
+import mock
 import numpy
 import six
 
+import chainer
+from chainer.dataset import convert
+from chainer import datasets
 from chainer import iterators
+from chainer.iterators import multiprocess_iterator
 from chainer import serializer
 from chainer import testing
 from chainer.testing import attr
@@ -564,6 +569,223 @@ class TestMultiprocessIteratorInvalidOrderSampler(unittest.TestCase):
             it.next()
 
 
+@testing.parameterize(*testing.product({
+    'n_prefetch': [1, 2],
+    'shuffle': [False, True],
+}))
+class TestMultiprocessIteratorColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.options = {'n_processes': 2, 'n_prefetch': self.n_prefetch,
+                        'shuffle': self.shuffle, 'columnar': True}
+
+    def check_batches(self, it, n_batches, check_batch):
+        for _ in range(n_batches):
+            batch = it.next()
+            self.assertIsInstance(batch, convert.ColumnarBatch)
+            check_batch(batch)
+        it.finalize()
+
+    def test_tuple_type(self):
+        xs = numpy.random.rand(10, 3, 2).astype(numpy.float32)
+        dataset = [(x, i) for i, x in enumerate(xs)]
+        it = iterators.MultiprocessIterator(dataset, 4, **self.options)
+
+        def check_batch(batch):
+            x, t = convert.concat_examples(batch)
+            self.assertEqual(x.shape, (len(batch), 3, 2))
+            self.assertEqual(x.dtype, numpy.float32)
+            numpy.testing.assert_array_equal(x, xs[t])
+            x_i, t_i = batch[0]
+            numpy.testing.assert_array_equal(x_i, xs[t_i])
+
+        self.check_batches(it, 8, check_batch)
+
+    def test_dict_type(self):
+        xs = numpy.random.rand(10, 3).astype(numpy.float32)
+        dataset = [{'x': x, 't': numpy.int32(i)} for i, x in enumerate(xs)]
+        it = iterators.MultiprocessIterator(dataset, 3, **self.options)
+
+        def check_batch(batch):
+            result = convert.concat_examples(batch)
+            self.assertEqual(result['t'].dtype, numpy.int32)
+            numpy.testing.assert_array_equal(result['x'], xs[result['t']])
+
+        self.check_batches(it, 8, check_batch)
+
+    def test_array_type(self):
+        xs = numpy.arange(20, dtype=numpy.float64).reshape(10, 2)
+        it = iterators.MultiprocessIterator(xs, 3, **self.options)
+
+        def check_batch(batch):
+            x = convert.concat_examples(batch)
+            numpy.testing.assert_array_equal(x[:, 1] - x[:, 0], 1)
+
+        self.check_batches(it, 8, check_batch)
+
+    def test_not_repeat(self):
+        xs = numpy.arange(5, dtype=numpy.int32)
+        it = iterators.MultiprocessIterator(
+            xs, 2, repeat=False, **self.options)
+        values = []
+        for batch in it:
+            values.extend(convert.concat_examples(batch).tolist())
+        self.assertEqual(sorted(values), list(range(5)))
+        it.finalize()
+
+    def test_mismatched_example(self):
+        dataset = [numpy.zeros(2, numpy.float32)] * 4 + \
+            [numpy.zeros(3, numpy.float32)] * 4
+        it = iterators.MultiprocessIterator(
+            dataset, 4, shuffle=False, n_processes=2, columnar=True)
+        it.next()
+        batch = it.next()
+        self.assertIsInstance(batch, list)
+        self.assertEqual([x.shape for x in batch], [(3,)] * 4)
+        it.finalize()
+
+    def test_unsupported_examples(self):
+        dataset = ['a', 'b', 'c', 'd']
+        it = iterators.MultiprocessIterator(dataset, 2, **self.options)
+        with testing.assert_warns(UserWarning):
+            batch = it.next()
+        self.assertEqual(len(batch), 2)
+        batch = it.next()
+        self.assertIsInstance(batch, list)
+        it.finalize()
+
+    def test_copy(self):
+        it = iterators.MultiprocessIterator([1, 2, 3], 2, **self.options)
+        copy_it = copy.copy(it)
+        self.assertTrue(copy_it.columnar)
+        it.finalize()
+        copy_it.finalize()
+
+    def test_get_examples(self):
+        xs = numpy.random.rand(10, 3).astype(numpy.float32)
+        ts = numpy.arange(10, dtype=numpy.int32)
+        dataset = datasets.TupleDataset(xs, ts)
+        it = iterators.MultiprocessIterator(dataset, 4, **self.options)
+
+        def check_batch(batch):
+            self.assertEqual(len(batch), 4)
+            x, t = convert.concat_examples(batch)
+            numpy.testing.assert_array_equal(x, xs[t])
+
+        self.check_batches(it, 8, check_batch)
+
+    def test_get_examples_mismatch(self):
+        # The chunks which do not match the layout are written example by
+        # example.
+        xs = numpy.random.rand(10, 3).astype(numpy.float32)
+        ts = numpy.arange(10, dtype=numpy.int32)
+        dataset = datasets.TupleDataset(xs, list(ts))
+        it = iterators.MultiprocessIterator(dataset, 4, **self.options)
+
+        def check_batch(batch):
+            x, t = convert.concat_examples(batch)
+            numpy.testing.assert_array_equal(x, xs[t])
+
+        self.check_batches(it, 8, check_batch)
+
+
+class TestMultiprocessIteratorAutotune(unittest.TestCase):
+
+    def test_report(self):
+        it = iterators.MultiprocessIterator(
+            [1, 2, 3, 4], 2, n_processes=1, autotune=True)
+        it.next()
+        reporter = chainer.Reporter()
+        observation = {}
+        with reporter.scope(observation):
+            it.next()
+        it.finalize()
+        self.assertEqual(
+            sorted(observation.keys()),
+            ['iterator/idle_time', 'iterator/n_prefetch',
+             'iterator/n_processes', 'iterator/wait_time'])
+        self.assertEqual(observation['iterator/n_processes'], 1)
+        self.assertEqual(observation['iterator/n_prefetch'], 1)
+        self.assertGreaterEqual(observation['iterator/wait_time'], 0)
+
+    def test_copy(self):
+        it = iterators.MultiprocessIterator([1, 2, 3], 2, autotune=True)
+        copy_it = copy.copy(it)
+        self.assertTrue(copy_it.autotune)
+        it.finalize()
+        copy_it.finalize()
+
+
+@testing.parameterize(
+    # The workers cannot keep up with the consumer.
+    {'n_processes': 1, 'n_prefetch': 1, 'wait_time': 0.5, 'idle_time': 0.,
+     'expect': (2, 1)},
+    {'n_processes': 4, 'n_prefetch': 1, 'wait_time': 0.5, 'idle_time': 0.,
+     'expect': (4, 2)},
+    {'n_processes': 4, 'n_prefetch': 8, 'wait_time': 0.5, 'idle_time': 0.,
+     'expect': (4, 8)},
+    # The batches are sometimes late.
+    {'n_processes': 2, 'n_prefetch': 1, 'wait_time': 0.05, 'idle_time': 0.,
+     'expect': (2, 2)},
+    # The workers are mostly idle.
+    {'n_processes': 2, 'n_prefetch': 2, 'wait_time': 0., 'idle_time': 0.9,
+     'expect': (1, 2)},
+    {'n_processes': 1, 'n_prefetch': 2, 'wait_time': 0., 'idle_time': 0.9,
+     'expect': (1, 1)},
+    {'n_processes': 1, 'n_prefetch': 1, 'wait_time': 0., 'idle_time': 0.9,
+     'expect': (1, 1)},
+    # Balanced.
+    {'n_processes': 2, 'n_prefetch': 2, 'wait_time': 0.001, 'idle_time': 0.1,
+     'expect': (2, 2)},
+)
+class TestMultiprocessIteratorTune(unittest.TestCase):
+
+    # The tuning is driven with injected times and statistics, without
+    # launching the prefetch thread.
+
+    def setUp(self):
+        self.it = iterators.MultiprocessIterator(
+            list(range(100)), 2, n_processes=self.n_processes,
+            n_prefetch=self.n_prefetch, autotune=True)
+        self.loop = self.it._prefetch_loop
+        self.loop._max_processes = 4
+        self.loop._max_prefetch = 8
+        self.loop._pool = mock.MagicMock()
+        self.now = 0.
+        self.tune()
+
+    def tearDown(self):
+        self.it.finalize()
+
+    def tune(self, wait_time=0., idle_time=0.):
+        time_module = mock.MagicMock()
+        time_module.time.side_effect = lambda: self.now
+        with mock.patch.object(
+                multiprocess_iterator, 'time', time_module), \
+                mock.patch.object(
+                    self.loop._comm, 'pop_tuning_statistics',
+                    return_value=(wait_time, idle_time)), \
+                mock.patch.object(self.loop, '_create_pool') as create_pool:
+            self.loop._tune()
+        return create_pool
+
+    def test_tune(self):
+        # The parameters are only changed at the end of an interval of one
+        # second.
+        for _ in range(multiprocess_iterator._autotune_interval - 1):
+            create_pool = self.tune(self.wait_time, self.idle_time)
+            self.assertEqual(self.loop.n_processes, self.n_processes)
+            self.assertEqual(self.it._comm.n_prefetch, self.n_prefetch)
+        self.now = 1.
+        create_pool = self.tune(self.wait_time, self.idle_time)
+
+        n_processes, n_prefetch = self.expect
+        self.assertEqual(self.loop.n_processes, n_processes)
+        self.assertEqual(self.it._comm.n_prefetch, n_prefetch)
+        self.assertEqual(
+            create_pool.call_count, int(n_processes != self.n_processes))
+
+
 class TestMultiprocessIteratorConcurrency(unittest.TestCase):
 
     def test_finalize_not_deadlock(self):
@@ -632,6 +854,8 @@ import os
 import random
 import sys
 import time
+import chainer
+from chainer.dataset import convert
 from chainer import iterators
 
 # Using `multiprocessing` on Windows Python 2.7 requires
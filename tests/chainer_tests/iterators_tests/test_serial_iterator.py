@@ -3,6 +3,8 @@ import unittest
 
 import numpy
 
+from chainer import dataset
+from chainer import datasets
 from chainer import iterators
 from chainer import serializer
 from chainer import testing
@@ -369,6 +371,37 @@ class TestSerialIteratorOrderSamplerEpochSize(unittest.TestCase):
                 sorted(batch1 + batch2 + batch3), [1, 1, 2, 2, 3, 3])
 
 
+class TestSerialIteratorGetExamples(unittest.TestCase):
+
+    def test_columnar(self):
+        x = numpy.random.rand(10, 3)
+        t = numpy.arange(10, dtype=numpy.int32)
+        it = iterators.SerialIterator(
+            datasets.TupleDataset(x, t), 4, shuffle=True)
+        seen = []
+        for _ in range(5):
+            batch = it.next()
+            self.assertIsInstance(batch, dataset.ColumnarBatch)
+            x_b, t_b = dataset.concat_examples(batch)
+            numpy.testing.assert_array_equal(x_b, x[t_b])
+            seen.extend(t_b.tolist())
+        self.assertEqual(sorted(seen[:10]), list(range(10)))
+
+    def test_dataset_mixin(self):
+        class Dataset(dataset.DatasetMixin):
+
+            def __len__(self):
+                return 5
+
+            def get_example(self, i):
+                return i
+
+        it = iterators.SerialIterator(Dataset(), 2, shuffle=False)
+        self.assertEqual(it.next(), [0, 1])
+        self.assertEqual(it.next(), [2, 3])
+        self.assertEqual(it.next(), [4, 0])
+
+
 class NoSameIndicesOrderSampler(object):
 
     def __init__(self, batchsize):
@@ -129,4 +129,28 @@ class TestEmbedIDUnpickleOldFile(unittest.TestCase):
         self.assertEqual(y.data.shape, (2, 4))
 
 
+class TestEmbedIDSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.W = numpy.random.uniform(-1, 1, (6, 4)).astype(numpy.float32)
+        self.x = numpy.array([[0, 4], [4, -1]], dtype=numpy.int32)
+
+    def update(self, sparse_grad):
+        embed = links.EmbedID(6, 4, initialW=self.W.copy(), ignore_label=-1,
+                              sparse_grad=sparse_grad)
+        optimizer = chainer.optimizers.SGD(lr=0.1)
+        optimizer.setup(embed)
+        optimizer.update(lambda: chainer.functions.sum(embed(self.x) ** 2))
+        return embed
+
+    def test_sparse_grad(self):
+        embed = self.update(True)
+        self.assertIsNone(embed.W.grad)
+        self.assertEqual(
+            sorted(embed.W.sparse_grad.rows.tolist()), [0, 4])
+        testing.assert_allclose(embed.W.array, self.update(False).W.array)
+        numpy.testing.assert_array_equal(
+            embed.W.array[[1, 2, 3, 5]], self.W[[1, 2, 3, 5]])
+
+
 testing.run_module(__name__, __file__)
@@ -134,4 +134,56 @@ class TestBinaryHierarchicalSoftmax(unittest.TestCase):
         self.assertTrue((f.codes == g.codes).all())
 
 
+class TestTreeParser(unittest.TestCase):
+
+    def test_padded_paths(self):
+        parser = links.loss.hierarchical_softmax.TreeParser(numpy.float32)
+        parser.parse(((0, 1), ((3, 4), 5)))
+        paths, codes, mask = parser.get_padded_paths(6)
+        self.assertEqual(paths.shape, (6, 3))
+        numpy.testing.assert_array_equal(
+            mask.sum(axis=1), [2, 2, 0, 3, 3, 2])
+        numpy.testing.assert_array_equal(paths[3], [0, 2, 3])
+        numpy.testing.assert_array_equal(codes[3], [-1, 1, 1])
+        numpy.testing.assert_array_equal(paths[5], [0, 2, 0])
+        numpy.testing.assert_array_equal(codes[5], [-1, -1, 0])
+        numpy.testing.assert_array_equal(codes[2], [0, 0, 0])
+        self.assertEqual(codes.dtype, numpy.float32)
+
+
+@testing.parameterize(*testing.product({
+    'dtype': [numpy.float32, numpy.float64],
+}))
+class TestBinaryHierarchicalSoftmaxBatch(unittest.TestCase):
+
+    def setUp(self):
+        tree = ((0, (1, (5, 6))), ((2, 3), 4))
+        with chainer.using_config('dtype', self.dtype):
+            self.link = links.BinaryHierarchicalSoftmax(4, tree)
+        self.x = numpy.random.uniform(-1, 1, (6, 4)).astype(self.dtype)
+        self.t = numpy.array([6, 0, 6, 3, 4, 1], dtype=numpy.int32)
+
+    def test_batch(self):
+        # The loss and the gradients of a batch equal the sums of those of
+        # each example.
+        self.link.cleargrads()
+        x = chainer.Variable(self.x)
+        loss = self.link(x, self.t)
+        loss.backward()
+        gx, gW = x.grad, self.link.W.grad.copy()
+
+        expect_loss = 0
+        expect_gW = numpy.zeros_like(gW)
+        for i in range(len(self.t)):
+            self.link.cleargrads()
+            xi = chainer.Variable(self.x[i:i + 1])
+            loss_i = self.link(xi, self.t[i:i + 1])
+            loss_i.backward()
+            expect_loss += loss_i.array
+            expect_gW += self.link.W.grad
+            testing.assert_allclose(gx[i:i + 1], xi.grad)
+        testing.assert_allclose(loss.array, expect_loss)
+        testing.assert_allclose(gW, expect_gW)
+
+
 testing.run_module(__name__, __file__)
@@ -107,4 +107,110 @@ class TestGradientClipping(unittest.TestCase):
         self.check_clipping(2.0)
 
 
+@testing.parameterize(*testing.product({
+    'multiplier': [0.5, 2.0],
+    'weight_decay': [0.0, 0.2],
+}))
+class TestGradientClippingMultipleParams(unittest.TestCase):
+
+    def setUp(self):
+        self.target = chainer.ChainList(
+            SimpleLink(np.random.uniform(-1, 1, (2, 3)).astype(np.float32),
+                       np.random.uniform(-1, 1, (2, 3)).astype(np.float32)),
+            SimpleLink(np.random.uniform(-1, 1, (4,)).astype(np.float64),
+                       np.random.uniform(-1, 1, (4,)).astype(np.float64)),
+            SimpleLink(np.random.uniform(-1, 1, (3,)).astype(np.float32),
+                       np.random.uniform(-1, 1, (3,)).astype(np.float32)))
+
+    def check_clipping(self):
+        ws = [link.param.data for link in self.target]
+        gs = [cuda.to_cpu(link.param.grad)
+              + self.weight_decay * cuda.to_cpu(link.param.data)
+              for link in self.target]
+        norm = np.sqrt(sum([float(np.sum(g * g)) for g in gs]))
+        threshold = norm * self.multiplier
+        rate = min(self.multiplier, 1)
+        expects = [cuda.to_cpu(w) - g * rate for w, g in zip(ws, gs)]
+
+        opt = optimizers.SGD(lr=1)
+        opt.setup(self.target)
+        opt.add_hook(optimizer_hooks.GradientClipping(
+            threshold, weight_decay=self.weight_decay))
+        opt.update()
+
+        for expect, w in zip(expects, ws):
+            testing.assert_allclose(expect, w, rtol=1e-4, atol=1e-4)
+
+    def test_clipping_cpu(self):
+        self.check_clipping()
+
+    def test_clipping_twice_cpu(self):
+        self.check_clipping()
+        for link in self.target:
+            link.param.grad = np.random.uniform(
+                -1, 1, link.param.shape).astype(link.param.dtype)
+        self.check_clipping()
+
+    @attr.gpu
+    def test_clipping_gpu(self):
+        self.target.to_gpu()
+        self.check_clipping()
+
+
+@testing.parameterize(*testing.product({
+    'multiplier': [0.5, 2.0],
+    'weight_decay': [0.0, 0.2],
+}))
+class TestGradientClippingSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.target = chainer.ChainList(
+            SimpleLink(np.random.uniform(-1, 1, (5, 3)).astype(np.float32),
+                       np.zeros((5, 3), dtype=np.float32)),
+            SimpleLink(np.random.uniform(-1, 1, (4,)).astype(np.float32),
+                       np.random.uniform(-1, 1, (4,)).astype(np.float32)))
+        param = self.target[0].param
+        param.cleargrad()
+        param.add_sparse_grad(chainer.utils.IndexedRows(
+            np.array([3, 1, 3], dtype=np.int32),
+            np.random.uniform(-1, 1, (3, 3)).astype(np.float32), (5, 3)))
+
+    def check_clipping(self):
+        rows = [1, 3]
+        sparse_param = self.target[0].param
+        dense_param = self.target[1].param
+        w_sparse = cuda.to_cpu(sparse_param.data)
+        w_dense = cuda.to_cpu(dense_param.data)
+        g_sparse = (cuda.to_cpu(sparse_param.sparse_grad.to_dense())[rows]
+                    + self.weight_decay * w_sparse[rows])
+        g_dense = cuda.to_cpu(dense_param.grad) + self.weight_decay * w_dense
+        norm = np.sqrt(float(np.sum(g_sparse * g_sparse))
+                       + float(np.sum(g_dense * g_dense)))
+        threshold = norm * self.multiplier
+        rate = min(self.multiplier, 1)
+        expect_sparse = w_sparse.copy()
+        expect_sparse[rows] -= g_sparse * rate
+        expect_dense = w_dense - g_dense * rate
+
+        opt = optimizers.SGD(lr=1)
+        opt.setup(self.target)
+        opt.add_hook(optimizer_hooks.GradientClipping(
+            threshold, weight_decay=self.weight_decay))
+        opt.update()
+
+        self.assertIsNone(sparse_param.grad)
+        testing.assert_allclose(
+            expect_sparse, sparse_param.data, rtol=1e-4, atol=1e-4)
+        testing.assert_allclose(
+            expect_dense, dense_param.data, rtol=1e-4, atol=1e-4)
+
+    def test_clipping_cpu(self):
+        self.check_clipping()
+
+    @attr.gpu
+    def test_clipping_gpu(self):
+        self.target.to_gpu()
+        self.check_clipping()
+
+
 testing.run_module(__name__, __file__)
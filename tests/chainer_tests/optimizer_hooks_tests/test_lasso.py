@@ -21,6 +21,9 @@ class SimpleLink(chainer.Link):
         self.param.grad = g
 
 
+@testing.parameterize(*testing.product({
+    'call_for_each_param': [True, False],
+}))
 class TestLasso(unittest.TestCase):
     def setUp(self):
         self.target = SimpleLink(
@@ -36,7 +39,8 @@ class TestLasso(unittest.TestCase):
 
         opt = optimizers.SGD(lr=1)
         opt.setup(self.target)
-        opt.add_hook(optimizer_hooks.Lasso(decay))
+        opt.add_hook(optimizer_hooks.Lasso(
+            decay, call_for_each_param=self.call_for_each_param))
         opt.update()
 
         testing.assert_allclose(expect, w)
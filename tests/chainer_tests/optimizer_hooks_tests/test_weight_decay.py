@@ -20,6 +20,9 @@ class SimpleLink(chainer.Link):
         self.param.grad = g
 
 
+@testing.parameterize(*testing.product({
+    'call_for_each_param': [True, False],
+}))
 class TestWeightDecay(unittest.TestCase):
 
     def setUp(self):
@@ -36,7 +39,8 @@ class TestWeightDecay(unittest.TestCase):
 
         opt = optimizers.SGD(lr=1)
         opt.setup(self.target)
-        opt.add_hook(optimizer_hooks.WeightDecay(decay))
+        opt.add_hook(optimizer_hooks.WeightDecay(
+            decay, call_for_each_param=self.call_for_each_param))
         opt.update()
 
         testing.assert_allclose(expect, w)
@@ -50,4 +54,80 @@ class TestWeightDecay(unittest.TestCase):
         self.check_weight_decay()
 
 
+class TestWeightDecayBuffers(unittest.TestCase):
+
+    def test_reuse_buffers(self):
+        target = chainer.ChainList(
+            SimpleLink(np.arange(6, dtype=np.float32).reshape(2, 3),
+                       np.ones((2, 3), dtype=np.float32)),
+            SimpleLink(np.arange(4, dtype=np.float32),
+                       np.ones(4, dtype=np.float32)))
+        ws = [link.param.data for link in target]
+        opt = optimizers.SGD(lr=1)
+        opt.setup(target)
+        opt.add_hook(optimizer_hooks.WeightDecay(
+            0.5, call_for_each_param=False))
+
+        opt.update()
+        bucket, = opt._grad_buckets.values()
+        work = bucket._work
+        for link in target:
+            link.param.grad = np.ones_like(link.param.data)
+        expects = [w - 1 - 0.5 * w for w in ws]
+        opt.update()
+
+        self.assertIs(bucket, opt._grad_buckets[np.dtype(np.float32)])
+        self.assertIs(work, bucket._work)
+        # The parameter arrays are updated in place.
+        for expect, w, link in zip(expects, ws, target):
+            self.assertIs(w, link.param.data)
+            testing.assert_allclose(expect, w)
+
+
+@testing.parameterize(*testing.product({
+    'call_for_each_param': [True, False],
+    'register_to_rule': [True, False],
+}))
+class TestWeightDecaySparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.target = SimpleLink(
+            np.arange(12, dtype=np.float32).reshape(4, 3),
+            np.zeros((4, 3), dtype=np.float32))
+        self.target.param.cleargrad()
+        self.target.param.add_sparse_grad(chainer.utils.IndexedRows(
+            np.array([2, 0, 2], dtype=np.int32),
+            np.arange(9, dtype=np.float32).reshape(3, 3), (4, 3)))
+
+    def check_weight_decay(self):
+        w = self.target.param.data
+        g = self.target.param.sparse_grad.to_dense()
+
+        # Only the rows in the sparse gradient are decayed.
+        decay = 0.2
+        expect = w - g - decay * w
+        expect[[1, 3]] = w[[1, 3]]
+
+        opt = optimizers.SGD(lr=1)
+        opt.setup(self.target)
+        hook = optimizer_hooks.WeightDecay(
+            decay, call_for_each_param=self.call_for_each_param)
+        if self.register_to_rule:
+            self.target.param.update_rule.add_hook(hook)
+        else:
+            opt.add_hook(hook)
+        opt.update()
+
+        self.assertIsNone(self.target.param.grad)
+        testing.assert_allclose(expect, w)
+
+    def test_weight_decay_cpu(self):
+        self.check_weight_decay()
+
+    @attr.gpu
+    def test_weight_decay_gpu(self):
+        self.target.to_gpu()
+        self.check_weight_decay()
+
+
 testing.run_module(__name__, __file__)
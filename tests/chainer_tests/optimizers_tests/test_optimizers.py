@@ -138,4 +138,189 @@ class TestOptimizerHooks(unittest.TestCase):
         self.assertNotEqual(h_pre.value, h_post.value)
 
 
+@testing.parameterize(*testing.product({
+    'impl': [
+        optimizers.Adam,
+        optimizers.MomentumSGD,
+        optimizers.RMSprop,
+        optimizers.SGD,
+    ],
+    'dtype': [np.float32, np.float64],
+}))
+class TestOptimizerFusedUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.shapes = [(3, 2), (4,), (), (2, 3, 4)]
+        self.data = [np.random.uniform(-1, 1, shape).astype(self.dtype)
+                     for shape in self.shapes]
+
+    def create(self, fused):
+        target = chainer.ChainList(*[chainer.Link() for _ in self.shapes])
+        for link, data in six.moves.zip(target, self.data):
+            with link.init_scope():
+                link.w = chainer.Parameter(data.copy())
+        optimizer = self.impl()
+        optimizer.setup(target)
+        optimizer.use_fused_update(fused)
+        return target, optimizer
+
+    def update(self, target, optimizer, grads):
+        for link, grad in six.moves.zip(target, grads):
+            link.w.grad = grad.copy()
+        optimizer.update()
+
+    def test_update(self):
+        target, optimizer = self.create(False)
+        fused_target, fused_optimizer = self.create(True)
+        for _ in six.moves.range(3):
+            grads = [np.random.uniform(-1, 1, shape).astype(self.dtype)
+                     for shape in self.shapes]
+            self.update(target, optimizer, grads)
+            self.update(fused_target, fused_optimizer, grads)
+
+        for link, fused_link in six.moves.zip(target, fused_target):
+            testing.assert_allclose(link.w.array, fused_link.w.array)
+            self.assertEqual(link.w.update_rule.t, fused_link.w.update_rule.t)
+            for name, value in six.iteritems(link.w.update_rule.state):
+                testing.assert_allclose(
+                    value, fused_link.w.update_rule.state[name])
+
+    def test_params_are_views(self):
+        target, optimizer = self.create(True)
+        grads = [np.ones(shape, dtype=self.dtype) for shape in self.shapes]
+        self.update(target, optimizer, grads)
+
+        arrays = [link.w.array for link in target]
+        self.update(target, optimizer, grads)
+        for link, array in six.moves.zip(target, arrays):
+            self.assertIs(link.w.array, array)
+            self.assertIsNot(array.base, None)
+            self.assertEqual(link.w.dtype, self.dtype)
+
+    def test_replaced_array(self):
+        target, optimizer = self.create(True)
+        grads = [np.ones(shape, dtype=self.dtype) for shape in self.shapes]
+        self.update(target, optimizer, grads)
+
+        # Replacing the array of a parameter repacks the buffers.
+        new_array = np.zeros(self.shapes[0], dtype=self.dtype)
+        target[0].w.array = new_array
+        expected = [link.w.array.copy() for link in target]
+        self.update(target, optimizer, grads)
+        self.assertIsNot(target[0].w.array, new_array)
+        for link, value in six.moves.zip(target, expected):
+            self.assertFalse(np.array_equal(link.w.array, value))
+
+    def test_rule_with_hook_is_not_fused(self):
+        target, optimizer = self.create(True)
+        calls = []
+        target[1].w.update_rule.add_hook(
+            lambda rule, param: calls.append(param), name='hook')
+        grads = [np.ones(shape, dtype=self.dtype) for shape in self.shapes]
+        self.update(target, optimizer, grads)
+        self.assertEqual(calls, [target[1].w])
+
+
+@testing.parameterize(*testing.product({
+    'impl': [
+        optimizers.AdaGrad,
+        optimizers.Adam,
+        optimizers.MomentumSGD,
+        optimizers.SGD,
+    ],
+    'dtype': [np.float32, np.float64],
+}))
+class TestOptimizerSparseUpdate(unittest.TestCase):
+
+    shape = (10, 3)
+
+    def setUp(self):
+        self.data = np.random.uniform(-1, 1, self.shape).astype(self.dtype)
+
+    def create(self):
+        target = chainer.Link()
+        with target.init_scope():
+            target.w = chainer.Parameter(self.data.copy())
+        optimizer = self.impl()
+        optimizer.setup(target)
+        return target, optimizer
+
+    def sparse_grad(self, rows):
+        rows = np.array(rows, dtype=np.int32)
+        values = np.random.uniform(
+            -1, 1, (len(rows),) + self.shape[1:]).astype(self.dtype)
+        return chainer.utils.IndexedRows(rows, values, self.shape)
+
+    def test_update(self):
+        # Lazy updates are equivalent to dense ones if the same rows are
+        # always touched.
+        target, optimizer = self.create()
+        sparse_target, sparse_optimizer = self.create()
+        for _ in six.moves.range(3):
+            grad = self.sparse_grad([4, 1, 4, 7])
+            target.w.grad = grad.to_dense()
+            optimizer.update()
+            sparse_target.cleargrads()
+            sparse_target.w.add_sparse_grad(grad)
+            sparse_optimizer.update()
+            self.assertIsNone(sparse_target.w.grad)
+
+        testing.assert_allclose(target.w.array, sparse_target.w.array)
+        for name, value in six.iteritems(target.w.update_rule.state):
+            testing.assert_allclose(
+                value, sparse_target.w.update_rule.state[name])
+
+    def test_untouched_rows(self):
+        target, optimizer = self.create()
+        for rows in ([0, 2], [2, 5, 2]):
+            target.cleargrads()
+            target.w.add_sparse_grad(self.sparse_grad(rows))
+            optimizer.update()
+        untouched = [1, 3, 4, 6, 7, 8, 9]
+        np.testing.assert_array_equal(
+            target.w.array[untouched], self.data[untouched])
+        for value in six.itervalues(target.w.update_rule.state):
+            np.testing.assert_array_equal(value[untouched], 0)
+
+    def test_mixed_grad(self):
+        # The sparse gradient is merged into the dense gradient.
+        target, optimizer = self.create()
+        dense_target, dense_optimizer = self.create()
+        grad = np.random.uniform(-1, 1, self.shape).astype(self.dtype)
+        sparse_grad = self.sparse_grad([3, 3])
+        target.w.grad = grad.copy()
+        target.w.add_sparse_grad(sparse_grad)
+        optimizer.update()
+        dense_target.w.grad = sparse_grad.to_dense(grad.copy())
+        dense_optimizer.update()
+        testing.assert_allclose(target.w.array, dense_target.w.array)
+        self.assertIsNone(target.w.sparse_grad)
+
+    def test_loss_scale(self):
+        # The sparse gradients are unscaled as well as the dense ones.
+        x = np.array([4, 1, 4], dtype=np.int32)
+        targets = []
+        for sparse_grad in (False, True):
+            target, optimizer = self.create()
+            loss = chainer.functions.sum(chainer.functions.embed_id(
+                x, target.w, sparse_grad=sparse_grad))
+            target.cleargrads()
+            loss.backward(loss_scale=128.)
+            self.assertEqual(target.w.sparse_grad is not None, sparse_grad)
+            optimizer.update()
+            targets.append(target)
+        testing.assert_allclose(targets[0].w.array, targets[1].w.array)
+
+    def test_hook_without_sparse_support(self):
+        target, optimizer = self.create()
+        grads = []
+        optimizer.add_hook(lambda opt: grads.append(target.w.grad),
+                           name='hook', timing='pre')
+        sparse_grad = self.sparse_grad([1, 8])
+        target.cleargrads()
+        target.w.add_sparse_grad(sparse_grad)
+        optimizer.update()
+        np.testing.assert_array_equal(grads[0], sparse_grad.to_dense())
+
+
 testing.run_module(__name__, __file__)
@@ -13,6 +13,7 @@ from chainer.backends import intel64
 from chainer import link
 from chainer import links
 from chainer import optimizers
+from chainer.serializers import _chunked
 from chainer.serializers import npz
 from chainer import testing
 from chainer.testing import attr
@@ -523,6 +524,212 @@ class TestLoadNpz(unittest.TestCase):
             target.parent_linear.W.data)
 
 
+@testing.parameterize(*testing.product({
+    'codec': ['none', 'zlib', 'lzma'],
+    'file_type': ['filename', 'bytesio'],
+}))
+class TestSaveNpzChunked(unittest.TestCase):
+
+    def setUp(self):
+        if self.codec == 'lzma' and not _chunked._lzma_available:
+            raise unittest.SkipTest('lzma is not available')
+        if self.file_type == 'filename':
+            fd, path = tempfile.mkstemp()
+            os.close(fd)
+            self.file = path
+        else:
+            self.file = six.BytesIO()
+
+        self.source = link.Chain()
+        with self.source.init_scope():
+            self.source.linear = links.Linear(30, 20)
+            self.source.bn = links.BatchNormalization(20)
+        self.source.bn.avg_mean[:] = numpy.arange(20)
+        self.source.bn.N = 3
+
+    def tearDown(self):
+        if self.file_type == 'filename':
+            os.remove(self.file)
+
+    def save(self, **kwargs):
+        npz.save_npz(self.file, self.source, codec=self.codec, **kwargs)
+        if self.file_type == 'bytesio':
+            self.file.seek(0)
+
+    def check_load(self):
+        target = link.Chain()
+        with target.init_scope():
+            target.linear = links.Linear(None, 20)
+            target.bn = links.BatchNormalization(20)
+        npz.load_npz(self.file, target)
+        for (name, p), (_, q) in zip(
+                sorted(self.source.namedparams()),
+                sorted(target.namedparams())):
+            numpy.testing.assert_array_equal(p.array, q.array, name)
+        numpy.testing.assert_array_equal(
+            target.bn.avg_mean, self.source.bn.avg_mean)
+        self.assertEqual(target.bn.N, 3)
+
+    def test_save_load(self):
+        self.save()
+        self.assertTrue(_chunked.is_chunked(self.file))
+        self.check_load()
+
+    def test_save_load_small_chunks(self):
+        self.save(chunk_size=100, n_threads=3)
+        self.check_load()
+
+    def test_load_mmap_mode(self):
+        self.save()
+        target = links.Linear(30, 20)
+        npz.load_npz(self.file, target, path='linear/', mmap_mode='r')
+        numpy.testing.assert_array_equal(
+            target.W.array, self.source.linear.W.array)
+
+    def test_corrupted(self):
+        self.save(chunk_size=100)
+        if self.file_type == 'filename':
+            with open(self.file, 'rb') as f:
+                data = bytearray(f.read())
+        else:
+            data = bytearray(self.file.getvalue())
+        with _chunked.ChunkedFile(six.BytesIO(bytes(data))) as f:
+            offset, size = f._entries['linear/W']['chunks'][1][:2]
+        data[offset + size // 2] ^= 0xff
+        with _chunked.ChunkedFile(six.BytesIO(bytes(data))) as f:
+            f['linear/b']
+            with self.assertRaises(Exception):
+                f['linear/W']
+
+
+class TestSaveNpzChunkedInvalid(unittest.TestCase):
+
+    def test_invalid_codec(self):
+        with self.assertRaises(ValueError):
+            npz.save_npz(six.BytesIO(), links.Linear(3, 2), codec='gzip')
+
+    def test_object_array(self):
+        with self.assertRaises(ValueError):
+            npz.save_npz(six.BytesIO(), {'a': numpy.array([None, 1])},
+                         codec='zlib')
+
+    def test_not_chunked(self):
+        with self.assertRaises(ValueError):
+            _chunked.ChunkedFile(six.BytesIO(b'a' * 100))
+
+
+@testing.parameterize(*testing.product({
+    'compress': [False, True],
+    'mmap_mode': ['r', 'c', 'r+'],
+}))
+class TestLoadNpzMmap(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.file = tempfile.mkstemp()
+        os.close(fd)
+
+        self.source = link.Chain()
+        with self.source.init_scope():
+            self.source.linear = links.Linear(3, 2)
+            self.source.bn = links.BatchNormalization(2)
+        self.source.bn.avg_mean[:] = numpy.arange(2)
+        npz.save_npz(self.file, self.source, self.compress)
+
+        self.target = link.Chain()
+        with self.target.init_scope():
+            self.target.linear = links.Linear(None, 2)
+            self.target.bn = links.BatchNormalization(2)
+
+    def tearDown(self):
+        # Release the memory maps before removing the file.
+        self.target = None
+        os.remove(self.file)
+
+    def test_load(self):
+        npz.load_npz(self.file, self.target, mmap_mode=self.mmap_mode)
+        for (name, p), (_, q) in zip(
+                sorted(self.source.namedparams()),
+                sorted(self.target.namedparams())):
+            numpy.testing.assert_array_equal(p.array, q.array, name)
+        numpy.testing.assert_array_equal(
+            self.target.bn.avg_mean, numpy.arange(2))
+
+        W = self.target.linear.W.array
+        if self.compress:
+            # Compressed entries are read as usual.
+            self.assertTrue(W.flags.writeable)
+        else:
+            self.assertIsInstance(W.base, npz.mmap.mmap)
+            self.assertEqual(W.flags.writeable, self.mmap_mode != 'r')
+        # The persistent values are copied.
+        self.assertTrue(self.target.bn.avg_mean.flags.writeable)
+
+    def test_copy_on_write(self):
+        if self.mmap_mode != 'c':
+            return
+        npz.load_npz(self.file, self.target, mmap_mode='c')
+        self.target.linear.W.array[...] = 0
+        target = link.Chain()
+        with target.init_scope():
+            target.linear = links.Linear(3, 2)
+            target.bn = links.BatchNormalization(2)
+        npz.load_npz(self.file, target)
+        numpy.testing.assert_array_equal(
+            target.linear.W.array, self.source.linear.W.array)
+
+    def test_load_with_path(self):
+        target = link.Chain()
+        with target.init_scope():
+            target.linear = links.Linear(3, 2)
+        parent = link.Chain()
+        with parent.init_scope():
+            parent.child = target
+        npz.save_npz(self.file, parent, self.compress)
+        target = links.Linear(3, 2)
+        npz.load_npz(self.file, target, path='child/linear/',
+                     mmap_mode=self.mmap_mode)
+        numpy.testing.assert_array_equal(
+            parent.child.linear.W.array, target.W.array)
+
+    def check_load_ignore_names(self, ignore_names):
+        self.target.linear.b.array[...] = 5
+        b = self.target.linear.b.array
+        npz.load_npz(self.file, self.target, ignore_names=ignore_names,
+                     mmap_mode=self.mmap_mode)
+        # The ignored parameter is neither overwritten nor mapped.
+        self.assertIs(self.target.linear.b.array, b)
+        numpy.testing.assert_array_equal(b, numpy.full(2, 5))
+        self.assertTrue(b.flags.writeable)
+        numpy.testing.assert_array_equal(
+            self.target.linear.W.array, self.source.linear.W.array)
+
+    def test_load_ignore_names(self):
+        self.check_load_ignore_names('linear/b')
+
+    def test_load_ignore_names_callable(self):
+        self.check_load_ignore_names([lambda key: key.endswith('/b')])
+
+
+class TestLoadNpzMmapInvalid(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.file = tempfile.mkstemp()
+        os.close(fd)
+        npz.save_npz(self.file, links.Linear(3, 2), False)
+
+    def tearDown(self):
+        os.remove(self.file)
+
+    def test_invalid_mmap_mode(self):
+        with self.assertRaises(ValueError):
+            npz.load_npz(self.file, links.Linear(3, 2), mmap_mode='w')
+
+    def test_file_object(self):
+        with open(self.file, 'rb') as f:
+            with self.assertRaises(TypeError):
+                npz.load_npz(f, links.Linear(3, 2), mmap_mode='r')
+
+
 @testing.parameterize(*testing.product({
     'compress': [False, True],
     'file_type': ['filename', 'bytesio'],
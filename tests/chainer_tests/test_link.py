@@ -1881,6 +1881,41 @@ class TestChainList(unittest.TestCase):
         assert not w
 
 
+class TestChainListCallSequentially(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (2, 3)).astype(numpy.float32)
+        self.chain = chainer.ChainList(
+            chainer.links.Linear(3, 4),
+            chainer.links.Linear(4, 4),
+            chainer.links.Linear(4, 2))
+
+    def backward(self):
+        self.chain.cleargrads()
+        y = self.chain.call_sequentially(chainer.Variable(self.x))
+        chainer.functions.sum(y).backward()
+        return y.array, [param.grad.copy() for param in self.chain.params()]
+
+    def test_call_sequentially(self):
+        h = self.x
+        for link in self.chain:
+            h = link(h)
+        y, _ = self.backward()
+        testing.assert_allclose(h.array, y)
+
+    def test_checkpointing(self):
+        expect_y, expect_grads = self.backward()
+        self.chain.set_checkpointing(every=2)
+        y, grads = self.backward()
+        testing.assert_allclose(expect_y, y)
+        for expect_grad, grad in zip(expect_grads, grads):
+            testing.assert_allclose(expect_grad, grad)
+
+        report = self.chain.checkpointing_report()
+        self.assertEqual(report['activation_bytes'], (8 + 8 + 4) * 4)
+        self.assertEqual(report['retained_bytes'], (8 + 4) * 4)
+
+
 class TestChainListRepeat(unittest.TestCase):
 
     def setUp(self):
@@ -581,4 +581,67 @@ class TestSequential(unittest.TestCase):
         self.assertIs(flattened_s2[2], self.l3)
 
 
+@testing.parameterize(
+    {'every': 2, 'memory_budget': None},
+    {'every': 3, 'memory_budget': None},
+    {'every': None, 'memory_budget': 100},
+)
+class TestSequentialCheckpointing(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (4, 3)).astype(numpy.float32)
+        self.model = sequential.Sequential(
+            links.Linear(3, 4), functions.tanh,
+            links.Linear(4, 4), functions.tanh,
+            links.Linear(4, 2), functions.tanh)
+
+    def backward(self, model):
+        model.cleargrads()
+        y = model(variable.Variable(self.x))
+        functions.sum(y * y).backward()
+        return y.array, [param.grad.copy() for param in model.params()]
+
+    def test_forward_backward(self):
+        expect_y, expect_grads = self.backward(self.model)
+        model = self.model.copy('copy')
+        model.set_checkpointing(self.every, self.memory_budget)
+        for _ in six.moves.range(2):
+            y, grads = self.backward(model)
+            testing.assert_allclose(expect_y, y)
+            for expect_grad, grad in six.moves.zip(expect_grads, grads):
+                testing.assert_allclose(expect_grad, grad)
+
+    def test_report(self):
+        self.assertIsNone(self.model.checkpointing_report())
+        self.model.set_checkpointing(self.every, self.memory_budget)
+        self.assertIsNone(self.model.checkpointing_report())
+        self.backward(self.model)
+
+        report = self.model.checkpointing_report()
+        # Outputs of the layers: (4, 4) x 4 and (4, 2) x 2 in float32
+        self.assertEqual(report['activation_bytes'], 4 * 4 * 4 * 4 + 2 * 32)
+        self.assertGreater(report['saved_bytes'], 0)
+        self.assertEqual(
+            report['saved_bytes'],
+            report['activation_bytes'] - report['retained_bytes'])
+        self.assertGreaterEqual(report['recompute_ratio'], 0)
+        self.assertLessEqual(report['recompute_ratio'], 1)
+
+    def test_disable(self):
+        self.model.set_checkpointing(self.every, self.memory_budget)
+        self.model.set_checkpointing()
+        self.assertIsNone(self.model._checkpoint_schedule)
+
+
+class TestSequentialCheckpointingInvalid(unittest.TestCase):
+
+    def test_both(self):
+        with self.assertRaises(ValueError):
+            sequential.Sequential().set_checkpointing(2, 100)
+
+    def test_invalid_every(self):
+        with self.assertRaises(ValueError):
+            sequential.Sequential().set_checkpointing(every=0)
+
+
 testing.run_module(__name__, __file__)
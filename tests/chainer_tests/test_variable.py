@@ -2968,6 +2968,67 @@ class TestLazyGradSum(unittest.TestCase):
             self.check_backward()
 
 
+class TestVariableFreeRetainedOnBackward(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.random.uniform(-1, 1, (3, 4)).astype(np.float32)
+        self.w = np.random.uniform(-1, 1, (4, 2)).astype(np.float32)
+
+    def forward(self, x, w):
+        h = F.tanh(F.matmul(x, w))
+        y = F.exp(h) * h
+        return F.sum(y), h
+
+    def check_backward(self, free, use_grad):
+        x = chainer.Variable(self.x)
+        w = chainer.Variable(self.w)
+        reporter = chainer.Reporter()
+        observation = {}
+        with chainer.using_config('free_retained_on_backward', free), \
+                reporter.scope(observation):
+            loss, h = self.forward(x, w)
+            h_node = h.node
+            del h
+            if use_grad:
+                gx, gw = chainer.grad([loss], [x, w])
+            else:
+                loss.backward()
+                gx, gw = x.grad_var, w.grad_var
+        return gx.array, gw.array, h_node, observation
+
+    def check(self, use_grad):
+        gx, gw, h_node, observation = self.check_backward(False, use_grad)
+        self.assertIsNotNone(h_node.data)
+        self.assertEqual(observation, {})
+
+        gx_free, gw_free, h_node, observation = self.check_backward(
+            True, use_grad)
+        testing.assert_allclose(gx, gx_free)
+        testing.assert_allclose(gw, gw_free)
+        self.assertIsNone(h_node.data)
+        self.assertEqual(h_node.shape, (3, 2))
+        self.assertGreater(observation['backward/retained_bytes'], 0)
+        self.assertGreater(observation['backward/freed_bytes'], 0)
+        self.assertLessEqual(observation['backward/freed_bytes'],
+                             observation['backward/retained_bytes'])
+
+    def test_backward(self):
+        self.check(False)
+
+    def test_grad(self):
+        self.check(True)
+
+    def test_double_backprop(self):
+        x = chainer.Variable(self.x)
+        w = chainer.Variable(self.w)
+        with chainer.using_config('free_retained_on_backward', True):
+            loss, h = self.forward(x, w)
+            h_node = h.node
+            del h
+            loss.backward(enable_double_backprop=True)
+        self.assertIsNotNone(h_node.data)
+
+
 @testing.parameterize(*(
     testing.product({
         'from_connected': [True, False],
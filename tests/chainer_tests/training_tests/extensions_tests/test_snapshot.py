@@ -1,9 +1,14 @@
 import os
+import shutil
+import tempfile
 import unittest
 
 import mock
+import numpy
 import pytest
 
+from chainer import link
+from chainer import serializers
 from chainer import testing
 from chainer import training
 from chainer.training import extensions
@@ -91,4 +96,115 @@ class TestSnapshotOnError(unittest.TestCase):
         self.assertTrue(os.path.exists(self.filename))
 
 
+class _IncrementalTarget(link.Link):
+
+    def __init__(self):
+        super(_IncrementalTarget, self).__init__()
+        self.add_persistent('a', numpy.zeros(1000, dtype=numpy.float32))
+        self.add_persistent('b', numpy.zeros((10, 10), dtype=numpy.int32))
+        self.add_persistent('c', 0)
+
+
+@testing.parameterize(*testing.product({
+    'writer': ['simple', 'thread_queue'],
+}))
+class TestIncrementalSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.trainer = testing.get_trainer_with_mock_updater()
+        self.trainer.out = tempfile.mkdtemp()
+        self.target = _IncrementalTarget()
+        if self.writer == 'simple':
+            writer = extensions.snapshot_writers.SimpleWriter(
+                compression=False)
+        else:
+            writer = extensions.snapshot_writers.ThreadQueueWriter()
+        self.snapshot = extensions.snapshot(
+            target=self.target, writer=writer, filename='snapshot_{}',
+            incremental=True, compaction_interval=3, chunk_size=400)
+        self.count = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.trainer.out)
+
+    def take_snapshot(self):
+        self.snapshot.filename = 'snapshot_{}'.format(self.count)
+        self.count += 1
+        self.snapshot(self.trainer)
+        return os.path.join(self.trainer.out, self.snapshot.filename)
+
+    def load(self, path):
+        target = _IncrementalTarget()
+        extensions.load_incremental_snapshot(path, target)
+        return target
+
+    def check_equal(self, actual):
+        numpy.testing.assert_array_equal(actual.a, self.target.a)
+        numpy.testing.assert_array_equal(actual.b, self.target.b)
+        self.assertEqual(actual.c, self.target.c)
+
+    def test_incremental(self):
+        paths = [self.take_snapshot()]
+        self.target.a[5] = 1
+        paths.append(self.take_snapshot())
+        self.target.a[500:] = 2
+        self.target.c = 3
+        paths.append(self.take_snapshot())
+        # Compaction
+        self.target.b[...] = 4
+        paths.append(self.take_snapshot())
+        self.target.b[0, 0] = 5
+        paths.append(self.take_snapshot())
+        self.snapshot.finalize()
+
+        self.check_equal(self.load(paths[-1]))
+        self.target.b[0, 0] = 4
+        self.check_equal(self.load(paths[-2]))
+
+        with numpy.load(paths[1]) as f:
+            # Only the first chunk of a is written.
+            self.assertNotIn('a', f)
+            self.assertNotIn('b', f)
+            numpy.testing.assert_array_equal(
+                f['_incremental/index/a'], [0])
+            self.assertEqual(f['_incremental/data/a'].size, 100)
+        with numpy.load(paths[3]) as f:
+            self.assertNotIn('_incremental/parent', f)
+            self.assertIn('a', f)
+
+    def test_load_full_snapshot_as_npz(self):
+        path = self.take_snapshot()
+        self.snapshot.finalize()
+        target = _IncrementalTarget()
+        serializers.load_npz(path, target)
+        self.check_equal(target)
+
+
+class TestIncrementalSnapshotSameFilename(unittest.TestCase):
+
+    def setUp(self):
+        self.trainer = testing.get_trainer_with_mock_updater()
+        self.trainer.out = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.trainer.out)
+
+    def test_same_filename(self):
+        target = _IncrementalTarget()
+        snapshot = extensions.snapshot(
+            target=target, filename='snapshot', incremental=True)
+        snapshot(self.trainer)
+        target.a[0] = 1
+        snapshot(self.trainer)
+
+        # The snapshot overwriting the previous one is always full.
+        path = os.path.join(self.trainer.out, 'snapshot')
+        with numpy.load(path) as f:
+            self.assertNotIn('_incremental/parent', f)
+
+    def test_invalid_compaction_interval(self):
+        with self.assertRaises(ValueError):
+            extensions.snapshot(incremental=True, compaction_interval=0)
+
+
 testing.run_module(__name__, __file__)
@@ -1,9 +1,14 @@
+import os
 import unittest
 
 import mock
 import multiprocessing
+import numpy
 import threading
 
+from chainer import links
+from chainer import serializers
+from chainer.serializers import _chunked
 from chainer import testing
 from chainer.training.extensions import snapshot_writers
 from chainer import utils
@@ -99,4 +104,24 @@ class TestQueueWriter(unittest.TestCase):
                 assert q.task_done.call_count == 3
 
 
+@testing.parameterize(*testing.product({
+    'writer': ['SimpleWriter', 'ThreadWriter', 'ProcessWriter',
+               'ThreadQueueWriter', 'ProcessQueueWriter'],
+}))
+class TestWriterWithKwds(unittest.TestCase):
+
+    def test_save_chunked(self):
+        target = links.Linear(3, 2)
+        w = getattr(snapshot_writers, self.writer)(codec='zlib', n_threads=2)
+        with utils.tempdir() as tempd:
+            w('myfile.dat', tempd, target)
+            w.finalize()
+
+            path = os.path.join(tempd, 'myfile.dat')
+            assert _chunked.is_chunked(path)
+            loaded = links.Linear(3, 2)
+            serializers.load_npz(path, loaded)
+            numpy.testing.assert_array_equal(loaded.W.array, target.W.array)
+
+
 testing.run_module(__name__, __file__)
@@ -154,4 +154,93 @@ class TestCol2Im(unittest.TestCase):
         self.check_col2im(*self.params, gpu=True)
 
 
+@testing.parameterize(*testing.product({
+    'stride': [1, 2],
+    'cover_all': [False, True],
+}))
+class TestConv1x1CPU(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (2, 3, 7, 6)).astype('f')
+        self.W = numpy.random.uniform(-1, 1, (4, 3, 1, 1)).astype('f')
+        s = self.stride
+        self.col = conv.im2col_cpu(self.x, 1, 1, s, s, 0, 0)
+        self.gy = numpy.random.uniform(
+            -1, 1, (2, 4) + self.col.shape[4:]).astype('f')
+
+    def test_conv(self):
+        y = conv.conv_1x1_cpu(self.x, self.W, self.stride, self.stride)
+        expect = numpy.einsum('ncjiyx,ocji->noyx', self.col, self.W)
+        testing.assert_allclose(y, expect)
+
+    def test_grad_w(self):
+        gW = conv.conv_1x1_grad_w_cpu(
+            self.x, self.gy, self.stride, self.stride)
+        expect = numpy.einsum('ncjiyx,noyx->ocji', self.col, self.gy)
+        testing.assert_allclose(gW, expect)
+
+    def test_deconv(self):
+        h, w = self.x.shape[2:]
+        if self.cover_all:
+            h += self.stride - 1
+        gx = conv.deconv_1x1_cpu(
+            self.gy, self.W, self.stride, self.stride, h, w)
+        self.assertEqual(gx.shape, (2, 3, h, w))
+        gcol = numpy.einsum('noyx,ocji->ncjiyx', self.gy, self.W)
+        expect = conv.col2im_cpu(
+            gcol, self.stride, self.stride, 0, 0, h, w)
+        testing.assert_allclose(gx, expect)
+
+
+@testing.parameterize(*testing.product({
+    'params': [
+        (3, 3, 1, 1, 1, 1, 1, 1),
+        (3, 2, 2, 2, 0, 1, 1, 1),
+        (2, 3, 1, 2, 1, 0, 2, 1),
+        (3, 3, 3, 3, 2, 2, 1, 2),
+    ],
+    'multiplier': [1, 2],
+    'cover_all': [False, True],
+}))
+class TestDepthwiseConvCPU(unittest.TestCase):
+
+    def setUp(self):
+        kh, kw, sy, sx, ph, pw, dy, dx = self.params
+        self.x = numpy.random.uniform(-1, 1, (2, 3, 7, 6)).astype('f')
+        self.W = numpy.random.uniform(
+            -1, 1, (3, self.multiplier, kh, kw)).astype('f')
+        self.col = conv.im2col_cpu(
+            self.x, kh, kw, sy, sx, ph, pw, cover_all=self.cover_all,
+            dy=dy, dx=dx)
+        self.gy = numpy.random.uniform(
+            -1, 1, (2, 3 * self.multiplier) + self.col.shape[4:]
+        ).astype('f')
+
+    def test_conv(self):
+        kh, kw, sy, sx, ph, pw, dy, dx = self.params
+        y = conv.depthwise_conv_cpu(
+            self.x, self.W, sy, sx, ph, pw, cover_all=self.cover_all,
+            dy=dy, dx=dx)
+        expect = numpy.einsum('ncjiyx,cmji->ncmyx', self.col, self.W)
+        testing.assert_allclose(y, expect.reshape(y.shape), atol=1e-5)
+
+    def test_grad_w(self):
+        kh, kw, sy, sx, ph, pw, dy, dx = self.params
+        gW = conv.depthwise_conv_grad_w_cpu(
+            self.x, self.gy, kh, kw, sy, sx, ph, pw,
+            cover_all=self.cover_all, dy=dy, dx=dx)
+        gy = self.gy.reshape((2, 3, self.multiplier) + self.gy.shape[2:])
+        expect = numpy.einsum('ncjiyx,ncmyx->cmji', self.col, gy)
+        testing.assert_allclose(gW, expect, atol=1e-5)
+
+    def test_deconv(self):
+        kh, kw, sy, sx, ph, pw, dy, dx = self.params
+        gx = conv.depthwise_deconv_cpu(
+            self.gy, self.W, sy, sx, ph, pw, 7, 6, dy=dy, dx=dx)
+        gy = self.gy.reshape((2, 3, self.multiplier) + self.gy.shape[2:])
+        gcol = numpy.einsum('ncmyx,cmji->ncjiyx', gy, self.W)
+        expect = conv.col2im_cpu(gcol, sy, sx, ph, pw, 7, 6, dy=dy, dx=dx)
+        testing.assert_allclose(gx, expect, atol=1e-5)
+
+
 testing.run_module(__name__, __file__)
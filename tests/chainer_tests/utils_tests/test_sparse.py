@@ -108,4 +108,74 @@ class TestGetOrder2(unittest.TestCase):
             utils.get_order(row, col)
 
 
+@testing.parameterize(*testing.product({
+    'rows': [[], [2], [4, 0, 4, 1, 0], [3, 3, 3]],
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+}))
+class TestIndexedRows(unittest.TestCase):
+
+    shape = (5, 2)
+
+    def setUp(self):
+        self.row_array = numpy.array(self.rows, dtype=numpy.int32)
+        self.values = numpy.random.uniform(
+            -1, 1, (len(self.rows),) + self.shape[1:]).astype(self.dtype)
+        self.expected = numpy.zeros(self.shape, dtype=self.dtype)
+        numpy.add.at(self.expected, self.row_array, self.values)
+        self.tol = {}
+        if self.dtype == numpy.float16:
+            self.tol = {'atol': 1e-2, 'rtol': 1e-2}
+
+    def test_to_dense(self):
+        x = utils.IndexedRows(self.row_array, self.values, self.shape)
+        dense = x.to_dense()
+        self.assertEqual(dense.dtype, self.dtype)
+        testing.assert_allclose(dense, self.expected, **self.tol)
+
+    def test_to_dense_out(self):
+        x = utils.IndexedRows(self.row_array, self.values, self.shape)
+        out = numpy.ones(self.shape, dtype=self.dtype)
+        self.assertIs(x.to_dense(out), out)
+        testing.assert_allclose(out, self.expected + 1, **self.tol)
+
+    def test_coalesce(self):
+        x = utils.IndexedRows(self.row_array, self.values, self.shape)
+        y = x.coalesce()
+        self.assertTrue(y.coalesced)
+        numpy.testing.assert_array_equal(
+            y.rows, numpy.unique(self.row_array))
+        testing.assert_allclose(y.values, self.expected[y.rows], **self.tol)
+        self.assertIs(y.coalesce(), y)
+
+    def test_concat(self):
+        x = utils.IndexedRows(self.row_array, self.values, self.shape)
+        testing.assert_allclose(
+            x.concat(x).to_dense(), self.expected * 2, **self.tol)
+
+
+class TestIndexedRowsInvalid(unittest.TestCase):
+
+    def test_invalid_rows(self):
+        with self.assertRaises(ValueError):
+            utils.IndexedRows(
+                numpy.zeros((2, 1), numpy.int32),
+                numpy.zeros((2, 1, 3), numpy.float32), (4, 3))
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValueError):
+            utils.IndexedRows(
+                numpy.zeros(2, numpy.int32),
+                numpy.zeros((2, 4), numpy.float32), (4, 3))
+
+    def test_concat_shape_mismatch(self):
+        x = utils.IndexedRows(
+            numpy.zeros(2, numpy.int32),
+            numpy.zeros((2, 3), numpy.float32), (4, 3))
+        y = utils.IndexedRows(
+            numpy.zeros(2, numpy.int32),
+            numpy.zeros((2, 3), numpy.float32), (5, 3))
+        with self.assertRaises(ValueError):
+            x.concat(y)
+
+
 testing.run_module(__name__, __file__)
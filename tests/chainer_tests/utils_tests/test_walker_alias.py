@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 
 import numpy
@@ -28,6 +30,34 @@ class TestWalkerAlias(unittest.TestCase):
         assert not self.sampler.use_gpu
         self.check_sample()
 
+    def test_sample_out_cpu(self):
+        out = numpy.empty((4, 3), numpy.int32)
+        numpy.random.seed(0)
+        expected = self.sampler.sample((4, 3))
+        numpy.random.seed(0)
+        vs = self.sampler.sample((4, 3), out=out)
+        assert vs is out
+        numpy.testing.assert_array_equal(vs, expected)
+
+    @attr.gpu
+    def test_sample_shape_gpu(self):
+        self.sampler.to_gpu()
+        vs = self.sampler.sample((4, 3))
+        assert isinstance(vs, cuda.ndarray)
+        assert vs.shape == (4, 3)
+        assert vs.dtype == numpy.int32
+
+    @attr.gpu
+    def test_sample_out_gpu(self):
+        self.sampler.to_gpu()
+        out = cuda.cupy.empty((4, 3), numpy.int32)
+        cuda.cupy.random.seed(0)
+        expected = self.sampler.sample((4, 3))
+        cuda.cupy.random.seed(0)
+        vs = self.sampler.sample((4, 3), out=out)
+        assert vs is out
+        cuda.cupy.testing.assert_array_equal(vs, expected)
+
     @attr.gpu
     def test_sample_gpu(self):
         self.sampler.to_gpu()
@@ -45,4 +75,66 @@ class TestWalkerAlias(unittest.TestCase):
         self.check_sample()
 
 
+class TestWalkerAliasPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.ps = numpy.array([5, 3, 4, 1, 2], dtype=numpy.int32)
+        self.sampler = utils.WalkerAlias(self.ps)
+        self.sampler.use_prefetch(3)
+
+    def tearDown(self):
+        self.sampler.use_prefetch(0)
+
+    def test_sample(self):
+        counts = numpy.zeros(len(self.ps), numpy.float32)
+        out = numpy.empty((4, 3), numpy.int32)
+        for i in range(1000):
+            if i % 2 == 0:
+                vs = self.sampler.sample((4, 3))
+            else:
+                vs = self.sampler.sample((4, 3), out=out)
+                assert vs is out
+            assert vs.shape == (4, 3)
+            assert vs.dtype == numpy.int32
+            numpy.add.at(counts, vs, 1)
+        counts /= (1000 * 12)
+        counts *= sum(self.ps)
+        testing.assert_allclose(self.ps, counts, atol=0.1, rtol=0.1)
+
+    def test_change_shape(self):
+        assert self.sampler.sample((4, 3)).shape == (4, 3)
+        assert self.sampler.sample((2,)).shape == (2,)
+        assert self.sampler.sample((4, 3)).shape == (4, 3)
+
+    def test_disable(self):
+        self.sampler.sample((4, 3))
+        prefetcher = self.sampler._prefetcher
+        thread = prefetcher._thread
+        assert thread.is_alive()
+        self.sampler.use_prefetch(0)
+        assert not thread.is_alive()
+        assert self.sampler._prefetcher is None
+        assert self.sampler.sample((4, 3)).shape == (4, 3)
+        assert self.sampler._prefetcher is None
+
+    def test_deepcopy(self):
+        self.sampler.sample((4, 3))
+        sampler = copy.deepcopy(self.sampler)
+        assert sampler._prefetcher is None
+        assert sampler.sample((4, 3)).shape == (4, 3)
+        sampler.use_prefetch(0)
+
+    def test_pickle(self):
+        self.sampler.sample((4, 3))
+        sampler = pickle.loads(pickle.dumps(self.sampler))
+        numpy.testing.assert_array_equal(
+            sampler.threshold, self.sampler.threshold)
+        assert sampler.sample((4, 3)).shape == (4, 3)
+        sampler.use_prefetch(0)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            self.sampler.use_prefetch(-1)
+
+
 testing.run_module(__name__, __file__)
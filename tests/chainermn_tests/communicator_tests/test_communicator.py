@@ -11,6 +11,8 @@ import chainer.testing
 import chainer.testing.attr
 import chainermn
 from chainermn.communicators import _communication_utility
+from chainermn.communicators.bucketed_communicator \
+    import BucketedCommunicator
 from chainermn.communicators.flat_communicator \
     import FlatCommunicator
 from chainermn.communicators.hierarchical_communicator \
@@ -52,6 +54,7 @@ class Param(object):
         self.model_dtype = None
         self.allreduce_grad_dtype = None
         self.batched_copy = False
+        self.bucket_size = None
         self.__dict__.update(param)
 
 
@@ -59,6 +62,17 @@ cpu_params = [Param(p) for p in [
     {
         'communicator_class': NaiveCommunicator,
         'multi_node': True,
+    }, {
+        'communicator_class': BucketedCommunicator,
+        'multi_node': True,
+    }, {
+        'communicator_class': BucketedCommunicator,
+        'multi_node': True,
+        'bucket_size': 16,
+    }, {
+        'communicator_class': BucketedCommunicator,
+        'multi_node': True,
+        'model_dtype': np.float16,
     }]]
 gpu_params = [Param(p) for p in [
     {
@@ -147,6 +161,9 @@ def create_communicator(param, use_gpu):
         communicator = param.communicator_class(
             mpi_comm, allreduce_grad_dtype=param.allreduce_grad_dtype,
             batched_copy=param.batched_copy)
+    elif param.bucket_size is not None:
+        communicator = param.communicator_class(
+            mpi_comm, bucket_size=param.bucket_size)
     else:
         communicator = param.communicator_class(mpi_comm)
 
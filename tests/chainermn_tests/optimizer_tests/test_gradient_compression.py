@@ -0,0 +1,169 @@
+import chainer
+from chainer import serializers
+import chainer.testing
+import chainermn
+from chainermn import compression
+import mock
+import numpy as np
+import unittest
+
+
+class ExampleModel(chainer.Chain):
+    def __init__(self):
+        super(ExampleModel, self).__init__()
+        with self.init_scope():
+            self.a = chainer.links.Linear(2, 3)
+            self.b = chainer.links.Linear(3, 4)
+            self.c = chainer.links.Linear(4, 5)
+
+
+def _create_compression(method):
+    if method == 'fp16':
+        return compression.FP16Compression()
+    elif method == 'topk':
+        return compression.TopKCompression(ratio=0.25)
+    elif method == 'onebit':
+        return compression.OneBitCompression()
+
+
+@chainer.testing.parameterize(*chainer.testing.product({
+    'method': ['fp16', 'topk', 'onebit'],
+}))
+class TestGradientCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = chainermn.create_communicator('naive')
+        self.compression = _create_compression(self.method)
+        self.target = ExampleModel()
+        # The gradients are common to all the processes, so that the
+        # average is equal to the decompressed gradients of each process.
+        rs = np.random.RandomState(0)
+        self.grads = {}
+        for name, param in sorted(self.target.namedparams()):
+            param.grad = rs.uniform(-1, 1, param.shape).astype(np.float32)
+            self.grads[name] = param.grad.copy()
+
+    def test_error_feedback(self):
+        self.compression.allreduce_grad(self.comm, self.target)
+        for name, param in self.target.namedparams():
+            residual = self.compression.residuals[name]
+            chainer.testing.assert_allclose(
+                param.grad + residual, self.grads[name],
+                atol=1e-3, rtol=1e-3)
+        self.assertGreater(self.compression.payload_bytes, 0)
+        n_bytes = sum(grad.nbytes for grad in self.grads.values())
+        self.assertLess(self.compression.payload_bytes, n_bytes)
+
+    def test_residual_is_added(self):
+        self.compression.allreduce_grad(self.comm, self.target)
+        residuals = {name: residual.copy() for name, residual
+                     in self.compression.residuals.items()}
+        for name, param in self.target.namedparams():
+            param.grad = np.zeros_like(param.grad)
+        self.compression.allreduce_grad(self.comm, self.target)
+        for name, param in self.target.namedparams():
+            chainer.testing.assert_allclose(
+                param.grad + self.compression.residuals[name],
+                residuals[name], atol=1e-3, rtol=1e-3)
+
+    def test_serialize(self):
+        self.compression.allreduce_grad(self.comm, self.target)
+        target = {}
+        self.compression.serialize(
+            serializers.DictionarySerializer(target), self.target)
+
+        copied = _create_compression(self.method)
+        copied.serialize(serializers.NpzDeserializer(target), self.target)
+        self.assertEqual(sorted(copied.residuals),
+                         sorted(self.compression.residuals))
+        for name, residual in self.compression.residuals.items():
+            np.testing.assert_array_equal(copied.residuals[name], residual)
+
+
+class TestTopKCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = chainermn.create_communicator('naive')
+
+    def test_invalid_ratio(self):
+        with self.assertRaises(ValueError):
+            compression.TopKCompression(ratio=0)
+        with self.assertRaises(ValueError):
+            compression.TopKCompression(ratio=1.5)
+
+    def test_all_elements(self):
+        target = ExampleModel()
+        for param in target.params():
+            param.grad = np.full(param.shape, self.comm.rank, np.float32)
+        compression.TopKCompression(ratio=1).allreduce_grad(
+            self.comm, target)
+        base = (self.comm.size - 1.0) / 2
+        for param in target.params():
+            chainer.testing.assert_allclose(
+                param.grad, np.full(param.shape, base))
+
+
+class TestMultiNodeOptimizerWithCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = chainermn.create_communicator('naive')
+        self.target = ExampleModel()
+        self.target.a.W.data[:] = self.comm.rank
+        self.target.b.W.data[:] = self.comm.rank + 1
+        self.target.c.W.data[:] = self.comm.rank + 2
+        self.target.a.W.grad[:] = 0
+        self.target.b.W.grad[:] = 0
+        self.target.c.W.grad[:] = 0
+        self.actual_optimizer = chainer.GradientMethod()
+        self.actual_optimizer.create_update_rule = mock.MagicMock
+
+    def test_update(self):
+        self.compression = compression.TopKCompression(ratio=1)
+        self.optimizer = chainermn.create_multi_node_optimizer(
+            self.actual_optimizer, self.comm, compression=self.compression)
+        self.optimizer.setup(self.target)
+        self.optimizer.update()
+        self.assertEqual(self.actual_optimizer.t, 0)
+        self.optimizer.target.a.W.grad[:] = self.comm.rank
+        self.optimizer.target.b.W.grad[:] = self.comm.rank + 1
+        self.optimizer.target.c.W.grad[:] = self.comm.rank + 2
+
+        self.optimizer.update()
+        self.assertEqual(self.actual_optimizer.t, 1)
+        self.optimizer.target.a.W.update_rule.update.assert_called_once_with(
+            self.optimizer.target.a.W)
+
+        base = (self.comm.size - 1.0) / 2
+        chainer.testing.assert_allclose(self.optimizer.target.a.W.grad,
+                                        (base + 0) * np.ones((3, 2)))
+        chainer.testing.assert_allclose(self.optimizer.target.b.W.grad,
+                                        (base + 1) * np.ones((4, 3)))
+        chainer.testing.assert_allclose(self.optimizer.target.c.W.grad,
+                                        (base + 2) * np.ones((5, 4)))
+        self.assertGreater(self.compression.payload_bytes, 0)
+
+    def test_serialize_residuals(self):
+        self.compression = compression.OneBitCompression()
+        self.optimizer = chainermn.create_multi_node_optimizer(
+            chainer.optimizers.SGD(), self.comm,
+            compression=self.compression)
+        self.optimizer.setup(self.target)
+        self.compression.residuals['/a/W'] = np.ones((3, 2), np.float32)
+
+        target = {}
+        self.optimizer.serialize(serializers.DictionarySerializer(target))
+        self.assertIn('compression_residual/a/W', target)
+
+        copied = compression.OneBitCompression()
+        optimizer = chainermn.create_multi_node_optimizer(
+            chainer.optimizers.SGD(), self.comm, compression=copied)
+        optimizer.setup(self.target)
+        optimizer.serialize(serializers.NpzDeserializer(target))
+        np.testing.assert_array_equal(
+            copied.residuals['/a/W'], np.ones((3, 2)))
+
+    def test_double_buffering(self):
+        with self.assertRaises(ValueError):
+            chainermn.create_multi_node_optimizer(
+                self.actual_optimizer, self.comm, double_buffering=True,
+                compression=compression.FP16Compression())
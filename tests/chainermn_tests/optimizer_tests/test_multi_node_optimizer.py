@@ -105,6 +105,42 @@ class TestMultiNodeOptimizer(unittest.TestCase):
                                         (base + 2) * np.ones((5, 4)))
 
 
+class SparseExampleModel(chainer.Chain):
+    def __init__(self):
+        super(SparseExampleModel, self).__init__()
+        with self.init_scope():
+            self.embed = chainer.links.EmbedID(5, 3, sparse_grad=True)
+
+    def __call__(self, x):
+        return chainer.functions.sum(self.embed(x))
+
+
+class TestMultiNodeOptimizerWithSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = chainermn.create_communicator('naive')
+        self.target = SparseExampleModel()
+        self.actual_optimizer = chainer.GradientMethod()
+        self.actual_optimizer.create_update_rule = mock.MagicMock
+
+    def test_update(self):
+        self.optimizer = chainermn.create_multi_node_optimizer(
+            self.actual_optimizer, self.comm)
+        self.optimizer.setup(self.target)
+        x = np.array([self.comm.rank % 5], np.int32)
+        self.optimizer.update(self.target, x)
+        self.assertEqual(self.actual_optimizer.t, 0)
+
+        self.optimizer.update(self.target, x)
+        self.assertEqual(self.actual_optimizer.t, 1)
+        W = self.optimizer.target.embed.W
+        self.assertIsNone(W.sparse_grad)
+        expected = np.zeros((5, 3), np.float32)
+        for rank in range(self.comm.size):
+            expected[rank % 5] += 1.0 / self.comm.size
+        chainer.testing.assert_allclose(W.grad, expected)
+
+
 class DynamicExampleModel(chainer.Chain):
 
     def __init__(self):